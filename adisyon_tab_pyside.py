@@ -1,20 +1,66 @@
 # adisyon_tab_pyside.py
 
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                                 QLineEdit, QPushButton, QComboBox, QTreeWidget,
-                                 QTreeWidgetItem, QMessageBox, QSizePolicy,
+                                 QLineEdit, QPushButton, QComboBox, QTreeView,
+                                 QAbstractItemView, QMessageBox, QSizePolicy,
                                  QScrollArea, QGridLayout, QDialog, QDoubleSpinBox,
-                                 QHeaderView)
-from PySide6.QtCore import Qt, QDateTime, QTimer
+                                 QHeaderView, QCompleter)
+from PySide6.QtCore import Qt, QDateTime, QTimer, QModelIndex
 from PySide6.QtGui import QColor, QPalette, QDoubleValidator
 
+import itertools
+import sqlite3
+
 import constants
+import refresh_bus
+from cart_tap_batcher import CartTapBatcher
+from cart_model import CartItemModel, CartLine, COLUMN_URUN_ADI, COLUMN_MIKTAR, COLUMN_BIRIM_FIYAT, COLUMN_TUTAR, COLUMN_EKLEME_SAAT
+from customer_search_model import CustomerSearchModel, CUSTOMER_ID_ROLE, customer_display_text
+from database import DatabaseManager
+from money import Money, ZERO
 from datetime import datetime, timedelta
-from masa_tab_pyside import MasaTabPyside
 
 import os # <<< Yeni import
 print(f"adisyon_tab_pyside.py yükleniyor. Dosya yolu: {os.path.abspath(__file__)}") # <<< Yeni debug satırı
 
+
+# Veritabanı kuyruğunda (db_executor) çalışan birleşik işler: func(db_manager, *args)
+def _read_order(db_manager, siparis_id):
+    """Sepet yüklemesi için sipariş detayları, sipariş bilgisi ve atanan müşteri (aynı okuma işinde)."""
+    order_info = db_manager.get_order_info(siparis_id)
+    customer = None
+    if order_info and order_info['musteri_id'] is not None:
+        customer = db_manager.get_customer_by_id(order_info['musteri_id'])
+    return db_manager.get_order_details(siparis_id), order_info, customer
+
+
+def _pay_order(db_manager, siparis_id, payment_method, musteri_id=None):
+    """Adisyonu kapatır; müşteri bakiyesinden ödemede bakiye kontrolü, bakiye düşme ve kapanış tek transaction'dadır
+    (kapanış başarısız olursa bakiye geri alınır). Dönüş: (başarı, net toplam, hata mesajı)."""
+    try:
+        with db_manager.transaction():
+            if musteri_id is not None:
+                customer_info = db_manager.get_customer_by_id(musteri_id)
+                if customer_info is None:
+                    return False, None, "Atanan müşteri bilgisi bulunamadı."
+                order_info = db_manager.get_order_info(siparis_id)
+                if not order_info:
+                    return False, None, "Adisyon bilgisi alınamadı."
+                kalan_tutar = (Money.of(order_info['toplam_tutar']) - Money.of(order_info['iskonto'])
+                               - Money.of(order_info['odenen_tutar']))
+                customer_balance = Money.of(customer_info['bakiye'])
+                if customer_balance < kalan_tutar:
+                    return False, None, f"Müşterinin bakiyesi yetersiz. (Bakiye: {customer_balance:.2f} TL, Kalan: {kalan_tutar:.2f} TL)"
+                if kalan_tutar > ZERO and not db_manager.update_customer_balance(musteri_id, -kalan_tutar):
+                    raise sqlite3.Error("Müşteri bakiyesi düşülürken bir hata oluştu.")
+            success, final_net_total = db_manager.process_full_payment(siparis_id, payment_method)
+            if not success:
+                raise sqlite3.Error(f"Ödeme kaydedilemedi: {final_net_total}")
+    except sqlite3.Error as e:
+        print(f"Adisyon kapatma hatası (Sipariş ID {siparis_id}, Yöntem {payment_method}): {e}")
+        return False, None, str(e)
+    return True, final_net_total, None
+
 # PySide6 Özel Diyalog Sınıfları
 class DiscountDialogPyside(QDialog):
     def __init__(self, parent, current_brut_total):
@@ -32,7 +78,7 @@ class DiscountDialogPyside(QDialog):
 
         self.spinbox_discount = QDoubleSpinBox(self)
         self.spinbox_discount.setMinimum(0.0)
-        self.spinbox_discount.setMaximum(current_brut_total)
+        self.spinbox_discount.setMaximum(current_brut_total.to_float()) # Money; spinbox TL float ile çalışır
         self.spinbox_discount.setDecimals(2)
         self.spinbox_discount.setSingleStep(0.5)
         self.spinbox_discount.setSuffix(" TL")
@@ -58,7 +104,7 @@ class DiscountDialogPyside(QDialog):
 
 
     def accept(self):
-        self.discount_amount = self.spinbox_discount.value()
+        self.discount_amount = Money.from_tl(self.spinbox_discount.value())
         super().accept()
 
     def reject(self):
@@ -84,12 +130,12 @@ class PartialPaymentDialogPyside(QDialog):
 
         self.spinbox_payment = QDoubleSpinBox(self)
         self.spinbox_payment.setMinimum(0.01)
-        self.spinbox_payment.setMaximum(max(remaining_balance, 0.01))
+        self.spinbox_payment.setMaximum(max(remaining_balance.to_float(), 0.01)) # Money; spinbox TL float ile çalışır
         self.spinbox_payment.setDecimals(2)
         self.spinbox_payment.setSingleStep(0.5)
         self.spinbox_payment.setSuffix(" TL")
         self.spinbox_payment.setKeyboardTracking(False)
-        self.spinbox_payment.setValue(remaining_balance)
+        self.spinbox_payment.setValue(remaining_balance.to_float())
         layout.addWidget(self.spinbox_payment)
 
         button_box = QWidget(self)
@@ -111,8 +157,8 @@ class PartialPaymentDialogPyside(QDialog):
 
 
     def accept(self):
-        self.payment_amount = self.spinbox_payment.value()
-        if self.payment_amount <= 0:
+        self.payment_amount = Money.from_tl(self.spinbox_payment.value())
+        if self.payment_amount <= ZERO:
              QMessageBox.warning(self, "Uyarı", "Ödeme miktarı pozitif bir sayı olmalıdır.")
              return
         super().accept()
@@ -129,7 +175,22 @@ class AdisyonTabPyside(QWidget):
         super().__init__()
         self.main_app = main_app
 
-        self._customer_list_data = []
+        # Müşteri seçici: liste yüklenmez, yazarken en iyi eşleşmeler aranır; seçilen müşteri "Ata" ile adisyona atanır
+        self._selected_customer_id = None
+
+        # Hızlı satış buton havuzu: butonlar katalog sürümü başına bir kez oluşturulur, filtre sadece gösterir/gizler
+        self._hizli_satis_buttons = {} # urun_id -> QPushButton (aktif ürünler, hızlı satış sırasıyla)
+        self._hizli_satis_catalogue_version = None # Havuzun oluşturulduğu katalog sürümü
+        self._hizli_satis_visible_ids = None # Izgarada şu an gösterilen urun_id listesi
+
+        # Veritabanı işleri main_app.db_executor kuyruğunda çalışır; sonuçlar geldiğinde masa/sipariş hâlâ aktifse ekrana yansıtılır
+        self._payment_pending = False # Ödeme kuyruktayken yeni ürün eklenmez
+        # Hızlı satış dokunuşları grup commit ile yazılır; sepet iyimser güncellenir
+        self.tap_batcher = CartTapBatcher(main_app.db_executor, parent=self)
+        self.tap_batcher.batch_finished.connect(self._on_taps_applied)
+        self._temp_detay_ids = itertools.count(-1, -1) # Kaydı henüz gelmemiş satırların geçici detay_id'leri
+        self._shown_discount = ZERO # Ekrandaki iskonto/ödenen (iyimser toplamda kullanılır)
+        self._shown_odenen = ZERO
 
         self._create_ui()
         self._configure_styles()
@@ -151,10 +212,27 @@ class AdisyonTabPyside(QWidget):
         customer_assign_layout = QHBoxLayout(customer_assign_groupbox)
 
         customer_assign_layout.addWidget(QLabel("Müşteri Ata:", self))
-        self.cmb_musteri_sec = QComboBox(self)
-        self.cmb_musteri_sec.setFixedWidth(200)
-        self.cmb_musteri_sec.setEditable(False)
-        customer_assign_layout.addWidget(self.cmb_musteri_sec)
+        self.entry_musteri_ara = QLineEdit(self)
+        self.entry_musteri_ara.setFixedWidth(200)
+        self.entry_musteri_ara.setPlaceholderText("Ad veya telefon ara...")
+        self.entry_musteri_ara.setClearButtonEnabled(True)
+        customer_assign_layout.addWidget(self.entry_musteri_ara)
+
+        self.customer_search_model = CustomerSearchModel(self.main_app.db_executor, self)
+        self.customer_search_model.search_finished.connect(self._on_customers_found)
+        self.customer_completer = QCompleter(self.customer_search_model, self)
+        # Sonuçlar zaten veritabanında filtrelendi; QCompleter tekrar filtrelemez
+        self.customer_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.customer_completer.setMaxVisibleItems(constants.CUSTOMER_SEARCH_LIMIT)
+        self.customer_completer.activated[QModelIndex].connect(self._on_customer_chosen)
+        self.entry_musteri_ara.setCompleter(self.customer_completer)
+
+        # Hızlı yazarken her tuşta değil, yazma durunca aranır
+        self._customer_search_timer = QTimer(self)
+        self._customer_search_timer.setSingleShot(True)
+        self._customer_search_timer.setInterval(constants.CUSTOMER_SEARCH_DELAY_MS)
+        self._customer_search_timer.timeout.connect(self._search_customers)
+        self.entry_musteri_ara.textEdited.connect(self._on_customer_text_edited)
 
         self.btn_atama_yap = QPushButton("Ata", self)
         self.btn_atama_yap.clicked.connect(self._assign_customer_to_order)
@@ -203,22 +281,25 @@ class AdisyonTabPyside(QWidget):
         cart_label = QLabel("Adisyon Sepeti:", self)
         main_layout.addWidget(cart_label)
 
-        self.cart_treeview = QTreeWidget(self)
-        self.cart_treeview.setHeaderLabels(["Ürün Adı", "Miktar", "Birim Fiyat", "Tutar", "Eklenme Saat", "detay_id"])
-        self.cart_treeview.setColumnHidden(5, True)
+        # Sepet satırları CartItemModel'de tutulur (tek doğru kaynak); görünüm sadece modeli çizer
+        self.cart_model = CartItemModel(self)
+        self.cart_treeview = QTreeView(self)
+        self.cart_treeview.setModel(self.cart_model)
+        self.cart_treeview.setUniformRowHeights(True)
 
         header = self.cart_treeview.header()
-        header.setSectionResizeMode(0, QHeaderView.Stretch)
-        header.resizeSection(1, 70)
-        header.resizeSection(2, 90)
-        header.resizeSection(3, 90)
-        header.resizeSection(4, 90)
-        header.resizeSection(5, 0)
+        header.setSectionResizeMode(COLUMN_URUN_ADI, QHeaderView.Stretch)
+        header.resizeSection(COLUMN_MIKTAR, 70)
+        header.resizeSection(COLUMN_BIRIM_FIYAT, 90)
+        header.resizeSection(COLUMN_TUTAR, 90)
+        header.resizeSection(COLUMN_EKLEME_SAAT, 90)
 
         self.cart_treeview.setSortingEnabled(False)
-        self.cart_treeview.setSelectionBehavior(QTreeWidget.SelectRows)
+        self.cart_treeview.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.cart_treeview.setSelectionMode(QAbstractItemView.SingleSelection)
         self.cart_treeview.setItemsExpandable(False)
         self.cart_treeview.setRootIsDecorated(False)
+        self.cart_treeview.selectionModel().selectionChanged.connect(lambda selected, deselected: self._update_button_states())
 
         main_layout.addWidget(self.cart_treeview, 3)
 
@@ -338,13 +419,23 @@ class AdisyonTabPyside(QWidget):
              QPushButton#HizliSatisButton:hover {
                 border-color: #007bff;
             }
-        """)
+        """ + self._category_color_styles())
+
+    @staticmethod
+    def _category_color_styles():
+        """Hızlı satış butonlarının kategori renkleri için ortak stil kuralları (kategoriRenk dinamik özelliği).
+
+        Renk butona ayrı setStyleSheet ile değil, sekmenin stil sayfasındaki özellik seçicisiyle verilir.
+        """
+        return "".join(f"""
+            QPushButton#HizliSatisButton[kategoriRenk="{index}"] {{
+                background-color: {color};
+            }}""" for index, color in enumerate(constants.DEFAULT_CATEGORY_COLORS))
 
     def load_data(self):
          """Adisyon sekmesi aktif olduğunda verileri yükler."""
          print("Adisyon sekmesi verileri yükleniyor...")
          self.update_aktif_masa_label()
-         self.load_customer_combobox()
          self.load_categories_combobox()
          self.filter_hizli_satis_buttons()
          self.load_cart()
@@ -359,58 +450,60 @@ class AdisyonTabPyside(QWidget):
         else:
             self.lbl_aktif_masa.setText("Aktif Masa: Seçilmedi")
 
-    def load_customer_combobox(self, clear_selection=False):
-        """Müşteri atama Combobox'ını veritabanındaki müşterilerle doldurur."""
-        customers = self.main_app.db_manager.get_all_customers()
-
-        self.cmb_musteri_sec.clear()
-        self._customer_list_data = []
-
-        self.cmb_musteri_sec.addItem("-- Müşteri Seçilmedi --", None)
-        self._customer_list_data.append({"id": None, "text": "-- Müşteri Seçilmedi --"})
-
-
-        for c in customers:
-            text = f"{c['ad_soyad']} ({c['telefon'] or 'Telefon Yok'})"
-            self.cmb_musteri_sec.addItem(text, c['musteri_id'])
-            self._customer_list_data.append({"id": c['musteri_id'], "text": text})
+    def _set_selected_customer(self, musteri_id, customer=None):
+        """Seçiciye verilen müşteriyi yazar ve Atanan etiketini günceller (adisyonun kayıtlı müşterisi; customer: müşteri satırı)."""
+        self._customer_search_timer.stop()
+        text = customer_display_text(customer['ad_soyad'], customer['telefon']) if musteri_id is not None and customer else ""
+        self._selected_customer_id = musteri_id
+        self.entry_musteri_ara.setText(text or "")
+        self._update_assigned_customer_label_by_text(text)
+
+    def _on_customer_text_edited(self, text):
+        """Metin elle değişince önceki seçim geçersiz olur; öneriler kısa bir gecikmeyle aranır."""
+        self._selected_customer_id = None
+        self._customer_search_timer.start()
+
+    def _search_customers(self):
+        text = self.entry_musteri_ara.text()
+        if text == self.customer_search_model.requested_query:
+            return
+        self.customer_search_model.search(text)
 
+    def _on_customers_found(self, count):
+        """Arama sonucu geldi: yazı hâlâ aynıysa öneri listesi açılır."""
+        if (count and self.entry_musteri_ara.hasFocus()
+                and self.entry_musteri_ara.text() == self.customer_search_model.last_query):
+            self.customer_completer.complete()
 
-        if clear_selection or self.main_app.aktif_siparis_id is None:
-            self.cmb_musteri_sec.setCurrentIndex(0)
-            self._update_assigned_customer_label(None)
-        else:
-             order_info = self.main_app.db_manager.get_order_info(self.main_app.aktif_siparis_id)
-             if order_info and order_info['musteri_id'] is not None:
-                  assigned_customer_id = order_info['musteri_id']
-                  index = self.cmb_musteri_sec.findData(assigned_customer_id)
-                  if index != -1:
-                       self.cmb_musteri_sec.setCurrentIndex(index)
-                       assigned_customer_text = self.cmb_musteri_sec.itemText(index)
-                       self._update_assigned_customer_label_by_text(assigned_customer_text)
-                  else:
-                       self.cmb_musteri_sec.setCurrentIndex(0)
-                       self._update_assigned_customer_label(None)
-             else:
-                 self.cmb_musteri_sec.setCurrentIndex(0)
-                 self._update_assigned_customer_label(None)
+    def _on_customer_chosen(self, index):
+        """Öneri listesinden müşteri seçildi (henüz atanmadı, "Ata" butonu bekleniyor)."""
+        self._customer_search_timer.stop()
+        self._selected_customer_id = index.data(CUSTOMER_ID_ROLE)
+        self.entry_musteri_ara.setText(index.data(Qt.DisplayRole))
 
     def _assign_customer_to_order(self):
-        """Combobox'tan seçilen müşteriyi aktif siparişe atar veya atamayı kaldırır."""
+        """Müşteri seçicide seçilen müşteriyi aktif siparişe atar (alan boşsa atamayı kaldırır)."""
         if self.main_app.aktif_siparis_id is None:
              QMessageBox.warning(self, "Uyarı", "Müşteri atamak için aktif bir adisyon olmalıdır.")
              return
 
-        selected_customer_id = self.cmb_musteri_sec.currentData()
-        selected_customer_text = self.cmb_musteri_sec.currentText()
+        selected_customer_id = self._selected_customer_id
+        selected_customer_text = self.entry_musteri_ara.text().strip()
+        if selected_customer_id is None and selected_customer_text:
+             QMessageBox.warning(self, "Uyarı", "Lütfen önerilerden bir müşteri seçin (atamayı kaldırmak için alanı boşaltın).")
+             return
 
         customer_name_for_message = "Yok"
         if selected_customer_id is not None:
              customer_name_for_message = selected_customer_text.split('(')[0].strip()
 
 
-        success = self.main_app.db_manager.link_customer_to_order(self.main_app.aktif_siparis_id, selected_customer_id)
+        masa_no = self.main_app.aktif_masa
+        self.main_app.db_executor.submit_write(
+            DatabaseManager.link_customer_to_order, self.main_app.aktif_siparis_id, selected_customer_id,
+            on_result=lambda success: self._on_customer_linked(masa_no, selected_customer_id, customer_name_for_message, success))
 
+    def _on_customer_linked(self, masa_no, selected_customer_id, customer_name_for_message, success):
         if success:
              if selected_customer_id is not None:
                  QMessageBox.information(self, "Başarılı", f"Müşteri '{customer_name_for_message}' adisyona atandı.")
@@ -418,8 +511,7 @@ class AdisyonTabPyside(QWidget):
                  QMessageBox.information(self, "Başarılı", "Müşteri adisyondan kaldırıldı.")
 
              self._update_assigned_customer_label(selected_customer_id)
-             if hasattr(self.main_app, 'masa_tab') and isinstance(self.main_app.masa_tab, MasaTabPyside):
-                  self.main_app.masa_tab.load_masa_buttons()
+             self._publish_masa_changed(masa_no)
 
         else:
              QMessageBox.critical(self, "Hata", "Müşteri atama/kaldırma sırasında bir hata oluştu.")
@@ -427,20 +519,27 @@ class AdisyonTabPyside(QWidget):
 
 
     def _update_assigned_customer_label(self, musteri_id):
-        """Atanan müşteri etiketini günceller (musteri_id'ye göre)."""
+        """Atanan müşteri etiketini günceller (musteri_id'ye göre; müşteri adı kuyruktan okunur)."""
         if musteri_id is not None:
-            customer = self.main_app.db_manager.get_customer_by_id(musteri_id)
-            if customer:
-                 musteri_ad_soyad = customer['ad_soyad']
-                 self.lbl_atanan_musteri.setText(f"Atanan: {musteri_ad_soyad}")
-            else:
-                 self.lbl_atanan_musteri.setText(f"Atanan: Bilinmiyor (ID: {musteri_id})")
+            siparis_id = self.main_app.aktif_siparis_id
+            self.main_app.db_executor.submit_read(
+                DatabaseManager.get_customer_by_id, musteri_id,
+                on_result=lambda customer: self._on_assigned_customer_loaded(siparis_id, musteri_id, customer))
         else:
             self.lbl_atanan_musteri.setText("Atanan: Yok")
 
+    def _on_assigned_customer_loaded(self, siparis_id, musteri_id, customer):
+        if self.main_app.aktif_siparis_id != siparis_id:
+            return # Bu arada başka adisyona geçildi
+        if customer:
+             musteri_ad_soyad = customer['ad_soyad']
+             self.lbl_atanan_musteri.setText(f"Atanan: {musteri_ad_soyad}")
+        else:
+             self.lbl_atanan_musteri.setText(f"Atanan: Bilinmiyor (ID: {musteri_id})")
+
     def _update_assigned_customer_label_by_text(self, customer_text):
-        """Atanan müşteri etiketini Combobox metnine göre günceller."""
-        if customer_text and customer_text != "-- Müşteri Seçilmedi --":
+        """Atanan müşteri etiketini seçici metnine ("Ad Soyad (telefon)") göre günceller."""
+        if customer_text:
              musteri_ad_soyad = customer_text.split('(')[0].strip()
              self.lbl_atanan_musteri.setText(f"Atanan: {musteri_ad_soyad}")
         else:
@@ -460,235 +559,253 @@ class AdisyonTabPyside(QWidget):
         self.cmb_kategori_filter.setCurrentIndex(0)
 
 
-    def filter_hizli_satis_buttons(self):
-        """Arama kutusu veya kategori seçimine göre hızlı satış butonlarını filtreler ve yeniden oluşturur."""
-        print("Hızlı satış butonları filtreleniyor ve yükleniyor...")
-        search_term = self.entry_search.text().strip().lower()
-        selected_category_id = self.cmb_kategori_filter.currentData()
-
-        while self.hizli_satis_grid_layout.count():
-            item = self.hizli_satis_grid_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-
-        urunler = self.main_app.db_manager.get_all_products(include_inactive=False)
-
-        filtered_urunler = []
-        for urun in urunler:
-            urun_adi_lower = urun['adi'].lower()
-            urun_kategori_id = urun['kategori_id']
-
-            category_match = (selected_category_id is None or selected_category_id == urun_kategori_id)
-            search_match = (search_term in urun_adi_lower)
-
-            if category_match and search_match:
-                filtered_urunler.append(urun)
-
-        row, col = 0, 0
-        max_cols = 6
+    def _build_hizli_satis_pool(self, catalogue):
+        """Aktif ürünler için hızlı satış butonlarını oluşturur (sadece katalog sürümü değiştiğinde)."""
+        for btn in self._hizli_satis_buttons.values():
+            self.hizli_satis_grid_layout.removeWidget(btn)
+            btn.deleteLater()
+        self._hizli_satis_buttons = {}
+        self._hizli_satis_visible_ids = None
 
-        for urun in filtered_urunler:
+        for urun in catalogue.get_products():
             urun_id = urun['urun_id']
             urun_adi = urun['adi']
             urun_fiyat = urun['fiyat']
             urun_kategori_id = urun['kategori_id']
 
-            button_text = f"{urun_adi}\n{urun_fiyat:.2f} TL"
-
-            btn = QPushButton(button_text)
+            btn = QPushButton(f"{urun_adi}\n{urun_fiyat:.2f} TL", self.hizli_satis_button_widget)
             btn.setObjectName("HizliSatisButton")
             btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
             btn.setMinimumSize(100, 80)
-
+            btn.setVisible(False)
 
             if urun_kategori_id is not None and urun_kategori_id > 0:
                  color_index = (urun_kategori_id - 1) % len(constants.DEFAULT_CATEGORY_COLORS)
-                 bg_color = constants.DEFAULT_CATEGORY_COLORS[color_index]
+                 btn.setProperty("kategoriRenk", str(color_index)) # Renk _category_color_styles kuralından gelir
 
-                 btn.setStyleSheet(f"""
-                     QPushButton#HizliSatisButton {{
-                         background-color: {bg_color};
-                     }}
-                      QPushButton#HizliSatisButton:hover {{
-                         border-color: #007bff;
-                     }}
-                 """)
+            btn.clicked.connect(lambda checked, id=urun_id, adi=urun_adi, fiyat=urun_fiyat, kat_id=urun_kategori_id: self.add_to_cart(id, adi, fiyat, kat_id))
+            self._hizli_satis_buttons[urun_id] = btn
 
+        self._hizli_satis_catalogue_version = catalogue.version
+        print(f"Hızlı satış buton havuzu oluşturuldu: {len(self._hizli_satis_buttons)} ürün (katalog sürümü {catalogue.version}).")
 
-            btn.clicked.connect(lambda checked, id=urun_id, adi=urun_adi, fiyat=urun_fiyat, kat_id=urun_kategori_id: self.add_to_cart(id, adi, fiyat, kat_id))
 
-            self.hizli_satis_grid_layout.addWidget(btn, row, col, 1, 1)
+    def filter_hizli_satis_buttons(self):
+        """Arama kutusu veya kategori seçimine göre hızlı satış butonlarını filtreler.
+
+        Butonlar yeniden oluşturulmaz; eşleşenler gösterilip ızgaraya yeniden dizilir, diğerleri gizlenir.
+        """
+        search_term = self.entry_search.text().strip()
+        selected_category_id = self.cmb_kategori_filter.currentData()
+
+        # Ürünler katalog önbelleğinden gelir (SQLite'a sadece katalog değiştiğinde gidilir)
+        catalogue = self.main_app.db_manager.get_catalogue()
+        if catalogue.version != self._hizli_satis_catalogue_version:
+            self._build_hizli_satis_pool(catalogue)
+
+        if search_term:
+            # N-gram arama indeksi (Türkçe harf/aksan duyarsız), sonuçlar popülerlik sırasıyla
+            urunler = catalogue.search_index.search(search_term, selected_category_id)
+        elif selected_category_id is None:
+            urunler = catalogue.get_products()
+        else:
+            urunler = catalogue.get_products_by_category(selected_category_id)
+
+        visible_ids = [urun['urun_id'] for urun in urunler]
+        if visible_ids == self._hizli_satis_visible_ids:
+            return # Görünen butonlar değişmedi
+
+        max_cols = 6
+        container = self.hizli_satis_button_widget
+        container.setUpdatesEnabled(False) # Yeniden dizme bitene kadar çizim yapılmasın
+        try:
+            if self._hizli_satis_visible_ids:
+                for urun_id in self._hizli_satis_visible_ids:
+                    btn = self._hizli_satis_buttons[urun_id]
+                    self.hizli_satis_grid_layout.removeWidget(btn)
+                    btn.setVisible(False)
 
-            col += 1
-            if col >= max_cols:
-                col = 0
-                row += 1
+            for position, urun_id in enumerate(visible_ids):
+                btn = self._hizli_satis_buttons[urun_id]
+                self.hizli_satis_grid_layout.addWidget(btn, position // max_cols, position % max_cols, 1, 1)
+                btn.setVisible(True)
 
-        for i in range(max_cols):
-            self.hizli_satis_grid_layout.setColumnStretch(i, 1)
+            for i in range(max_cols):
+                self.hizli_satis_grid_layout.setColumnStretch(i, 1)
+        finally:
+            container.setUpdatesEnabled(True)
 
-        print(f"Toplam {len(filtered_urunler)} adet hızlı satış butonu eklendi.")
+        self._hizli_satis_visible_ids = visible_ids
+        print(f"Hızlı satış: {len(visible_ids)}/{len(self._hizli_satis_buttons)} buton gösteriliyor.")
 
 
     def add_to_cart(self, urun_id, urun_adi, urun_fiyat, kategori_id):
-        """Sepete ürün ekler veya mevcut ürünün miktarını artırır (hızlı satış butonu için miktar 1 kullanılır)."""
+        """Sepete ürün ekler veya mevcut ürünün miktarını artırır (hızlı satış butonu için miktar 1 kullanılır).
+
+        Sepet ve toplamlar hemen (iyimser) güncellenir; yazma grup commit penceresinde biriktirilir (tap_batcher) ve
+        aynı satıra gelen dokunuşlarla birlikte tek commit'te kaydedilir. Yeni satır kayıt numarası gelene kadar geçici
+        (negatif) detay_id taşır.
+        """
         if self.main_app.aktif_masa is None:
             QMessageBox.warning(self, "Uyarı", "Lütfen önce Masalar sekmesinden bir masa seçin.")
             return
+        if self._payment_pending:
+            QMessageBox.warning(self, "Uyarı", "Ödeme işleniyor, lütfen bekleyin.")
+            return
 
-        try:
-            if self.main_app.aktif_siparis_id is None:
-                siparis_id = self.main_app.db_manager.create_new_order(self.main_app.aktif_masa)
-                if siparis_id is None:
-                     QMessageBox.critical(self, "Hata", "Yeni sipariş oluşturulamadı.")
-                     return
+        existing_line = self.cart_model.cart.line_for_product(urun_id)
+        quantity = 1.0
+        if existing_line is None:
+            # Ürün sepette yok, yeni ürün olarak ekle. Miktar girişindeki değeri kullan.
+            try:
+                # Miktar girişindeki değeri al, boş veya geçersizse 1.0 kullan
+                quantity_str = self.entry_quantity.text().strip()
+                if quantity_str:
+                    quantity = float(quantity_str)
+                    if quantity <= 0:
+                        QMessageBox.warning(self, "Uyarı", "Miktar pozitif bir sayı olmalıdır.")
+                        return
+            except ValueError:
+                QMessageBox.warning(self, "Uyarı", "Geçerli bir miktar girin.")
+                return
+
+        birim_fiyat = Money.from_tl(urun_fiyat)
+        if existing_line is not None:
+            self.cart_model.set_quantity(existing_line.detay_id, existing_line.miktar + 1.0)
+        else:
+            self.cart_model.add_line(CartLine(next(self._temp_detay_ids), urun_id, urun_adi, quantity, birim_fiyat,
+                                              birim_fiyat * quantity, kategori_id, datetime.now().strftime("%H:%M:%S")))
+        self.update_totals_labels(self.cart_model.cart.brut_total, self._shown_discount, self._shown_odenen)
+        self._update_button_states()
+
+        self.tap_batcher.add(self.main_app.aktif_masa, urun_id, urun_adi, birim_fiyat, kategori_id, quantity)
+
+
+    def flush_pending_taps(self):
+        """Grup commit penceresinde bekleyen dokunuşları hemen yazıcı kuyruğuna gönderir (ödeme, sekme değişikliği, kapanış)."""
+        self.tap_batcher.flush()
+
+
+    def _on_taps_applied(self, success, results):
+        """Grup commit sonucu: iyimser eklenen satırlar kayıt numarasını alır; bekleyen dokunuş kalmadıysa miktarlar
+        ve toplamlar veritabanındaki değerlerle eşitlenir."""
+        if not success:
+            QMessageBox.critical(self, "Hata", "Ürünler sepete eklenemedi.")
+            if self.main_app.aktif_masa is not None:
+                self.load_cart()
+            return
+
+        reload_cart = False
+        latest_totals = None
+        for masa_no, urun_id, siparis_id, detay_id, miktar, totals in results:
+            self._publish_masa_changed(masa_no)
+            if self.main_app.aktif_masa != masa_no:
+                continue # Bu arada başka masaya geçildi; sadece Masalar görünümü yenilenir
+
+            if self.main_app.aktif_siparis_id != siparis_id:
+                if self.main_app.aktif_siparis_id is None:
+                    print(f"Yeni sipariş oluşturuldu. ID: {siparis_id} (Masa {masa_no})")
+                    self._set_selected_customer(None)
+                else:
+                    reload_cart = True # Sipariş başka yerden değişti, sepet baştan okunur
                 self.main_app.aktif_siparis_id = siparis_id
-                print(f"Yeni sipariş oluşturuldu. ID: {self.main_app.aktif_siparis_id} (Masa {self.main_app.aktif_masa})")
-                # Masa tabı tamamlandıysa MasaTab.load_masa_buttons() çağrılacak
-                if hasattr(self.main_app, 'masa_tab') and isinstance(self.main_app.masa_tab, MasaTabPyside):
-                     self.main_app.masa_tab.load_masa_buttons()
-                self.load_customer_combobox(clear_selection=True)
-
-            existing_item_widget = None
-            detay_id_to_update = None
-
-            root_item = self.cart_treeview.invisibleRootItem()
-            for i in range(root_item.childCount()):
-                 item = root_item.child(i)
-                 # Try to safely get the detail ID, handle potential errors
-                 try:
-                     item_detay_id = int(item.text(5))
-                 except ValueError:
-                     print(f"Hata: Treeview item'ında geçersiz detay_id değeri: {item.text(5)}")
-                     item_detay_id = -1 # Use a value that won't match a real ID
-
-                 item_urun_id = item.data(0, Qt.UserRole)
-
-                 if item_urun_id is not None and item_urun_id == urun_id and item_detay_id != -1:
-                      existing_item_widget = item
-                      detay_id_to_update = item_detay_id
-                      break
-
-            if existing_item_widget:
-                current_miktar = float(existing_item_widget.text(1))
-                new_miktar = current_miktar + 1.0
-                birim_fiyat = float(existing_item_widget.text(2).replace(" TL", ""))
-                new_tutar = new_miktar * birim_fiyat
-
-                success, updated_detay_id = self.main_app.db_manager.add_order_item(
-                    self.main_app.aktif_siparis_id, urun_id, urun_adi, new_miktar, birim_fiyat, kategori_id, detay_id=detay_id_to_update
-                )
-
-                if success:
-                    existing_item_widget.setText(1, f"{new_miktar}")
-                    existing_item_widget.setText(3, f"{new_tutar:.2f}")
-                    self._recalculate_and_update_totals()
-
-            else:
-                # Ürün sepette yok, yeni ürün olarak ekle. Miktar girişindeki değeri kullan.
-                try:
-                    # Miktar girişindeki değeri al, boş veya geçersizse 1.0 kullan
-                    quantity_str = self.entry_quantity.text().strip()
-                    if not quantity_str:
-                        quantity = 1.0
-                    else:
-                        quantity = float(quantity_str)
-                        if quantity <= 0:
-                            QMessageBox.warning(self, "Uyarı", "Miktar pozitif bir sayı olmalıdır.")
-                            return
-                except ValueError:
-                    QMessageBox.warning(self, "Uyarı", "Geçerli bir miktar girin.")
-                    return
-
-                # Aşağıdaki satırlar (except bloğundan sonraki)
-                # try: ve except: satırlarıyla aynı girintide olmalı (12 boşluk)
-                birim_fiyat = urun_fiyat
-                tutar = quantity * birim_fiyat
-
-                success, new_detay_id = self.main_app.db_manager.add_order_item(
-                    self.main_app.aktif_siparis_id, urun_id, urun_adi, quantity, birim_fiyat, kategori_id, detay_id=None
-                )
-
-                if success:
-                    self.load_cart()
-
-
-        except Exception as e:
-            # This catch is for errors *outside* the inner try blocks in this method
-            print(f"Ürün sepete eklenirken/güncellenirken beklenmedik hata oluştu: {e}")
-            # In a real app, more robust error handling might be needed
-            QMessageBox.critical(self, "Hata", f"Ürün sepete eklenirken/güncellenirken beklenmedik hata oluştu: {e}\nLütfen uygulamayı yeniden başlatmayı deneyin.")
-            # Attempt to reload cart just in case, but error state might be tricky
+
+            line = self.cart_model.cart.line_for_product(urun_id)
+            if line is None or (line.detay_id != detay_id and line.detay_id >= 0):
+                reload_cart = True # Sepet bu arada yeniden yüklendi veya veritabanıyla uyuşmuyor
+                continue
+            if line.detay_id != detay_id:
+                self.cart_model.set_detay_id(line.detay_id, detay_id)
+            if self.tap_batcher.is_idle():
+                self.cart_model.set_quantity(detay_id, miktar)
+            latest_totals = totals
+
+        if reload_cart:
             self.load_cart()
+        elif latest_totals is not None and self.tap_batcher.is_idle():
+            self._apply_order_totals(latest_totals)
+        else:
+            self._update_button_states()
 
 
-    def _recalculate_and_update_totals(self):
-        """TreeWidget'taki öğelere göre toplamları yeniden hesaplar ve UI'ı/Masa toplamlarını günceller."""
-        current_brut_total = 0.0
-        root_item = self.cart_treeview.invisibleRootItem()
-        for i in range(root_item.childCount()):
-             item = root_item.child(i)
-             try:
-                  item_tutar = float(item.text(3).replace(" TL", ""))
-                  current_brut_total += item_tutar
-             except ValueError:
-                  print(f"Hata: Geçersiz tutar değeri treeview'de bulundu: {item.text(3)}")
+    def _apply_order_totals(self, totals, masa_no=None):
+        """DatabaseManager'ın döndürdüğü güncel sipariş toplamlarını ekrana yansıtır (ek sorgu yapmaz)."""
+        if totals is None:
+            self._recalculate_and_update_totals()
+            return
 
+        self.update_totals_labels(totals['toplam_tutar'], totals['iskonto'], totals['odenen_tutar'])
+        # Masa toplamı apply_order_item içinde güncellendi, sadece Masalar görünümüne bildir
+        self._publish_masa_changed(masa_no if masa_no is not None else self.main_app.aktif_masa)
+        self._update_button_states()
 
-        current_iskonto = 0.0
-        current_odenen_tutar = 0.0
 
-        if self.main_app.aktif_siparis_id is not None:
-             order_info = self.main_app.db_manager.get_order_info(self.main_app.aktif_siparis_id)
-             if order_info:
-                  current_iskonto = order_info['iskonto'] or 0.0
-                  current_odenen_tutar = order_info['odenen_tutar'] or 0.0
+    def _publish_masa_changed(self, masa_no=None):
+        """Masa durum/toplam değişikliğini yenileme veriyoluna bildirir (Masalar görünümü bir sonraki turda bir kez yenilenir)."""
+        self.main_app.refresh_bus.publish(refresh_bus.MASA_CHANGED, masa_no)
 
 
-        self.update_totals_labels(current_brut_total, current_iskonto, current_odenen_tutar)
+    def _is_active_order(self, masa_no, siparis_id):
+        """Kuyruktan dönen sonuç hâlâ ekrandaki adisyona mı ait."""
+        return self.main_app.aktif_masa == masa_no and self.main_app.aktif_siparis_id == siparis_id
 
-        if self.main_app.aktif_masa is not None and self.main_app.aktif_siparis_id is not None:
-            order_info = self.main_app.db_manager.get_order_info(self.main_app.aktif_siparis_id)
-            if order_info and order_info['durum'] == 'Açık':
-                 self.main_app.db_manager.update_masa_totals(self.main_app.aktif_masa, current_brut_total, current_iskonto, current_odenen_tutar)
-                 # Masa tabı tamamlandıysa MasaTab.load_masa_buttons() çağrılacak
-                 if hasattr(self.main_app, 'masa_tab') and isinstance(self.main_app.masa_tab, MasaTabPyside):
-                      self.main_app.masa_tab.load_masa_buttons()
 
+    def _recalculate_and_update_totals(self):
+        """Sepet modelindeki brüt toplama göre UI'ı/Masa toplamlarını günceller (iskonto/ödenen kuyruktan okunur)."""
+        if self.main_app.aktif_siparis_id is None:
+            self.update_totals_labels(self.cart_model.cart.brut_total, ZERO, ZERO)
+            return
 
-    def load_cart(self):
-        """Aktif masanın sepetini (sipariş detaylarını) TreeWidget'e yükler."""
-        print("Sepet verileri yükleniyor...")
-        self.cart_treeview.clear()
+        self.flush_pending_taps() # Okuma yazıcı kuyruğunda dokunuşlardan sonra çalışır
+        masa_no, siparis_id = self.main_app.aktif_masa, self.main_app.aktif_siparis_id
+        self.main_app.db_executor.submit_read(
+            DatabaseManager.get_order_info, siparis_id,
+            on_result=lambda order_info: self._show_order_totals(masa_no, siparis_id, order_info))
 
-        current_musteri_id = None
 
-        if self.main_app.aktif_siparis_id is not None:
-            items = self.main_app.db_manager.get_order_details(self.main_app.aktif_siparis_id)
+    def _show_order_totals(self, masa_no, siparis_id, order_info):
+        if not self._is_active_order(masa_no, siparis_id):
+            return
+        current_brut_total = self.cart_model.cart.brut_total # Satır ekleme/silmede fark ile güncellenir
+        current_iskonto = ZERO
+        current_odenen_tutar = ZERO
+        if order_info:
+             current_iskonto = Money.of(order_info['iskonto'])
+             current_odenen_tutar = Money.of(order_info['odenen_tutar'])
 
-            for item in items:
-                 ekleme_saat = datetime.strptime(item['ekleme_zamani'], "%Y-%m-%d %H:%M:%S").strftime("%H:%M:%S") if item['ekleme_zamani'] else ""
+        self.update_totals_labels(current_brut_total, current_iskonto, current_odenen_tutar)
 
-                 tree_item = QTreeWidgetItem(self.cart_treeview)
-                 tree_item.setText(0, item['urun_adi'])
-                 tree_item.setText(1, f"{item['miktar']}")
-                 tree_item.setText(2, f"{item['birim_fiyat']:.2f} TL")
-                 tree_item.setText(3, f"{item['tutar']:.2f} TL")
-                 tree_item.setText(4, ekleme_saat)
-                 tree_item.setText(5, str(item['detay_id']))
+        if masa_no is not None and order_info and order_info['durum'] == 'Açık':
+             self.main_app.db_executor.submit_write(
+                 DatabaseManager.update_masa_totals, masa_no, current_brut_total, current_iskonto, current_odenen_tutar,
+                 on_result=lambda success: self._publish_masa_changed(masa_no))
 
-                 tree_item.setData(0, Qt.UserRole, item['urun_id'])
 
-            order_info = self.main_app.db_manager.get_order_info(self.main_app.aktif_siparis_id)
-            if order_info:
-                 current_musteri_id = order_info['musteri_id']
+    def load_cart(self):
+        """Aktif masanın sepetini (sipariş detaylarını) kuyruktan okuyup sepet görünümüne yükler."""
+        print("Sepet verileri yükleniyor...")
 
-        self._recalculate_and_update_totals()
-        print(f"Sepete {self.cart_treeview.topLevelItemCount()} adet öğe yüklendi.")
+        if self.main_app.aktif_siparis_id is None:
+            self.cart_model.clear()
+            self._recalculate_and_update_totals()
+            self._set_selected_customer(None)
+            self._update_button_states()
+            return
 
-        self._update_assigned_customer_label(current_musteri_id)
-        self.load_customer_combobox()
+        self.flush_pending_taps()
+        masa_no, siparis_id = self.main_app.aktif_masa, self.main_app.aktif_siparis_id
+        self.main_app.db_executor.submit_read(
+            _read_order, siparis_id, on_result=lambda result: self._on_cart_loaded(masa_no, siparis_id, *result))
+
+
+    def _on_cart_loaded(self, masa_no, siparis_id, order_details, order_info, customer):
+        if not self._is_active_order(masa_no, siparis_id):
+            return
+        self.cart_model.load(order_details)
+        self._show_order_totals(masa_no, siparis_id, order_info)
+        print(f"Sepete {len(self.cart_model.cart)} adet öğe yüklendi.")
+
+        self._set_selected_customer(order_info['musteri_id'] if order_info else None, customer)
 
         self._update_button_states()
 
@@ -698,6 +815,8 @@ class AdisyonTabPyside(QWidget):
         net_total = brut_total - discount_amount
         # Düzeltme: kalan_tutar hesaplamasında da 'odenen_tutar' kullanıldı
         kalan_tutar = net_total - odenen_tutar
+        self._shown_discount = discount_amount
+        self._shown_odenen = odenen_tutar
 
         self.lbl_brut_total.setText(f"Brüt Toplam: {brut_total:.2f} TL")
         self.lbl_discount.setText(f"İskonto: {discount_amount:.2f} TL")
@@ -707,30 +826,53 @@ class AdisyonTabPyside(QWidget):
         self.lbl_kalan_tutar.setText(f"Kalan Tutar: {kalan_tutar:.2f} TL")
 
 
+    def _reset_active_order(self):
+        """Adisyon kapandı/iptal edildi: aktif masa ve sipariş bırakılır, sepet ve toplamlar sıfırlanır."""
+        self.main_app.aktif_masa = None
+        self.main_app.aktif_siparis_id = None
+        self.update_aktif_masa_label()
+        self.cart_model.clear()
+        self.update_totals_labels(ZERO, ZERO, ZERO)
+        self._set_selected_customer(None)
+        self._update_assigned_customer_label(None)
+
+        self._update_button_states()
+
+
     def remove_selected_cart_item(self):
         """Sepetten seçili ürünü siler."""
-        selected_items = self.cart_treeview.selectedItems()
+        selected_rows = self.cart_treeview.selectionModel().selectedRows()
 
-        if not selected_items:
+        if not selected_rows:
             QMessageBox.warning(self, "Uyarı", "Lütfen sepetten silmek için bir ürün seçin.")
             return
 
-        selected_item = selected_items[0]
-        detay_id_to_delete = int(selected_item.text(5))
+        detay_id_to_delete = self.cart_model.line_at(selected_rows[0].row()).detay_id
 
-        if self.main_app.aktif_siparis_id is None:
-             QMessageBox.critical(self, "Hata", "Aktif sipariş bulunamadı.")
+        self.flush_pending_taps()
+        if self.main_app.aktif_siparis_id is None or detay_id_to_delete < 0:
+             QMessageBox.warning(self, "Uyarı", "Ürün henüz kaydedilmedi, lütfen tekrar deneyin.")
              return
 
         reply = QMessageBox.question(self, "Onay", "Seçili ürünü sepetten silmek istediğinizden emin misiniz?",
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            success, _ = self.main_app.db_manager.remove_order_item(detay_id_to_delete, self.main_app.aktif_siparis_id)
-
-            if success:
-                 QMessageBox.information(self, "Başarılı", "Ürün sepetten silindi.")
-                 self.load_cart()
+            masa_no, siparis_id = self.main_app.aktif_masa, self.main_app.aktif_siparis_id
+            self.main_app.db_executor.submit_write(
+                DatabaseManager.remove_order_item, detay_id_to_delete, siparis_id,
+                on_result=lambda result: self._on_cart_item_removed(masa_no, siparis_id, detay_id_to_delete, *result))
+
+    def _on_cart_item_removed(self, masa_no, siparis_id, detay_id, success, totals):
+        if not success:
+             QMessageBox.critical(self, "Hata", "Ürün sepetten silinirken bir hata oluştu.")
+             return
+        if not self._is_active_order(masa_no, siparis_id):
+             self._publish_masa_changed(masa_no)
+             return
+        QMessageBox.information(self, "Başarılı", "Ürün sepetten silindi.")
+        self.cart_model.remove_line(detay_id)
+        self._apply_order_totals(totals, masa_no)
 
     def clear_cart(self):
         """Aktif masanın sepetini tamamen temizler ve adisyonu iptal eder."""
@@ -742,39 +884,44 @@ class AdisyonTabPyside(QWidget):
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            success = self.main_app.db_manager.clear_order_details(self.main_app.aktif_siparis_id)
-
-            if success:
-                QMessageBox.information(self, "Başarılı", "Sepet temizlendi ve adisyon iptal edildi.")
-                self.main_app.aktif_masa = None
-                self.main_app.aktif_siparis_id = None
-                self.update_aktif_masa_label()
-                self.cart_treeview.clear()
-                self.update_totals_labels(0.0, 0.0, 0.0)
-                self.load_customer_combobox(clear_selection=True)
-                self._update_assigned_customer_label(None)
-
-                # Masa tabı tamamlandıysa MasaTab.load_masa_buttons() çağrılacak
-                if hasattr(self.main_app, 'masa_tab') and isinstance(self.main_app.masa_tab, MasaTabPyside):
-                     self.main_app.masa_tab.load_masa_buttons()
-
-                self._update_button_states()
+            self.flush_pending_taps()
+            masa_no, siparis_id = self.main_app.aktif_masa, self.main_app.aktif_siparis_id
+            self.main_app.db_executor.submit_write(
+                DatabaseManager.clear_order_details, siparis_id,
+                on_result=lambda success: self._on_cart_cleared(masa_no, siparis_id, success))
+
+    def _on_cart_cleared(self, masa_no, siparis_id, success):
+        if not success:
+            QMessageBox.critical(self, "Hata", "Sepet temizlenirken bir hata oluştu.")
+            return
+        QMessageBox.information(self, "Başarılı", "Sepet temizlendi ve adisyon iptal edildi.")
+        self._publish_masa_changed(masa_no)
+        if self._is_active_order(masa_no, siparis_id):
+            self._reset_active_order()
 
 
     def apply_discount(self):
-        """Aktif masanın adisyonına iskonto uygular."""
+        """Aktif masanın adisyonına iskonto uygular (güncel brüt toplam önce kuyruktan okunur)."""
         if self.main_app.aktif_siparis_id is None:
             QMessageBox.warning(self, "Uyarı", "İskonto uygulamak için aktif bir adisyon olmalıdır.")
             return
 
-        order_info = self.main_app.db_manager.get_order_info(self.main_app.aktif_siparis_id)
+        self.flush_pending_taps()
+        masa_no, siparis_id = self.main_app.aktif_masa, self.main_app.aktif_siparis_id
+        self.main_app.db_executor.submit_read(
+            DatabaseManager.get_order_info, siparis_id,
+            on_result=lambda order_info: self._show_discount_dialog(masa_no, siparis_id, order_info))
+
+    def _show_discount_dialog(self, masa_no, siparis_id, order_info):
+        if not self._is_active_order(masa_no, siparis_id):
+             return
         if not order_info:
              QMessageBox.critical(self, "Hata", "Adisyon bilgisi alınamadı.")
              return
 
-        current_brut_total = order_info['toplam_tutar'] or 0.0
+        current_brut_total = Money.of(order_info['toplam_tutar'])
 
-        if current_brut_total <= 0:
+        if current_brut_total <= ZERO:
              QMessageBox.warning(self, "Uyarı", "İskonto uygulamak için sepette ürün olmalı veya brüt toplam sıfırdan büyük olmalıdır.")
              return
 
@@ -789,34 +936,48 @@ class AdisyonTabPyside(QWidget):
                       QMessageBox.warning(self, "Uyarı", f"İskonto miktarı brüt toplamdan ({current_brut_total:.2f} TL) fazla olamaz.")
                       return
 
-                 success = self.main_app.db_manager.update_order_discount(self.main_app.aktif_siparis_id, discount_amount)
-
-                 if success:
-                     QMessageBox.information(self, "Başarılı", f"{discount_amount:.2f} TL iskonto uygulandı.")
-                     self._recalculate_and_update_totals()
+                 self.main_app.db_executor.submit_write(
+                     DatabaseManager.update_order_discount, siparis_id, discount_amount,
+                     on_result=lambda success: self._on_discount_applied(masa_no, siparis_id, discount_amount, success))
 
         else:
              QMessageBox.information(self, "Bilgi", "İskonto işlemi iptal edildi.")
 
+    def _on_discount_applied(self, masa_no, siparis_id, discount_amount, success):
+        if not success:
+             QMessageBox.critical(self, "Hata", "İskonto uygulanırken bir hata oluştu.")
+             return
+        QMessageBox.information(self, "Başarılı", f"{discount_amount:.2f} TL iskonto uygulandı.")
+        if self._is_active_order(masa_no, siparis_id):
+             self._recalculate_and_update_totals()
+
 
     def process_partial_payment(self):
-         """Parçalı ödeme işlemini başlatır."""
+         """Parçalı ödeme işlemini başlatır (kalan tutar önce kuyruktan okunur)."""
          if self.main_app.aktif_siparis_id is None:
              QMessageBox.warning(self, "Uyarı", "Parçalı ödeme almak için aktif bir adisyon olmalıdır.")
              return
 
-         order_info = self.main_app.db_manager.get_order_info(self.main_app.aktif_siparis_id)
+         self.flush_pending_taps()
+         masa_no, siparis_id = self.main_app.aktif_masa, self.main_app.aktif_siparis_id
+         self.main_app.db_executor.submit_read(
+             DatabaseManager.get_order_info, siparis_id,
+             on_result=lambda order_info: self._show_partial_payment_dialog(masa_no, siparis_id, order_info))
+
+    def _show_partial_payment_dialog(self, masa_no, siparis_id, order_info):
+         if not self._is_active_order(masa_no, siparis_id):
+              return
          if not order_info:
               QMessageBox.critical(self, "Hata", "Adisyon bilgisi alınamadı.")
               return
 
-         brut_toplam = order_info['toplam_tutar'] or 0.0
-         iskonto = order_info['iskonto'] or 0.0
-         odenen_tutar_current = order_info['odenen_tutar'] or 0.0
+         brut_toplam = Money.of(order_info['toplam_tutar'])
+         iskonto = Money.of(order_info['iskonto'])
+         odenen_tutar_current = Money.of(order_info['odenen_tutar'])
          net_toplam = brut_toplam - iskonto
          kalan_tutar = net_toplam - odenen_tutar_current
 
-         if kalan_tutar <= 0 and odenen_tutar_current >= net_toplam:
+         if kalan_tutar <= ZERO and odenen_tutar_current >= net_toplam:
               QMessageBox.information(self, "Bilgi", f"Ödenecek kalan tutar yok. Bu adisyon zaten {odenen_tutar_current:.2f} TL ile kapatılmış.")
               return
 
@@ -826,94 +987,98 @@ class AdisyonTabPyside(QWidget):
          if result == QDialog.Accepted:
              payment_amount = dialog.get_payment_amount()
 
-             if payment_amount is not None and payment_amount > 0:
-
-                 success = self.main_app.db_manager.record_partial_payment(self.main_app.aktif_siparis_id, payment_amount, payment_method="Ara Ödeme")
+             if payment_amount is not None and payment_amount > ZERO:
 
-                 if success:
-                     QMessageBox.information(self, "Başarılı", f"{payment_amount:.2f} TL parçalı ödeme alındı.")
-                     self._recalculate_and_update_totals()
+                 self.main_app.db_executor.submit_write(
+                     DatabaseManager.record_partial_payment, siparis_id, payment_amount, "Ara Ödeme",
+                     on_result=lambda success: self._on_partial_payment_recorded(masa_no, siparis_id, payment_amount, success))
 
-             elif payment_amount is not None and payment_amount <= 0:
+             elif payment_amount is not None and payment_amount <= ZERO:
                  QMessageBox.warning(self, "Uyarı", "Ödeme miktarı pozitif bir sayı olmalıdır.")
 
          else:
              QMessageBox.information(self, "Bilgi", "Parçalı ödeme işlemi iptal edildi.")
 
+    def _on_partial_payment_recorded(self, masa_no, siparis_id, payment_amount, success):
+         if not success:
+              QMessageBox.critical(self, "Hata", "Parçalı ödeme kaydedilirken bir hata oluştu.")
+              return
+         QMessageBox.information(self, "Başarılı", f"{payment_amount:.2f} TL parçalı ödeme alındı.")
+         if self._is_active_order(masa_no, siparis_id):
+              self._recalculate_and_update_totals()
+
 
     def process_full_payment(self, payment_method):
-        """Adisyonun kalan tutarını kapatır ve ödeme işlemini tamamlar."""
+        """Adisyonun kalan tutarını kapatır ve ödeme işlemini tamamlar (kalan tutar önce kuyruktan okunur)."""
         if self.main_app.aktif_siparis_id is None:
             QMessageBox.warning(self, "Uyarı", "Ödeme almak için aktif bir adisyon olmalıdır.")
             return
 
-        order_info = self.main_app.db_manager.get_order_info(self.main_app.aktif_siparis_id)
+        self.flush_pending_taps() # Ödeme tutarı bekleyen dokunuşlar yazıldıktan sonra okunur
+        masa_no, siparis_id = self.main_app.aktif_masa, self.main_app.aktif_siparis_id
+        self.main_app.db_executor.submit_read(
+            DatabaseManager.get_order_info, siparis_id,
+            on_result=lambda order_info: self._confirm_full_payment(masa_no, siparis_id, payment_method, order_info))
+
+    def _confirm_full_payment(self, masa_no, siparis_id, payment_method, order_info):
+        if not self._is_active_order(masa_no, siparis_id) or self._payment_pending:
+             return
         if not order_info:
              QMessageBox.critical(self, "Hata", "Adisyon bilgisi alınamadı.")
              return
 
-        brut_toplam = order_info['toplam_tutar'] or 0.0
-        iskonto = order_info['iskonto'] or 0.0
-        odenen_tutar_current = order_info['odenen_tutar'] or 0.0
+        brut_toplam = Money.of(order_info['toplam_tutar'])
+        iskonto = Money.of(order_info['iskonto'])
+        odenen_tutar_current = Money.of(order_info['odenen_tutar'])
         net_toplam = brut_toplam - iskonto
         # DÜZELTİLDİ: odenen_toplam yerine odenen_tutar_current kullanıldı
         kalan_tutar = net_toplam - odenen_tutar_current
 
-        if kalan_tutar <= 0 and odenen_tutar_current >= net_toplam:
+        if kalan_tutar <= ZERO and odenen_tutar_current >= net_toplam:
              QMessageBox.information(self, "Bilgi", f"Bu adisyon zaten {odenen_tutar_current:.2f} TL ile kapatılmış veya ödenecek kalan tutar yok.")
              self._update_button_states()
              return
 
 
-        confirm_message = f"Masa {self.main_app.aktif_masa} için kalan {kalan_tutar:.2f} TL tutarını ({payment_method}) ile kapatmak istediğinizden emin misiniz?"
-        if odenen_tutar_current > 0:
-             confirm_message = f"Masa {self.main_app.aktif_masa} için kalan {kalan_tutar:.2f} TL tutarını ({payment_method}) ile kapatmak istediğinizden (Toplam ödenen: {odenen_tutar_current:.2f} TL) emin misiniz? (Daha önce {odenen_tutar_current:.2f} TL ödeme alınmıştır.)"
+        confirm_message = f"Masa {masa_no} için kalan {kalan_tutar:.2f} TL tutarını ({payment_method}) ile kapatmak istediğinizden emin misiniz?"
+        if odenen_tutar_current > ZERO:
+             confirm_message = f"Masa {masa_no} için kalan {kalan_tutar:.2f} TL tutarını ({payment_method}) ile kapatmak istediğinizden (Toplam ödenen: {odenen_tutar_current:.2f} TL) emin misiniz? (Daha önce {odenen_tutar_current:.2f} TL ödeme alınmıştır.)"
 
 
         reply = QMessageBox.question(self, "Ödeme Onayı", confirm_message,
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
+            customer_id = None
             if payment_method == "Müşteri Bakiyesinden":
                  if order_info['musteri_id'] is None:
                       QMessageBox.warning(self, "Uyarı", "Adisyona atanmış bir müşteri olmadan bakiyeden ödeme yapılamaz.")
                       return
 
+                 # Bakiye yeterliliği yazma işinde, düşme ve kapanışla aynı transaction'da kontrol edilir
                  customer_id = order_info['musteri_id']
-                 customer_info = self.main_app.db_manager.get_customer_by_id(customer_id)
-                 if customer_info is None:
-                      QMessageBox.critical(self, "Hata", "Atanan müşteri bilgisi bulunamadı.")
-                      return
-
-                 customer_balance = customer_info['bakiye'] or 0.0
-
-                 if customer_balance < kalan_tutar:
-                      QMessageBox.warning(self, "Uyarı", f"Müşterinin bakiyesi yetersiz. (Bakiye: {customer_balance:.2f} TL, Kalan: {kalan_tutar:.2f} TL)")
-                      return
 
-                 success_balance = self.main_app.db_manager.update_customer_balance(customer_id, -kalan_tutar)
-                 if not success_balance:
-                      QMessageBox.critical(self, "Hata", "Müşteri bakiyesi düşülürken bir hata oluştu.")
-                      return
-
-            success, final_net_total = self.main_app.db_manager.process_full_payment(self.main_app.aktif_siparis_id, payment_method)
-
-            if success:
-                QMessageBox.information(self, "Başarılı", f"Masa {self.main_app.aktif_masa} için ödeme alındı. Net Toplam: {final_net_total:.2f} TL ({payment_method})")
-
-                self.main_app.aktif_masa = None
-                self.main_app.aktif_siparis_id = None
-                self.update_aktif_masa_label()
-                self.cart_treeview.clear()
-                self.update_totals_labels(0.0, 0.0, 0.0)
-                self.load_customer_combobox(clear_selection=True)
-                self._update_assigned_customer_label(None)
+            # Sonuç gelene kadar bu adisyona ürün eklenmez
+            self._payment_pending = True
+            self._update_button_states()
+            self.main_app.db_executor.submit_write(
+                _pay_order, siparis_id, payment_method, customer_id,
+                on_result=lambda result: self._on_full_payment_done(masa_no, siparis_id, payment_method, *result))
+
+    def _on_full_payment_done(self, masa_no, siparis_id, payment_method, success, final_net_total, error_message):
+        self._payment_pending = False
+        if not success:
+            QMessageBox.critical(self, "Hata", error_message)
+            self._update_button_states()
+            return
 
-                # Masa tabı tamamlandıysa MasaTab.load_masa_buttons() çağrılacak
-                if hasattr(self.main_app, 'masa_tab') and isinstance(self.main_app.masa_tab, MasaTabPyside):
-                     self.main_app.masa_tab.load_masa_buttons()
+        QMessageBox.information(self, "Başarılı", f"Masa {masa_no} için ödeme alındı. Net Toplam: {final_net_total:.2f} TL ({payment_method})")
 
-                self._update_button_states()
+        self._publish_masa_changed(masa_no)
+        if self._is_active_order(masa_no, siparis_id):
+            self._reset_active_order()
+        else:
+            self._update_button_states()
 
 
     # adisyon_tab_pyside.py içinde, _update_button_states metodu
@@ -921,16 +1086,16 @@ class AdisyonTabPyside(QWidget):
         """Aktif masa veya sepet durumuna göre butonların aktifliğini ayarlar."""
         is_masa_selected = self.main_app.aktif_masa is not None
         is_order_open = self.main_app.aktif_siparis_id is not None
-        is_cart_empty = self.cart_treeview.topLevelItemCount() == 0
+        is_cart_empty = len(self.cart_model.cart) == 0
 
         self.btn_apply_discount.setEnabled(is_order_open and not is_cart_empty)
         self.btn_clear_cart.setEnabled(is_order_open and not is_cart_empty)
-        # Düzeltme: selectedItems() sonucunu bool() ile True/False'a çevir
-        self.btn_remove_selected.setEnabled(is_order_open and bool(self.cart_treeview.selectedItems()) and not is_cart_empty) # <<< Bu satırı düzeltin
+        self.btn_remove_selected.setEnabled(is_order_open and self.cart_treeview.selectionModel().hasSelection() and not is_cart_empty)
 
-        self.btn_partial_payment.setEnabled(is_order_open and not is_cart_empty)
-        self.btn_pay_cash.setEnabled(is_order_open and not is_cart_empty)
-        self.btn_pay_card.setEnabled(is_order_open and not is_cart_empty)
-        self.btn_pay_balance.setEnabled(is_order_open and not is_cart_empty)
+        can_pay = is_order_open and not is_cart_empty and not self._payment_pending
+        self.btn_partial_payment.setEnabled(can_pay)
+        self.btn_pay_cash.setEnabled(can_pay)
+        self.btn_pay_card.setEnabled(can_pay)
+        self.btn_pay_balance.setEnabled(can_pay)
 
         self.btn_atama_yap.setEnabled(is_order_open)
\ No newline at end of file
@@ -0,0 +1,310 @@
+# analytics.py
+
+import array
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from collections import Counter
+from itertools import combinations
+
+import constants
+
+try:
+    import numpy # İsteğe bağlı: kuruluysa gruplama işlemleri vektörel (bincount) çalışır
+except ImportError:
+    numpy = None
+
+# --- Sütunlu Sipariş Geçmişi Analizi ---
+# Trend analizleri (saat/gün ısı haritası, sepet analizi, fiyat-satış ilişkisi) siparis_detaylari + siparis_gecmisi
+# satırlarını sqlite3.Row olarak tek tek işlemek yerine tarih aralığını tipli sütun dizilerine yükler:
+#   zaman damgaları int64 epoch, tutar kuruş / miktar binde bir olarak int64 (sabit noktalı), id'ler int32.
+# Ürün adı ve ödeme yöntemi sözlükle kodlanır (urun_kodu / odeme_kodu -> isim listesi).
+# Veri SQLite'tan fetchmany ile parça parça okunur (DatabaseManager.iter_closed_order_lines). Sütunlar ana veritabanının
+# yanındaki ANALYTICS_CACHE_DIR dizinine ikili dosyalar olarak yazılır; aynı aralığın tekrar analizinde satırlar SQLite'tan
+# okunmaz, sadece aralığın günlük satış özetiyle (O(gün)) önbelleğin hâlâ geçerli olduğu kontrol edilir.
+
+# Sütun adı -> array typecode ('q': int64, 'i': int32)
+COLUMN_TYPES = {
+    'kapanis_epoch': 'q',
+    'siparis_id': 'q',
+    'urun_id': 'i',       # Silinmiş ürün / NULL: -1
+    'urun_kodu': 'i',     # urun_adlari listesindeki indeks
+    'kategori_id': 'i',   # NULL: -1
+    'miktar_milli': 'q',  # miktar * 1000
+    'tutar_kurus': 'q',   # tutar * 100
+    'odeme_kodu': 'i',    # odeme_yontemleri listesindeki indeks
+}
+CACHE_FORMAT_VERSION = 1
+SECONDS_PER_DAY = 86400
+SECONDS_PER_WEEK = 7 * SECONDS_PER_DAY
+_EPOCH_WEEKDAY_OFFSET = 3 # 1970-01-01 Perşembe; (gün + 3) % 7 -> Pazartesi = 0
+
+
+class OrderLineColumns:
+    """Bir tarih aralığındaki kapanmış sipariş satırlarının sütunlu (tipli dizi) gösterimi."""
+
+    def __init__(self, start_date, end_date, columns=None, urun_adlari=None, odeme_yontemleri=None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.columns = columns or {name: array.array(typecode) for name, typecode in COLUMN_TYPES.items()}
+        self.urun_adlari = urun_adlari or []
+        self.odeme_yontemleri = odeme_yontemleri or []
+        self.signature = None # Yüklendiği andaki (adisyon sayısı, net satış kuruş); önbellek geçerlilik kontrolü için
+        self.from_cache = False
+
+    def __len__(self):
+        return len(self.columns['kapanis_epoch'])
+
+    def append_rows(self, rows, urun_kodlari, odeme_kodlari):
+        """DatabaseManager.iter_closed_order_lines parçasını sütunların sonuna ekler (sözlükler yerinde genişletilir)."""
+        epochs, siparis_ids, urun_ids, urun_adlari, kategori_ids, miktarlar, tutarlar, odemeler = zip(*rows)
+        for name in urun_adlari:
+            if name not in urun_kodlari:
+                urun_kodlari[name] = len(self.urun_adlari)
+                self.urun_adlari.append(name)
+        for name in odemeler:
+            if name not in odeme_kodlari:
+                odeme_kodlari[name] = len(self.odeme_yontemleri)
+                self.odeme_yontemleri.append(name)
+        columns = self.columns
+        columns['kapanis_epoch'].extend(epochs)
+        columns['siparis_id'].extend(siparis_ids)
+        columns['urun_id'].extend(urun_ids)
+        columns['urun_kodu'].extend(map(urun_kodlari.__getitem__, urun_adlari))
+        columns['kategori_id'].extend(kategori_ids)
+        columns['miktar_milli'].extend(miktarlar)
+        columns['tutar_kurus'].extend(tutarlar)
+        columns['odeme_kodu'].extend(map(odeme_kodlari.__getitem__, odemeler))
+
+    def column(self, name):
+        """Sütunu döndürür: numpy varsa kopyasız ndarray görünümü, yoksa array.array."""
+        values = self.columns[name]
+        if numpy is not None:
+            return numpy.frombuffer(values, dtype=numpy.int64 if values.typecode == 'q' else numpy.int32)
+        return values
+
+    # --- Türetilmiş anahtar sütunları ---
+    def hour_of_day(self):
+        """Kapanış saatinin saati (0-23)."""
+        epochs = self.column('kapanis_epoch')
+        if numpy is not None:
+            return (epochs % SECONDS_PER_DAY) // 3600
+        return array.array('i', [(epoch % SECONDS_PER_DAY) // 3600 for epoch in epochs])
+
+    def weekday(self):
+        """Kapanış gününün haftanın günü (Pazartesi = 0)."""
+        epochs = self.column('kapanis_epoch')
+        if numpy is not None:
+            return (epochs // SECONDS_PER_DAY + _EPOCH_WEEKDAY_OFFSET) % 7
+        return array.array('i', [(epoch // SECONDS_PER_DAY + _EPOCH_WEEKDAY_OFFSET) % 7 for epoch in epochs])
+
+    def week_index(self):
+        """Aralığın ilk satırının haftasından itibaren hafta numarası (0, 1, ...)."""
+        epochs = self.column('kapanis_epoch')
+        if not len(epochs):
+            return epochs
+        first = min(epochs)
+        if numpy is not None:
+            return (epochs - first) // SECONDS_PER_WEEK
+        return array.array('i', [(epoch - first) // SECONDS_PER_WEEK for epoch in epochs])
+
+    # --- Cache (disk) ---
+    def save(self, directory):
+        """Sütunları ikili dosyalara, sözlükleri manifest.json'a yazar (önce geçici dizine, sonra tek adımda yer değiştirir)."""
+        parent = os.path.dirname(directory)
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".yaziliyor_", dir=parent)
+        try:
+            for name, values in self.columns.items():
+                with open(os.path.join(tmp_dir, f"{name}.bin"), "wb") as f:
+                    values.tofile(f)
+            manifest = {
+                'version': CACHE_FORMAT_VERSION,
+                'byteorder': sys.byteorder,
+                'start_date': self.start_date,
+                'end_date': self.end_date,
+                'rows': len(self),
+                'signature': self.signature,
+                'columns': {name: values.typecode for name, values in self.columns.items()},
+                'urun_adlari': self.urun_adlari,
+                'odeme_yontemleri': self.odeme_yontemleri,
+            }
+            with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            if os.path.isdir(directory):
+                shutil.rmtree(directory)
+            os.replace(tmp_dir, directory)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    @classmethod
+    def load(cls, directory, signature=None):
+        """Önbellek dizinini okur. Önbellek yoksa, biçim/bayt sırası/imza uyuşmuyorsa veya dosya bozuksa None döner."""
+        manifest_path = os.path.join(directory, "manifest.json")
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if (manifest.get('version') != CACHE_FORMAT_VERSION or manifest.get('byteorder') != sys.byteorder
+                    or manifest.get('columns') != COLUMN_TYPES
+                    or (signature is not None and manifest.get('signature') != list(signature))):
+                return None
+            columns = {}
+            for name, typecode in COLUMN_TYPES.items():
+                values = array.array(typecode)
+                with open(os.path.join(directory, f"{name}.bin"), "rb") as f:
+                    values.fromfile(f, manifest['rows'])
+                columns[name] = values
+        except (OSError, ValueError, EOFError, KeyError) as e:
+            print(f"Analiz önbelleği okunamadı ({directory}): {e}")
+            return None
+        lines = cls(manifest['start_date'], manifest['end_date'], columns, manifest['urun_adlari'], manifest['odeme_yontemleri'])
+        lines.signature = tuple(manifest['signature'])
+        lines.from_cache = True
+        return lines
+
+
+# --- Gruplama Primitifleri ---
+def group_count(keys, size):
+    """keys (0..size-1 tamsayı) değerlerinin kaç kez geçtiği: uzunluğu size olan liste."""
+    if numpy is not None:
+        return numpy.bincount(numpy.asarray(keys), minlength=size).tolist()
+    counts = [0] * size
+    for key in keys:
+        counts[key] += 1
+    return counts
+
+
+def group_sum(keys, values, size):
+    """Her anahtar için values toplamı (tamsayı): uzunluğu size olan liste."""
+    if numpy is not None:
+        # bincount ağırlıkları float64'tür; kuruş toplamları 2**53'ün çok altında olduğu için sonuç tam sayıya kesin döner
+        sums = numpy.bincount(numpy.asarray(keys), weights=numpy.asarray(values), minlength=size)
+        return numpy.rint(sums).astype(numpy.int64).tolist()
+    sums = [0] * size
+    for key, value in zip(keys, values):
+        sums[key] += value
+    return sums
+
+
+def combine_keys(major, minor, minor_size):
+    """İki anahtar sütununu tek anahtara birleştirir (major * minor_size + minor), örn. gün x saat ısı haritası."""
+    if numpy is not None:
+        return numpy.asarray(major) * minor_size + numpy.asarray(minor)
+    return array.array('i', [a * minor_size + b for a, b in zip(major, minor)])
+
+
+# --- Yükleme ve Önbellek ---
+def cache_directory(db_name, start_date, end_date, include_archives=True):
+    base = os.path.join(os.path.dirname(os.path.abspath(db_name)), constants.ANALYTICS_CACHE_DIR)
+    return os.path.join(base, f"{start_date}_{end_date}" + ("" if include_archives else "_ana"))
+
+
+def _range_signature(db_manager, start_date, end_date, include_archives):
+    """Aralığın (adisyon sayısı, net satış kuruş) özeti; günlük satış özetinden okunur (satırlar taranmaz)."""
+    summary = db_manager.get_sales_summary(start_date, end_date, include_archives=include_archives)
+    if summary is None:
+        return None
+    return (summary['toplam_adisyon'] or 0, summary['net_satis'] or 0)
+
+
+def load_order_lines(db_manager, start_date, end_date, include_archives=True, use_cache=True,
+                     chunk_size=constants.ANALYTICS_FETCH_CHUNK):
+    """Tarih aralığının ('YYYY-MM-DD', bitiş dahil) kapanmış sipariş satırlarını OrderLineColumns olarak döndürür.
+
+    Önbellekte aynı aralık varsa ve aralığın özeti değişmediyse (yeni kapanan/içe aktarılan sipariş yok) dosyalardan
+    okunur; yoksa SQLite'tan parça parça okunup önbelleğe yazılır. Hata durumunda None döner.
+    """
+    directory = cache_directory(db_manager.db_name, start_date, end_date, include_archives)
+    signature = _range_signature(db_manager, start_date, end_date, include_archives) if use_cache else None
+    if use_cache and signature is not None:
+        cached = OrderLineColumns.load(directory, signature)
+        if cached is not None:
+            return cached
+
+    lines = OrderLineColumns(start_date, end_date)
+    urun_kodlari, odeme_kodlari = {}, {}
+    try:
+        for rows in db_manager.iter_closed_order_lines(start_date, end_date, chunk_size, include_archives):
+            lines.append_rows(rows, urun_kodlari, odeme_kodlari)
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Analiz verisi okuma hatası ({start_date} - {end_date}): {e}")
+        return None
+
+    if use_cache and signature is not None:
+        lines.signature = signature
+        try:
+            lines.save(directory)
+        except OSError as e:
+            print(f"Analiz önbelleği yazılamadı ({directory}): {e}")
+    return lines
+
+
+def clear_cache(db_name):
+    """Tüm analiz önbelleğini siler (örn. geçmiş siparişler dışarıdan değiştirildiğinde)."""
+    base = os.path.join(os.path.dirname(os.path.abspath(db_name)), constants.ANALYTICS_CACHE_DIR)
+    shutil.rmtree(base, ignore_errors=True)
+
+
+# --- Hazır Analizler ---
+def hourly_heatmap(lines, value_column='tutar_kurus'):
+    """Haftanın günü x saat ısı haritası: 7 satır x 24 sütun (value_column toplamı, None ise satır sayısı)."""
+    keys = combine_keys(lines.weekday(), lines.hour_of_day(), 24)
+    if value_column is None:
+        flat = group_count(keys, 7 * 24)
+    else:
+        flat = group_sum(keys, lines.column(value_column), 7 * 24)
+    return [flat[day * 24:(day + 1) * 24] for day in range(7)]
+
+
+def product_totals(lines):
+    """Ürün bazında (ad, toplam miktar, toplam tutar TL), tutara göre azalan."""
+    size = len(lines.urun_adlari)
+    codes = lines.column('urun_kodu')
+    quantities = group_sum(codes, lines.column('miktar_milli'), size)
+    amounts = group_sum(codes, lines.column('tutar_kurus'), size)
+    totals = [(name, quantities[code] / 1000, amounts[code] / 100) for code, name in enumerate(lines.urun_adlari)]
+    return sorted(totals, key=lambda item: item[2], reverse=True)
+
+
+def basket_pairs(lines, top=20):
+    """Aynı adisyonda birlikte satılan ürün çiftleri: [((ürün a, ürün b), adisyon sayısı), ...] en sık olanlar."""
+    baskets = {}
+    for siparis_id, code in zip(lines.columns['siparis_id'], lines.columns['urun_kodu']):
+        baskets.setdefault(siparis_id, set()).add(code)
+    pairs = Counter()
+    for codes in baskets.values():
+        if len(codes) > 1:
+            pairs.update(combinations(sorted(codes), 2))
+    names = lines.urun_adlari
+    return [((names[a], names[b]), count) for (a, b), count in pairs.most_common(top)]
+
+
+def weekly_price_volume(lines, urun_adi):
+    """Bir ürünün haftalık ortalama birim fiyatı (TL) ve satış miktarı: [(hafta no, birim fiyat, miktar), ...].
+
+    Fiyat değişikliklerinin satış miktarına etkisini (fiyat esnekliği) incelemek için.
+    """
+    if urun_adi not in lines.urun_adlari:
+        return []
+    code = lines.urun_adlari.index(urun_adi)
+    weeks = lines.week_index()
+    if not len(weeks):
+        return []
+    size = int(max(weeks)) + 1
+    # Diğer ürünlerin satırları sıfır ağırlıkla toplanır (tek geçiş, filtre dizisi oluşturulmaz)
+    codes = lines.column('urun_kodu')
+    if numpy is not None:
+        mask = codes == code
+        quantities = group_sum(weeks, numpy.where(mask, lines.column('miktar_milli'), 0), size)
+        amounts = group_sum(weeks, numpy.where(mask, lines.column('tutar_kurus'), 0), size)
+    else:
+        quantities = group_sum(weeks, [q if c == code else 0 for c, q in zip(codes, lines.column('miktar_milli'))], size)
+        amounts = group_sum(weeks, [t if c == code else 0 for c, t in zip(codes, lines.column('tutar_kurus'))], size)
+    return [(week, (amounts[week] / 100) / (quantities[week] / 1000), quantities[week] / 1000)
+            for week in range(size) if quantities[week]]
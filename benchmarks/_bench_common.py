@@ -0,0 +1,109 @@
+# benchmarks/_bench_common.py
+
+"""Benchmark betikleri için ortak yardımcılar (geçici veritabanı, sentetik veri, zamanlama).
+
+Betikler depo kök dizininden çalıştırılır, örn: python benchmarks/bench_indexes.py
+Hiçbir betik gerçek cafe_adisyon.db dosyasına dokunmaz; her çalıştırma geçici bir dizinde kendi veritabanını oluşturur.
+"""
+
+import os
+import sys
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from database import DatabaseManager, to_epoch
+
+ODEME_YONTEMLERI = ['Nakit', 'Kart', 'Müşteri Bakiyesinden']
+
+
+def create_temp_db(prefix="bench"):
+    """Geçici bir dizinde yeni bir DatabaseManager oluşturur. (db_manager, dizin) döndürür."""
+    tmp_dir = tempfile.mkdtemp(prefix=f"kafe_{prefix}_")
+    db_manager = DatabaseManager(os.path.join(tmp_dir, "cafe_adisyon_bench.db"))
+    return db_manager, tmp_dir
+
+
+def remove_temp_dir(tmp_dir):
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def generate_closed_orders(db_manager, order_count, lines_per_order=4, start=datetime(2020, 1, 1), days=365, seed=42, batch_size=5000):
+    """Kapanmış sentetik adisyonlar ve detay satırları ekler. Eklenen detay satırı sayısını döndürür."""
+    rnd = random.Random(seed)
+    cursor = db_manager.conn.cursor()
+    products = cursor.execute("SELECT urun_id, adi, fiyat, kategori_id FROM urunler WHERE aktif_durumu = 1").fetchall()
+    masa_nos = [row[0] for row in cursor.execute("SELECT masa_no FROM masalar").fetchall()]
+    next_siparis_id = (cursor.execute("SELECT MAX(siparis_id) FROM siparis_gecmisi").fetchone()[0] or 0) + 1
+
+    total_seconds = days * 24 * 3600
+    line_count = 0
+    orders, details = [], []
+
+    for i in range(order_count):
+        siparis_id = next_siparis_id + i
+        acilis = start + timedelta(seconds=rnd.randrange(total_seconds))
+        kapanis = acilis + timedelta(minutes=rnd.randint(10, 120))
+        acilis_str = acilis.strftime("%Y-%m-%d %H:%M:%S")
+        kapanis_str = kapanis.strftime("%Y-%m-%d %H:%M:%S")
+
+        toplam = 0
+        for _ in range(lines_per_order):
+            urun_id, adi, fiyat, kategori_id = rnd.choice(products) # fiyat tamsayı kuruş
+            miktar = rnd.randint(1, 3)
+            tutar = miktar * fiyat
+            toplam += tutar
+            details.append((siparis_id, urun_id, adi, float(miktar), fiyat, tutar, kategori_id, acilis_str))
+        line_count += lines_per_order
+
+        iskonto = 1000 if rnd.random() < 0.1 else 0
+        orders.append((siparis_id, rnd.choice(masa_nos), acilis_str, kapanis_str, to_epoch(kapanis), 'Kapandı',
+                       toplam, iskonto, toplam - iskonto, rnd.choice(ODEME_YONTEMLERI)))
+
+        if len(orders) >= batch_size:
+            _flush_orders(cursor, orders, details)
+            orders, details = [], []
+
+    _flush_orders(cursor, orders, details)
+    db_manager.conn.commit()
+    # Satırlar uygulama dışından eklendiği için günlük satış özetleri baştan oluşturulur
+    db_manager.rebuild_sales_rollups()
+    return line_count
+
+
+def _flush_orders(cursor, orders, details):
+    if not orders:
+        return
+    cursor.executemany("""
+        INSERT INTO siparis_gecmisi (siparis_id, masa_no, acilis_zamani, kapanis_zamani, kapanis_epoch, durum,
+                                     toplam_tutar, iskonto, odenen_tutar, odeme_yontemi)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, orders)
+    cursor.executemany("""
+        INSERT INTO siparis_detaylari (siparis_id, urun_id, urun_adi, miktar, birim_fiyat, tutar, kategori_id, ekleme_zamani)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, details)
+
+
+def measure(func, repeat=5):
+    """func'ı repeat kez çalıştırır, (medyan saniye, son sonuç) döndürür."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings), result
+
+
+def print_query_plan(conn, sql, params=()):
+    """EXPLAIN QUERY PLAN çıktısını okunabilir şekilde yazdırır."""
+    for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall():
+        print(f"      {row[-1]}")
@@ -0,0 +1,118 @@
+# benchmarks/bench_analytics.py
+
+"""Sütunlu analiz modülünün (analytics.py) satır satır sqlite3.Row işlemeye göre süresini ve belleğini ölçer.
+
+Senaryo: ORDER_COUNT kapanmış sipariş (sipariş başına 4 satır), tek yıl. Analiz: gün x saat ciro ısı haritası + ürün toplamları.
+  - eski yöntem: detay + sipariş JOIN'i (aynı sütunlar) fetchall ile sqlite3.Row listesi olarak okunur, Python döngüsüyle gruplanır
+  - sütunlu (SQLite): iter_closed_order_lines ile fetchmany parçaları tipli dizilere yüklenir
+  - sütunlu (önbellek): aynı aralığın ikinci analizi; satırlar SQLite yerine sütun dosyalarından okunur
+Bellek: tracemalloc ile yükleme sırasındaki en yüksek Python bellek kullanımı (süre ayrı, tracemalloc kapalıyken ölçülür). numpy kuruluysa gruplama vektörel çalışır.
+
+Kullanım: python benchmarks/bench_analytics.py [--orders 150000]
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from _bench_common import create_temp_db, remove_temp_dir, generate_closed_orders
+
+import analytics
+from database import date_range_to_epochs
+
+YEAR = 2024
+PERIOD = (f"{YEAR}-01-01", f"{YEAR}-12-31")
+
+
+def traced(func, setup=None):
+    """func'ı iki kez çalıştırır: süre tracemalloc kapalıyken, en yüksek bellek ayrı bir çalıştırmada ölçülür.
+
+    Dönüş: (sonuç, süre sn, en yüksek bellek MB). setup her çalıştırmadan önce çağrılır (örn. önbelleği silmek için).
+    """
+    if setup:
+        setup()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    tracemalloc.stop()
+    if setup:
+        setup()
+    t0 = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - t0, peak
+
+
+def load_rows(db_manager):
+    start_epoch, end_epoch = date_range_to_epochs(*PERIOD)
+    db_manager.cursor.execute("""
+        SELECT sg.kapanis_epoch, sg.siparis_id, sd.urun_id, sd.urun_adi, sd.kategori_id, sd.miktar, sd.tutar, sg.odeme_yontemi
+        FROM siparis_detaylari sd JOIN siparis_gecmisi sg ON sd.siparis_id = sg.siparis_id
+        WHERE sg.durum = 'Kapandı' AND sg.kapanis_epoch >= ? AND sg.kapanis_epoch < ?
+    """, (start_epoch, end_epoch))
+    return db_manager.cursor.fetchall()
+
+
+def analyse_rows(rows):
+    heatmap = [[0] * 24 for _ in range(7)]
+    products = {}
+    for row in rows:
+        epoch = row['kapanis_epoch']
+        heatmap[(epoch // 86400 + 3) % 7][(epoch % 86400) // 3600] += row['tutar'] # tamsayı kuruş
+        totals = products.setdefault(row['urun_adi'], [0.0, 0.0])
+        totals[0] += row['miktar']
+        totals[1] += row['tutar'] / 100
+    return heatmap, products
+
+
+def analyse_columns(lines):
+    return analytics.hourly_heatmap(lines), analytics.product_totals(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=150_000)
+    args = parser.parse_args()
+
+    db_manager, tmp_dir = create_temp_db("analytics")
+    try:
+        generate_closed_orders(db_manager, args.orders, start=datetime(YEAR, 1, 1), days=365, seed=3)
+        print(f"\n{args.orders} sipariş / {args.orders * 4} satır, numpy: {'var' if analytics.numpy is not None else 'yok (array)'}")
+        print(f"{'yöntem':<26} {'yükleme (sn)':>12} {'bellek (MB)':>12} {'analiz (sn)':>12}")
+
+        rows, load_s, peak = traced(lambda: load_rows(db_manager))
+        t0 = time.perf_counter()
+        row_heatmap, row_products = analyse_rows(rows)
+        print(f"{'eski (sqlite3.Row)':<26} {load_s:12.2f} {peak:12.1f} {time.perf_counter() - t0:12.2f}")
+        del rows
+
+        for name, from_cache in (("sütunlu (SQLite)", False), ("sütunlu (önbellek)", True)):
+            setup = None if from_cache else (lambda: analytics.clear_cache(db_manager.db_name))
+            lines, load_s, peak = traced(lambda: analytics.load_order_lines(db_manager, *PERIOD), setup)
+            assert lines.from_cache == from_cache
+            t0 = time.perf_counter()
+            heatmap, products = analyse_columns(lines)
+            print(f"{name:<26} {load_s:12.2f} {peak:12.1f} {time.perf_counter() - t0:12.2f}")
+            assert heatmap == row_heatmap
+            for urun_adi, miktar, tutar in products:
+                assert abs(row_products[urun_adi][0] - miktar) < 1e-6 and abs(row_products[urun_adi][1] - tutar) < 0.01
+
+        column_bytes = sum(values.itemsize * len(values) for values in lines.columns.values())
+        print(f"sonuçlar aynı; {len(lines)} satır sütunlarda {column_bytes / (1024 * 1024):.1f} MB")
+
+        t0 = time.perf_counter()
+        pairs = analytics.basket_pairs(lines, top=3)
+        print(f"sepet analizi: {time.perf_counter() - t0:.2f} sn, en sık çift: {pairs[0][0]} ({pairs[0][1]} adisyon)")
+
+        # Yeni kapanan sipariş aralığın özetini değiştirir: önbellek geçersiz sayılır ve SQLite'tan yeniden yüklenir
+        generate_closed_orders(db_manager, 1, start=datetime(YEAR, 6, 1), days=1, seed=99)
+        lines = analytics.load_order_lines(db_manager, *PERIOD)
+        assert not lines.from_cache and len(lines) == args.orders * 4 + 4
+        print("aralığa yeni sipariş eklenince önbellek yenilendi")
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
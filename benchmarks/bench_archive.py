@@ -0,0 +1,213 @@
+# benchmarks/bench_archive.py
+
+"""Yıllık arşivlemenin süresini ve en yüksek bellek kullanımını (peak RSS) ölçer.
+
+Karşılaştırma:
+  - eski yöntem: tüm siparişler ve detaylar fetchall() ile Python'a okunur, tek IN (?,?,...) listesi kurulur ve
+    executemany ile arşiv dosyasına kopyalanır (büyük yılda SQLite parametre sınırına takılır)
+  - DatabaseManager.archive_and_delete_old_orders: ATTACH + parça parça INSERT ... SELECT / DELETE, ilerleme noktası
+    settings tablosunda
+Her çalıştırma ayrı bir alt süreçte yapılır (peak RSS ölçümü süreç başına). Son bölümde akışlı arşivleme yarıda
+öldürülür (SIGKILL) ve tekrar başlatılarak kaldığı yerden tamamlandığı, satır sayılarının tuttuğu doğrulanır.
+
+Kullanım: python benchmarks/bench_archive.py [--lines 2000000]
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from _bench_common import create_temp_db, remove_temp_dir, generate_closed_orders, to_epoch
+
+ARCHIVE_YEAR = 2023
+LINES_PER_ORDER = 4
+SMALL_ORDERS = 30_000 # Eski yöntemin SQLite parametre sınırına (varsayılan derlemede 32766) takılmadığı boyut
+NEXT_YEAR_ORDERS = 20_000 # Arşivlenmeyip ana DB'de kalması gereken siparişler
+
+
+def legacy_archive(conn, year_to_process, archive_db_name):
+    """Değişiklik öncesi archive_and_delete_old_orders (messagebox çağrıları çıkarılmış)."""
+    cursor = conn.cursor()
+    end_of_year_epoch = to_epoch(datetime(year_to_process + 1, 1, 1))
+    cursor.execute("""
+        SELECT sg.siparis_id, sg.masa_no, sg.acilis_zamani, sg.kapanis_zamani,
+               sg.durum, sg.toplam_tutar, sg.iskonto, sg.odenen_tutar,
+               sg.odeme_yontemi, sg.son_islem_zamani, sg.musteri_id, sg.kapanis_epoch
+        FROM siparis_gecmisi sg
+        WHERE sg.durum = 'Kapandı' AND sg.kapanis_epoch < ?
+    """, (end_of_year_epoch,))
+    orders_to_archive = cursor.fetchall()
+
+    archive_conn = sqlite3.connect(archive_db_name)
+    try:
+        archive_cursor = archive_conn.cursor()
+        archive_cursor.execute("""CREATE TABLE IF NOT EXISTS siparis_gecmisi (siparis_id INTEGER PRIMARY KEY, masa_no INTEGER,
+            acilis_zamani TEXT, kapanis_zamani TEXT, durum TEXT, toplam_tutar REAL, iskonto REAL, odenen_tutar REAL,
+            odeme_yontemi TEXT, son_islem_zamani TEXT, musteri_id INTEGER, kapanis_epoch INTEGER)""")
+        archive_cursor.execute("""CREATE TABLE IF NOT EXISTS siparis_detaylari (detay_id INTEGER PRIMARY KEY,
+            siparis_id INTEGER NOT NULL, urun_id INTEGER, urun_adi TEXT NOT NULL, miktar REAL NOT NULL,
+            birim_fiyat REAL NOT NULL, tutar REAL NOT NULL, kategori_id INTEGER, ekleme_zamani TEXT NOT NULL)""")
+        archive_conn.commit()
+
+        deleted_order_ids = [order['siparis_id'] for order in orders_to_archive]
+        placeholders = ','.join('?' for _ in deleted_order_ids)
+        cursor.execute(f"""
+            SELECT detay_id, siparis_id, urun_id, urun_adi, miktar, birim_fiyat, tutar, kategori_id, ekleme_zamani
+            FROM siparis_detaylari WHERE siparis_id IN ({placeholders})
+        """, deleted_order_ids)
+        details_to_archive = cursor.fetchall()
+        archive_cursor.executemany("INSERT OR IGNORE INTO siparis_detaylari VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                   [tuple(d) for d in details_to_archive])
+        archive_conn.commit()
+        archive_cursor.executemany("INSERT OR IGNORE INTO siparis_gecmisi VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                   [tuple(o) for o in orders_to_archive])
+        archive_conn.commit()
+
+        cursor.execute(f"DELETE FROM siparis_gecmisi WHERE siparis_id IN ({placeholders})", deleted_order_ids)
+        conn.commit()
+        return len(orders_to_archive), len(details_to_archive)
+    finally:
+        archive_conn.close()
+
+
+def child_main(mode, db_path, archive_path):
+    """Alt süreç: tek bir arşivleme çalıştırır ve sonucu JSON olarak son satıra yazar."""
+    from database import DatabaseManager
+    db_manager = DatabaseManager(db_path)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    result = {}
+    try:
+        if mode == "legacy":
+            result['orders'], result['lines'] = legacy_archive(db_manager.conn, ARCHIVE_YEAR, archive_path)
+            result['ok'] = True
+        else:
+            ok, message = db_manager.archive_and_delete_old_orders(ARCHIVE_YEAR, archive_path)
+            result['ok'] = ok
+            result['message'] = message
+    except Exception as e:
+        result['ok'] = False
+        result['message'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - t0
+    result['rss_before_mb'] = rss_before / 1024
+    result['rss_peak_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    db_manager.close()
+    print(json.dumps(result))
+
+
+def build_base_db(order_count, tmp_dir):
+    """ARCHIVE_YEAR yılına order_count sipariş + sonraki yıla NEXT_YEAR_ORDERS sipariş içeren veritabanı dosyası."""
+    db_manager, db_tmp = create_temp_db("archive_base")
+    generate_closed_orders(db_manager, order_count, LINES_PER_ORDER, start=datetime(ARCHIVE_YEAR, 1, 1), days=365, seed=1)
+    generate_closed_orders(db_manager, NEXT_YEAR_ORDERS, LINES_PER_ORDER, start=datetime(ARCHIVE_YEAR + 1, 1, 1), days=120, seed=2)
+    db_path = db_manager.db_name
+    db_manager.close() # WAL içeriği ana dosyaya yazılır, dosya kopyalanabilir
+    base_path = os.path.join(tmp_dir, f"base_{order_count}.db")
+    shutil.move(db_path, base_path)
+    remove_temp_dir(db_tmp)
+    return base_path
+
+
+def run_child(mode, base_path, tmp_dir, kill_after=None, keep_db=None):
+    """base_path'in kopyası üzerinde alt süreçte arşivleme çalıştırır. (sonuç, db yolu, arşiv yolu) döndürür."""
+    db_path = keep_db or os.path.join(tmp_dir, f"run_{mode}.db")
+    archive_path = os.path.join(tmp_dir, f"run_{mode}_archive.db")
+    if keep_db is None:
+        shutil.copy(base_path, db_path)
+        if os.path.exists(archive_path):
+            os.remove(archive_path)
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", mode, db_path, archive_path]
+    if kill_after is None:
+        output = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+        return json.loads(output.strip().splitlines()[-1]), db_path, archive_path
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(kill_after)
+    proc.kill()
+    proc.wait()
+    return None, db_path, archive_path
+
+
+def count_rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return (conn.execute("SELECT COUNT(*) FROM siparis_gecmisi").fetchone()[0],
+                conn.execute("SELECT COUNT(*) FROM siparis_detaylari").fetchone()[0])
+    finally:
+        conn.close()
+
+
+def expected_counts(base_path):
+    """Arşive gitmesi gereken (sipariş, detay) sayısı; yılbaşına yakın açılıp ertesi yıl kapanan siparişler ana DB'de kalır."""
+    conn = sqlite3.connect(base_path)
+    try:
+        end_epoch = to_epoch(datetime(ARCHIVE_YEAR + 1, 1, 1))
+        orders = conn.execute("SELECT COUNT(*) FROM siparis_gecmisi WHERE durum = 'Kapandı' AND kapanis_epoch < ?",
+                              (end_epoch,)).fetchone()[0]
+        lines = conn.execute("""SELECT COUNT(*) FROM siparis_detaylari WHERE siparis_id IN
+                                (SELECT siparis_id FROM siparis_gecmisi WHERE durum = 'Kapandı' AND kapanis_epoch < ?)""",
+                             (end_epoch,)).fetchone()[0]
+        return orders, lines
+    finally:
+        conn.close()
+
+
+def print_result(name, result):
+    status = "tamam" if result['ok'] else f"HATA ({result.get('message', '')[:45]})"
+    print(f"{name:<24} {result['seconds']:9.2f} {result['rss_peak_mb'] - result['rss_before_mb']:14.1f}  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=2_000_000, help="Arşivlenecek yıldaki detay satırı sayısı")
+    args = parser.parse_args()
+    large_orders = args.lines // LINES_PER_ORDER
+
+    tmp_dir = tempfile.mkdtemp(prefix="kafe_archive_bench_")
+    try:
+        for order_count in (SMALL_ORDERS, large_orders):
+            print(f"\n{ARCHIVE_YEAR} yılı: {order_count} sipariş / {order_count * LINES_PER_ORDER} detay satırı "
+                  f"(+{NEXT_YEAR_ORDERS} sipariş {ARCHIVE_YEAR + 1})")
+            t0 = time.perf_counter()
+            base_path = build_base_db(order_count, tmp_dir)
+            print(f"veri hazırlama: {time.perf_counter() - t0:.1f} sn")
+            expected = expected_counts(base_path)
+            expected_remaining = order_count + NEXT_YEAR_ORDERS - expected[0]
+            print(f"{'yöntem':<24} {'süre (sn)':>9} {'peak RSS (MB)':>14}  durum")
+            for mode, name in (("legacy", "eski (fetchall + IN)"), ("streaming", "akışlı (ATTACH)")):
+                result, db_path, archive_path = run_child(mode, base_path, tmp_dir)
+                print_result(name, result)
+                if result['ok']:
+                    remaining, archived = count_rows(db_path), count_rows(archive_path)
+                    assert archived == expected and remaining[0] == expected_remaining, (remaining, archived, expected)
+            streaming_seconds = result['seconds']
+
+        # Kesinti ve devam: büyük veri seti üzerinde akışlı arşivleme yarıda öldürülür
+        kill_after = 0.5 + streaming_seconds / 2 # Alt süreç açılışı + işin yaklaşık yarısı
+        result, db_path, archive_path = run_child("streaming", base_path, tmp_dir, kill_after=kill_after)
+        conn = sqlite3.connect(db_path)
+        checkpoint = conn.execute("SELECT value FROM settings WHERE key = ?", (f"archive_checkpoint_{ARCHIVE_YEAR}",)).fetchone()
+        conn.close()
+        print(f"\n{kill_after:.1f} sn sonra SIGKILL: ilerleme noktası = {checkpoint[0] if checkpoint else 'yok'}, "
+              f"ana DB'de kalan {count_rows(db_path)[0]} sipariş")
+        result, db_path, archive_path = run_child("streaming", base_path, tmp_dir, keep_db=db_path)
+        remaining, archived = count_rows(db_path), count_rows(archive_path)
+        print(f"devam çalıştırması: {result['seconds']:.2f} sn, ana DB {remaining}, arşiv {archived}")
+        assert archived == expected and remaining[0] == expected_remaining, (remaining, archived, expected)
+        print("kesinti sonrası devam: satır sayıları doğru")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        child_main(*sys.argv[2:])
+    else:
+        main()
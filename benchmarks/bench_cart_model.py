@@ -0,0 +1,114 @@
+# benchmarks/bench_cart_model.py
+
+"""200 satırlık grup adisyonunda sepet tarafındaki tekrar dokunma ve toplam hesaplama maliyetini ölçer (PySide6 gerekir).
+
+Karşılaştırma (veritabanı yazması hariç, sadece sepet/UI tarafı):
+  - eski yöntem: QTreeWidget; mevcut satır tüm öğeler taranıp int(item.text(5)) ile bulunur, miktar/fiyat metinden
+    float'a çevrilir, toplam her seferinde tüm satırların item.text(3) metni ayrıştırılarak hesaplanır
+  - CartItemModel: urun_id / detay_id sözlükleri, brüt toplam fark ile güncellenir
+Ekran gerekmez, QT_QPA_PLATFORM=offscreen kullanılır.
+
+Kullanım: python benchmarks/bench_cart_model.py
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import _bench_common # Depo kök dizinini sys.path'e ekler
+
+from PySide6.QtWidgets import QApplication, QTreeWidget, QTreeWidgetItem, QTreeView
+from PySide6.QtCore import Qt
+
+from cart_model import CartItemModel, CartLine
+from money import Money
+
+LINE_COUNT = 200
+TAPS = 2000
+
+
+def legacy_add_line(tree, detay_id, urun_id, adi, fiyat):
+    item = QTreeWidgetItem(tree)
+    item.setText(0, adi)
+    item.setText(1, "1.0")
+    item.setText(2, f"{fiyat:.2f} TL")
+    item.setText(3, f"{fiyat:.2f} TL")
+    item.setText(4, "12:00:00")
+    item.setText(5, str(detay_id))
+    item.setData(0, Qt.UserRole, urun_id)
+
+
+def legacy_tap(tree, urun_id):
+    """Değişiklik öncesi add_to_cart (mevcut satır yolu) + _recalculate_and_update_totals."""
+    root_item = tree.invisibleRootItem()
+    existing = None
+    for i in range(root_item.childCount()):
+        item = root_item.child(i)
+        if item.data(0, Qt.UserRole) == urun_id and int(item.text(5)) != -1:
+            existing = item
+            break
+    new_miktar = float(existing.text(1)) + 1.0
+    birim_fiyat = float(existing.text(2).replace(" TL", ""))
+    existing.setText(1, f"{new_miktar}")
+    existing.setText(3, f"{new_miktar * birim_fiyat:.2f} TL")
+
+    total = 0.0
+    for i in range(root_item.childCount()):
+        total += float(root_item.child(i).text(3).replace(" TL", ""))
+    return total
+
+
+def model_tap(model, urun_id):
+    line = model.cart.line_for_product(urun_id)
+    model.set_quantity(line.detay_id, line.miktar + 1.0)
+    return model.cart.brut_total
+
+
+def run_taps(app, tap, urun_ids):
+    timings = []
+    total = None
+    for urun_id in urun_ids:
+        t0 = time.perf_counter()
+        total = tap(urun_id)
+        timings.append((time.perf_counter() - t0) * 1_000_000)
+    app.processEvents()
+    return timings, total
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    rnd = random.Random(3)
+    products = [(urun_id, f"Ürün {urun_id}", round(rnd.uniform(20, 300), 2)) for urun_id in range(1, LINE_COUNT + 1)]
+    tap_ids = [rnd.choice(products)[0] for _ in range(TAPS)]
+
+    tree = QTreeWidget()
+    tree.setColumnCount(6)
+    tree.show()
+    for detay_id, (urun_id, adi, fiyat) in enumerate(products, start=1):
+        legacy_add_line(tree, detay_id, urun_id, adi, fiyat)
+
+    model = CartItemModel()
+    view = QTreeView()
+    view.setModel(model)
+    view.setUniformRowHeights(True) # AdisyonTabPyside.cart_treeview ile aynı ayar
+    view.show()
+    for detay_id, (urun_id, adi, fiyat) in enumerate(products, start=1):
+        model.add_line(CartLine(detay_id, urun_id, adi, 1.0, Money.from_tl(fiyat), Money.from_tl(fiyat), None, "12:00:00"))
+
+    legacy_us, legacy_total = run_taps(app, lambda urun_id: legacy_tap(tree, urun_id), tap_ids)
+    model_us, model_total = run_taps(app, lambda urun_id: model_tap(model, urun_id), tap_ids)
+    assert abs(legacy_total - model_total.to_float()) < 0.01, (legacy_total, model_total)
+
+    print(f"{LINE_COUNT} satırlık sepet, {TAPS} tekrar dokunma (brüt toplam: {model_total:.2f} TL)")
+    print(f"{'yöntem':<30} {'medyan (µs)':>12} {'p95 (µs)':>10}")
+    for name, timings in (("eski (tarama + metin ayrıştırma)", legacy_us), ("CartItemModel", model_us)):
+        p95 = sorted(timings)[int(len(timings) * 0.95)]
+        print(f"{name:<30} {statistics.median(timings):12.1f} {p95:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
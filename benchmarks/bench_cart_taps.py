@@ -0,0 +1,74 @@
+# benchmarks/bench_cart_taps.py
+
+"""Hızlı satış butonuna her basışın (tap) veritabanı maliyetini ölçer.
+
+Eski akış: add_order_item (satır + SUM ile toplam + masa, commit) ardından
+_recalculate_and_update_totals (2x get_order_info + update_masa_totals commit).
+Yeni akış: apply_order_item, satır ve toplamlar fark (delta) ile tek transaction/tek commit.
+
+Kullanım: python benchmarks/bench_cart_taps.py [tap_sayısı] [sepetteki_satır_sayısı]
+"""
+
+import sys
+import time
+from datetime import datetime
+
+from _bench_common import create_temp_db, remove_temp_dir
+
+
+def legacy_tap(db_manager, masa_no, siparis_id, product, miktar, detay_id):
+    """Değişiklik öncesi tap akışının SQL karşılığı (3 commit)."""
+    cursor = db_manager.cursor
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    tutar = miktar * product['fiyat']
+    cursor.execute("UPDATE siparis_detaylari SET miktar = ?, tutar = ? WHERE detay_id = ? AND siparis_id = ?", (miktar, tutar, detay_id, siparis_id))
+    cursor.execute("""UPDATE siparis_gecmisi
+                      SET toplam_tutar = (SELECT COALESCE(SUM(tutar), 0.0) FROM siparis_detaylari WHERE siparis_id = ?),
+                          son_islem_zamani = ?
+                      WHERE siparis_id = ?""", (siparis_id, now, siparis_id))
+    cursor.execute("UPDATE masalar SET durum = 'Dolu' WHERE aktif_siparis_id = ?", (siparis_id,))
+    db_manager.conn.commit()
+
+    brut_total = sum(row['tutar'] for row in db_manager.get_order_details(siparis_id)) # UI'daki satır toplamının karşılığı
+    order_info = db_manager.get_order_info(siparis_id)
+    order_info = db_manager.get_order_info(siparis_id)
+    db_manager.update_masa_totals(masa_no, brut_total, order_info['iskonto'], order_info['odenen_tutar'])
+
+
+def new_tap(db_manager, masa_no, siparis_id, product, miktar, detay_id):
+    db_manager.apply_order_item(siparis_id, product['urun_id'], product['adi'], miktar, product['fiyat'], product['kategori_id'], detay_id=detay_id)
+
+
+def run(tap_func, tap_count, line_count, masa_no):
+    db_manager, tmp_dir = create_temp_db("cart_taps")
+    try:
+        siparis_id = db_manager.create_new_order(masa_no)
+        products = db_manager.get_all_products()[:line_count]
+        detay_ids = [db_manager.add_order_item(siparis_id, p['urun_id'], p['adi'], 1, p['fiyat'], p['kategori_id'])[1] for p in products]
+
+        t0 = time.perf_counter()
+        for i in range(tap_count):
+            line = i % len(products)
+            tap_func(db_manager, masa_no, siparis_id, products[line], 2 + i // len(products), detay_ids[line])
+        elapsed = time.perf_counter() - t0
+        total = db_manager.get_order_info(siparis_id)['toplam_tutar']
+        return tap_count / elapsed, total
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+def main():
+    tap_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    line_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    legacy_rate, legacy_total = run(legacy_tap, tap_count, line_count, 1)
+    new_rate, new_total = run(new_tap, tap_count, line_count, 1)
+
+    print(f"\n{tap_count} tap, sepette {line_count} satır")
+    print(f"  Eski akış (3 commit/tap): {legacy_rate:8.0f} tap/sn  (son toplam {legacy_total:.2f})")
+    print(f"  Yeni akış (1 commit/tap): {new_rate:8.0f} tap/sn  (son toplam {new_total:.2f})")
+    print(f"  Hızlanma: x{new_rate / legacy_rate:.1f}")
+
+
+if __name__ == "__main__":
+    main()
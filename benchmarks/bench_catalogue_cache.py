@@ -0,0 +1,96 @@
+# benchmarks/bench_catalogue_cache.py
+
+"""Katalog önbelleği (CatalogueCache) ile her çağrıda SELECT çalıştıran eski get_all_products'ı karşılaştırır.
+
+Ölçülenler (ürün sayısına göre, medyan):
+  - tüm aktif ürünler (hızlı satış listesi), pasifler dahil tüm ürünler (ürün yönetimi listesi)
+  - tek kategori, ID ile tek ürün
+  - katalog değiştikten sonraki ilk okuma (yeniden yükleme maliyeti)
+
+Kullanım: python benchmarks/bench_catalogue_cache.py
+"""
+
+import random
+
+from _bench_common import create_temp_db, remove_temp_dir, measure
+
+from catalogue_cache import CatalogueCache
+
+PRODUCT_COUNTS = [100, 1000, 5000]
+REPEAT = 200
+
+
+def legacy_get_all_products(db_manager, include_inactive=False):
+    """Değişiklik öncesi get_all_products: her çağrıda JOIN + ORDER BY sorgusu."""
+    query = CatalogueCache.PRODUCTS_QUERY
+    if not include_inactive:
+        query += " WHERE u.aktif_durumu = 1"
+    query += " ORDER BY u.hizli_satis_sirasi, u.adi"
+    return db_manager.conn.execute(query).fetchall()
+
+
+def record_tuple(product):
+    """Önbellek kaydı, sorgu satırıyla karşılaştırılabilir tuple olarak (fiyat Money -> tamsayı kuruş)."""
+    return tuple(product._replace(fiyat=product.fiyat.kurus))
+
+
+def legacy_get_product_by_id(db_manager, urun_id):
+    return db_manager.conn.execute(CatalogueCache.PRODUCTS_QUERY + " WHERE u.urun_id = ?", (urun_id,)).fetchone()
+
+
+def legacy_get_products_by_category(db_manager, kategori_id):
+    """Eski hızlı satış filtresi: tüm aktif ürünleri çekip Python'da kategoriye göre süzme."""
+    return [p for p in legacy_get_all_products(db_manager) if p['kategori_id'] == kategori_id]
+
+
+def add_products(db_manager, count, seed=7):
+    rnd = random.Random(seed)
+    kategori_ids = [c['kategori_id'] for c in db_manager.get_all_categories()]
+    existing = len(db_manager.get_all_products(include_inactive=True))
+    rows = [(f"Bench Ürün {i:05d}", rnd.randint(2000, 40000), rnd.choice(kategori_ids),
+             1 if rnd.random() < 0.9 else 0, rnd.randint(0, 50))
+            for i in range(max(0, count - existing))]
+    db_manager.conn.executemany(
+        "INSERT INTO urunler (adi, fiyat, kategori_id, aktif_durumu, hizli_satis_sirasi) VALUES (?, ?, ?, ?, ?)", rows)
+    db_manager.conn.commit()
+    db_manager.catalogue.invalidate()
+    return kategori_ids
+
+
+def main():
+    print(f"{'Ürün':>6} {'işlem':<24} {'SELECT (ms)':>12} {'önbellek (ms)':>14} {'hız':>8}")
+    for product_count in PRODUCT_COUNTS:
+        db_manager, tmp_dir = create_temp_db("catalogue")
+        try:
+            kategori_ids = add_products(db_manager, product_count)
+            urun_id = db_manager.get_all_products()[len(db_manager.get_all_products()) // 2]['urun_id']
+            kategori_id = kategori_ids[0]
+
+            # Önbellek sonuçları eski sorgularla aynı sırada ve aynı içerikte olmalı
+            assert [tuple(r) for r in legacy_get_all_products(db_manager, True)] == [record_tuple(r) for r in db_manager.get_all_products(True)]
+            assert tuple(legacy_get_product_by_id(db_manager, urun_id)) == record_tuple(db_manager.get_product_by_id(urun_id))
+
+            cases = [
+                ("aktif ürünler", lambda: legacy_get_all_products(db_manager), lambda: db_manager.get_all_products()),
+                ("tüm ürünler", lambda: legacy_get_all_products(db_manager, True), lambda: db_manager.get_all_products(True)),
+                ("kategoriye göre", lambda: legacy_get_products_by_category(db_manager, kategori_id),
+                 lambda: db_manager.get_catalogue().get_products_by_category(kategori_id)),
+                ("ID ile ürün", lambda: legacy_get_product_by_id(db_manager, urun_id), lambda: db_manager.get_product_by_id(urun_id)),
+            ]
+            for name, legacy, cached in cases:
+                legacy_ms = measure(legacy, REPEAT)[0] * 1000
+                cached_ms = measure(cached, REPEAT)[0] * 1000
+                print(f"{product_count:>6} {name:<24} {legacy_ms:12.4f} {cached_ms:14.4f} {legacy_ms / cached_ms:7.0f}x")
+
+            def reload_after_change():
+                db_manager.catalogue.invalidate()
+                db_manager.get_catalogue()
+            reload_ms = measure(reload_after_change, 20)[0] * 1000
+            print(f"{product_count:>6} {'değişiklik sonrası yükleme':<24} {'':>12} {reload_ms:14.4f}")
+        finally:
+            db_manager.close()
+            remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_connection_profiles.py
+
+"""constants.DB_CONNECTION_PROFILES içindeki her profil için saniyedeki commit sayısını ölçer.
+
+Her profil için ayrı bir geçici veritabanı açılır ve sepete ürün ekleme (add_order_item, commit dahil)
+art arda çalıştırılır. fsync maliyeti diske bağlı olduğundan sonuçlar tmpfs üzerinde yanıltıcı olabilir;
+gerçek ölçüm için KAFE_BENCH_DIR ile kasadaki diskte bir dizin verilebilir.
+
+Kullanım: python benchmarks/bench_connection_profiles.py [işlem_sayısı]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from _bench_common import remove_temp_dir
+from database import DatabaseManager
+import constants
+
+
+def run_profile(profile_name, operation_count):
+    tmp_dir = tempfile.mkdtemp(prefix=f"kafe_profile_{profile_name}_", dir=os.environ.get("KAFE_BENCH_DIR"))
+    db_manager = DatabaseManager(os.path.join(tmp_dir, "cafe_adisyon_bench.db"), connection_profile=profile_name)
+    try:
+        journal_mode = db_manager.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        siparis_id = db_manager.create_new_order(1)
+        product = db_manager.get_product_by_id(1)
+
+        success, detay_id = db_manager.add_order_item(siparis_id, product['urun_id'], product['adi'], 1, product['fiyat'], product['kategori_id'])
+        t0 = time.perf_counter()
+        for i in range(operation_count):
+            db_manager.add_order_item(siparis_id, product['urun_id'], product['adi'], i + 2, product['fiyat'], product['kategori_id'], detay_id=detay_id)
+        elapsed = time.perf_counter() - t0
+        return journal_mode, operation_count / elapsed
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+def main():
+    operation_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    results = [(name, *run_profile(name, operation_count)) for name in constants.DB_CONNECTION_PROFILES]
+
+    print(f"\n{'Profil':<10} {'journal':<8} {'synchronous':<12} {'commit/sn':>10}")
+    for name, journal_mode, commits_per_second in results:
+        synchronous = constants.DB_CONNECTION_PROFILES[name].get('synchronous', '-')
+        print(f"{name:<10} {journal_mode:<8} {synchronous:<12} {commits_per_second:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
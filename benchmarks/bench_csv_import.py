@@ -0,0 +1,134 @@
+# benchmarks/bench_csv_import.py
+
+"""Toplu CSV içe aktarmanın (csv_import.py) satır başına add_product/add_customer çağrısına göre süresini ölçer.
+
+Senaryo: ROWS satırlık ürün CSV'si (CATEGORIES farklı kategori adı, her INVALID_EVERY satırda bir hatalı satır) ve
+aynı büyüklükte müşteri CSV'si.
+  - eski yöntem: her satır için kategori adı SQL ile çözülür ve add_product/add_customer çağrılır (satır başına commit).
+    Çok yavaş olduğu için BASELINE_ROWS satırda ölçülür ve ROWS'a oranlanır.
+  - import_csv: satırlar akış halinde okunur, kategori adları tek eşlemeyle çözülür, executemany ile tek transaction'da yazılır
+Aynı dosyanın ikinci kez içe aktarılması upsert yoluyla (tüm satırlar güncelleme) ayrıca ölçülür.
+
+Kullanım: python benchmarks/bench_csv_import.py [--rows 100000]
+"""
+
+import argparse
+import csv
+import os
+import random
+import time
+
+from _bench_common import create_temp_db, remove_temp_dir
+
+import csv_import
+
+CATEGORIES = 40
+INVALID_EVERY = 1000
+BASELINE_ROWS = 2000
+
+
+def write_products_csv(path, rows, seed=1):
+    rnd = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["adi", "fiyat", "kategori", "aktif_durumu", "hizli_satis_sirasi"])
+        for i in range(rows):
+            fiyat = f"{rnd.uniform(5, 400):.2f}".replace(".", ",")
+            if i % INVALID_EVERY == INVALID_EVERY - 1:
+                fiyat = "yok" # Hatalı satır: içe aktarma durmadan raporlanmalı
+            writer.writerow([f"Ürün {i:06d}", fiyat, f"Kategori {rnd.randrange(CATEGORIES):02d}", rnd.choice(["1", "1", "0"]), ""])
+
+
+def write_customers_csv(path, rows, seed=2):
+    rnd = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["ad_soyad", "telefon", "bakiye"])
+        for i in range(rows):
+            telefon = f"0532 {i // 10000:03d} {i % 10000:04d}"
+            if i % INVALID_EVERY == INVALID_EVERY - 1:
+                telefon = "telefon?"
+            writer.writerow([f"Müşteri {i}", telefon, f"{rnd.uniform(0, 500):.2f}"])
+
+
+def baseline_products(db_manager, path, limit):
+    """Eski yöntem: satır başına kategori sorgusu + add_product (her biri kendi commit'i)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f, delimiter=";")
+        for index, row in enumerate(reader):
+            if index >= limit:
+                break
+            try:
+                fiyat = float(row["fiyat"].replace(",", "."))
+            except ValueError:
+                continue
+            db_manager.cursor.execute("SELECT kategori_id FROM kategoriler WHERE adi = ?", (row["kategori"],))
+            found = db_manager.cursor.fetchone()
+            if found is None:
+                db_manager.add_category(row["kategori"])
+                db_manager.cursor.execute("SELECT kategori_id FROM kategoriler WHERE adi = ?", (row["kategori"],))
+                found = db_manager.cursor.fetchone()
+            db_manager.add_product(row["adi"], fiyat, found[0], int(row["aktif_durumu"]), 0)
+
+
+def baseline_customers(db_manager, path, limit):
+    with open(path, newline="", encoding="utf-8") as f:
+        for index, row in enumerate(csv.DictReader(f)):
+            if index >= limit:
+                break
+            db_manager.add_customer(row["ad_soyad"], row["telefon"])
+
+
+def timed(func):
+    t0 = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    expected_errors = args.rows // INVALID_EVERY
+
+    print(f"\n{args.rows} satır, {CATEGORIES} kategori, {expected_errors} hatalı satır")
+    print(f"{'liste':<11} {'yöntem':<38} {'süre (sn)':>10}")
+    for kind, write_csv, baseline in (("urunler", write_products_csv, baseline_products),
+                                      ("musteriler", write_customers_csv, baseline_customers)):
+        # Eski yöntem (BASELINE_ROWS satır ölçülür, ROWS'a oranlanır)
+        db_manager, tmp_dir = create_temp_db(f"csv_{kind}_baseline")
+        try:
+            path = os.path.join(tmp_dir, f"{kind}.csv")
+            write_csv(path, args.rows)
+            _, seconds = timed(lambda: baseline(db_manager, path, BASELINE_ROWS))
+            estimate = seconds * args.rows / BASELINE_ROWS
+            print(f"{kind:<11} {f'satır başına commit (tahmini)':<38} {estimate:10.1f}")
+        finally:
+            db_manager.close()
+            remove_temp_dir(tmp_dir)
+
+        db_manager, tmp_dir = create_temp_db(f"csv_{kind}")
+        try:
+            path = os.path.join(tmp_dir, f"{kind}.csv")
+            write_csv(path, args.rows)
+            table = kind # Tür adı tablo adıyla aynı
+            count_before = db_manager.cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+            result, seconds = timed(lambda: csv_import.import_csv(db_manager, kind, path))
+            assert result.success, result.message
+            assert len(result.errors) == expected_errors and result.inserted == args.rows - expected_errors, result.counts_text()
+            count_after = db_manager.cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            assert count_after - count_before == result.inserted
+            print(f"{kind:<11} {'import_csv (ilk yükleme)':<38} {seconds:10.2f}")
+
+            result, seconds = timed(lambda: csv_import.import_csv(db_manager, kind, path))
+            assert result.success and result.inserted == 0 and result.updated == args.rows - expected_errors
+            print(f"{kind:<11} {'import_csv (tekrar, hepsi güncelleme)':<38} {seconds:10.2f}")
+            print(f"{'':<11} ilk hata: satır {result.errors[0][0]}: {result.errors[0][1]}")
+        finally:
+            db_manager.close()
+            remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
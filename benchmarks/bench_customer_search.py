@@ -0,0 +1,109 @@
+# benchmarks/bench_customer_search.py
+
+"""Adisyon sekmesi müşteri seçicisinin gecikmesini ölçer (PySide6 gerekir).
+
+Senaryo: CUSTOMERS müşteri (rastgele Türkçe ad soyad + telefon).
+  - eski yöntem: load_customer_combobox; get_all_customers + QComboBox'a tek tek addItem (her load_cart'ta çalışıyordu)
+  - search_customers: yazılan metin için en fazla CUSTOMER_SEARCH_LIMIT sonuç (FTS5 trigram / ifade indeksi)
+  - search_customers (indekssiz): aynı sorgu FTS5 olmadan, musteriler tablosu taranarak
+Her sorgu türü için QUERIES rastgele metinle medyan ve en kötü süre verilir. Ekran gerekmez, QT_QPA_PLATFORM=offscreen kullanılır.
+
+Kullanım: python benchmarks/bench_customer_search.py [--customers 100000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _bench_common import create_temp_db, remove_temp_dir, measure
+
+from PySide6.QtWidgets import QApplication, QComboBox
+
+FIRST_NAMES = ["Ahmet", "Mehmet", "Ayşe", "Fatma", "İlker", "Işıl", "Özge", "Şule", "Çağrı", "Gülşen", "Ümit", "Can",
+               "Deniz", "Emre", "Zeynep", "Buğra", "Elif", "Oğuz", "Selin", "Burak", "İrem", "Tuğçe", "Kaan", "Ece"]
+LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Öztürk", "Aydın", "Arslan", "Doğan", "Kılıç",
+              "Aslan", "Çetin", "Koç", "Kurt", "Özdemir", "Işık", "Güneş", "Erdoğan", "Aksoy", "Tekin", "Polat"]
+QUERIES = 200
+
+
+def add_customers(db_manager, count, seed=7):
+    rnd = random.Random(seed)
+    rows = [(f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)} {i}", f"05{rnd.randint(30, 59)} {i:07d}", 0.0)
+            for i in range(count)]
+    with db_manager.transaction():
+        db_manager.bulk_upsert_customers(rows)
+    return rows
+
+
+def old_combobox_load(db_manager, combo):
+    customers = db_manager.get_all_customers()
+    combo.clear()
+    combo.addItem("-- Müşteri Seçilmedi --", None)
+    for c in customers:
+        combo.addItem(f"{c['ad_soyad']} ({c['telefon'] or 'Telefon Yok'})", c['musteri_id'])
+    return combo.count()
+
+
+def query_sets(rows, seed=11):
+    rnd = random.Random(seed)
+    names = [row[0] for row in rows]
+    phones = [row[1] for row in rows]
+    return {
+        "boş (ilk sayfa)": [""] * QUERIES,
+        "1 harf": [rnd.choice(names)[:1].lower() for _ in range(QUERIES)],
+        "2 harf": [rnd.choice(names)[:2] for _ in range(QUERIES)],
+        "ad parçası (4 harf)": [rnd.choice(names).split()[1][1:5].upper() for _ in range(QUERIES)],
+        "ad + soyad": [" ".join(rnd.choice(names).split()[:2]) for _ in range(QUERIES)],
+        "telefon parçası": [rnd.choice(phones)[-7:-1] for _ in range(QUERIES)],
+        "olmayan metin": [f"zzq{i}" for i in range(QUERIES)],
+    }
+
+
+def latency(db_manager, queries):
+    timings = []
+    for text in queries:
+        t0 = time.perf_counter()
+        db_manager.search_customers(text)
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--customers", type=int, default=100_000)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    db_manager, tmp_dir = create_temp_db("customer_search")
+    try:
+        rows = add_customers(db_manager, args.customers)
+        print(f"\n{args.customers} müşteri")
+
+        combo = QComboBox()
+        seconds, count = measure(lambda: old_combobox_load(db_manager, combo), repeat=3)
+        print(f"eski load_customer_combobox ({count} öğe): {seconds * 1000:.0f} ms (her load_cart / yeni adisyonda)")
+
+        print(f"\n{'sorgu':<22} {'indeksli medyan':>16} {'en kötü':>9} {'indekssiz medyan':>17} {'en kötü':>9}  (ms)")
+        for name, queries in query_sets(rows).items():
+            db_manager._customer_search_fts = None # Bağlantı açılışındaki gibi: FTS5 tablosu kontrol edilir
+            indexed = latency(db_manager, queries)
+            db_manager._customer_search_fts = False # FTS5'siz derlenmiş SQLite davranışı
+            scanned = latency(db_manager, queries)
+            print(f"{name:<22} {indexed[0]:16.2f} {indexed[1]:9.2f} {scanned[0]:17.2f} {scanned[1]:9.2f}")
+        db_manager._customer_search_fts = None
+
+        sample = rows[12345 % len(rows)]
+        found = db_manager.search_customers(sample[1])
+        assert found and found[0]['ad_soyad'] == sample[0], (sample, [tuple(r) for r in found])
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# benchmarks/bench_db_executor.py
+
+"""Kasa yazmalarının (sepete ürün ekleme) arayüz iş parçacığını ne kadar dondurduğunu ölçer (PySide6 gerekir).
+
+Senaryo: kasiyer her TAP_INTERVAL_MS'de bir hızlı satış butonuna basar (TAPS dokunuş, aynı masa, birkaç ürün).
+Her dokunuş DatabaseManager.add_product_to_table ile bir transaction (commit) yapar.
+  - eski yöntem: yazma arayüz iş parçacığında senkron çalışır
+  - DatabaseExecutor: yazma yazıcı iş parçacığının kuyruğuna gönderilir, sonuç sinyalle gelir
+Yavaş disk iki şekilde taklit edilir:
+  - yavaş commit: yazan bağlantının her COMMIT'i SLOW_COMMIT_MS sürer (fsync gecikmesi)
+  - kilit: başka bir bağlantı (ör. bakım işi) belli aralıklarla yazma kilidini LOCK_HOLD_MS tutar, yazma busy_timeout'ta bekler
+Arayüz iş parçacığında her TICK_MS'de çalışan timer'ın gecikmesi donma olarak ölçülür. Ekran gerekmez.
+
+Kullanım: python benchmarks/bench_db_executor.py [--taps 200]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _bench_common import create_temp_db, remove_temp_dir
+
+from PySide6.QtCore import QCoreApplication, QTimer, QObject
+
+from database import DatabaseManager
+from db_executor import DatabaseExecutor
+from money import Money
+
+TICK_MS = 5
+TAP_INTERVAL_MS = 40
+SLOW_COMMIT_MS = 30
+LOCK_HOLD_MS = 300
+LOCK_EVERY_MS = 1000
+PRODUCTS = [(1, 'Espresso', Money(11000), None), (2, 'Doppio', Money(12000), None), (3, 'Latte', Money(13500), None)]
+
+
+def slow_commits(conn):
+    """Bağlantının her COMMIT'ini SLOW_COMMIT_MS geciktirir (yavaş disk)."""
+    def trace(statement):
+        if statement == "COMMIT":
+            time.sleep(SLOW_COMMIT_MS / 1000)
+    conn.set_trace_callback(trace)
+
+
+class SlowDiskExecutor(DatabaseExecutor):
+    """Yazıcı bağlantısının COMMIT'leri yavaş olan DatabaseExecutor."""
+
+    def __init__(self, db_name, slow_commit):
+        super().__init__(db_name)
+        self.slow_commit = slow_commit
+
+    def _db(self, read_only):
+        fresh = getattr(self._local, 'db', None) is None
+        db_manager = super()._db(read_only)
+        if fresh and not read_only and self.slow_commit:
+            slow_commits(db_manager.conn)
+        return db_manager
+
+
+class LockHolder(threading.Thread):
+    """Başka bir bağlantıyla her LOCK_EVERY_MS'de yazma kilidini LOCK_HOLD_MS tutar."""
+
+    def __init__(self, db_name):
+        super().__init__(daemon=True)
+        self.db_name = db_name
+        self.stop_event = threading.Event()
+
+    def run(self):
+        conn = sqlite3.connect(self.db_name, isolation_level=None)
+        while not self.stop_event.wait(LOCK_EVERY_MS / 1000):
+            conn.execute("BEGIN IMMEDIATE")
+            time.sleep(LOCK_HOLD_MS / 1000)
+            conn.execute("COMMIT")
+        conn.close()
+
+
+class Ticker(QObject):
+    """Arayüz iş parçacığında olay döngüsünün ne kadar donduğunu ölçer."""
+
+    def __init__(self):
+        super().__init__()
+        self.gaps = []
+        self._last = None
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+
+    def tick(self):
+        now = time.perf_counter()
+        if self._last is not None:
+            self.gaps.append((now - self._last) * 1000)
+        self._last = now
+
+    def stall_ms(self):
+        """Timer aralığını aşan toplam gecikme."""
+        return sum(gap - TICK_MS for gap in self.gaps if gap > TICK_MS * 2)
+
+
+def run(app, db_manager, masa_no, taps, use_executor, slow_commit, lock):
+    """TAPS dokunuşu uygular. (en uzun donma ms, toplam donma ms, dokunuş başına arayüz süresi ms, son sonuç gelene kadar sn) döndürür."""
+    executor = None
+    if use_executor:
+        executor = SlowDiskExecutor(db_manager.db_name, slow_commit)
+    elif slow_commit:
+        slow_commits(db_manager.conn)
+    holder = LockHolder(db_manager.db_name) if lock else None
+
+    ticker = Ticker()
+    state = {'sent': 0, 'done': 0, 'handler_s': 0.0}
+
+    def on_result(result):
+        assert result[0]
+        state['done'] += 1
+        if state['done'] == taps:
+            state['finished'] = time.perf_counter()
+            app.quit()
+
+    def tap():
+        urun_id, adi, fiyat, kategori_id = PRODUCTS[state['sent'] % len(PRODUCTS)]
+        t = time.perf_counter()
+        if executor is not None:
+            executor.submit_write(DatabaseManager.add_product_to_table, masa_no, urun_id, adi, fiyat, kategori_id,
+                                  on_result=on_result)
+        else:
+            on_result(db_manager.add_product_to_table(masa_no, urun_id, adi, fiyat, kategori_id))
+        state['handler_s'] += time.perf_counter() - t
+        state['sent'] += 1
+        if state['sent'] == taps:
+            tap_timer.stop()
+
+    tap_timer = QTimer()
+    tap_timer.timeout.connect(tap)
+    ticker.timer.start(TICK_MS)
+    if holder is not None:
+        holder.start()
+    t0 = time.perf_counter()
+    tap_timer.start(TAP_INTERVAL_MS)
+    app.exec()
+    ticker.timer.stop()
+    if holder is not None:
+        holder.stop_event.set()
+        holder.join()
+    if executor is not None:
+        executor.shutdown()
+    db_manager.conn.set_trace_callback(None)
+    return (max(ticker.gaps), ticker.stall_ms(), state['handler_s'] * 1000 / taps, state['finished'] - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--taps", type=int, default=200)
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    db_manager, tmp_dir = create_temp_db("db_executor")
+    try:
+        print(f"\n{args.taps} dokunuş, {TAP_INTERVAL_MS} ms arayla; timer {TICK_MS} ms. Yavaş commit: {SLOW_COMMIT_MS} ms, "
+              f"kilit: her {LOCK_EVERY_MS} ms'de {LOCK_HOLD_MS} ms")
+        print(f"{'senaryo':<22} {'yöntem':<16} {'en uzun donma':>14} {'toplam donma':>13} {'dokunuş/arayüz':>15} {'süre (sn)':>10}")
+        masa_no = 1
+        for scenario, slow_commit, lock in (("normal disk", False, False), ("yavaş commit", True, False),
+                                            ("kilit", False, True)):
+            for name, use_executor in (("eski (senkron)", False), ("DatabaseExecutor", True)):
+                active = db_manager.get_masa_info(masa_no)['aktif_siparis_id']
+                if active:
+                    db_manager.clear_order_details(active) # Her ölçüm boş masayla başlar
+                max_gap, stall, per_tap, seconds = run(app, db_manager, masa_no, args.taps, use_executor, slow_commit, lock)
+                # Tüm dokunuşlar aynı siparişe işlendi: satır başına miktar = o ürünün dokunuş sayısı
+                siparis_id = db_manager.get_masa_info(masa_no)['aktif_siparis_id']
+                miktarlar = sorted(row['miktar'] for row in db_manager.get_order_details(siparis_id))
+                expected = sorted(float(len(range(i, args.taps, len(PRODUCTS)))) for i in range(len(PRODUCTS)))
+                assert miktarlar == expected, (miktarlar, expected)
+                print(f"{scenario:<22} {name:<16} {max_gap:11.1f} ms {stall:10.0f} ms {per_tap:12.2f} ms {seconds:10.2f}")
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
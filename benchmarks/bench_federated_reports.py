@@ -0,0 +1,114 @@
+# benchmarks/bench_federated_reports.py
+
+"""Arşivlenmiş yıllar dahil raporların doğruluğunu ve arşiv budamasının (pruning) etkisini ölçer.
+
+Senaryo: ARCHIVE_YEARS yılları ayrı ayrı cafe_adisyon_archive_<yıl>.db dosyalarına arşivlenir, son yıl ana DB'de kalır.
+  - doğruluk: arşivleme öncesi rapor sonuçları ile arşivleme sonrası (ana DB + arşivler) sonuçlar aynı olmalı;
+    sadece ana DB'yi okuyan eski sorgu arşivlenen yılları kaybeder
+  - budama: bir haftalık rapor hiçbir arşive dokunmamalı; "bu Mart + önceki üç Mart" sadece ilgili dosyaları bağlamalı
+  - karşılaştırma: budama olmadan (tüm arşivler her raporda bağlanır) aynı raporların süresi
+
+Kullanım: python benchmarks/bench_federated_reports.py
+"""
+
+import os
+from datetime import datetime
+
+from _bench_common import create_temp_db, remove_temp_dir, generate_closed_orders, measure
+
+import constants
+
+ARCHIVE_YEARS = (2020, 2021, 2022, 2023)
+CURRENT_YEAR = 2024
+ORDERS_PER_YEAR = 40_000
+
+
+def summary_tuple(row):
+    return (row['toplam_adisyon'], round(row['brut_satis'] or 0, 2), round(row['toplam_iskonto'] or 0, 2),
+            round(row['net_satis'] or 0, 2))
+
+
+def products_tuple(rows):
+    return sorted((row['urun_adi'], row['kategori_adi'], round(row['toplam_miktar'], 2), round(row['toplam_tutar_urun'], 2))
+                  for row in rows)
+
+
+def run_reports(db_manager, periods):
+    return {period: (summary_tuple(db_manager.get_sales_summary(*period)),
+                     products_tuple(db_manager.get_product_sales_report(*period)))
+            for period in periods}
+
+
+def count_attaches(db_manager, func):
+    """func çalışırken bağlanan arşiv sayısını sayar (rapor ATTACH komutları)."""
+    attaches = []
+    db_manager.conn.set_trace_callback(lambda sql: attaches.append(sql) if sql.startswith("ATTACH DATABASE") else None)
+    try:
+        func()
+    finally:
+        db_manager.conn.set_trace_callback(None)
+    return len(attaches)
+
+
+def main():
+    db_manager, tmp_dir = create_temp_db("federated")
+    try:
+        for seed, year in enumerate(ARCHIVE_YEARS + (CURRENT_YEAR,)):
+            generate_closed_orders(db_manager, ORDERS_PER_YEAR, start=datetime(year, 1, 1), days=365, seed=seed)
+
+        week = (f"{CURRENT_YEAR}-12-20", f"{CURRENT_YEAR}-12-26")
+        marches = [(f"{year}-03-01", f"{year}-03-31") for year in (CURRENT_YEAR,) + ARCHIVE_YEARS[-3:]]
+        all_years = (f"{ARCHIVE_YEARS[0]}-01-01", f"{CURRENT_YEAR}-12-31")
+        periods = [week] + marches + [all_years]
+
+        before = run_reports(db_manager, periods)
+        for year in ARCHIVE_YEARS:
+            ok, message = db_manager.archive_and_delete_old_orders(year)
+            assert ok, message
+        print(f"\n{len(ARCHIVE_YEARS)} yıl arşivlendi: {', '.join(os.path.basename(info.path) for info in db_manager.archives.archives())}")
+
+        after = run_reports(db_manager, periods)
+        main_only = {period: summary_tuple(db_manager.get_sales_summary(*period, include_archives=False)) for period in periods}
+        print(f"\n{'dönem':<24} {'arşiv öncesi':>12} {'ana+arşiv':>10} {'sadece ana':>11}  (adisyon sayısı)")
+        for period in periods:
+            assert after[period] == before[period], period
+            print(f"{period[0] + ' / ' + period[1]:<24} {before[period][0][0]:12d} {after[period][0][0]:10d} {main_only[period][0]:11d}")
+
+        # Grup birleştirme: aynı anda en fazla 2 arşiv bağlanırken sonuçlar değişmemeli
+        saved_limit = constants.REPORT_MAX_ATTACHED_ARCHIVES
+        constants.REPORT_MAX_ATTACHED_ARCHIVES = 2
+        try:
+            assert run_reports(db_manager, [all_years]) == {all_years: before[all_years]}
+        finally:
+            constants.REPORT_MAX_ATTACHED_ARCHIVES = saved_limit
+        print("gruplar halinde (en fazla 2 arşiv) birleştirme: sonuçlar aynı")
+
+        def week_report():
+            db_manager.get_sales_summary(*week)
+            db_manager.get_product_sales_report(*week)
+
+        def march_comparison():
+            db_manager.get_sales_summaries(marches)
+            for period in marches:
+                db_manager.get_product_sales_report(*period)
+
+        print(f"\n{'rapor':<34} {'budamalı (ms)':>14} {'bağlanan':>9} {'tüm arşivler (ms)':>18} {'bağlanan':>9}")
+        for name, func in (("1 haftalık özet + ürün raporu", week_report), ("4 Mart karşılaştırması", march_comparison)):
+            pruned_attaches = count_attaches(db_manager, func)
+            pruned_s, _ = measure(func)
+            overlapping = db_manager.archives.overlapping
+            db_manager.archives.overlapping = lambda start_epoch, end_epoch: db_manager.archives.archives()
+            try:
+                all_attaches = count_attaches(db_manager, func)
+                all_s, _ = measure(func)
+            finally:
+                db_manager.archives.overlapping = overlapping
+            print(f"{name:<34} {pruned_s * 1000:14.2f} {pruned_attaches:9d} {all_s * 1000:18.2f} {all_attaches:9d}")
+        print(f"arşiv aralığı okuma: {db_manager.archives.stats['range_reads']} kez (dosya değişmedikçe önbellekten)")
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
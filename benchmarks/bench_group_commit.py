@@ -0,0 +1,152 @@
+# benchmarks/bench_group_commit.py
+
+"""Sepet dokunuşlarında grup commit'in (CartTapBatcher) commit sayısına ve yazıcı süresine etkisini ölçer (PySide6 gerekir).
+
+Senaryo: yoğun bir saat yeniden oynatılır (ORDERS adisyon, 10 masa sırayla). Her adisyonda birkaç ürün; aynı ürüne art arda
+1-4 dokunuş (aralık REPEAT_TAP_MS), farklı ürünler arasında PRODUCT_GAP_MS, adisyon sonunda ödeme (ödeme öncesi flush).
+İki iş yükü:
+  - normal: saniyede birkaç dokunuş (REPEAT_TAP_MS arayla)
+  - çift basış: ayrıca dokunuşların DOUBLE_PRESS_RATE kadarı aynı butona DOUBLE_PRESS_MS içinde ikinci kez basılır
+Dokunuş zamanları sentetik saate göre işlenir: pencere ilk bekleyen dokunuşla başlar, pencere süresi dolunca flush edilir.
+Pencere 0 ms: her dokunuş ayrı commit (grup commit öncesi davranış). Yazıcı bağlantısının her COMMIT'i SLOW_COMMIT_MS
+sürer (fsync). Her iş yükünde tüm pencerelerin kapanan adisyonlarının ürün miktarları karşılaştırılır.
+
+Kullanım: python benchmarks/bench_group_commit.py [--orders 150]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _bench_common import create_temp_db, remove_temp_dir
+from bench_db_executor import SlowDiskExecutor
+
+from PySide6.QtCore import QCoreApplication
+
+from cart_tap_batcher import CartTapBatcher
+
+HOUR_S = 3600
+WINDOWS_MS = (0, 20, 30, 50, 100, 250)
+REPEAT_TAP_MS = (60, 250) # Aynı butona art arda basış aralığı
+DOUBLE_PRESS_MS = (15, 60) # Çift basışta ikinci basışın gecikmesi
+DOUBLE_PRESS_RATE = 0.3
+PRODUCT_GAP_MS = (300, 2000) # Sonraki ürüne geçiş
+TABLE_COUNT = 10
+
+
+def close_table(db_manager, masa_no):
+    """Masanın açık adisyonunu nakit kapatır (yazıcı iş parçacığında)."""
+    masa_info = db_manager.get_masa_info(masa_no)
+    return db_manager.process_full_payment(masa_info['aktif_siparis_id'], "Nakit")
+
+
+def busy_hour(products, order_count, double_press_rate=0.0, seed=11):
+    """Yoğun saat olayları: (ms, 'tap', masa_no, ürün) ve (ms, 'pay', masa_no, None), zaman sırasıyla."""
+    rnd = random.Random(seed)
+    events = []
+    order_gap = HOUR_S * 1000 / order_count
+    for order in range(order_count):
+        t = order * order_gap + rnd.uniform(0, order_gap / 4)
+        masa_no = order % TABLE_COUNT + 1
+        for product in rnd.sample(products, rnd.randint(1, 5)):
+            for _ in range(rnd.choices((1, 2, 3, 4), weights=(45, 30, 15, 10))[0]):
+                events.append((t, 'tap', masa_no, product))
+                if double_press_rate and rnd.random() < double_press_rate:
+                    events.append((t + rnd.uniform(*DOUBLE_PRESS_MS), 'tap', masa_no, product))
+                t += rnd.uniform(*REPEAT_TAP_MS)
+            t += rnd.uniform(*PRODUCT_GAP_MS)
+        events.append((t + rnd.uniform(5000, 20000), 'pay', masa_no, None))
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+def replay(app, db_name, events, window_ms):
+    """Olayları batcher üzerinden uygular. (dokunuş, commit zamanları ms listesi, yazıcı süresi sn, batcher) döndürür."""
+    executor = SlowDiskExecutor(db_name, True)
+    batcher = CartTapBatcher(executor, window_ms=window_ms)
+    commit_times = []
+    window_start = None
+
+    def flush(at_ms):
+        nonlocal window_start
+        if batcher.flush() is not None:
+            commit_times.append(at_ms)
+        window_start = None
+
+    t0 = time.perf_counter()
+    for at_ms, kind, masa_no, product in events:
+        if window_start is not None and at_ms >= window_start + window_ms:
+            flush(window_start + window_ms) # Pencere doldu (QTimer'ın yaptığı)
+        if kind == 'pay':
+            flush(at_ms) # Ödemeden önce bekleyen dokunuşlar yazılır
+            executor.submit_write(close_table, masa_no)
+            commit_times.append(at_ms)
+            continue
+        urun_id, adi, fiyat, kategori_id = product
+        batcher.add(masa_no, urun_id, adi, fiyat, kategori_id)
+        if window_ms <= 0:
+            commit_times.append(at_ms) # add() hemen flush etti
+        elif window_start is None:
+            window_start = at_ms
+    flush(events[-1][0])
+    executor.wait_for_writes()
+    writer_s = time.perf_counter() - t0
+    app.processEvents()
+    executor.shutdown()
+    app.processEvents()
+    assert batcher.stats['failed'] == 0
+    return batcher.stats['taps'], commit_times, writer_s, batcher
+
+
+def peak_per_second(commit_times):
+    counts = {}
+    for at_ms in commit_times:
+        counts[int(at_ms // 1000)] = counts.get(int(at_ms // 1000), 0) + 1
+    return max(counts.values())
+
+
+def sold_quantities(db_manager):
+    return db_manager.conn.execute("""
+        SELECT sd.urun_id, SUM(sd.miktar), SUM(sd.tutar) FROM siparis_detaylari sd
+        JOIN siparis_gecmisi sg ON sd.siparis_id = sg.siparis_id WHERE sg.durum = 'Kapandı'
+        GROUP BY sd.urun_id ORDER BY sd.urun_id""").fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=150)
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    print(f"\nYoğun saat: {args.orders} adisyon, {TABLE_COUNT} masa; aynı ürüne art arda dokunuş {REPEAT_TAP_MS[0]}-{REPEAT_TAP_MS[1]} ms arayla")
+    for workload, double_press_rate in (("normal", 0.0), ("çift basış", DOUBLE_PRESS_RATE)):
+        baseline = None
+        if double_press_rate:
+            print(f"\nİş yükü: {workload} (dokunuşların %{double_press_rate * 100:.0f}'i {DOUBLE_PRESS_MS[0]}-{DOUBLE_PRESS_MS[1]} ms içinde tekrar basılır)")
+        else:
+            print(f"\nİş yükü: {workload}")
+        print(f"{'pencere':>8} {'dokunuş':>8} {'commit':>7} {'commit/sn':>10} {'tepe/sn':>8} {'kazanılan commit/sn':>20} {'yazıcı (sn)':>12}")
+        for window_ms in WINDOWS_MS:
+            db_manager, tmp_dir = create_temp_db("group_commit")
+            try:
+                products = [(p['urun_id'], p['adi'], p['fiyat'], p['kategori_id']) for p in db_manager.get_all_products()[:20]]
+                events = busy_hour(products, args.orders, double_press_rate)
+                taps, commit_times, writer_s, batcher = replay(app, db_manager.db_name, events, window_ms)
+                sold = [tuple(row) for row in sold_quantities(db_manager)]
+                if baseline is None:
+                    baseline = (len(commit_times), sold)
+                assert sold == baseline[1], (workload, window_ms) # Grup commit satılan miktarları değiştirmez
+                saved = (baseline[0] - len(commit_times)) / HOUR_S
+                print(f"{window_ms:>5} ms {taps:>8} {len(commit_times):>7} {len(commit_times) / HOUR_S:>10.3f} "
+                      f"{peak_per_second(commit_times):>8} {saved:>20.3f} {writer_s:>12.2f}")
+            finally:
+                db_manager.close()
+                remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
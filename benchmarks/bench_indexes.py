@@ -0,0 +1,90 @@
+# benchmarks/bench_indexes.py
+
+"""İkincil indeks migration'larının etkisini ölçer.
+
+Aynı sentetik veri üzerinde rapor, sepet ve arşiv sorgularının sorgu planlarını ve sürelerini
+indekssiz (sürüm 0) ve tüm migration'lar uygulandıktan sonraki durum için yazdırır.
+
+Kullanım: python benchmarks/bench_indexes.py [sipariş_sayısı]
+"""
+
+import sys
+from datetime import datetime
+
+from _bench_common import create_temp_db, remove_temp_dir, generate_closed_orders, measure, print_query_plan
+from database import date_range_to_epochs
+
+
+def build_queries(db_manager):
+    """(ad, çağrılacak fonksiyon, plan için SQL, parametreler) listesi döndürür."""
+    month_range = date_range_to_epochs('2020-03-01', '2020-03-31')
+    archive_end = date_range_to_epochs('2020-01-01', '2020-01-31')[1]
+    mid_order_id = db_manager.conn.execute("SELECT siparis_id FROM siparis_gecmisi ORDER BY siparis_id LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM siparis_gecmisi)").fetchone()[0]
+    return [
+        ("get_sales_summary (1 ay)",
+         lambda: db_manager.get_sales_summary('2020-03-01', '2020-03-31'),
+         "SELECT COUNT(siparis_id), SUM(toplam_tutar), SUM(iskonto), SUM(odenen_tutar) FROM siparis_gecmisi WHERE durum = 'Kapandı' AND kapanis_epoch >= ? AND kapanis_epoch < ?",
+         month_range),
+        ("get_product_sales_report (1 ay)",
+         lambda: db_manager.get_product_sales_report('2020-03-01', '2020-03-31'),
+         "SELECT sd.urun_adi, SUM(sd.miktar), SUM(sd.tutar), k.adi FROM siparis_detaylari sd JOIN siparis_gecmisi sg ON sd.siparis_id = sg.siparis_id LEFT JOIN kategoriler k ON sd.kategori_id = k.kategori_id WHERE sg.durum = 'Kapandı' AND sg.kapanis_epoch >= ? AND sg.kapanis_epoch < ? GROUP BY sd.urun_adi, k.adi",
+         month_range),
+        ("get_order_details (tek adisyon)",
+         lambda: db_manager.get_order_details(mid_order_id),
+         "SELECT detay_id, urun_id, urun_adi, miktar, birim_fiyat, tutar, kategori_id, ekleme_zamani FROM siparis_detaylari WHERE siparis_id = ?",
+         (mid_order_id,)),
+        ("sepet toplamı (SUM tutar)",
+         lambda: db_manager.conn.execute("SELECT COALESCE(SUM(tutar), 0.0) FROM siparis_detaylari WHERE siparis_id = ?", (mid_order_id,)).fetchone(),
+         "SELECT COALESCE(SUM(tutar), 0.0) FROM siparis_detaylari WHERE siparis_id = ?",
+         (mid_order_id,)),
+        ("get_late_table_info",
+         db_manager.get_late_table_info,
+         "SELECT m.masa_no, m.durum, sg.son_islem_zamani, m.aktif_siparis_id FROM masalar m JOIN siparis_gecmisi sg ON m.aktif_siparis_id = sg.siparis_id WHERE m.durum IN ('Dolu', 'Geçikmiş') AND sg.son_islem_zamani IS NOT NULL",
+         ()),
+        ("arşivlenecek siparişler (yıl sonu)",
+         lambda: db_manager.conn.execute("SELECT siparis_id FROM siparis_gecmisi WHERE durum = 'Kapandı' AND kapanis_epoch < ?", (archive_end,)).fetchall(),
+         "SELECT siparis_id FROM siparis_gecmisi WHERE durum = 'Kapandı' AND kapanis_epoch < ?",
+         (archive_end,)),
+    ]
+
+
+def run_queries(db_manager, title):
+    print(f"\n=== {title} (şema sürümü {db_manager.get_schema_version()}) ===")
+    results = {}
+    for name, func, plan_sql, params in build_queries(db_manager):
+        median, _ = measure(func)
+        results[name] = median
+        print(f"  {name:<40} {median * 1000:9.2f} ms")
+        print_query_plan(db_manager.conn, plan_sql, params)
+    return results
+
+
+def main():
+    order_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    db_manager, tmp_dir = create_temp_db("indexes")
+    try:
+        # İndeksleri kaldırıp şemayı sürüm 0'a döndür (migration öncesi durum)
+        for (index_name,) in db_manager.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'").fetchall():
+            db_manager.conn.execute(f"DROP INDEX {index_name}")
+        db_manager.conn.execute("DELETE FROM settings WHERE key = 'schema_version'")
+        db_manager.conn.commit()
+
+        line_count = generate_closed_orders(db_manager, order_count, start=datetime(2020, 1, 1), days=365)
+        print(f"{order_count} sipariş / {line_count} detay satırı oluşturuldu.")
+
+        before = run_queries(db_manager, "Migration öncesi")
+        db_manager._apply_migrations()
+        db_manager.conn.execute("ANALYZE")
+        after = run_queries(db_manager, "Migration sonrası")
+
+        print("\n=== Özet ===")
+        for name in before:
+            speedup = before[name] / after[name] if after[name] else float('inf')
+            print(f"  {name:<40} {before[name] * 1000:9.2f} ms -> {after[name] * 1000:9.2f} ms  (x{speedup:.1f})")
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# benchmarks/bench_late_tables.py
+
+"""Geçikmiş masa tespitinin maliyetini ve gecikmesini ölçer (PySide6 gerekir).
+
+Karşılaştırma (TABLE_COUNT dolu masa):
+  - eski yöntem: her LATE_TABLE_CHECK_INTERVAL_MS'de get_late_table_info + satır başına strptime, geçikmiş her masa için
+    ayrı update_masa_status (ayrı commit)
+  - LateTableScheduler: son tarih min-heap'i, timer bir sonraki masanın geçikeceği ana kurulur, zamanı gelen masalar
+    mark_late_tables ile tek UPDATE/tek commit'te işaretlenir
+Son bölümde zamanlayıcı gerçek olay döngüsünde (okuma/yazmalar DatabaseExecutor'da) çalıştırılır ve masanın son tarihinden
+ne kadar sonra işaretlendiği ölçülür.
+Ekran gerekmez, QT_QPA_PLATFORM=offscreen kullanılır.
+
+Kullanım: python benchmarks/bench_late_tables.py
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _bench_common import create_temp_db, remove_temp_dir, measure
+
+from PySide6.QtCore import QCoreApplication, QTimer
+
+import constants
+import refresh_bus
+from db_executor import DatabaseExecutor
+from refresh_bus import RefreshBus
+from late_table_scheduler import LateTableScheduler, _now_epoch
+
+TABLE_COUNT = 120
+SHIFT_HOURS = 4
+THRESHOLD = constants.LATE_TABLE_THRESHOLD_MINUTES
+
+
+def open_tables(db_manager, son_islem_zamanlari):
+    """Her son işlem zamanı için bir dolu masa ve açık adisyon oluşturur. Masa numaralarını döndürür."""
+    cursor = db_manager.conn.cursor()
+    cursor.execute("UPDATE masalar SET aktif_siparis_id = NULL")
+    cursor.execute("DELETE FROM siparis_gecmisi")
+    cursor.execute("DELETE FROM masalar")
+    masa_nos = []
+    for masa_no, son_islem in enumerate(son_islem_zamanlari, start=1):
+        zaman_str = son_islem.strftime("%Y-%m-%d %H:%M:%S")
+        cursor.execute("INSERT INTO masalar (masa_no) VALUES (?)", (masa_no,))
+        cursor.execute("INSERT INTO siparis_gecmisi (masa_no, acilis_zamani, durum, son_islem_zamani) VALUES (?, ?, 'Açık', ?)",
+                       (masa_no, zaman_str, zaman_str))
+        cursor.execute("UPDATE masalar SET durum = 'Dolu', aktif_siparis_id = ? WHERE masa_no = ?", (cursor.lastrowid, masa_no))
+        masa_nos.append(masa_no)
+    db_manager.conn.commit()
+    return masa_nos
+
+
+def reset_to_dolu(db_manager):
+    db_manager.conn.execute("UPDATE masalar SET durum = 'Dolu' WHERE durum = 'Geçikmiş'")
+    db_manager.conn.commit()
+
+
+def legacy_check(db_manager, now):
+    """Değişiklik öncesi MasaTabPyside.check_late_tables (masa başına commit). (işaretlenen, commit) döndürür."""
+    marked = 0
+    for masa_info in db_manager.get_late_table_info():
+        son_islem_zamani = datetime.strptime(masa_info['son_islem_zamani'], "%Y-%m-%d %H:%M:%S")
+        if now - son_islem_zamani > timedelta(minutes=THRESHOLD) and masa_info['durum'] != 'Geçikmiş':
+            db_manager.update_masa_status(masa_info['masa_no'], 'Geçikmiş')
+            marked += 1
+    return marked, marked
+
+
+def bench_burst(db_manager):
+    """Tüm masalar aynı anda geçikmişken tek kontrol turunun maliyeti."""
+    now = datetime.now()
+    open_tables(db_manager, [now - timedelta(minutes=THRESHOLD + 5)] * TABLE_COUNT)
+
+    def legacy():
+        reset_to_dolu(db_manager)
+        return legacy_check(db_manager, now)
+
+    def batched():
+        reset_to_dolu(db_manager)
+        return len(db_manager.mark_late_tables(THRESHOLD, int(_now_epoch()))), 1
+
+    legacy_s, (legacy_marked, legacy_commits) = measure(legacy)
+    batched_s, (batched_marked, batched_commits) = measure(batched)
+    assert legacy_marked == batched_marked == TABLE_COUNT, (legacy_marked, batched_marked)
+
+    print(f"{TABLE_COUNT} masa aynı anda geçikiyor (tek kontrol turu)")
+    print(f"{'yöntem':<34} {'süre (ms)':>10} {'commit':>7}")
+    print(f"{'eski (masa başına update)':<34} {legacy_s * 1000:10.2f} {legacy_commits:7d}")
+    print(f"{'mark_late_tables (tek UPDATE)':<34} {batched_s * 1000:10.2f} {batched_commits:7d}")
+
+
+def bench_shift(db_manager):
+    """SHIFT_HOURS saatlik vardiyada uyanma/sorgu sayısı ve tespit gecikmesi (simülasyon, gerçek saat beklenmez)."""
+    start = datetime(2024, 5, 1, 12, 0, 0)
+    shift_seconds = SHIFT_HOURS * 3600
+    # Masaların son işlem zamanları vardiyaya yayılır (her masa vardiya içinde bir kez geçikir)
+    deadlines = sorted(start + timedelta(seconds=(i * 7919) % shift_seconds, minutes=THRESHOLD)
+                       for i in range(TABLE_COUNT))
+    deadlines = [d for d in deadlines if d <= start + timedelta(seconds=shift_seconds)]
+
+    poll_interval = constants.LATE_TABLE_CHECK_INTERVAL_MS / 1000
+    legacy_polls = int(shift_seconds // poll_interval)
+    legacy_delays = [poll_interval - ((d - start).total_seconds() % poll_interval) for d in deadlines]
+    scheduler_wakeups = len(set(deadlines)) # Aynı saniyeye düşen son tarihler tek uyanmada işlenir
+
+    print(f"\n{SHIFT_HOURS} saatlik vardiya, {len(deadlines)} masa geçikiyor (simülasyon)")
+    print(f"{'yöntem':<34} {'DB sorgu turu':>14} {'ort. tespit gecikmesi (s)':>26}")
+    print(f"{'eski (60 sn yoklama)':<34} {legacy_polls:14d} {sum(legacy_delays) / len(legacy_delays):26.1f}")
+    print(f"{'LateTableScheduler':<34} {scheduler_wakeups:14d} {0.0:26.1f}")
+
+
+def bench_live(db_manager, app):
+    """Zamanlayıcıyı gerçek olay döngüsünde çalıştırır: son tarihleri 1-2 sn sonraya denk gelen masalar."""
+    now = datetime.now()
+    offsets = (1.2, 1.2, 1.7, 2.2)
+    # strptime çözünürlüğü saniye olduğundan son tarih tam saniyeye yuvarlanır
+    open_tables(db_manager, [now + timedelta(seconds=s) - timedelta(minutes=THRESHOLD) for s in offsets])
+
+    bus = RefreshBus()
+    marked_at = {}
+    refreshes = []
+    bus.subscribe(refresh_bus.MASA_CHANGED,
+                  lambda changes: (refreshes.append(changes), marked_at.update(
+                      {masa_no: _now_epoch() for masa_no in changes[refresh_bus.MASA_CHANGED]})))
+
+    executor = DatabaseExecutor(db_manager.db_name)
+    scheduler = LateTableScheduler(executor, bus)
+    expected = {row['masa_no']: row['deadline_epoch'] for row in db_manager.get_late_table_deadlines(THRESHOLD)}
+    scheduler.start()
+    QTimer.singleShot(int((max(offsets) + 1.5) * 1000), app.quit)
+    app.exec()
+    scheduler.stop()
+    executor.shutdown()
+
+    delays = [(marked_at[masa_no] - deadline) * 1000 for masa_no, deadline in expected.items() if masa_no in marked_at]
+    print(f"\nGerçek olay döngüsü: {len(delays)}/{len(expected)} masa işaretlendi, "
+          f"{scheduler.stats['wakeups']} uyanma, {scheduler.stats['batches']} toplu UPDATE, {len(refreshes)} masa yenilemesi")
+    if delays:
+        print(f"son tarihten sonra işaretlenme gecikmesi: en fazla {max(delays):.0f} ms")
+
+
+def main():
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    db_manager, tmp_dir = create_temp_db("late_tables")
+    try:
+        bench_burst(db_manager)
+        bench_shift(db_manager)
+        bench_live(db_manager, app)
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
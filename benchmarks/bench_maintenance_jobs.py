@@ -0,0 +1,186 @@
+# benchmarks/bench_maintenance_jobs.py
+
+"""Arşivleme sırasında kasanın (arayüz iş parçacığı) ne kadar bloke olduğunu ölçer (PySide6 gerekir).
+
+Senaryo: arayüz iş parçacığında her ORDER_INTERVAL_MS'de bir sepete ürün eklenir (apply_order_item, ana bağlantı).
+  - eski yöntem: arşivleme arayüz iş parçacığında senkron çalışır; olay döngüsü arşiv bitene kadar donar
+  - MaintenanceJobRunner: arşivleme arka plan iş parçacığında kendi bağlantısıyla çalışır
+Ölçülen: olay döngüsündeki en uzun duraklama, ürün ekleme gecikmesi (p50/p99/en kötü) ve arşiv boyunca eklenen ürün sayısı.
+Son bölümde iş yarıda iptal edilir ve tekrar kuyruğa eklenerek kaldığı yerden tamamlandığı doğrulanır.
+Ekran gerekmez, QT_QPA_PLATFORM=offscreen kullanılır.
+
+Kullanım: python benchmarks/bench_maintenance_jobs.py [--lines 400000]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _bench_common import create_temp_db, remove_temp_dir, generate_closed_orders
+
+from PySide6.QtCore import QCoreApplication, QTimer, QObject
+
+from database import DatabaseManager
+from maintenance_jobs import MaintenanceJobRunner, archive_job
+
+ARCHIVE_YEAR = 2023
+ORDER_INTERVAL_MS = 20
+
+
+class OrderTaker(QObject):
+    """Arayüz iş parçacığında periyodik olarak sepete ürün ekleyen 'kasa'."""
+
+    def __init__(self, db_manager):
+        super().__init__()
+        self.db_manager = db_manager
+        self.siparis_id = db_manager.create_new_order(1)
+        self.latencies = [] # ms
+        self.gaps = [] # ardışık timer çağrıları arası (ms)
+        self._last = None
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+
+    def tick(self):
+        now = time.perf_counter()
+        if self._last is not None:
+            self.gaps.append((now - self._last) * 1000)
+        self._last = now
+        success, _, _ = self.db_manager.apply_order_item(self.siparis_id, 1, "Espresso", 1.0, 110.0, None)
+        assert success
+        self.latencies.append((time.perf_counter() - now) * 1000)
+
+
+class Collector(QObject):
+    """Sinyal alıcısı (arayüz iş parçacığında yaşar, sinyaller kuyruklanarak gelir)."""
+
+    def __init__(self, app, quit_on_finish=True):
+        super().__init__()
+        self.app = app
+        self.quit_on_finish = quit_on_finish
+        self.progress_events = 0
+        self.finished = []
+
+    def on_progress(self, job_id, done, total, message):
+        self.progress_events += 1
+
+    def on_finished(self, job_id, success, message, result):
+        self.finished.append((success, message))
+        if self.quit_on_finish:
+            self.app.quit()
+
+
+def make_db(order_count, tmp_dir):
+    db_manager, db_tmp = create_temp_db("maintenance_base")
+    generate_closed_orders(db_manager, order_count, 4, start=datetime(ARCHIVE_YEAR, 1, 1), days=365, seed=5)
+    path = db_manager.db_name
+    db_manager.close()
+    base = os.path.join(tmp_dir, "base.db")
+    shutil.move(path, base)
+    remove_temp_dir(db_tmp)
+    return base
+
+
+def fresh_copy(base, tmp_dir, name):
+    path = os.path.join(tmp_dir, f"{name}.db")
+    shutil.copy(base, path)
+    return path
+
+
+def run_sync(app, db_path, archive_path):
+    """Eski yöntem: arşivleme olay döngüsü içinde (arayüz iş parçacığında) çalışır."""
+    db_manager = DatabaseManager(db_path)
+    taker = OrderTaker(db_manager)
+    taker.timer.start(ORDER_INTERVAL_MS)
+    state = {}
+
+    def archive():
+        t0 = time.perf_counter()
+        state['result'] = db_manager.archive_and_delete_old_orders(ARCHIVE_YEAR, archive_path)
+        state['seconds'] = time.perf_counter() - t0
+        QTimer.singleShot(300, app.quit) # Arşivden sonra biraz daha sipariş alınsın
+
+    QTimer.singleShot(200, archive)
+    app.exec()
+    taker.timer.stop()
+    db_manager.close()
+    return taker, state['seconds'], None
+
+
+def run_background(app, db_path, archive_path):
+    db_manager = DatabaseManager(db_path)
+    taker = OrderTaker(db_manager)
+    runner = MaintenanceJobRunner(db_path)
+    collector = Collector(app)
+    runner.job_progress.connect(collector.on_progress)
+    runner.job_finished.connect(collector.on_finished)
+    taker.timer.start(ORDER_INTERVAL_MS)
+    t0 = time.perf_counter()
+    runner.submit("arşivleme", archive_job, ARCHIVE_YEAR, archive_path)
+    app.exec()
+    seconds = time.perf_counter() - t0
+    taker.timer.stop()
+    runner.shutdown()
+    db_manager.close()
+    return taker, seconds, collector
+
+
+def run_cancel_resume(app, db_path, archive_path):
+    """İş ilk ilerleme bildiriminden sonra iptal edilir, sonra tekrar kuyruğa eklenip tamamlanır."""
+    runner = MaintenanceJobRunner(db_path)
+    collector = Collector(app)
+    job_holder = {}
+
+    def on_progress(job_id, done, total, message):
+        collector.on_progress(job_id, done, total, message)
+        if collector.progress_events == 3:
+            job_holder['job'].cancel()
+
+    runner.job_progress.connect(on_progress)
+    runner.job_finished.connect(collector.on_finished)
+    job_holder['job'] = runner.submit("arşivleme", archive_job, ARCHIVE_YEAR, archive_path)
+    app.exec()
+    runner.submit("arşivleme (devam)", archive_job, ARCHIVE_YEAR, archive_path)
+    app.exec()
+    runner.shutdown()
+    return collector.finished
+
+
+def print_row(name, taker, seconds):
+    lat = sorted(taker.latencies)
+    p99 = lat[min(len(lat) - 1, int(len(lat) * 0.99))]
+    print(f"{name:<26} {seconds:8.2f} {max(taker.gaps):14.0f} {statistics.median(lat):9.2f} {p99:9.2f} {lat[-1]:9.1f} {len(lat):8d}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=400_000, help="Arşivlenecek detay satırı sayısı")
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    tmp_dir = tempfile.mkdtemp(prefix="kafe_maintenance_bench_")
+    try:
+        base = make_db(args.lines // 4, tmp_dir)
+        print(f"\n{args.lines} detay satırı arşivleniyor, kasa her {ORDER_INTERVAL_MS} ms'de ürün ekliyor")
+        print(f"{'yöntem':<26} {'arşiv (s)':>8} {'en uzun donma':>14} {'p50 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9} {'ekleme':>8}")
+        taker, seconds, _ = run_sync(app, fresh_copy(base, tmp_dir, "sync"), os.path.join(tmp_dir, "sync_archive.db"))
+        print_row("eski (arayüz iş parçacığı)", taker, seconds)
+        taker, seconds, collector = run_background(app, fresh_copy(base, tmp_dir, "bg"), os.path.join(tmp_dir, "bg_archive.db"))
+        print_row("MaintenanceJobRunner", taker, seconds)
+        print(f"arka plan: {collector.progress_events} ilerleme bildirimi, sonuç: {collector.finished[-1][1]}")
+
+        finished = run_cancel_resume(app, fresh_copy(base, tmp_dir, "cancel"), os.path.join(tmp_dir, "cancel_archive.db"))
+        print(f"\niptal: {finished[0][1]}")
+        print(f"devam: {finished[1][1]}")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/bench_masa_grid.py
+
+"""Masa ızgarası yenileme maliyetini masa sayısına göre ölçer (PySide6 gerekir).
+
+Karşılaştırma: eski yöntem (tüm butonları deleteLater ile silip yeniden oluşturma) ile
+MasaTabPyside.load_masa_buttons'ın fark tabanlı güncellemesi (değişiklik yok / tek masa değişti).
+Ekran gerekmez, QT_QPA_PLATFORM=offscreen kullanılır.
+
+Kullanım: python benchmarks/bench_masa_grid.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _bench_common import create_temp_db, remove_temp_dir
+
+from PySide6.QtWidgets import QApplication, QPushButton, QSizePolicy
+from PySide6.QtCore import QCoreApplication, QEvent
+
+from masa_tab_pyside import MasaTabPyside
+
+TABLE_COUNTS = [10, 30, 60, 120]
+REPEAT = 20
+
+
+class _BenchApp:
+    """MasaTabPyside'ın ihtiyaç duyduğu ana uygulama alanlarının minimum karşılığı."""
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.aktif_masa = None
+        self.aktif_siparis_id = None
+
+
+def reload_masa_buttons(tab):
+    """MasaTabPyside.load_masa_buttons'ın senkron karşılığı (okuma kuyruk yerine doğrudan bu bağlantıyla yapılır)."""
+    return tab.update_masa_buttons(tab.main_app.db_manager.get_all_masalar())
+
+
+def legacy_rebuild(tab):
+    """Değişiklik öncesi load_masa_buttons: tüm butonları silip yeniden oluşturur."""
+    for i in reversed(range(tab.masa_grid_layout.count())):
+        widget = tab.masa_grid_layout.itemAt(i).widget()
+        tab.masa_grid_layout.removeWidget(widget)
+        widget.deleteLater()
+    tab.masa_buttons = {}
+    tab._masa_state = {}
+    row, col = 0, 0
+    for masa in tab.main_app.db_manager.get_all_masalar():
+        btn = QPushButton(tab._masa_button_text(masa))
+        btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        btn.setMinimumSize(100, 80)
+        btn.setObjectName(tab._masa_object_name(masa['durum']))
+        btn.clicked.connect(lambda checked, mn=masa['masa_no']: tab._on_masa_button_clicked(mn))
+        tab.masa_grid_layout.addWidget(btn, row, col)
+        tab.masa_buttons[masa['masa_no']] = btn
+        col += 1
+        if col >= 5:
+            col, row = 0, row + 1
+
+
+def timed(app, func):
+    """func + bekleyen olaylar (deleteLater, yeniden çizim) için geçen süre (ms, ortalama)."""
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        app.processEvents()
+    return (time.perf_counter() - t0) / REPEAT * 1000
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{'Masa':>5} {'tam yeniden oluşturma':>22} {'fark: değişiklik yok':>22} {'fark: 1 masa':>14}")
+
+    for table_count in TABLE_COUNTS:
+        db_manager, tmp_dir = create_temp_db("masa_grid")
+        try:
+            while len(db_manager.get_all_masalar()) < table_count:
+                db_manager.add_masa()
+            siparis_id = db_manager.create_new_order(1)
+
+            tab = MasaTabPyside(_BenchApp(db_manager))
+            tab.resize(1200, 800)
+            tab.show()
+
+            legacy_ms = timed(app, lambda: legacy_rebuild(tab))
+            reload_masa_buttons(tab) # Fark tabanlı önbelleği doldur
+            unchanged_ms = timed(app, lambda: reload_masa_buttons(tab))
+
+            counter = [0]
+            def change_one_table():
+                counter[0] += 1
+                db_manager.apply_order_item(siparis_id, 1, 'Espresso', counter[0], 110.0, None)
+                reload_masa_buttons(tab)
+            changed_ms = timed(app, change_one_table)
+
+            print(f"{table_count:>5} {legacy_ms:19.2f} ms {unchanged_ms:19.2f} ms {changed_ms:11.2f} ms")
+            tab.close()
+            tab.deleteLater()
+        finally:
+            db_manager.close()
+            remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# benchmarks/bench_money.py
+
+"""Tamsayı kuruş tutarların (Money) rapor toplama ve sepet hesaplama süresine etkisini ve kuruş kaymasını ölçer.
+
+Senaryo 1 (rapor): ORDERS kapanmış sipariş; aynı satırların REAL (TL) kopyası şema sürümü 5 öncesi tabloların yerine geçer
+  - eski: SUM(REAL) ve Python'da round(x, 2)
+  - yeni: SUM(INTEGER) kuruş, gösterimde Money
+  Ürün raporu (GROUP BY urun_adi) ve satış özeti (SUM) ayrı ölçülür; iki yöntemin sonuçları kuruşu kuruşuna karşılaştırılır.
+Senaryo 2 (sepet): TAPS kez satır ekleme/miktar değiştirme/silme ile brüt toplamın farkla güncellenmesi
+  - eski: float, her adımda round(toplam + yeni - eski, 2)
+  - yeni: Money toplama/çıkarma (yuvarlama yok)
+Senaryo 3 (kuruş kayması): rastgele adisyonlar birkaç parçalı ödemeyle tam kapatılır; eski process_full_payment'ın
+float 'kalan_tutar > 0' kontrolünün kaç adisyonda yanlış sonuç verdiği (kalan kuruş artığı) sayılır.
+
+Kullanım: python benchmarks/bench_money.py [--orders 200000]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+
+from _bench_common import create_temp_db, remove_temp_dir, generate_closed_orders, measure
+
+from money import Money, ZERO
+
+TAPS = 200_000
+PAYMENT_ORDERS = 20_000
+PRICES = (12.5, 19.99, 33.33, 45.1, 7.7, 110.0, 0.1, 66.67)
+
+LEGACY_TABLES = """
+    CREATE TABLE sg_tl AS SELECT siparis_id, durum, kapanis_epoch, toplam_tutar / 100.0 AS toplam_tutar,
+                                 iskonto / 100.0 AS iskonto, odenen_tutar / 100.0 AS odenen_tutar FROM siparis_gecmisi;
+    CREATE TABLE sd_tl AS SELECT siparis_id, urun_adi, miktar, tutar / 100.0 AS tutar FROM siparis_detaylari;
+    CREATE INDEX idx_sd_tl ON sd_tl (siparis_id, urun_adi, miktar, tutar);
+"""
+
+SUMMARY_SQL = """SELECT COUNT(*), SUM(toplam_tutar), SUM(iskonto), SUM(odenen_tutar) FROM {orders} WHERE durum = 'Kapandı'"""
+PRODUCT_SQL = """SELECT sd.urun_adi, SUM(sd.miktar), SUM(sd.tutar) AS toplam FROM {details} sd
+                 JOIN {orders} sg ON sd.siparis_id = sg.siparis_id WHERE sg.durum = 'Kapandı'
+                 GROUP BY sd.urun_adi ORDER BY toplam DESC"""
+
+
+def legacy_report(conn):
+    summary = conn.execute(SUMMARY_SQL.format(orders="sg_tl")).fetchone()
+    products = conn.execute(PRODUCT_SQL.format(orders="sg_tl", details="sd_tl")).fetchall()
+    return ((summary[0],) + tuple(round(value, 2) for value in summary[1:]),
+            [(adi, miktar, round(tutar, 2)) for adi, miktar, tutar in products])
+
+
+def kurus_report(conn):
+    summary = conn.execute(SUMMARY_SQL.format(orders="siparis_gecmisi")).fetchone()
+    products = conn.execute(PRODUCT_SQL.format(orders="siparis_gecmisi", details="siparis_detaylari")).fetchall()
+    return ((summary[0],) + tuple(Money.of(value) for value in summary[1:]),
+            [(adi, miktar, Money.of(tutar)) for adi, miktar, tutar in products])
+
+
+def cart_steps(seed=5):
+    """(işlem, birim fiyat TL, miktar) adımları; sepette en fazla 30 satır."""
+    rnd = random.Random(seed)
+    steps = []
+    for _ in range(TAPS):
+        steps.append((rnd.choice(("ekle", "miktar", "sil")), rnd.choice(PRICES), rnd.choice((1, 2, 3, 0.5))))
+    return steps
+
+
+def run_float_cart(steps):
+    lines, total = [], 0.0
+    for action, fiyat, miktar in steps:
+        if action == "ekle" or not lines:
+            tutar = miktar * fiyat
+            lines.append([fiyat, tutar])
+            total = round(total + tutar, 2)
+        elif action == "miktar":
+            line = lines[len(lines) // 2]
+            new_tutar = miktar * line[0]
+            total = round(total + new_tutar - line[1], 2)
+            line[1] = new_tutar
+        else:
+            total = round(total - lines.pop()[1], 2)
+        if len(lines) > 30:
+            total = round(total - lines.pop(0)[1], 2)
+    return total, lines
+
+
+def run_money_cart(steps):
+    lines, total = [], ZERO
+    for action, fiyat, miktar in steps:
+        if action == "ekle" or not lines:
+            birim_fiyat = Money.from_tl(fiyat)
+            tutar = birim_fiyat * miktar
+            lines.append([birim_fiyat, tutar])
+            total += tutar
+        elif action == "miktar":
+            line = lines[len(lines) // 2]
+            new_tutar = line[0] * miktar
+            total += new_tutar - line[1]
+            line[1] = new_tutar
+        else:
+            total -= lines.pop()[1]
+        if len(lines) > 30:
+            total -= lines.pop(0)[1]
+    return total, lines
+
+
+def split(amount, parts):
+    share = Money(amount.kurus // parts)
+    return [share] * (parts - 1) + [amount - share * (parts - 1)]
+
+
+def payment_drift(seed=9):
+    """Parçalı ödemelerle tam kapatılan adisyonlarda eski float kontrolünün yanlış 'kalan' bulduğu adisyon sayısı."""
+    rnd = random.Random(seed)
+    float_wrong = money_wrong = 0
+    for _ in range(PAYMENT_ORDERS):
+        prices = [(rnd.choice(PRICES), rnd.choice((1, 2, 0.5))) for _ in range(rnd.randint(1, 8))]
+        iskonto_tl = rnd.choice((0.0, 0.0, 1.5, 3.33))
+
+        # Eski: float satır tutarları ve toplamlar (satır başına round yoktu, toplam ROUND(..., 2) ile yazılıyordu)
+        brut = round(sum(miktar * fiyat for fiyat, miktar in prices), 2)
+        net = brut - iskonto_tl
+        # Yeni: Money
+        money_net = sum(Money.from_tl(fiyat) * miktar for fiyat, miktar in prices) - Money.from_tl(iskonto_tl)
+
+        # Müşteriler ekranda görünen net tutarı eşit parçalarla öder (son parça kuruş artığını alır)
+        parts = rnd.randint(2, 4)
+        odenen = 0.0
+        for payment in split(Money.from_tl(net), parts):
+            odenen += payment.to_float() # record_partial_payment: odenen_tutar + ? (REAL)
+        if net - odenen != 0:
+            float_wrong += 1
+        if money_net - sum(split(money_net, parts)) != ZERO:
+            money_wrong += 1
+    return float_wrong, money_wrong
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=200_000)
+    args = parser.parse_args()
+
+    db_manager, tmp_dir = create_temp_db("money")
+    try:
+        generate_closed_orders(db_manager, args.orders, start=datetime(2024, 1, 1), days=365)
+        db_manager.conn.executescript(LEGACY_TABLES)
+        conn = db_manager.conn
+
+        legacy_s, legacy_result = measure(lambda: legacy_report(conn))
+        kurus_s, kurus_result = measure(lambda: kurus_report(conn))
+        legacy_summary, legacy_products = legacy_result
+        summary, products = kurus_result
+        assert legacy_summary == (summary[0],) + tuple(value.to_float() for value in summary[1:]), (legacy_summary, summary)
+        mismatched = sum(1 for old, new in zip(legacy_products, products) if old[2] != new[2].to_float())
+        assert not mismatched and len(legacy_products) == len(products)
+
+        print(f"\nRapor toplama: {args.orders} sipariş, {args.orders * 4} detay satırı, {len(products)} ürün")
+        print(f"  eski (REAL SUM + round): {legacy_s * 1000:8.1f} ms")
+        print(f"  yeni (INTEGER SUM, Money): {kurus_s * 1000:6.1f} ms  ({legacy_s / kurus_s:.2f}x)")
+        print(f"  net satış: {summary[3]}  (REAL toplamın ham değeri: "
+              f"{conn.execute('SELECT SUM(odenen_tutar) FROM sg_tl').fetchone()[0]!r})")
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+    steps = cart_steps()
+    t0 = time.perf_counter()
+    float_total, float_lines = run_float_cart(steps)
+    float_us = (time.perf_counter() - t0) * 1e6 / TAPS
+    t0 = time.perf_counter()
+    money_total, money_lines = run_money_cart(steps)
+    money_us = (time.perf_counter() - t0) * 1e6 / TAPS
+    assert money_total == sum(line[1] for line in money_lines)
+    line_sum = sum(line[1] for line in float_lines)
+    print(f"\nSepet hesaplama: {TAPS} adım (ekle/miktar/sil)")
+    print(f"  eski (float + round): {float_us:.2f} µs/adım, toplam {float_total!r}, satırların toplamı {line_sum!r}")
+    print(f"  yeni (Money):         {money_us:.2f} µs/adım, toplam {money_total} (satırların toplamına eşit)")
+
+    float_wrong, money_wrong = payment_drift()
+    print(f"\nKuruş kayması: {PAYMENT_ORDERS} adisyon parçalı ödemelerle tam kapatıldı")
+    print(f"  eski float 'kalan_tutar' sıfır değil: {float_wrong} adisyon ({float_wrong * 100 / PAYMENT_ORDERS:.1f}%)")
+    print(f"  Money 'kalan_tutar' sıfır değil:      {money_wrong} adisyon")
+    assert money_wrong == 0
+
+
+if __name__ == "__main__":
+    main()
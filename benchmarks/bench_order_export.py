@@ -0,0 +1,98 @@
+# benchmarks/bench_order_export.py
+
+"""Sipariş geçmişi dışa aktarmanın (order_export.py) fetchall ile toplu okumaya göre belleğini ve süresini ölçer.
+
+Senaryo: YEARS yılı boyunca ORDERS_PER_YEAR kapanmış sipariş (sipariş başına 4 satır), son yıl hariç hepsi arşivde.
+  - eski yöntem: siparis_gecmisi ve siparis_detaylari fetchall ile belleğe alınır, siparişler gruplanıp JSON Lines yazılır
+    (sadece ana DB; arşivler için aynı işlem her dosyada tekrarlanır)
+  - export_orders: fetchmany parçaları okundukça yazılır (arşivler dahil)
+Bellek: tracemalloc ile en yüksek Python bellek kullanımı (süre ayrı, tracemalloc kapalıyken ölçülür).
+Artımlı: ilk 'son dışa aktarmadan bu yana' çalıştırmasından sonra NEW_ORDERS sipariş eklenir; ikinci çalıştırma sadece onları yazar.
+
+Kullanım: python benchmarks/bench_order_export.py [--orders-per-year 100000]
+"""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime
+
+from _bench_common import create_temp_db, remove_temp_dir, generate_closed_orders
+
+import order_export
+
+YEARS = (2023, 2024)
+NEW_ORDERS = 1000
+
+
+def naive_export(db_manager, path):
+    """Eski yöntem: tüm siparişler ve detaylar fetchall ile okunur, sözlükte gruplanır, sonra yazılır."""
+    orders = db_manager.cursor.execute("SELECT * FROM siparis_gecmisi WHERE durum = 'Kapandı' ORDER BY siparis_id").fetchall()
+    details = db_manager.cursor.execute("SELECT * FROM siparis_detaylari ORDER BY siparis_id, detay_id").fetchall()
+    lines_by_order = {}
+    for row in details:
+        lines_by_order.setdefault(row['siparis_id'], []).append(dict(row))
+    with open(path, "w", encoding="utf-8") as f:
+        for row in orders:
+            order = dict(row)
+            order['satirlar'] = lines_by_order.get(row['siparis_id'], [])
+            f.write(json.dumps(order, ensure_ascii=False) + "\n")
+    return len(orders)
+
+
+def traced(func):
+    """Dönüş: (sonuç, süre sn, en yüksek bellek MB); bellek ve süre ayrı çalıştırmalarda ölçülür."""
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    tracemalloc.stop()
+    t0 = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - t0, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders-per-year", type=int, default=100_000)
+    args = parser.parse_args()
+
+    db_manager, tmp_dir = create_temp_db("order_export")
+    try:
+        for seed, year in enumerate(YEARS):
+            generate_closed_orders(db_manager, args.orders_per_year, start=datetime(year, 1, 1), days=365, seed=seed)
+        success, message = db_manager.archive_and_delete_old_orders(YEARS[0]) # Arşiv dosyası ana DB ile aynı dizinde
+        assert success, message
+        path = os.path.join(tmp_dir, "siparisler.jsonl")
+        total_orders = args.orders_per_year * len(YEARS)
+        print(f"\n{len(YEARS)} yıl x {args.orders_per_year} sipariş (x4 satır), {YEARS[0]} arşivde")
+        print(f"{'yöntem':<36} {'sipariş':>9} {'süre (sn)':>10} {'bellek (MB)':>12}")
+
+        count, seconds, peak = traced(lambda: naive_export(db_manager, path))
+        print(f"{'fetchall (sadece ana DB)':<36} {count:9d} {seconds:10.2f} {peak:12.1f}")
+
+        for export_format in order_export.EXPORT_FORMATS:
+            out = os.path.join(tmp_dir, f"siparisler.{export_format}")
+            outcome, seconds, peak = traced(lambda: order_export.export_orders(db_manager, out, include_archives=True))
+            assert outcome[0] and outcome[2]['orders'] == total_orders, outcome[1]
+            print(f"{f'export_orders {export_format} (arşiv dahil)':<36} {outcome[2]['orders']:9d} {seconds:10.2f} {peak:12.1f}")
+
+        # Artımlı dışa aktarma
+        out = os.path.join(tmp_dir, "artimli.jsonl")
+        first = order_export.export_orders(db_manager, out, since_last_export=True, include_archives=True)
+        generate_closed_orders(db_manager, NEW_ORDERS, start=datetime(YEARS[-1] + 1, 1, 1), days=1, seed=99)
+        t0 = time.perf_counter()
+        second = order_export.export_orders(db_manager, out, since_last_export=True, include_archives=True)
+        seconds = time.perf_counter() - t0
+        assert first[2]['orders'] == total_orders and second[2]['orders'] == NEW_ORDERS, (first[1], second[1])
+        with open(out, encoding="utf-8") as f:
+            assert sum(1 for _ in f) == NEW_ORDERS
+        print(f"{'artımlı (son dışa aktarmadan bu yana)':<36} {second[2]['orders']:9d} {seconds:10.2f}")
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
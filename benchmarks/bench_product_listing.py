@@ -0,0 +1,109 @@
+# benchmarks/bench_product_listing.py
+
+"""Ürün yönetimi listesinin (UrunTabPyside.load_data) yükleme süresini ve sorgu sayısını ölçer (PySide6 gerekir).
+
+Karşılaştırma:
+  - eski yöntem: ürün listesi sorgusu + her satır için ayrı kategori sorgusu (N+1), tablo satır satır ve
+    her setItem'da yeniden çizim/sinyal açıkken doldurulur
+  - yeni load_data: kategori adları tek JOIN sorgusuyla katalog önbelleğinden gelir, tablo tek geçişte doldurulur
+Sorgu sayısı sqlite3 set_trace_callback ile sayılır. Ekran gerekmez, QT_QPA_PLATFORM=offscreen kullanılır.
+
+Kullanım: python benchmarks/bench_product_listing.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _bench_common import create_temp_db, remove_temp_dir
+
+from PySide6.QtWidgets import QApplication, QTableWidgetItem
+
+from urun_tab_pyside import UrunTabPyside
+from bench_catalogue_cache import add_products, legacy_get_all_products
+
+PRODUCT_COUNT = 5000
+
+
+class _BenchApp:
+    """UrunTabPyside'ın ihtiyaç duyduğu ana uygulama alanlarının minimum karşılığı."""
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+
+def legacy_load_data(tab):
+    """Değişiklik öncesi load_data: satır başına kategori sorgusu ve satır satır doldurma."""
+    db_manager = tab.db_manager
+    tab.table_products.setRowCount(0)
+    products = legacy_get_all_products(db_manager, include_inactive=True)
+    tab.table_products.setRowCount(len(products))
+    for row_index, product in enumerate(products):
+        category_name = "Belirtilmemiş"
+        if product['kategori_id'] is not None:
+            category = db_manager.conn.execute("SELECT kategori_id, adi FROM kategoriler WHERE kategori_id = ?",
+                                               (product['kategori_id'],)).fetchone()
+            if category:
+                category_name = category['adi']
+        tab.table_products.setItem(row_index, 0, QTableWidgetItem(str(product['urun_id'])))
+        tab.table_products.setItem(row_index, 1, QTableWidgetItem(product['adi']))
+        tab.table_products.setItem(row_index, 2, QTableWidgetItem(f"{product['fiyat']:.2f}"))
+        tab.table_products.setItem(row_index, 3, QTableWidgetItem(str(product['kategori_id'])))
+        tab.table_products.setItem(row_index, 4, QTableWidgetItem(str(product['aktif_durumu'])))
+        tab.table_products.setItem(row_index, 5, QTableWidgetItem(category_name))
+
+
+def timed_load(app, db_manager, load):
+    """load() süresini (ms) ve çalışan SQL sorgu sayısını döndürür."""
+    queries = [0]
+    def count_query(statement):
+        if statement.lstrip().upper().startswith("SELECT"):
+            queries[0] += 1
+    db_manager.conn.set_trace_callback(count_query)
+    t0 = time.perf_counter()
+    load()
+    app.processEvents()
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    db_manager.conn.set_trace_callback(None)
+    return elapsed_ms, queries[0]
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    db_manager, tmp_dir = create_temp_db("product_listing")
+    try:
+        add_products(db_manager, PRODUCT_COUNT)
+
+        def new_tab():
+            # Her ölçüm boş bir tabloyla başlar (eski tabloyu temizleme maliyeti ölçüme karışmasın)
+            tab = UrunTabPyside(_BenchApp(db_manager))
+            tab.resize(1200, 800)
+            tab.show()
+            app.processEvents()
+            return tab
+
+        print(f"{PRODUCT_COUNT} ürün")
+        print(f"{'yöntem':<34} {'süre (ms)':>10} {'sorgu':>7}")
+        tab = new_tab()
+        legacy_ms, legacy_queries = timed_load(app, db_manager, lambda: legacy_load_data(tab))
+        print(f"{'eski (N+1, satır satır)':<34} {legacy_ms:10.1f} {legacy_queries:>7}")
+        tab.close()
+
+        tab = new_tab()
+        db_manager.catalogue.invalidate()
+        cold_ms, cold_queries = timed_load(app, db_manager, tab.load_data)
+        print(f"{'load_data (katalog yüklenerek)':<34} {cold_ms:10.1f} {cold_queries:>7}")
+        tab.close()
+
+        tab = new_tab()
+        warm_ms, warm_queries = timed_load(app, db_manager, tab.load_data)
+        print(f"{'load_data (katalog önbellekte)':<34} {warm_ms:10.1f} {warm_queries:>7}")
+        tab.close()
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/bench_product_search.py
+
+"""Ürün aramasının (hızlı satış ızgarası / Ürünler tablosu filtresi) tuş başına gecikmesini ölçer.
+
+Senaryo: PRODUCTS ürün (Türkçe harfli ve aksanlı adlar), son 60 güne ORDERS kapanmış sipariş (popülerlik için).
+  - eski yöntem: her tuşta aktif ürünlerde `arama in adi.lower()` taraması
+  - ProductSearchIndex: katalog sürümü başına bir kez hesaplanan anahtarlar ve n-gram listeleri
+Her arama adımı (kullanıcının harf harf yazması) için ortalama süre verilir; indeksin oluşturma süresi ayrıca yazılır.
+
+Kullanım: python benchmarks/bench_product_search.py [--products 10000]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from _bench_common import create_temp_db, remove_temp_dir, generate_closed_orders
+
+from product_search import ProductSearchIndex
+
+WORDS = ["Çay", "Türk Kahvesi", "Latte", "İce Tea", "Işıklı Limonata", "Sütlaç", "Crème Brûlée", "Gözleme",
+         "Şalgam", "Ayran", "Çikolatalı Pasta", "Ihlamur", "Köfte", "Menemen", "Tost", "Soğuk Çay", "Böreği", "Açma"]
+SIZES = ["Küçük", "Orta", "Büyük", "Duble", "XL"]
+TYPING = ["ç", "ça", "çay", "çay ", "çay b", "çay bü", "çay büy", "ice", "ice t", "creme", "ışık", "latte 4", "zzz"]
+REPEAT = 50
+ORDERS = 20000
+
+
+def add_products(db_manager, count, seed=7):
+    rnd = random.Random(seed)
+    kategori_ids = [c['kategori_id'] for c in db_manager.get_all_categories()]
+    rows = [(f"{rnd.choice(WORDS)} {rnd.choice(SIZES)} {i}", rnd.randint(2000, 40000), rnd.choice(kategori_ids),
+             1 if rnd.random() < 0.9 else 0, rnd.randint(0, 50))
+            for i in range(count)]
+    db_manager.conn.executemany(
+        "INSERT INTO urunler (adi, fiyat, kategori_id, aktif_durumu, hizli_satis_sirasi) VALUES (?, ?, ?, ?, ?)", rows)
+    db_manager.conn.commit()
+    db_manager.catalogue.invalidate()
+
+
+def legacy_search(catalogue, text):
+    """Değişiklik öncesi filter_hizli_satis_buttons filtresi."""
+    search_term = text.strip().lower()
+    return [urun['urun_id'] for urun in catalogue.get_products() if search_term in urun['adi'].lower()]
+
+
+def mean_ms(func, text):
+    t0 = time.perf_counter()
+    for _ in range(REPEAT):
+        result = func(text)
+    return (time.perf_counter() - t0) * 1000 / REPEAT, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=10_000)
+    args = parser.parse_args()
+
+    db_manager, tmp_dir = create_temp_db("product_search")
+    try:
+        add_products(db_manager, args.products)
+        start = datetime.now() - timedelta(days=60)
+        generate_closed_orders(db_manager, ORDERS, start=start, days=59)
+        db_manager.catalogue.invalidate()
+
+        t0 = time.perf_counter()
+        catalogue = db_manager.get_catalogue()
+        load_ms = (time.perf_counter() - t0) * 1000
+        t0 = time.perf_counter()
+        index = ProductSearchIndex(catalogue.products, catalogue.popularity)
+        build_ms = (time.perf_counter() - t0) * 1000
+        print(f"\n{len(catalogue.products)} ürün, {len(catalogue.popularity)} üründe satış kaydı")
+        print(f"katalog yükleme (popülerlik dahil): {load_ms:.1f} ms, indeks oluşturma (sürüm başına bir kez): {build_ms:.1f} ms")
+
+        print(f"\n{'arama':<10} {'eski (ms)':>10} {'indeks (ms)':>12} {'hız':>7} {'eski sonuç':>11} {'yeni sonuç':>11}")
+        for text in TYPING:
+            legacy_ms, legacy_ids = mean_ms(lambda t: legacy_search(catalogue, t), text)
+            index_ms, records = mean_ms(index.search, text)
+            print(f"{text!r:<10} {legacy_ms:10.3f} {index_ms:12.3f} {legacy_ms / index_ms:6.0f}x {len(legacy_ids):11d} {len(records):11d}")
+            # Eski aramanın bulduğu her ürün bulunur; fazlası Türkçe harf/aksan farkıyla eşleşenlerdir
+            assert set(legacy_ids) <= {p.urun_id for p in records}, text
+
+        # Türkçe harf ve aksan duyarsızlığı, popülerlik sırası
+        assert not legacy_search(catalogue, "ice tea") and index.search("ice tea")
+        assert index.search("CREME BRULEE") and index.search("isikli")
+        ranked = [catalogue.popularity.get(p.adi, 0) for p in index.search("çay")]
+        assert ranked == sorted(ranked, reverse=True)
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# benchmarks/bench_product_table.py
+
+"""Ürün tablosunun bellek kullanımını ve filtre gecikmesini katalog büyüklüğüne göre ölçer (PySide6 gerekir).
+
+Karşılaştırma:
+  - eski yöntem: QTableWidget, ürün başına 6 QTableWidgetItem, filtre her satırda setRowHidden
+  - UrunTabPyside: ProductTableModel + ProductFilterProxyModel (QTableView)
+Bellek, tablo doldurulmadan önceki ve sonraki süreç RSS farkıdır (Linux /proc/self/statm).
+Filtre gecikmesi arama kutusuna yazılan birkaç harf ve bir kategori seçimi için medyandır.
+Ekran gerekmez, QT_QPA_PLATFORM=offscreen kullanılır.
+
+Kullanım: python benchmarks/bench_product_table.py
+"""
+
+import gc
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _bench_common import create_temp_db, remove_temp_dir
+
+from PySide6.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+
+from urun_tab_pyside import UrunTabPyside
+from bench_catalogue_cache import add_products
+
+PRODUCT_COUNTS = [1000, 10000, 30000]
+SEARCH_STEPS = ["b", "be", "ben", "bench ürün 1", "bench ürün 12", ""]
+
+
+class _BenchApp:
+    """UrunTabPyside'ın ihtiyaç duyduğu ana uygulama alanlarının minimum karşılığı."""
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def legacy_fill(table, products):
+    """Değişiklik öncesi tablo: ürün başına 6 QTableWidgetItem."""
+    table.setRowCount(len(products))
+    for row_index, product in enumerate(products):
+        table.setItem(row_index, 0, QTableWidgetItem(str(product['urun_id'])))
+        table.setItem(row_index, 1, QTableWidgetItem(product['adi']))
+        table.setItem(row_index, 2, QTableWidgetItem(f"{product['fiyat']:.2f}"))
+        table.setItem(row_index, 3, QTableWidgetItem(str(product['kategori_id'])))
+        table.setItem(row_index, 4, QTableWidgetItem(str(product['aktif_durumu'])))
+        table.setItem(row_index, 5, QTableWidgetItem(product['kategori_adi'] or "Belirtilmemiş"))
+
+
+def legacy_filter(table, search_term, selected_category_id):
+    """Değişiklik öncesi filter_products: her satırda öğeleri okuyup setRowHidden."""
+    for row in range(table.rowCount()):
+        name_match = search_term in table.item(row, 1).text().lower()
+        category_text = table.item(row, 3).text()
+        category_id = int(category_text) if category_text not in ("", "None") else None
+        category_match = selected_category_id is None or selected_category_id == category_id
+        table.setRowHidden(row, not (name_match and category_match))
+
+
+def filter_latency_ms(app, apply_filter, kategori_id):
+    timings = []
+    for search_term in SEARCH_STEPS:
+        for category_id in (None, kategori_id):
+            t0 = time.perf_counter()
+            apply_filter(search_term, category_id)
+            app.processEvents()
+            timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{'Ürün':>6} {'eski bellek':>12} {'model bellek':>13} {'eski filtre':>12} {'model filtre':>13}")
+    for product_count in PRODUCT_COUNTS:
+        db_manager, tmp_dir = create_temp_db("product_table")
+        try:
+            kategori_id = add_products(db_manager, product_count)[0]
+            products = db_manager.get_all_products(include_inactive=True)
+
+            gc.collect()
+            before = rss_mb()
+            table = QTableWidget()
+            table.setColumnCount(6)
+            table.resize(1200, 800)
+            table.show()
+            legacy_fill(table, products)
+            app.processEvents()
+            legacy_mb = rss_mb() - before
+            legacy_filter_ms = filter_latency_ms(app, lambda term, cid: legacy_filter(table, term, cid), kategori_id)
+            table.close()
+            table.deleteLater()
+            app.processEvents()
+
+            gc.collect()
+            before = rss_mb()
+            tab = UrunTabPyside(_BenchApp(db_manager))
+            tab.resize(1200, 800)
+            tab.show()
+            tab.load_data()
+            app.processEvents()
+            model_mb = rss_mb() - before
+            model_filter_ms = filter_latency_ms(app, tab.product_proxy.set_filter, kategori_id)
+            tab.close()
+
+            print(f"{product_count:>6} {legacy_mb:9.1f} MB {model_mb:10.1f} MB {legacy_filter_ms:9.2f} ms {model_filter_ms:10.2f} ms")
+        finally:
+            db_manager.close()
+            remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
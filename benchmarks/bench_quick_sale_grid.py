@@ -0,0 +1,131 @@
+# benchmarks/bench_quick_sale_grid.py
+
+"""Hızlı satış ızgarasında tuş vuruşundan çizime kadar geçen süreyi ölçer (PySide6 gerekir).
+
+Karşılaştırma (300 aktif ürün):
+  - eski yöntem: her filtrede tüm butonlar deleteLater ile silinir, yeniden oluşturulur ve her birine ayrı setStyleSheet
+  - AdisyonTabPyside.filter_hizli_satis_buttons: katalog sürümü başına bir kez oluşturulan buton havuzu, filtre
+    sadece gösterir/gizler; kategori rengi sekme stil sayfasındaki kategoriRenk özellik seçicisinden gelir
+Her adım: arama kutusuna bir harf yazılır (textChanged), bekleyen olaylar işlenir ve ızgara grab() ile çizdirilir.
+Ekran gerekmez, QT_QPA_PLATFORM=offscreen kullanılır.
+
+Kullanım: python benchmarks/bench_quick_sale_grid.py
+"""
+
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _bench_common import create_temp_db, remove_temp_dir
+
+from PySide6.QtWidgets import QApplication, QPushButton, QSizePolicy
+from PySide6.QtCore import QCoreApplication, QEvent
+
+import constants
+from adisyon_tab_pyside import AdisyonTabPyside
+from bench_catalogue_cache import add_products
+
+PRODUCT_COUNT = 300
+TYPED_TEXT = "bench ürün 01"
+ROUNDS = 5
+
+
+class _BenchApp:
+    """AdisyonTabPyside'ın ihtiyaç duyduğu ana uygulama alanlarının minimum karşılığı."""
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.aktif_masa = None
+        self.aktif_siparis_id = None
+
+
+def legacy_filter(tab):
+    """Değişiklik öncesi filter_hizli_satis_buttons: tüm butonları silip stil sayfasıyla yeniden oluşturur."""
+    search_term = tab.entry_search.text().strip().lower()
+    selected_category_id = tab.cmb_kategori_filter.currentData()
+    while tab.hizli_satis_grid_layout.count():
+        widget = tab.hizli_satis_grid_layout.takeAt(0).widget()
+        if widget:
+            widget.deleteLater()
+    urunler = tab.main_app.db_manager.get_all_products(include_inactive=False)
+    row, col = 0, 0
+    for urun in urunler:
+        if not (selected_category_id is None or selected_category_id == urun['kategori_id']):
+            continue
+        if search_term not in urun['adi'].lower():
+            continue
+        btn = QPushButton(f"{urun['adi']}\n{urun['fiyat']:.2f} TL")
+        btn.setObjectName("HizliSatisButton")
+        btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        btn.setMinimumSize(100, 80)
+        if urun['kategori_id'] is not None and urun['kategori_id'] > 0:
+            bg_color = constants.DEFAULT_CATEGORY_COLORS[(urun['kategori_id'] - 1) % len(constants.DEFAULT_CATEGORY_COLORS)]
+            btn.setStyleSheet(f"""
+                QPushButton#HizliSatisButton {{ background-color: {bg_color}; }}
+                QPushButton#HizliSatisButton:hover {{ border-color: #007bff; }}
+            """)
+        tab.hizli_satis_grid_layout.addWidget(btn, row, col, 1, 1)
+        col += 1
+        if col >= 6:
+            col, row = 0, row + 1
+
+
+def keystroke_latencies(app, tab):
+    """TYPED_TEXT harf harf yazılıp silinirken her tuş vuruşunun çizime kadar süresi (ms)."""
+    steps = [TYPED_TEXT[:i] for i in range(1, len(TYPED_TEXT) + 1)]
+    steps += list(reversed(steps[:-1])) + [""]
+    timings = []
+    for _ in range(ROUNDS):
+        for text in steps:
+            t0 = time.perf_counter()
+            tab.entry_search.setText(text)
+            QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+            app.processEvents()
+            tab.hizli_satis_scroll_area.grab()
+            timings.append((time.perf_counter() - t0) * 1000)
+    return timings
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    db_manager, tmp_dir = create_temp_db("quick_sale")
+    try:
+        add_products(db_manager, PRODUCT_COUNT)
+        active_count = len(db_manager.get_all_products())
+
+        tab = AdisyonTabPyside(_BenchApp(db_manager))
+        tab.resize(1200, 800)
+        tab.show()
+        tab.load_categories_combobox()
+
+        tab.entry_search.textChanged.disconnect(tab.filter_hizli_satis_buttons)
+        tab.entry_search.textChanged.connect(lambda text: legacy_filter(tab))
+        legacy_filter(tab)
+        legacy = keystroke_latencies(app, tab)
+        tab.entry_search.textChanged.disconnect()
+        while tab.hizli_satis_grid_layout.count():
+            tab.hizli_satis_grid_layout.takeAt(0).widget().deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+        tab.entry_search.textChanged.connect(tab.filter_hizli_satis_buttons)
+        t0 = time.perf_counter()
+        tab.filter_hizli_satis_buttons() # Havuz oluşturma (katalog sürümü başına bir kez)
+        app.processEvents()
+        pool_ms = (time.perf_counter() - t0) * 1000
+        pooled = keystroke_latencies(app, tab)
+
+        print(f"{active_count} aktif ürün, {len(legacy)} tuş vuruşu")
+        print(f"{'yöntem':<28} {'medyan (ms)':>12} {'en kötü (ms)':>13}")
+        print(f"{'eski (yeniden oluşturma)':<28} {statistics.median(legacy):12.2f} {max(legacy):13.2f}")
+        print(f"{'buton havuzu':<28} {statistics.median(pooled):12.2f} {max(pooled):13.2f}")
+        print(f"havuz oluşturma (bir kez): {pool_ms:.1f} ms")
+        tab.close()
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
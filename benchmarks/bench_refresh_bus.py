@@ -0,0 +1,99 @@
+# benchmarks/bench_refresh_bus.py
+
+"""Yenileme veriyolunun (RefreshBus) tek kullanıcı işleminde yaptığı masa ızgarası yenileme sayısını ölçer (PySide6 gerekir).
+
+Senaryo: tek bir olay döngüsü turunda birden fazla sepet işlemi (ürün ekleme + masa toplamı + müşteri ataması).
+Eski yöntemde her değişiklik load_masa_buttons'ı doğrudan çağırır; veriyolunda aynı turdaki olaylar birleştirilir.
+Ekran gerekmez, QT_QPA_PLATFORM=offscreen kullanılır.
+
+Kullanım: python benchmarks/bench_refresh_bus.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _bench_common import create_temp_db, remove_temp_dir
+
+from PySide6.QtWidgets import QApplication
+
+import refresh_bus
+from refresh_bus import RefreshBus
+from masa_tab_pyside import MasaTabPyside
+
+TABLE_COUNT = 60
+EVENTS_PER_ACTION = [1, 3, 6]
+REPEAT = 30
+
+
+class _BenchApp:
+    """MasaTabPyside'ın ihtiyaç duyduğu ana uygulama alanlarının minimum karşılığı."""
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.aktif_masa = None
+        self.aktif_siparis_id = None
+        self.refresh_bus = RefreshBus()
+
+
+def reload_masa_buttons(tab):
+    """MasaTabPyside.load_masa_buttons'ın senkron karşılığı (okuma kuyruk yerine doğrudan bu bağlantıyla yapılır)."""
+    return tab.update_masa_buttons(tab.main_app.db_manager.get_all_masalar())
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    db_manager, tmp_dir = create_temp_db("refresh_bus")
+    try:
+        while len(db_manager.get_all_masalar()) < TABLE_COUNT:
+            db_manager.add_masa()
+        siparis_id = db_manager.create_new_order(1)
+
+        main_app = _BenchApp(db_manager)
+        tab = MasaTabPyside(main_app)
+        tab.resize(1200, 800)
+        tab.show()
+        reload_masa_buttons(tab)
+
+        load_calls = [0]
+        def counted_load(changes):
+            load_calls[0] += 1
+            reload_masa_buttons(tab)
+        main_app.refresh_bus.subscribe(refresh_bus.MASA_CHANGED, counted_load)
+
+        counter = [0]
+        def mutate():
+            counter[0] += 1
+            db_manager.apply_order_item(siparis_id, 1, 'Espresso', counter[0], 110.0, None)
+
+        print(f"{'Olay/işlem':>10} {'doğrudan':>16} {'veriyolu':>16} {'yenileme (doğrudan/veriyolu)':>30}")
+        for events in EVENTS_PER_ACTION:
+            t0 = time.perf_counter()
+            for _ in range(REPEAT):
+                for _ in range(events):
+                    mutate()
+                    reload_masa_buttons(tab)
+                app.processEvents()
+            direct_ms = (time.perf_counter() - t0) / REPEAT * 1000
+
+            load_calls[0] = 0
+            t0 = time.perf_counter()
+            for _ in range(REPEAT):
+                for _ in range(events):
+                    mutate()
+                    main_app.refresh_bus.publish(refresh_bus.MASA_CHANGED, 1)
+                app.processEvents()
+            bus_ms = (time.perf_counter() - t0) / REPEAT * 1000
+
+            print(f"{events:>10} {direct_ms:13.2f} ms {bus_ms:13.2f} ms {events * REPEAT:>16} / {load_calls[0]}")
+
+        print(f"Veriyolu sayaçları: {main_app.refresh_bus.stats_text()}")
+        tab.close()
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_report_dates.py
+
+"""Rapor tarih filtrelerinin (date(kapanis_zamani) BETWEEN ... ile kapanis_epoch aralığı) karşılaştırması.
+
+5 yıllık sentetik veri üzerinde eski metin tabanlı sorgular ile get_sales_summary /
+get_product_sales_report metotlarının farklı tarih aralıklarındaki gecikmesini ve
+mevcut satırların epoch sütununa taşınma (migration) süresini ölçer.
+
+Kullanım: python benchmarks/bench_report_dates.py [sipariş_sayısı]
+"""
+
+import sys
+import time
+from datetime import datetime
+
+from _bench_common import create_temp_db, remove_temp_dir, generate_closed_orders, measure
+
+LEGACY_SUMMARY_SQL = """
+    SELECT COUNT(siparis_id), SUM(toplam_tutar), SUM(iskonto), SUM(odenen_tutar)
+    FROM siparis_gecmisi
+    WHERE durum = 'Kapandı' AND date(kapanis_zamani) BETWEEN date(?) AND date(?)
+"""
+
+LEGACY_PRODUCT_SQL = """
+    SELECT sd.urun_adi, SUM(sd.miktar), SUM(sd.tutar), k.adi
+    FROM siparis_detaylari sd
+    JOIN siparis_gecmisi sg ON sd.siparis_id = sg.siparis_id
+    LEFT JOIN kategoriler k ON sd.kategori_id = k.kategori_id
+    WHERE sg.durum = 'Kapandı' AND date(sg.kapanis_zamani) BETWEEN date(?) AND date(?)
+    GROUP BY sd.urun_adi, k.adi
+"""
+
+RANGES = [
+    ("1 hafta", '2024-03-04', '2024-03-10'),
+    ("1 ay", '2024-03-01', '2024-03-31'),
+    ("1 yıl", '2023-01-01', '2023-12-31'),
+    ("5 yıl", '2020-01-01', '2024-12-31'),
+]
+
+
+def main():
+    order_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    db_manager, tmp_dir = create_temp_db("report_dates")
+    try:
+        line_count = generate_closed_orders(db_manager, order_count, start=datetime(2020, 1, 1), days=5 * 365)
+        conn = db_manager.conn
+        print(f"5 yıllık veri: {order_count} sipariş / {line_count} detay satırı.")
+
+        # Mevcut satırların migration süresi (sürüm 2'deki UPDATE)
+        conn.execute("UPDATE siparis_gecmisi SET kapanis_epoch = NULL")
+        conn.commit()
+        t0 = time.perf_counter()
+        conn.execute("""UPDATE siparis_gecmisi
+                        SET kapanis_epoch = CAST(strftime('%s', kapanis_zamani) AS INTEGER)
+                        WHERE kapanis_zamani IS NOT NULL AND kapanis_epoch IS NULL""")
+        conn.commit()
+        print(f"Epoch migration'ı: {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+        # Eski durumu temsil etmek için sürüm 1'deki metin indeksi de mevcut olsun
+        conn.execute("""CREATE INDEX IF NOT EXISTS idx_bench_legacy_kapanis
+                        ON siparis_gecmisi (durum, kapanis_zamani, toplam_tutar, iskonto, odenen_tutar)""")
+        conn.execute("ANALYZE")
+        conn.commit()
+
+        print(f"\n{'Aralık':<10} {'Rapor':<15} {'date() BETWEEN':>16} {'epoch aralığı':>16} {'hızlanma':>10}")
+        for label, start_date, end_date in RANGES:
+            legacy_summary, _ = measure(lambda: conn.execute(LEGACY_SUMMARY_SQL, (start_date, end_date)).fetchone())
+            new_summary, _ = measure(lambda: db_manager.get_sales_summary(start_date, end_date))
+            legacy_product, _ = measure(lambda: conn.execute(LEGACY_PRODUCT_SQL, (start_date, end_date)).fetchall(), repeat=3)
+            new_product, _ = measure(lambda: db_manager.get_product_sales_report(start_date, end_date), repeat=3)
+
+            print(f"{label:<10} {'satış özeti':<15} {legacy_summary * 1000:13.2f} ms {new_summary * 1000:13.2f} ms {legacy_summary / new_summary:9.1f}x")
+            print(f"{'':<10} {'ürün raporu':<15} {legacy_product * 1000:13.2f} ms {new_product * 1000:13.2f} ms {legacy_product / new_product:9.1f}x")
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# benchmarks/bench_report_executor.py
+
+"""Raporlar sekmesi sorgularının arayüz iş parçacığını ne kadar bloke ettiğini ve eski sorgu iptalini ölçer (PySide6 gerekir).
+
+Senaryo: YEARS yılı boyunca kapanmış siparişler. Arayüz iş parçacığında her TICK_MS'de bir çalışan timer olay döngüsünün
+donmasını ölçer. 3 yıllık özet + ürün raporu ham tablolardan (use_rollups=False, en kötü durum) sorgulanır:
+  - eski yöntem: rapor arayüz iş parçacığında senkron çalışır
+  - ReportQueryExecutor: salt okunur bağlantıyla arka plan iş parçacığında çalışır, satırlar sayfa sayfa gelir
+İptal: uzun sorgu çalışırken kullanıcı tarih aralığını değiştirir (kısa aralık); yeni sonucun gelme süresi
+iptalli ve iptalsiz (eski sorgu bitene kadar beklenir) karşılaştırılır. Ekran gerekmez, QT_QPA_PLATFORM=offscreen kullanılır.
+
+Kullanım: python benchmarks/bench_report_executor.py [--orders-per-year 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from _bench_common import create_temp_db, remove_temp_dir, generate_closed_orders
+
+from PySide6.QtCore import QCoreApplication, QTimer, QObject
+
+from report_query_executor import ReportQueryExecutor
+
+YEARS = (2022, 2023, 2024)
+TICK_MS = 20
+LONG_RANGE = (f"{YEARS[0]}-01-01", f"{YEARS[-1]}-12-31")
+SHORT_RANGE = (f"{YEARS[-1]}-03-01", f"{YEARS[-1]}-03-07")
+
+
+class Ticker(QObject):
+    """Arayüz iş parçacığında olay döngüsünün ne kadar donduğunu ölçer."""
+
+    def __init__(self):
+        super().__init__()
+        self.gaps = []
+        self._last = None
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+
+    def tick(self):
+        now = time.perf_counter()
+        if self._last is not None:
+            self.gaps.append((now - self._last) * 1000)
+        self._last = now
+
+
+class Collector(QObject):
+    """Sorgu sinyallerini (arayüz iş parçacığında) toplar; beklenen sorgu bitince olay döngüsünden çıkar."""
+
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+        self.wait_for = None
+        self.t0 = None
+        self.summaries = {}
+        self.pages = {}
+        self.rows = {}
+        self.finished = {} # request_id -> (başarılı mı, mesaj, süre ms)
+
+    def on_summary(self, request_id, summary):
+        self.summaries[request_id] = summary
+
+    def on_rows(self, request_id, rows, loaded):
+        self.pages[request_id] = self.pages.get(request_id, 0) + 1
+        self.rows.setdefault(request_id, []).extend(rows)
+
+    def on_finished(self, request_id, success, message):
+        self.finished[request_id] = (success, message, (time.perf_counter() - self.t0) * 1000)
+        if request_id == self.wait_for:
+            self.app.quit()
+
+
+def gap_stats(gaps):
+    gaps = sorted(gaps)
+    return max(gaps), gaps[min(len(gaps) - 1, int(len(gaps) * 0.99))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders-per-year", type=int, default=100_000)
+    args = parser.parse_args()
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    db_manager, tmp_dir = create_temp_db("report_executor")
+    try:
+        for seed, year in enumerate(YEARS):
+            generate_closed_orders(db_manager, args.orders_per_year, start=datetime(year, 1, 1), days=365, seed=seed)
+        print(f"\n{len(YEARS)} yıl x {args.orders_per_year} sipariş, 3 yıllık rapor ham tablolardan, timer {TICK_MS} ms")
+        print(f"{'yöntem':<28} {'rapor (ms)':>11} {'en uzun donma':>14} {'p99 (ms)':>9}")
+
+        # Eski yöntem: arayüz iş parçacığında senkron
+        ticker = Ticker()
+        ticker.timer.start(TICK_MS)
+        state = {}
+
+        def sync_report():
+            t0 = time.perf_counter()
+            state['summary'] = dict(db_manager.get_sales_summary(*LONG_RANGE, use_rollups=False))
+            state['rows'] = [dict(row) for row in db_manager.get_product_sales_report(*LONG_RANGE, use_rollups=False)]
+            state['ms'] = (time.perf_counter() - t0) * 1000
+            QTimer.singleShot(200, app.quit)
+
+        QTimer.singleShot(200, sync_report)
+        app.exec()
+        ticker.timer.stop()
+        print(f"{'eski (arayüz iş parçacığı)':<28} {state['ms']:11.0f} {gap_stats(ticker.gaps)[0]:14.0f} {gap_stats(ticker.gaps)[1]:9.0f}")
+
+        # ReportQueryExecutor
+        executor = ReportQueryExecutor(db_manager.db_name)
+        collector = Collector(app)
+        executor.summary_ready.connect(collector.on_summary)
+        executor.rows_ready.connect(collector.on_rows)
+        executor.query_finished.connect(collector.on_finished)
+        ticker = Ticker()
+        ticker.timer.start(TICK_MS)
+        collector.t0 = time.perf_counter()
+        collector.wait_for = executor.submit(*LONG_RANGE, use_rollups=False)
+        app.exec()
+        ticker.timer.stop()
+        request_id = collector.wait_for
+        assert collector.finished[request_id][0]
+        assert collector.summaries[request_id] == state['summary'] and collector.rows[request_id] == state['rows']
+        print(f"{'ReportQueryExecutor':<28} {collector.finished[request_id][2]:11.0f} {gap_stats(ticker.gaps)[0]:14.0f} "
+              f"{gap_stats(ticker.gaps)[1]:9.0f}")
+        print(f"sonuçlar senkron sorguyla aynı; {len(collector.rows[request_id])} satır {collector.pages[request_id]} sayfada geldi")
+
+        # Eski sorgu iptali: uzun sorgu başladıktan 100 ms sonra kısa aralık istenir
+        print(f"\n{'tarih değişikliği':<28} {'yeni sonuç (ms)':>16}")
+        for cancel in (False, True):
+            long_id = executor.submit(*LONG_RANGE, use_rollups=False)
+            time.sleep(0.1)
+            if not cancel:
+                executor._latest = None # İptal olmadan: kuyruk eski sorguyu bitirmeden yeniyi çalıştıramaz
+            collector.t0 = time.perf_counter()
+            collector.wait_for = executor.submit(*SHORT_RANGE, use_rollups=False)
+            app.exec()
+            long_result = collector.finished.get(long_id, (None, "henüz bitmedi"))[1]
+            name = "eski sorgu iptal edilir" if cancel else "iptal yok (sırayla)"
+            print(f"{name:<28} {collector.finished[collector.wait_for][2]:16.0f}   uzun sorgu: {long_result}")
+        expected = dict(db_manager.get_sales_summary(*SHORT_RANGE, use_rollups=False))
+        assert collector.summaries[collector.wait_for] == expected
+        executor.shutdown()
+        print(f"sayaçlar: {executor.stats}")
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/bench_sales_rollups.py
+
+"""Günlük satış özetlerinin (rollup) rapor süresine etkisini ve tutarlılığını ölçer.
+
+Senaryo: YEARS yılı boyunca kapanmış siparişler; 3 yıllık satış özeti ve ürün raporu
+  - ham: siparis_gecmisi / siparis_detaylari taranır (use_rollups=False)
+  - özet: satis_ozeti_gunluk / urun_satis_gunluk okunur (gün başına birkaç satır)
+Ayrıca: baştan oluşturma süresi, tutarlılık kontrolü, process_full_payment ile artımlı güncelleme (tekrar kapatma dahil),
+ilk yılın arşivlenmesinden sonra raporların değişmediği ve ödeme başına ek maliyet.
+
+Kullanım: python benchmarks/bench_sales_rollups.py [--orders-per-year 100000]
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from _bench_common import create_temp_db, remove_temp_dir, generate_closed_orders, measure
+
+from money import Money
+
+YEARS = (2022, 2023, 2024)
+
+
+def summary_tuple(row):
+    return (row['toplam_adisyon'], round(row['brut_satis'] or 0, 2), round(row['toplam_iskonto'] or 0, 2),
+            round(row['net_satis'] or 0, 2))
+
+
+def products_tuple(rows):
+    return sorted((row['urun_adi'], row['kategori_adi'], round(row['toplam_miktar'], 2), round(row['toplam_tutar_urun'], 2))
+                  for row in rows)
+
+
+def report(db_manager, period, use_rollups):
+    return (summary_tuple(db_manager.get_sales_summary(*period, use_rollups=use_rollups)),
+            products_tuple(db_manager.get_product_sales_report(*period, use_rollups=use_rollups)))
+
+
+def close_order(db_manager, masa_no, items, discount, method):
+    """Uygulama akışıyla (sepete ekleme, iskonto, ödeme) bir sipariş açıp kapatır."""
+    siparis_id = db_manager.create_new_order(masa_no)
+    for urun_id, adi, fiyat, kategori_id in items:
+        success, _, _ = db_manager.apply_order_item(siparis_id, urun_id, adi, 2.0, Money.of(fiyat), kategori_id) # fiyat: kuruş
+        assert success
+    if discount:
+        db_manager.update_order_discount(siparis_id, discount)
+    success, _ = db_manager.process_full_payment(siparis_id, method)
+    assert success
+    return siparis_id
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders-per-year", type=int, default=100_000)
+    args = parser.parse_args()
+
+    db_manager, tmp_dir = create_temp_db("rollups")
+    try:
+        t0 = time.perf_counter()
+        for seed, year in enumerate(YEARS):
+            generate_closed_orders(db_manager, args.orders_per_year, start=datetime(year, 1, 1), days=365, seed=seed)
+        print(f"\n{len(YEARS)} yıl x {args.orders_per_year} sipariş hazırlandı ({time.perf_counter() - t0:.1f} sn)")
+
+        rebuild_s, (ok, message) = measure(db_manager.rebuild_sales_rollups, repeat=1)
+        assert ok, message
+        rows = db_manager.cursor.execute("SELECT (SELECT COUNT(*) FROM satis_ozeti_gunluk), (SELECT COUNT(*) FROM urun_satis_gunluk)").fetchone()
+        print(f"baştan oluşturma: {rebuild_s:.2f} sn, {rows[0]} gün/ödeme + {rows[1]} gün/ürün satırı")
+        check_s, (consistent, mismatches) = measure(db_manager.check_sales_rollups, repeat=1)
+        assert consistent, mismatches[:5]
+        print(f"tutarlılık kontrolü (tüm geçmiş): {check_s:.2f} sn, fark yok")
+
+        three_years = (f"{YEARS[0]}-01-01", f"{YEARS[-1]}-12-31")
+        one_month = (f"{YEARS[-1]}-03-01", f"{YEARS[-1]}-03-31")
+        print(f"\n{'rapor':<30} {'ham (ms)':>10} {'özet (ms)':>10} {'hızlanma':>9}")
+        for name, period in (("3 yıl özet + ürün raporu", three_years), ("1 ay özet + ürün raporu", one_month)):
+            raw_s, raw = measure(lambda: report(db_manager, period, False))
+            rollup_s, rollup = measure(lambda: report(db_manager, period, True))
+            assert raw == rollup, period
+            print(f"{name:<30} {raw_s * 1000:10.1f} {rollup_s * 1000:10.2f} {raw_s / rollup_s:8.0f}x")
+
+        # Artımlı güncelleme: uygulama akışıyla kapanan siparişler özetlere aynı transaction içinde eklenir
+        products = db_manager.cursor.execute("SELECT urun_id, adi, fiyat, kategori_id FROM urunler LIMIT 3").fetchall()
+        today = datetime.now().strftime("%Y-%m-%d")
+        payment_timings = []
+        for i in range(50):
+            t = time.perf_counter()
+            close_order(db_manager, (i % 5) + 1, products[: (i % 3) + 1], 5.0 if i % 4 == 0 else 0.0, ("Nakit", "Kredi Kartı")[i % 2])
+            payment_timings.append(time.perf_counter() - t)
+        reclosed = close_order(db_manager, 1, products, 0.0, "Nakit")
+        success, _ = db_manager.process_full_payment(reclosed, "Kredi Kartı") # Tekrar kapatma: eski katkı çıkarılır
+        assert success
+        assert report(db_manager, (today, today), True) == report(db_manager, (today, today), False)
+        consistent, mismatches = db_manager.check_sales_rollups(today, today)
+        assert consistent, mismatches
+        print(f"\n51 sipariş uygulama akışıyla kapatıldı (biri iki kez): bugünün raporu ham ile aynı, kontrol: fark yok")
+
+        # Ödeme başına ek maliyet: aynı kapanış özet güncellemesi olmadan
+        apply_rollups = db_manager._apply_order_to_sales_rollups
+        db_manager._apply_order_to_sales_rollups = lambda siparis_id, sign=1: None
+        try:
+            plain_timings = []
+            for i in range(50):
+                t = time.perf_counter()
+                close_order(db_manager, (i % 5) + 1, products[: (i % 3) + 1], 0.0, "Nakit")
+                plain_timings.append(time.perf_counter() - t)
+        finally:
+            db_manager._apply_order_to_sales_rollups = apply_rollups
+        payment_timings.sort()
+        plain_timings.sort()
+        print(f"sipariş açma+ekleme+ödeme medyanı: özetli {payment_timings[25] * 1000:.2f} ms, özetsiz {plain_timings[25] * 1000:.2f} ms")
+        ok, message = db_manager.rebuild_sales_rollups() # Özetsiz kapatılan 50 sipariş eklenir
+        assert ok, message
+
+        # Arşivleme özetlere dokunmaz: ilk yıl arşivlendikten sonra özet raporu ve ham (federasyonlu) rapor aynı kalır
+        before = report(db_manager, three_years, True)
+        ok, message = db_manager.archive_and_delete_old_orders(YEARS[0])
+        assert ok, message
+        assert report(db_manager, three_years, True) == before == report(db_manager, three_years, False)
+        consistent, mismatches = db_manager.check_sales_rollups()
+        assert consistent, mismatches[:5]
+        rebuild_s, (ok, message) = measure(db_manager.rebuild_sales_rollups, repeat=1)
+        assert ok and report(db_manager, three_years, True) == before
+        print(f"{YEARS[0]} arşivlendikten sonra: raporlar aynı, kontrol temiz, arşiv dahil baştan oluşturma {rebuild_s:.2f} sn")
+    finally:
+        db_manager.close()
+        remove_temp_dir(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
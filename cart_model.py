@@ -0,0 +1,179 @@
+# cart_model.py
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from money import Money, ZERO
+
+# --- Sepet (Adisyon) Modeli ---
+# Aktif adisyonun satırları bellekte CartLine kayıtları olarak tutulur ve sepet görünümü (QTreeView) doğrudan
+# bu modelden çizilir. Miktar/fiyat/tutar değerleri ekrandaki metinden geri okunmaz; tek doğru kaynak bu modeldir.
+# Fiyat, tutar ve brüt toplam Money'dir (tamsayı kuruş); toplam farkla güncellenirken yuvarlama gerekmez.
+
+CART_COLUMNS = ("Ürün Adı", "Miktar", "Birim Fiyat", "Tutar", "Eklenme Saat")
+COLUMN_URUN_ADI, COLUMN_MIKTAR, COLUMN_BIRIM_FIYAT, COLUMN_TUTAR, COLUMN_EKLEME_SAAT = range(len(CART_COLUMNS))
+
+
+class CartLine:
+    """Sepetteki tek satır (siparis_detaylari kaydının bellekteki karşılığı; birim_fiyat ve tutar Money)."""
+    __slots__ = ('detay_id', 'urun_id', 'urun_adi', 'miktar', 'birim_fiyat', 'tutar', 'kategori_id', 'ekleme_saat')
+
+    def __init__(self, detay_id, urun_id, urun_adi, miktar, birim_fiyat, tutar, kategori_id, ekleme_saat=""):
+        self.detay_id = detay_id
+        self.urun_id = urun_id
+        self.urun_adi = urun_adi
+        self.miktar = miktar
+        self.birim_fiyat = birim_fiyat
+        self.tutar = tutar
+        self.kategori_id = kategori_id
+        self.ekleme_saat = ekleme_saat # "HH:MM:SS"
+
+
+class Cart:
+    """Sepet satırları; detay_id ve urun_id ile O(1) erişim, brüt toplam fark (delta) ile güncellenir."""
+
+    def __init__(self):
+        self.lines = [] # Görünüm sırası (eklenme sırası)
+        self._by_detay_id = {} # detay_id -> CartLine
+        self._by_urun_id = {} # urun_id -> CartLine (aynı ürünün tekrar eklenmesi bu satırın miktarını artırır)
+        self._rows = {} # detay_id -> satır indeksi
+        self.brut_total = ZERO
+
+    def __len__(self):
+        return len(self.lines)
+
+    def line_for_product(self, urun_id):
+        """Ürünün sepetteki satırını döndürür (yoksa None)."""
+        return self._by_urun_id.get(urun_id)
+
+    def line_by_detay_id(self, detay_id):
+        return self._by_detay_id.get(detay_id)
+
+    def row_of(self, detay_id):
+        """Satırın görünümdeki indeksini döndürür (yoksa None)."""
+        return self._rows.get(detay_id)
+
+    def append(self, line):
+        self._rows[line.detay_id] = len(self.lines)
+        self.lines.append(line)
+        self._by_detay_id[line.detay_id] = line
+        if line.urun_id is not None:
+            self._by_urun_id.setdefault(line.urun_id, line)
+        self.brut_total += line.tutar
+
+    def set_quantity(self, detay_id, miktar):
+        """Satırın miktarını ve tutarını günceller, brüt toplama sadece farkı uygular. Güncellenen satırı döndürür."""
+        line = self._by_detay_id[detay_id]
+        new_tutar = line.birim_fiyat * miktar # apply_order_item ile aynı kuruş yuvarlaması
+        self.brut_total += new_tutar - line.tutar
+        line.miktar = miktar
+        line.tutar = new_tutar
+        return line
+
+    def rename(self, detay_id, new_detay_id):
+        """Satırın detay_id'sini değiştirir (iyimser eklenen satırın geçici numarası kayıt numarasıyla değişir)."""
+        line = self._by_detay_id.pop(detay_id)
+        self._rows[new_detay_id] = self._rows.pop(detay_id)
+        self._by_detay_id[new_detay_id] = line
+        line.detay_id = new_detay_id
+        return line
+
+    def remove(self, detay_id):
+        """Satırı siler; sonraki satırların indeksleri kaydırılır. Silinen satırı döndürür."""
+        row = self._rows.pop(detay_id)
+        line = self.lines.pop(row)
+        del self._by_detay_id[detay_id]
+        if self._by_urun_id.get(line.urun_id) is line:
+            del self._by_urun_id[line.urun_id]
+            # Aynı ürünün başka satırı varsa (örn. veritabanından gelen eski kayıtlar) indeksi ona devret
+            for other in self.lines:
+                if other.urun_id == line.urun_id:
+                    self._by_urun_id[line.urun_id] = other
+                    break
+        for index in range(row, len(self.lines)):
+            self._rows[self.lines[index].detay_id] = index
+        self.brut_total -= line.tutar
+        return line
+
+    def clear(self):
+        self.lines = []
+        self._by_detay_id = {}
+        self._by_urun_id = {}
+        self._rows = {}
+        self.brut_total = ZERO
+
+
+class CartItemModel(QAbstractTableModel):
+    """Sepet görünümü için Qt modeli. Tüm değişiklikler bu sınıf üzerinden yapılır ve sadece ilgili satır bildirilir."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cart = Cart()
+
+    # --- Değişiklikler ---
+    def load(self, detail_rows):
+        """get_order_details satırlarıyla sepeti yeniden doldurur (tek reset)."""
+        self.beginResetModel()
+        self.cart.clear()
+        for row in detail_rows:
+            ekleme_zamani = row['ekleme_zamani']
+            self.cart.append(CartLine(row['detay_id'], row['urun_id'], row['urun_adi'], row['miktar'], Money.of(row['birim_fiyat']),
+                                      Money.of(row['tutar']), row['kategori_id'], ekleme_zamani[11:19] if ekleme_zamani else ""))
+        self.endResetModel()
+
+    def add_line(self, line):
+        row = len(self.cart)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.cart.append(line)
+        self.endInsertRows()
+
+    def set_quantity(self, detay_id, miktar):
+        line = self.cart.set_quantity(detay_id, miktar)
+        row = self.cart.row_of(detay_id)
+        self.dataChanged.emit(self.index(row, COLUMN_MIKTAR), self.index(row, COLUMN_TUTAR), [Qt.DisplayRole])
+        return line
+
+    def set_detay_id(self, detay_id, new_detay_id):
+        """detay_id görünümde gösterilmez; satır değişikliği bildirilmez."""
+        return self.cart.rename(detay_id, new_detay_id)
+
+    def remove_line(self, detay_id):
+        row = self.cart.row_of(detay_id)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        line = self.cart.remove(detay_id)
+        self.endRemoveRows()
+        return line
+
+    def clear(self):
+        self.beginResetModel()
+        self.cart.clear()
+        self.endResetModel()
+
+    def line_at(self, row):
+        return self.cart.lines[row]
+
+    # --- QAbstractTableModel ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.cart.lines)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(CART_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return CART_COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        line = self.cart.lines[index.row()]
+        column = index.column()
+        if column == COLUMN_URUN_ADI:
+            return line.urun_adi
+        if column == COLUMN_MIKTAR:
+            return f"{line.miktar}"
+        if column == COLUMN_BIRIM_FIYAT:
+            return f"{line.birim_fiyat:.2f} TL"
+        if column == COLUMN_TUTAR:
+            return f"{line.tutar:.2f} TL"
+        return line.ekleme_saat
@@ -0,0 +1,86 @@
+# cart_tap_batcher.py
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+import constants
+from database import DatabaseManager
+
+# --- Sepet Dokunuşları için Grup Commit ---
+# Hızlı satış butonuna art arda basıldığında her dokunuş ayrı bir transaction/commit yapmaz. Dokunuşlar ilk dokunuştan
+# itibaren window_ms boyunca bellekte biriktirilir (write-behind); aynı masa/ürün satırına gelen dokunuşlar tek girdide
+# birleştirilir (tek UPDATE). Pencere dolunca birikenler veritabanı kuyruğuna (db_executor) tek yazma işi olarak
+# gönderilir ve DatabaseManager.apply_cart_taps ile tek commit'te kaydedilir.
+# Arayüz sepeti iyimser (optimistic) günceller; ödeme, sekme değişikliği ve kapanışta flush() ile birikenler hemen gönderilir.
+# Yazıcı kuyruğu sıralı olduğundan flush()'tan sonra gönderilen okuma/yazmalar bu dokunuşları görür.
+# window_ms = 0: grup commit kapalı, her dokunuş hemen gönderilir.
+
+
+class CartTapBatcher(QObject):
+    """Hızlı satış dokunuşlarını zaman penceresinde birleştirip tek commit'te yazar. Sonuçlar arayüz iş parçacığında gelir."""
+
+    # başarılı mı, [(masa_no, urun_id, siparis_id, detay_id, satırın yeni miktarı, toplamlar), ...]
+    batch_finished = Signal(bool, object)
+
+    def __init__(self, db_executor, window_ms=constants.DB_GROUP_COMMIT_WINDOW_MS, parent=None):
+        super().__init__(parent)
+        self.db_executor = db_executor
+        self.window_ms = window_ms
+        self._pending = {} # (masa_no, urun_id) -> [urun_adi, birim_fiyat, kategori_id, miktar, dokunuş sayısı] (ilk dokunuş sırasıyla)
+        self._in_flight = 0 # Gönderilmiş, sonucu henüz gelmemiş yazma sayısı
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self.stats = {'taps': 0, 'merged': 0, 'commits': 0, 'failed': 0}
+
+    def add(self, masa_no, urun_id, urun_adi, birim_fiyat, kategori_id, miktar=1.0):
+        """Dokunuşu biriktirir (ürün satırda yoksa ilk dokunuş miktar, sonrakiler +1)."""
+        self.stats['taps'] += 1
+        entry = self._pending.get((masa_no, urun_id))
+        if entry is not None:
+            entry[4] += 1
+            self.stats['merged'] += 1
+        else:
+            self._pending[(masa_no, urun_id)] = [urun_adi, birim_fiyat, kategori_id, miktar, 1]
+        if self.window_ms <= 0:
+            self.flush()
+        elif not self._timer.isActive():
+            self._timer.start(self.window_ms) # Pencere ilk dokunuştan başlar, sonraki dokunuşlar uzatmaz
+
+    def has_pending(self, masa_no=None):
+        """Gönderilmemiş dokunuş var mı (masa_no verilirse sadece o masa için)."""
+        if masa_no is None:
+            return bool(self._pending)
+        return any(key[0] == masa_no for key in self._pending)
+
+    def is_idle(self):
+        """Biriken ve sonucu beklenen dokunuş yok (ekrandaki iyimser değerler veritabanıyla aynı)."""
+        return not self._pending and self._in_flight == 0
+
+    def flush(self):
+        """Biriken dokunuşları hemen tek yazma işi olarak kuyruğa gönderir. Gönderilecek dokunuş yoksa None döner."""
+        self._timer.stop()
+        if not self._pending:
+            return None
+        taps = [(masa_no, urun_id, urun_adi, birim_fiyat, kategori_id, miktar, count)
+                for (masa_no, urun_id), (urun_adi, birim_fiyat, kategori_id, miktar, count) in self._pending.items()]
+        self._pending = {}
+        self._in_flight += 1
+        self.stats['commits'] += 1
+        return self.db_executor.submit_write(DatabaseManager.apply_cart_taps, taps,
+                                             on_result=self._on_batch_done, on_error=self._on_batch_error)
+
+    def stats_text(self):
+        return (f"{self.stats['taps']} dokunuş, {self.stats['commits']} commit "
+                f"({self.stats['merged']} dokunuş satırda birleşti), {self.stats['failed']} hata")
+
+    def _on_batch_done(self, result):
+        self._in_flight -= 1
+        success, results = result
+        if not success:
+            self.stats['failed'] += 1
+        self.batch_finished.emit(success, results)
+
+    def _on_batch_error(self, error):
+        self._in_flight -= 1
+        self.stats['failed'] += 1
+        self.batch_finished.emit(False, [])
@@ -0,0 +1,141 @@
+# catalogue_cache.py
+
+import time
+from collections import namedtuple
+
+import constants
+from money import Money
+from product_search import ProductSearchIndex
+
+# --- Katalog Kayıtları ---
+# Ürün ve kategori kayıtları değiştirilemez (immutable) tuple'lardır. sqlite3.Row gibi record['adi'] ile de
+# okunabilirler, böylece get_all_products() çağıran mevcut kod değişmeden çalışır. Ürün fiyatı Money'dir.
+
+_PRODUCT_FIELDS = ('urun_id', 'adi', 'fiyat', 'kategori_adi', 'aktif_durumu', 'hizli_satis_sirasi', 'kategori_id')
+_CATEGORY_FIELDS = ('kategori_id', 'adi')
+
+
+class _Record(tuple):
+    """Alan adıyla (record['adi']) veya indeksle (record[0]) erişilebilen namedtuple tabanı."""
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def keys(self):
+        return list(self._fields)
+
+
+class ProductRecord(_Record, namedtuple('_ProductRecord', _PRODUCT_FIELDS)):
+    __slots__ = ()
+
+
+class CategoryRecord(_Record, namedtuple('_CategoryRecord', _CATEGORY_FIELDS)):
+    __slots__ = ()
+
+
+def _quick_sale_key(product):
+    """SQL'deki 'ORDER BY hizli_satis_sirasi, adi' sıralamasının karşılığı (NULL değerler önce gelir)."""
+    sira = product.hizli_satis_sirasi
+    return (sira is not None, sira if sira is not None else 0, product.adi)
+
+
+class CatalogueSnapshot:
+    """Belirli bir katalog sürümünde ürün ve kategorilerin değiştirilemez görüntüsü.
+
+    Tüm listeler tuple olarak tutulur ve sorgular sadece sözlük/tuple erişimi yapar (SQLite'a gitmez).
+    """
+
+    def __init__(self, version, product_rows, category_rows, popularity=None):
+        self.version = version
+        self.popularity = popularity or {} # Ürün adı -> son PRODUCT_POPULARITY_DAYS gündeki satış miktarı
+        self._search_index = None
+        self.categories = tuple(CategoryRecord(*row) for row in category_rows) # Kategori adına göre sıralı
+        self.category_names = {c.kategori_id: c.adi for c in self.categories}
+
+        products = sorted((ProductRecord(row[0], row[1], Money.of(row[2]), *row[3:]) for row in product_rows),
+                          key=_quick_sale_key)
+        self.products = tuple(products) # Hızlı satış sırasına, sonra ada göre sıralı (pasifler dahil)
+        self.active_products = tuple(p for p in products if p.aktif_durumu == 1)
+        self.products_by_id = {p.urun_id: p for p in products}
+
+        by_category, active_by_category = {}, {}
+        for p in products:
+            by_category.setdefault(p.kategori_id, []).append(p)
+            if p.aktif_durumu == 1:
+                active_by_category.setdefault(p.kategori_id, []).append(p)
+        self._by_category = {k: tuple(v) for k, v in by_category.items()}
+        self._active_by_category = {k: tuple(v) for k, v in active_by_category.items()}
+
+    @property
+    def search_index(self):
+        """Ürün arama indeksi (ProductSearchIndex); ilk aramada bir kez oluşturulur."""
+        if self._search_index is None:
+            self._search_index = ProductSearchIndex(self.products, self.popularity)
+        return self._search_index
+
+    def get_product(self, urun_id):
+        """Ürünü ID'sine göre döndürür (yoksa None)."""
+        return self.products_by_id.get(urun_id)
+
+    def get_products(self, include_inactive=False):
+        """Tüm (veya sadece aktif) ürünleri hızlı satış sırasıyla döndürür."""
+        return self.products if include_inactive else self.active_products
+
+    def get_products_by_category(self, kategori_id, include_inactive=False):
+        """Bir kategorideki ürünleri hızlı satış sırasıyla döndürür."""
+        index = self._by_category if include_inactive else self._active_by_category
+        return index.get(kategori_id, ())
+
+    def get_category_name(self, kategori_id):
+        """Kategori adını döndürür (yoksa None)."""
+        return self.category_names.get(kategori_id)
+
+
+class CatalogueCache:
+    """DatabaseManager için sürüm sayaçlı ürün/kategori önbelleği.
+
+    DatabaseManager katalog değiştiren her metotta (ürün/kategori ekleme, güncelleme, silme, aktif/pasif yapma)
+    invalidate() çağırır; sürüm artar ve bir sonraki snapshot() çağrısında katalog tek sorguyla yeniden yüklenir.
+    """
+
+    PRODUCTS_QUERY = """
+        SELECT
+            u.urun_id, u.adi, u.fiyat, k.adi AS kategori_adi, u.aktif_durumu, u.hizli_satis_sirasi, u.kategori_id
+        FROM urunler u
+        LEFT JOIN kategoriler k ON u.kategori_id = k.kategori_id
+    """
+    CATEGORIES_QUERY = "SELECT kategori_id, adi FROM kategoriler ORDER BY adi"
+    # Arama sonuçlarının sıralaması için; günlük ürün satış özetinden (urun_satis_gunluk) okunur
+    POPULARITY_QUERY = "SELECT urun_adi, SUM(toplam_miktar) FROM urun_satis_gunluk WHERE gun_epoch >= ? GROUP BY urun_adi"
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.version = 0
+        self._snapshot = None
+        self.stats = {'hits': 0, 'loads': 0}
+
+    def invalidate(self):
+        """Katalog değişti: sürümü artırır, mevcut görüntü bir sonraki okumada yenilenir."""
+        self.version += 1
+        self._snapshot = None
+
+    def snapshot(self):
+        """Güncel katalog görüntüsünü döndürür, gerekiyorsa veritabanından yükler (sqlite3.Error yukarı iletilir)."""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self.version:
+            self.stats['hits'] += 1
+            return snapshot
+
+        cursor = self.conn.cursor()
+        product_rows = cursor.execute(self.PRODUCTS_QUERY).fetchall()
+        category_rows = cursor.execute(self.CATEGORIES_QUERY).fetchall()
+        since_epoch = int(time.time()) - constants.PRODUCT_POPULARITY_DAYS * 86400
+        popularity = dict(cursor.execute(self.POPULARITY_QUERY, (since_epoch,)).fetchall())
+        snapshot = CatalogueSnapshot(self.version, product_rows, category_rows, popularity)
+        self._snapshot = snapshot
+        self.stats['loads'] += 1
+        print(f"Ürün kataloğu yüklendi (sürüm {self.version}): {len(snapshot.products)} ürün, {len(snapshot.categories)} kategori.")
+        return snapshot
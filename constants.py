@@ -5,6 +5,49 @@
 # Veritabanı dosyasının adı
 DB_NAME = 'cafe_adisyon.db'
 
+# Veritabanı bağlantı profilleri (her bağlantı açılışında uygulanan PRAGMA ayarları)
+# journal_mode: 'WAL' okuyucuların yazanı beklemesini engeller.
+# synchronous: 'FULL' her commit'te fsync yapar; WAL ile 'NORMAL' sadece checkpoint'te fsync yapar
+#              (elektrik kesintisinde son birkaç commit kaybolabilir ama veritabanı bozulmaz); 'OFF' hiç fsync yapmaz.
+# mmap_size: bayt cinsinden bellek eşlemeli okuma alanı, cache_size: negatif değer KB cinsindendir.
+# foreign_keys: Tablolarda tanımlı FOREIGN KEY kısıtlarının (ON DELETE CASCADE / SET NULL) uygulanması.
+# busy_timeout: Başka bir bağlantı yazarken beklenecek süre (ms).
+DB_CONNECTION_PROFILES = {
+    'guvenli': { # Her commit diske kalıcı yazılır
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'mmap_size': 64 * 1024 * 1024,
+        'cache_size': -16000,
+        'temp_store': 'MEMORY',
+        'foreign_keys': 'ON',
+        'busy_timeout': 5000,
+    },
+    'dengeli': { # Varsayılan: WAL + NORMAL, commit başına fsync yok
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 128 * 1024 * 1024,
+        'cache_size': -32000,
+        'temp_store': 'MEMORY',
+        'foreign_keys': 'ON',
+        'busy_timeout': 5000,
+    },
+    'hizli': { # Test/demo ortamı: fsync yok, elektrik kesintisinde veri kaybı olabilir
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64000,
+        'temp_store': 'MEMORY',
+        'foreign_keys': 'ON',
+        'busy_timeout': 5000,
+    },
+    'klasik': { # Eski davranış: rollback journal, PRAGMA ayarı yok (karşılaştırma için)
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'foreign_keys': 'OFF',
+    },
+}
+DB_CONNECTION_PROFILE = 'dengeli' # Kullanılacak profil (DB_CONNECTION_PROFILES anahtarlarından biri)
+
 # Masa Durumları ve Renkleri İçin Stiller (main.py'deki stil tanımlarıyla uyumlu)
 MASA_STYLES = {
     'Boş': {
@@ -169,4 +212,49 @@ DEFAULT_CATEGORY_COLORS = [
 ]
 
 # Geçmiş verileri arşivleme süresi (yıl cinsinden)
-ARCHIVE_PERIOD_YEARS = 1
\ No newline at end of file
+ARCHIVE_PERIOD_YEARS = 1
+# Arşivleme her adımda en fazla bu kadar siparişi (ve detaylarını) taşır; bellek kullanımı ve commit süresi sınırlı kalır
+ARCHIVE_CHUNK_SIZE = 2000
+# Arka plan sıkıştırmasında (incremental_vacuum) her adımda dosyadan geri verilen en fazla sayfa sayısı
+VACUUM_PAGES_PER_STEP = 256
+# Arşiv dosyası adı: <önek><yıl>.db (ana veritabanıyla aynı dizinde)
+ARCHIVE_DB_PREFIX = 'cafe_adisyon_archive_'
+# Raporlarda aynı anda bağlanan (ATTACH) en fazla arşiv sayısı (SQLite varsayılan sınırı 10); fazlası gruplar halinde sorgulanıp birleştirilir
+REPORT_MAX_ATTACHED_ARCHIVES = 8
+# Raporlar sekmesi: ürün satırları arayüze bu büyüklükte sayfalar halinde gönderilir
+REPORT_PAGE_SIZE = 200
+# Tarih aralığı değiştikten sonra sorgu bu kadar bekler (hızlı ardışık değişikliklerde sadece sonuncusu çalışır)
+REPORT_REQUERY_DELAY_MS = 250
+# Bu süreden uzun süren raporlarda ilerleme göstergesi açılır; bu günden uzun aralıklarda hemen açılır
+REPORT_PROGRESS_DELAY_MS = 300
+REPORT_LONG_RANGE_DAYS = 92
+# Rapor sorgusu iptal kontrolü: SQLite her bu kadar VM adımında bir eski sorgunun iptal edilip edilmediğine bakar
+REPORT_CANCEL_CHECK_OPS = 10000
+# Satış özeti kontrolünde (Raporlar > Bakım) mesajda gösterilecek en fazla fark
+SALES_ROLLUP_MISMATCH_PREVIEW = 20
+# Analiz modülü (analytics.py): SQLite okumasında parça büyüklüğü ve sütun dosyası önbelleği dizini (ana veritabanının yanında)
+ANALYTICS_FETCH_CHUNK = 10000
+ANALYTICS_CACHE_DIR = 'analytics_cache'
+
+# Toplu CSV içe aktarma (csv_import.py): executemany grup büyüklüğü ve sonuç mesajında gösterilecek en fazla satır hatası
+CSV_IMPORT_BATCH_SIZE = 5000
+CSV_IMPORT_ERROR_PREVIEW = 20
+
+# Sipariş geçmişi dışa aktarma (order_export.py): okuma parça büyüklüğü ve artımlı dışa aktarmanın son noktası (settings anahtarı)
+ORDER_EXPORT_FETCH_CHUNK = 5000
+ORDER_EXPORT_WATERMARK_KEY = 'order_export_watermark'
+
+# Müşteri arama (Adisyon sekmesi müşteri seçici): en fazla öneri sayısı ve yazarken sorgu gecikmesi
+CUSTOMER_SEARCH_LIMIT = 20
+CUSTOMER_SEARCH_DELAY_MS = 150
+
+# Ürün araması: sonuçlar son kaç gündeki satış miktarına göre sıralanır (katalog her yüklendiğinde okunur)
+PRODUCT_POPULARITY_DAYS = 90
+
+# Veritabanı kuyruğu (db_executor.py): salt okunur okuyucu iş parçacığı sayısı ve kapanışta bekleyen yazmalar için en fazla bekleme (sn)
+DB_READER_THREADS = 2
+DB_SHUTDOWN_WAIT_S = 10
+
+# Sepet dokunuşları için grup commit (cart_tap_batcher.py): ilk dokunuştan sonra bu süre içindeki dokunuşlar tek commit'te yazılır (0: kapalı)
+# 30 ms aynı butona çift basışları birleştirir; normal hızda art arda dokunuşlar (60 ms ve üzeri) yine ayrı commit olur
+DB_GROUP_COMMIT_WINDOW_MS = 30
\ No newline at end of file
@@ -0,0 +1,311 @@
+# csv_import.py
+
+import argparse
+import csv
+import re
+import sqlite3
+import sys
+import time
+
+import constants
+from database import DatabaseManager
+from money import Money
+
+# --- Toplu CSV İçe Aktarma ---
+# Kategori, ürün ve müşteri listeleri CSV dosyasından satır satır (dosya belleğe alınmadan) okunur, her satır doğrulanır ve
+# geçerli satırlar CSV_IMPORT_BATCH_SIZE'lık gruplar halinde executemany ile eklenir/güncellenir (upsert). Tüm içe
+# aktarma tek transaction'dır: veritabanı hatası veya iptal durumunda hiçbir satır yazılmaz. Hatalı satırlar içe
+# aktarmayı durdurmaz, satır numarasıyla raporlanır.
+#
+# Sütunlar (başlık satırı zorunlu, büyük/küçük harf duyarsız, ayraç ',' ';' veya sekme):
+#   kategoriler: adi
+#   urunler:     adi, fiyat, kategori, aktif_durumu, hizli_satis_sirasi (son üçü isteğe bağlı; boş veya sütun yoksa mevcut
+#                ürünün değeri korunur, yeni ürün kategorisiz, aktif ve hızlı satış ekranında görünmez olur)
+#   musteriler:  ad_soyad, telefon (isteğe bağlı), bakiye (isteğe bağlı). Telefonlu satırlar telefona, telefonsuz satırlar
+#                aynı adlı telefonsuz müşteriye göre eşleşir; dosya tekrar içe aktarıldığında çift müşteri oluşmaz.
+
+IMPORT_KINDS = {
+    'kategoriler': {'required': ('adi',), 'optional': ()},
+    'urunler': {'required': ('adi', 'fiyat'), 'optional': ('kategori', 'aktif_durumu', 'hizli_satis_sirasi')},
+    'musteriler': {'required': ('ad_soyad',), 'optional': ('telefon', 'bakiye')},
+}
+
+_TRUE_VALUES = {'1', 'evet', 'aktif', 'true', 'e', 'yes'}
+_FALSE_VALUES = {'0', 'hayır', 'hayir', 'pasif', 'false', 'h', 'no'}
+_PHONE_RE = re.compile(r"^\+?[0-9 ()\-]{7,20}$")
+
+
+class RowError(ValueError):
+    """Tek bir CSV satırının doğrulama hatası (içe aktarma devam eder)."""
+
+
+class ImportResult:
+    """İçe aktarma sonucu: sayaçlar, satır hataları ve (varsa) tüm içe aktarmayı durduran hata."""
+
+    def __init__(self, kind, path):
+        self.kind = kind
+        self.path = path
+        self.rows = 0 # Okunan veri satırı (başlık hariç)
+        self.valid = 0
+        self.inserted = 0
+        self.updated = 0
+        self.created_categories = 0
+        self.matched_by_name = 0 # Aynı adlı telefonsuz müşteriyle eşleşip güncellenen satır
+        self.errors = [] # (satır numarası, mesaj)
+        self.success = False
+        self.message = ""
+        self.seconds = 0.0
+
+    def add_error(self, line_no, message):
+        self.errors.append((line_no, message))
+
+    def counts_text(self):
+        text = (f"{self.rows} satır okundu: {self.inserted} yeni, {self.updated} güncellendi, "
+                f"{len(self.errors)} hatalı satır atlandı ({self.seconds:.1f} sn).")
+        if self.created_categories:
+            text += f" {self.created_categories} yeni kategori oluşturuldu."
+        if self.matched_by_name:
+            text += f" {self.matched_by_name} telefonsuz satır ada göre mevcut müşteriyle eşleşti."
+        return text
+
+    def summary_text(self, max_errors=constants.CSV_IMPORT_ERROR_PREVIEW):
+        """Kullanıcıya gösterilecek özet (ilk max_errors satır hatası dahil)."""
+        lines = [self.counts_text() if self.success else self.message]
+        for line_no, message in self.errors[:max_errors]:
+            lines.append(f"Satır {line_no}: {message}")
+        if len(self.errors) > max_errors:
+            lines.append(f"... ve {len(self.errors) - max_errors} hata daha.")
+        return "\n".join(lines)
+
+
+# --- Alan Dönüştürücüler ---
+def _text(value, field, required=True):
+    value = (value or "").strip()
+    if required and not value:
+        raise RowError(f"'{field}' boş olamaz.")
+    return value or None
+
+
+def _number(value, field, minimum=None):
+    """'12.50', '12,50' veya '1.250,50' biçimindeki sayıyı okur; boşsa None."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    if ',' in value:
+        value = value.replace('.', '').replace(',', '.') # Türkçe biçim: binlik nokta, ondalık virgül
+    try:
+        number = float(value)
+    except ValueError:
+        raise RowError(f"'{field}' sayı olmalı: '{value}'.") from None
+    if minimum is not None and number < minimum:
+        raise RowError(f"'{field}' en az {minimum} olmalı: {number}.")
+    return number
+
+
+def _money(value, field, minimum=None):
+    """Tutar alanı: _number ile aynı biçimler, kuruşa yuvarlanmış Money; boşsa None."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        amount = Money.parse(value)
+    except ValueError:
+        raise RowError(f"'{field}' sayı olmalı: '{value}'.") from None
+    if minimum is not None and amount < minimum:
+        raise RowError(f"'{field}' en az {minimum} olmalı: {amount}.")
+    return amount
+
+
+def _flag(value, field):
+    """1/0 bayrağı; boşsa None (mevcut değer korunur)."""
+    value = (value or "").strip().lower()
+    if not value:
+        return None
+    if value in _TRUE_VALUES:
+        return 1
+    if value in _FALSE_VALUES:
+        return 0
+    raise RowError(f"'{field}' 1/0, evet/hayır veya aktif/pasif olmalı: '{value}'.")
+
+
+def _integer(value, field):
+    number = _number(value, field, minimum=0)
+    if number is None:
+        return None
+    if number != int(number):
+        raise RowError(f"'{field}' tam sayı olmalı: {number}.")
+    return int(number)
+
+
+# --- Satır Doğrulayıcılar (dict -> parametre tuple'ı) ---
+def _category_row(row):
+    return (_text(row.get('adi'), 'adi'),)
+
+
+def _product_row(row):
+    fiyat = _money(row.get('fiyat'), 'fiyat', minimum=Money(1))
+    if fiyat is None:
+        raise RowError("'fiyat' boş olamaz.")
+    return (_text(row.get('adi'), 'adi'), fiyat, _text(row.get('kategori'), 'kategori', required=False),
+            _flag(row.get('aktif_durumu'), 'aktif_durumu'), _integer(row.get('hizli_satis_sirasi'), 'hizli_satis_sirasi'))
+
+
+def _customer_row(row):
+    telefon = _text(row.get('telefon'), 'telefon', required=False)
+    if telefon is not None and not _PHONE_RE.match(telefon):
+        raise RowError(f"'telefon' geçersiz: '{telefon}'.")
+    return (_text(row.get('ad_soyad'), 'ad_soyad'), telefon, _money(row.get('bakiye'), 'bakiye'))
+
+
+_ROW_PARSERS = {'kategoriler': _category_row, 'urunler': _product_row, 'musteriler': _customer_row}
+
+
+def _open_reader(csv_file):
+    """Ayraç ilk satırlardan tahmin edilir; başlıklar küçük harfe çevrilir."""
+    sample = csv_file.read(4096)
+    csv_file.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(csv_file, dialect)
+    header = next(reader, None)
+    return reader, [column.strip().lower() for column in header] if header else None
+
+
+def import_csv(db_manager, kind, path, create_missing_categories=True, batch_size=constants.CSV_IMPORT_BATCH_SIZE,
+               progress_callback=None, cancel_event=None):
+    """CSV dosyasını tek transaction'da içe aktarır ve ImportResult döndürür.
+
+    kind: 'kategoriler', 'urunler' veya 'musteriler'. Ürünlerde kategori adları tek bir ad -> kategori_id eşlemesiyle
+    çözülür; olmayan kategoriler create_missing_categories=True ise aynı transaction'da oluşturulur, değilse satır hatalıdır.
+    progress_callback(okunan satır, 0, mesaj) her grup yazıldığında çağrılır; cancel_event grup sınırlarında kontrol edilir.
+    """
+    result = ImportResult(kind, path)
+    if kind not in IMPORT_KINDS:
+        result.message = f"Bilinmeyen içe aktarma türü: {kind}"
+        return result
+    parse_row = _ROW_PARSERS[kind]
+    t0 = time.perf_counter()
+
+    try:
+        with open(path, newline='', encoding='utf-8-sig') as csv_file, db_manager.transaction():
+            reader, header = _open_reader(csv_file)
+            if not header:
+                result.message = "Dosya boş veya başlık satırı yok."
+                return result
+            missing = [column for column in IMPORT_KINDS[kind]['required'] if column not in header]
+            if missing:
+                result.message = f"Eksik sütun(lar): {', '.join(missing)}. Başlık: {', '.join(header)}"
+                return result
+
+            category_ids = None
+            if kind == 'urunler':
+                category_ids = db_manager.upsert_categories([]) # Tek ad -> kategori_id eşlemesi
+                category_count = len(category_ids)
+
+            batch = []
+            batch_lines = [] # batch satırlarının dosyadaki satır numaraları
+            for values in reader:
+                line_no = reader.line_num # Tırnak içinde satır sonu olan alanlarda da dosyadaki satır
+                if not any(value.strip() for value in values):
+                    continue # Boş satır
+                result.rows += 1
+                try:
+                    if len(values) > len(header):
+                        raise RowError(f"Başlıkta {len(header)} sütun var, satırda {len(values)}.")
+                    params = parse_row(dict(zip(header, values)))
+                except RowError as e:
+                    result.add_error(line_no, str(e))
+                    continue
+
+                if category_ids is not None and params[2] is not None:
+                    kategori_id = category_ids.get(params[2])
+                    if kategori_id is None:
+                        if not create_missing_categories:
+                            result.add_error(line_no, f"Kategori bulunamadı: '{params[2]}'.")
+                            continue
+                        category_ids = db_manager.upsert_categories([params[2]])
+                        kategori_id = category_ids[params[2]]
+                    params = (params[0], params[1], kategori_id) + params[3:]
+                batch.append(params)
+                batch_lines.append(line_no)
+                result.valid += 1
+
+                if len(batch) >= batch_size:
+                    _write_batch(db_manager, kind, batch, batch_lines, result)
+                    batch = []
+                    batch_lines = []
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise _Cancelled()
+                    if progress_callback:
+                        progress_callback(result.rows, 0, f"{result.rows} satır işlendi")
+            _write_batch(db_manager, kind, batch, batch_lines, result)
+            if category_ids is not None:
+                result.created_categories = len(category_ids) - category_count
+    except _Cancelled:
+        result.message = "İçe aktarma iptal edildi, hiçbir satır yazılmadı."
+        return result
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        print(f"CSV okuma hatası ({path}): {e}")
+        result.message = f"Dosya okunamadı: {e}"
+        return result
+    except sqlite3.Error as e:
+        print(f"CSV içe aktarma veritabanı hatası ({kind}, {path}): {e}")
+        result.message = f"İçe aktarma sırasında veritabanı hatası oluştu, hiçbir satır yazılmadı: {e}"
+        return result
+    finally:
+        if kind in ('kategoriler', 'urunler'):
+            db_manager.catalogue.invalidate()
+
+    result.seconds = time.perf_counter() - t0
+    result.success = True
+    result.message = result.counts_text()
+    print(f"CSV içe aktarma ({kind}, {path}): {result.message}")
+    return result
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def _write_batch(db_manager, kind, batch, batch_lines, result):
+    if not batch:
+        return
+    skipped = []
+    if kind == 'kategoriler':
+        existing = len(db_manager.upsert_categories([]))
+        inserted = len(db_manager.upsert_categories([params[0] for params in batch])) - existing
+    elif kind == 'urunler':
+        inserted = db_manager.bulk_upsert_products(batch)
+    else:
+        inserted, matched_by_name, skipped = db_manager.bulk_upsert_customers(batch)
+        result.matched_by_name += matched_by_name
+        for index in skipped:
+            result.add_error(batch_lines[index], f"Telefonsuz müşteri '{batch[index][0]}': aynı adlı birden fazla telefonsuz "
+                                                 f"müşteri var, hangisi olduğu belirsiz. Satır atlandı.")
+        result.valid -= len(skipped)
+    result.inserted += inserted
+    result.updated += len(batch) - inserted - len(skipped)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kategori, ürün veya müşteri listesini CSV dosyasından içe aktarır.")
+    parser.add_argument("kind", choices=sorted(IMPORT_KINDS))
+    parser.add_argument("path", help="CSV dosyası (UTF-8, başlık satırlı)")
+    parser.add_argument("--db", default=constants.DB_NAME, help="Veritabanı dosyası")
+    parser.add_argument("--no-create-categories", action="store_true",
+                        help="Ürünlerde olmayan kategorileri oluşturmak yerine satırı hatalı say")
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db, interactive=False)
+    try:
+        result = import_csv(db_manager, args.kind, args.path, create_missing_categories=not args.no_create_categories)
+        print(result.summary_text(max_errors=len(result.errors)))
+        return 0 if result.success else 1
+    finally:
+        db_manager.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
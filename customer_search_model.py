@@ -0,0 +1,65 @@
+# customer_search_model.py
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, Signal
+
+from database import DatabaseManager
+
+# --- Müşteri Arama Modeli ---
+# Adisyon sekmesindeki müşteri seçicinin (QCompleter) modeli. Müşteri listesinin tamamı yüklenmez; her aramada
+# DatabaseManager.search_customers ile sadece en iyi CUSTOMER_SEARCH_LIMIT eşleşme alınır ve model sıfırlanır.
+# Arama veritabanı kuyruğunun (db_executor) okuyucularında çalışır; yazarken arayüz beklemez. Sonuç geldiğinde daha
+# yeni bir arama gönderilmişse eski sonuç atılır.
+
+CUSTOMER_ID_ROLE = Qt.UserRole
+
+
+def customer_display_text(ad_soyad, telefon):
+    return f"{ad_soyad} ({telefon or 'Telefon Yok'})"
+
+
+class CustomerSearchModel(QAbstractListModel):
+    """Son aramanın sonuçlarını "Ad Soyad (telefon)" metni ve musteri_id (CUSTOMER_ID_ROLE) olarak sunar."""
+
+    search_finished = Signal(int) # Model yeni sonuçlarla sıfırlandı: sonuç sayısı
+
+    def __init__(self, db_executor, parent=None):
+        super().__init__(parent)
+        self.db_executor = db_executor
+        self._rows = [] # (musteri_id, görünen metin)
+        self.last_query = None # Modeldeki sonuçların araması
+        self.requested_query = None # Son gönderilen arama (sonucu henüz gelmemiş olabilir)
+
+    def search(self, text):
+        """Metne uyan müşterilerin aramasını kuyruğa gönderir (sadece ilk CUSTOMER_SEARCH_LIMIT kayıt)."""
+        self.requested_query = text
+        self.db_executor.submit_read(DatabaseManager.search_customers, text,
+                                     on_result=lambda customers: self._on_search_result(text, customers))
+
+    def _on_search_result(self, text, customers):
+        if text != self.requested_query:
+            return # Bu arada daha yeni bir arama gönderildi veya model temizlendi
+        self.beginResetModel()
+        self._rows = [(c['musteri_id'], customer_display_text(c['ad_soyad'], c['telefon'])) for c in customers]
+        self.last_query = text
+        self.endResetModel()
+        self.search_finished.emit(len(self._rows))
+
+    def clear(self):
+        self.beginResetModel()
+        self._rows = []
+        self.last_query = None
+        self.requested_query = None
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        musteri_id, text = self._rows[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return text
+        if role == CUSTOMER_ID_ROLE:
+            return musteri_id
+        return None
@@ -7,35 +7,290 @@ from datetime import datetime, date, timedelta
 import constants
 import os # Arşiv dosyası oluşturmak için
 import shutil # Dosya kopyalama için
+import calendar # Zaman damgası <-> epoch dönüşümü için
+from contextlib import contextmanager
+from urllib.request import pathname2url # Salt okunur bağlantı URI'si için
+from catalogue_cache import CatalogueCache, CatalogueSnapshot
+from report_federation import ArchiveCatalog, archive_db_path, epoch_sql, kurus_sql, money_columns_in_kurus
+from money import Money, ZERO
+from search_text import fold_text, phone_digits, sql_fold, sql_phone_digits, strip_like_wildcards
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def to_epoch(dt):
+    """datetime'ı (saat dilimi olmadan, yerel saat) tamsayı saniyeye çevirir.
+
+    Değer SQLite'ın strftime('%s', '<YYYY-MM-DD HH:MM:SS>') sonucu ile aynıdır,
+    bu sayede metin sütunlardan migration ile doldurulan değerlerle tutarlı kalır.
+    """
+    return calendar.timegm(dt.timetuple())
+
+
+def date_range_to_epochs(start_date, end_date):
+    """'YYYY-MM-DD' (veya date/datetime) başlangıç-bitiş tarihlerini yarı açık [başlangıç, bitiş+1 gün) epoch aralığına çevirir."""
+    start = datetime.strptime(str(start_date)[:10], "%Y-%m-%d")
+    end = datetime.strptime(str(end_date)[:10], "%Y-%m-%d") + timedelta(days=1)
+    return to_epoch(start), to_epoch(end)
+
+
+def apply_connection_profile(conn, profile_name=None):
+    """constants.DB_CONNECTION_PROFILES içindeki PRAGMA ayarlarını verilen bağlantıya uygular."""
+    profile_name = profile_name or constants.DB_CONNECTION_PROFILE
+    profile = constants.DB_CONNECTION_PROFILES.get(profile_name)
+    if profile is None:
+        print(f"Bilinmeyen bağlantı profili: {profile_name}, varsayılan SQLite ayarları kullanılıyor.")
+        return None
+
+    # journal_mode önce ayarlanmalı, synchronous'ın anlamı journal moduna göre değişir.
+    # PRAGMA değerleri parametre olarak geçilemediği için sadece constants.py'deki sabit değerler kullanılır.
+    for pragma in ('journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'temp_store', 'foreign_keys', 'busy_timeout'):
+        if pragma in profile:
+            conn.execute(f"PRAGMA {pragma} = {profile[pragma]}").fetchall()
+    return profile_name
+
+
+def _add_column_if_missing(cursor, table, column, declaration):
+    """Tabloda sütun yoksa ALTER TABLE ile ekler (migration'ların tekrar çalıştırılabilir olması için)."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+
+# Tamsayı kuruşa çevrilen tutar sütunları (şema sürümü 5): tablo -> [(sütun, yeni tanım), ...]
+MONEY_COLUMNS = {
+    'masalar': [('guncel_toplam', 'INTEGER DEFAULT 0'), ('iskonto', 'INTEGER DEFAULT 0')],
+    'urunler': [('fiyat', 'INTEGER NOT NULL DEFAULT 0')],
+    'siparis_gecmisi': [('toplam_tutar', 'INTEGER DEFAULT 0'), ('iskonto', 'INTEGER DEFAULT 0'),
+                        ('odenen_tutar', 'INTEGER DEFAULT 0')],
+    'siparis_detaylari': [('birim_fiyat', 'INTEGER NOT NULL DEFAULT 0'), ('tutar', 'INTEGER NOT NULL DEFAULT 0')],
+    'musteriler': [('bakiye', 'INTEGER DEFAULT 0')],
+}
+
+
+def _convert_money_columns_to_kurus(cursor):
+    """REAL (TL) tutar sütunlarını tamsayı kuruş (INTEGER) sütunlara çevirir; zaten INTEGER olanlar atlanır.
+
+    Her sütun için yeni sütun eklenir, değer CAST(ROUND(x * 100)) ile doldurulur, eski sütun silinir ve yeni sütun eski
+    adla yeniden adlandırılır (SQLite 3.35+). Sütun tablonun sonuna taşınır; kod sütunlara her zaman adıyla erişir.
+    """
+    for table, columns in MONEY_COLUMNS.items():
+        cursor.execute(f"PRAGMA table_info({table})")
+        declared_types = {row[1]: (row[2] or '').upper() for row in cursor.fetchall()}
+        for column, declaration in columns:
+            if declared_types.get(column) == 'INTEGER':
+                continue
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column}_kurus {declaration}")
+            cursor.execute(f"UPDATE {table} SET {column}_kurus = CAST(ROUND({column} * 100) AS INTEGER) WHERE {column} IS NOT NULL")
+            cursor.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+            cursor.execute(f"ALTER TABLE {table} RENAME COLUMN {column}_kurus TO {column}")
+
+
+def _customer_search_text_sql(prefix=""):
+    """Müşteri arama metni: Türkçe harfleri indirgenmiş ad + ' ' + sadece rakamlardan oluşan telefon (search_text)."""
+    return f"{sql_fold(prefix + 'ad_soyad')} || ' ' || {sql_phone_digits(prefix + 'telefon')}"
+
+
+def _create_customer_search_index(cursor):
+    """Müşteri adı/telefonu için FTS5 trigram tablosu ve onu güncel tutan tetikleyiciler.
+
+    SQLite FTS5 olmadan derlenmişse tablo oluşturulmaz; search_customers o durumda musteriler tablosunu tarar.
+    """
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS musteri_arama USING fts5(arama_metni, tokenize='trigram')")
+    except sqlite3.OperationalError as e:
+        print(f"FTS5 trigram desteklenmiyor, müşteri araması indekssiz çalışacak: {e}")
+        return
+    cursor.execute("DELETE FROM musteri_arama")
+    cursor.execute(f"INSERT INTO musteri_arama (rowid, arama_metni) SELECT musteri_id, {_customer_search_text_sql()} FROM musteriler")
+    cursor.execute(f"""CREATE TRIGGER IF NOT EXISTS musteriler_arama_ekle AFTER INSERT ON musteriler BEGIN
+                           INSERT INTO musteri_arama (rowid, arama_metni) VALUES (new.musteri_id, {_customer_search_text_sql('new.')});
+                       END""")
+    cursor.execute(f"""CREATE TRIGGER IF NOT EXISTS musteriler_arama_guncelle AFTER UPDATE OF ad_soyad, telefon ON musteriler BEGIN
+                           UPDATE musteri_arama SET arama_metni = {_customer_search_text_sql('new.')} WHERE rowid = old.musteri_id;
+                       END""")
+    cursor.execute("""CREATE TRIGGER IF NOT EXISTS musteriler_arama_sil AFTER DELETE ON musteriler BEGIN
+                          DELETE FROM musteri_arama WHERE rowid = old.musteri_id;
+                      END""")
+
+
+# --- Şema Sürümleri (Migration) ---
+# Her kayıt: (sürüm, açıklama, adımlar listesi). Adım bir SQL komutu veya cursor alan bir fonksiyon olabilir.
+# Uygulanan son sürüm settings tablosunda 'schema_version' anahtarıyla saklanır;
+# açılışta sadece henüz uygulanmamış sürümler sırayla ve her biri tek transaction içinde çalıştırılır.
+# Yeni indeks/şema değişikliği gerektiğinde listenin sonuna yeni sürüm eklenmeli, eski kayıtlar değiştirilmemelidir.
+SCHEMA_MIGRATIONS = [
+    (1, "Rapor, sepet ve masa sorguları için ikincil indeksler", [
+        # Sepet yükleme (get_order_details), toplam hesaplama ve ürün satış raporu için.
+        # Rapor sütunlarını da içerdiği için ürün raporu tabloya dönmeden indeksten okunur (covering).
+        """CREATE INDEX IF NOT EXISTS idx_siparis_detaylari_siparis
+               ON siparis_detaylari (siparis_id, kategori_id, urun_adi, miktar, tutar)""",
+        # Satış özeti ve arşivleme: durum = 'Kapandı' + kapanış zamanı aralığı (covering)
+        """CREATE INDEX IF NOT EXISTS idx_siparis_gecmisi_durum_kapanis
+               ON siparis_gecmisi (durum, kapanis_zamani, toplam_tutar, iskonto, odenen_tutar)""",
+        # Müşteri silme kontrolü (siparis_gecmisi.musteri_id sayımı)
+        "CREATE INDEX IF NOT EXISTS idx_siparis_gecmisi_musteri ON siparis_gecmisi (musteri_id)",
+        # Her ürün eklemede çalışan 'UPDATE masalar ... WHERE aktif_siparis_id = ?' sorguları için
+        "CREATE INDEX IF NOT EXISTS idx_masalar_aktif_siparis ON masalar (aktif_siparis_id)",
+    ]),
+    (2, "Kapanış zamanı için indekslenebilir epoch sütunu (kapanis_epoch)", [
+        # date(kapanis_zamani) gibi sütunu saran ifadeler indeks kullanamaz;
+        # raporlar artık kapanis_epoch üzerinde yarı açık aralık (>= başlangıç AND < bitiş) kullanır.
+        lambda cursor: _add_column_if_missing(cursor, 'siparis_gecmisi', 'kapanis_epoch', 'INTEGER'),
+        """UPDATE siparis_gecmisi
+               SET kapanis_epoch = CAST(strftime('%s', kapanis_zamani) AS INTEGER)
+               WHERE kapanis_zamani IS NOT NULL AND kapanis_epoch IS NULL""",
+        "DROP INDEX IF EXISTS idx_siparis_gecmisi_durum_kapanis",
+        """CREATE INDEX IF NOT EXISTS idx_siparis_gecmisi_durum_kapanis_epoch
+               ON siparis_gecmisi (durum, kapanis_epoch, toplam_tutar, iskonto, odenen_tutar)""",
+    ]),
+    (3, "Günlük satış özet (rollup) tabloları", [
+        # Gün × ödeme yöntemi; gun_epoch = kapanış gününün başlangıcı (kapanis_epoch - kapanis_epoch % 86400)
+        """CREATE TABLE IF NOT EXISTS satis_ozeti_gunluk (
+               gun_epoch INTEGER NOT NULL,
+               odeme_yontemi TEXT NOT NULL, -- NULL ödeme yöntemi '' olarak tutulur
+               adisyon_sayisi INTEGER NOT NULL DEFAULT 0,
+               brut_satis REAL NOT NULL DEFAULT 0.0,
+               toplam_iskonto REAL NOT NULL DEFAULT 0.0,
+               net_satis REAL NOT NULL DEFAULT 0.0,
+               PRIMARY KEY (gun_epoch, odeme_yontemi)
+           ) WITHOUT ROWID""",
+        # Gün × ürün × kategori; kategorisiz satırlar kategori_id = 0 ile tutulur
+        """CREATE TABLE IF NOT EXISTS urun_satis_gunluk (
+               gun_epoch INTEGER NOT NULL,
+               urun_adi TEXT NOT NULL,
+               kategori_id INTEGER NOT NULL,
+               toplam_miktar REAL NOT NULL DEFAULT 0.0,
+               toplam_tutar REAL NOT NULL DEFAULT 0.0,
+               PRIMARY KEY (gun_epoch, urun_adi, kategori_id)
+           ) WITHOUT ROWID""",
+        # Mevcut (ve arşivlenmiş) kapanmış siparişler açılışta rebuild_sales_rollups ile bir kez özetlenir
+        "INSERT OR REPLACE INTO settings (key, value) VALUES ('sales_rollups_stale', '1')",
+    ]),
+    (4, "Müşteri arama indeksi (ad öneki ve ad/telefon alt dizesi)", [
+        # Kısa (1-2 karakter) aramalar: indirgenmiş ad üzerinde ifade indeksi, alfabetik önek aralığı
+        f"CREATE INDEX IF NOT EXISTS idx_musteriler_ad_arama ON musteriler ({sql_fold('ad_soyad')})",
+        # Uzun aramalar: ad ve telefonun herhangi bir yerinde geçen metin (trigram)
+        _create_customer_search_index,
+    ]),
+    (5, "Tutarlar tamsayı kuruş (fiyat, tutar, iskonto, ödenen, bakiye, günlük özetler)", [
+        # Tutar sütunlarını içeren indeksler sütun silinmeden önce kaldırılır, dönüşümden sonra aynen oluşturulur
+        "DROP INDEX IF EXISTS idx_siparis_gecmisi_durum_kapanis_epoch",
+        "DROP INDEX IF EXISTS idx_siparis_detaylari_siparis",
+        _convert_money_columns_to_kurus,
+        """CREATE INDEX IF NOT EXISTS idx_siparis_gecmisi_durum_kapanis_epoch
+               ON siparis_gecmisi (durum, kapanis_epoch, toplam_tutar, iskonto, odenen_tutar)""",
+        """CREATE INDEX IF NOT EXISTS idx_siparis_detaylari_siparis
+               ON siparis_detaylari (siparis_id, kategori_id, urun_adi, miktar, tutar)""",
+        # Günlük özetler kuruş sütunlarla yeniden oluşturulur ve açılışta ham tablolardan tekrar hesaplanır
+        "DROP TABLE IF EXISTS satis_ozeti_gunluk",
+        "DROP TABLE IF EXISTS urun_satis_gunluk",
+        """CREATE TABLE satis_ozeti_gunluk (
+               gun_epoch INTEGER NOT NULL,
+               odeme_yontemi TEXT NOT NULL,
+               adisyon_sayisi INTEGER NOT NULL DEFAULT 0,
+               brut_satis INTEGER NOT NULL DEFAULT 0,
+               toplam_iskonto INTEGER NOT NULL DEFAULT 0,
+               net_satis INTEGER NOT NULL DEFAULT 0,
+               PRIMARY KEY (gun_epoch, odeme_yontemi)
+           ) WITHOUT ROWID""",
+        """CREATE TABLE urun_satis_gunluk (
+               gun_epoch INTEGER NOT NULL,
+               urun_adi TEXT NOT NULL,
+               kategori_id INTEGER NOT NULL,
+               toplam_miktar REAL NOT NULL DEFAULT 0.0,
+               toplam_tutar INTEGER NOT NULL DEFAULT 0,
+               PRIMARY KEY (gun_epoch, urun_adi, kategori_id)
+           ) WITHOUT ROWID""",
+        "INSERT OR REPLACE INTO settings (key, value) VALUES ('sales_rollups_stale', '1')",
+    ]),
+    (6, "Müşteri ad + telefon indeksi (CSV içe aktarmada telefonsuz müşterileri adla eşleştirme)", [
+        # Kısmi indeks (WHERE telefon IS NULL) yerine bileşik indeks: telefon üzerindeki UNIQUE indeks 'telefon IS NULL'
+        # koşulunda tek satır bekleneceği varsayımıyla seçilirdi, bileşik indeks her iki eşitliği karşıladığı için tercih edilir
+        "CREATE INDEX IF NOT EXISTS idx_musteriler_ad_telefon ON musteriler (ad_soyad, telefon)",
+    ]),
+]
+
+# Kapanmış siparişin gün anahtarı (kapanis_epoch yerel saat UTC gibi yorumlandığı için gün sınırları 86400'e hizalıdır)
+SECONDS_PER_DAY = 86400
+
 
 class DatabaseManager:
-    def __init__(self, db_name=constants.DB_NAME):
+    def __init__(self, db_name=constants.DB_NAME, connection_profile=None, interactive=True, read_only=False):
         self.db_name = db_name
+        self.connection_profile = connection_profile or constants.DB_CONNECTION_PROFILE
+        # interactive=False: arka plan iş parçacığı bağlantısı (maintenance_jobs); hatalar diyalog açmadan sadece yazdırılır
+        self.interactive = interactive
+        # read_only=True: rapor bağlantısı (report_query_executor); dosya salt okunur açılır, şema kurulumu yapılmaz
+        self.read_only = read_only
         self.conn = None
         self.cursor = None
+        self._transaction_depth = 0 # transaction() iç içe kullanım sayacı
+        self.catalogue = None # Ürün/kategori önbelleği (CatalogueCache), bağlantı kurulunca oluşturulur
+        self.archives = ArchiveCatalog(db_name) # Raporların birlikte sorguladığı arşiv dosyaları
+        self._customer_search_fts = None # musteri_arama (FTS5) tablosu var mı; ilk aramada kontrol edilir
         self._connect_db()
+        if self.read_only:
+            return # Şema, migration ve varsayılan veriler yazma bağlantısı tarafından hazırlanır
         self._create_tables()
+        self._apply_migrations()
         self._add_default_data()
+        # Günlük satış özetleri geçersizse (yeni şema, yarıda kalmış yeniden oluşturma) ham tablolardan oluşturulur
+        if self.get_setting('sales_rollups_stale', '0') == '1':
+            self.rebuild_sales_rollups()
 
     def _connect_db(self):
         """SQLite veritabanı bağlantısını kurar."""
         try:
-            self.conn = sqlite3.connect(self.db_name)
+            if self.read_only:
+                self.conn = sqlite3.connect(f"file:{pathname2url(os.path.abspath(self.db_name))}?mode=ro", uri=True)
+            else:
+                self.conn = sqlite3.connect(self.db_name)
             # Sorgu sonuçlarına sütun isimleriyle erişmek için
             self.conn.row_factory = sqlite3.Row
+            # WAL, synchronous, önbellek ve foreign key ayarları (constants.DB_CONNECTION_PROFILES)
+            apply_connection_profile(self.conn, self.connection_profile)
             self.cursor = self.conn.cursor()
-            print("Veritabanı bağlantısı başarılı.")
+            self.catalogue = CatalogueCache(self.conn)
+            print(f"Veritabanı bağlantısı başarılı. (Profil: {self.connection_profile})")
         except sqlite3.Error as e:
             print(f"Veritabanı bağlantı hatası: {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Veritabanına bağlanılamadı: {e}")
+            self._show_error("Veritabanı Hatası", f"Veritabanına bağlanılamadı: {e}")
+            if not self.interactive:
+                raise # Arka plan işi başarısız olur, uygulama çalışmaya devam eder
             sys.exit() # Bağlantı kurulamıyorsa uygulamayı sonlandır
 
+    def _show_error(self, title, message):
+        """Hata diyaloğu gösterir (sadece arayüz bağlantısında; arka plan işlerinde hata dönüş değeriyle bildirilir)."""
+        if self.interactive:
+            messagebox.showerror(title, message)
+
     def close(self):
         """Veritabanı bağlantısını kapatır."""
         if self.conn:
             self.conn.close()
             print("Veritabanı bağlantısı kapatıldı.")
 
+    @contextmanager
+    def transaction(self):
+        """İş birimi (unit of work): blok içindeki tüm yazmalar tek commit ile kaydedilir.
+
+        Blokta hata oluşursa tüm değişiklikler geri alınır ve hata yeniden fırlatılır.
+        İç içe kullanımda sadece en dıştaki blok commit/rollback yapar.
+        """
+        outermost = self._transaction_depth == 0
+        self._transaction_depth += 1
+        try:
+            yield self.cursor
+            if outermost:
+                self.conn.commit()
+        except BaseException:
+            if outermost:
+                self.conn.rollback()
+            raise
+        finally:
+            self._transaction_depth -= 1
+
     def _create_tables(self):
         """Gerekli veritabanı tablolarını oluşturur."""
         try:
@@ -46,8 +301,8 @@ class DatabaseManager:
                     masa_no INTEGER UNIQUE NOT NULL,
                     durum TEXT DEFAULT 'Boş', -- 'Boş', 'Dolu', 'Ödeme Bekliyor', 'Geçikmiş'
                     aktif_siparis_id INTEGER, -- O anki aktif siparişin ID'si
-                    guncel_toplam REAL DEFAULT 0.0, -- İskonto ve parçalı ödeme sonrası kalan net tutar
-                    iskonto REAL DEFAULT 0.0, -- Uygulanan toplam iskonto
+                    guncel_toplam INTEGER DEFAULT 0, -- İskonto ve parçalı ödeme sonrası kalan net tutar (kuruş)
+                    iskonto INTEGER DEFAULT 0, -- Uygulanan toplam iskonto (kuruş)
                     FOREIGN KEY (aktif_siparis_id) REFERENCES siparis_gecmisi(siparis_id)
                 );
             """)
@@ -65,7 +320,7 @@ class DatabaseManager:
                 CREATE TABLE IF NOT EXISTS urunler (
                     urun_id INTEGER PRIMARY KEY AUTOINCREMENT,
                     adi TEXT UNIQUE NOT NULL,
-                    fiyat REAL NOT NULL,
+                    fiyat INTEGER NOT NULL DEFAULT 0, -- Kuruş
                     kategori_id INTEGER,
                     aktif_durumu INTEGER DEFAULT 1, -- 1: Aktif, 0: Pasif (BOOLEAN SQLite'da INTEGER'dır)
                     hizli_satis_sirasi INTEGER, -- Hızlı satış ekranındaki sıralama (0: görünmez)
@@ -80,11 +335,11 @@ class DatabaseManager:
                     siparis_id INTEGER PRIMARY KEY AUTOINCREMENT,
                     masa_no INTEGER NOT NULL,
                     acilis_zamani TEXT NOT NULL,
-                    kapanis_zamani TEXT,
+                    kapanis_zamani TEXT, -- kapanis_epoch (tamsayı saniye) sütunu şema sürümü 2 ile eklenir
                     durum TEXT DEFAULT 'Açık', -- 'Açık', 'Kapandı', 'İptal Edildi'
-                    toplam_tutar REAL DEFAULT 0.0, -- Kapanış anındaki toplam brüt tutar
-                    iskonto REAL DEFAULT 0.0, -- Kapanış anındaki toplam iskonto
-                    odenen_tutar REAL DEFAULT 0.0, -- Yapılan parçalı ödemeler dahil toplam ödenen tutar
+                    toplam_tutar INTEGER DEFAULT 0, -- Kapanış anındaki toplam brüt tutar (kuruş)
+                    iskonto INTEGER DEFAULT 0, -- Kapanış anındaki toplam iskonto (kuruş)
+                    odenen_tutar INTEGER DEFAULT 0, -- Yapılan parçalı ödemeler dahil toplam ödenen tutar (kuruş)
                     odeme_yontemi TEXT, -- 'Nakit', 'Kart', 'Müşteri Bakiyesi' vb. (Son ödeme veya ana ödeme yöntemi)
                     son_islem_zamani TEXT, -- Masa durumu takibi için son ürün ekleme/ödeme zamanı
                     musteri_id INTEGER, -- İlişkilendirilen müşteri
@@ -102,8 +357,8 @@ class DatabaseManager:
                     urun_id INTEGER, -- Bağlantılı ürün (ON DELETE SET NULL)
                     urun_adi TEXT NOT NULL, -- Ürün adı (raporlama kolaylığı ve tutarlılık için saklanıyor)
                     miktar REAL NOT NULL,
-                    birim_fiyat REAL NOT NULL, -- Ürünün sipariş anındaki fiyatı
-                    tutar REAL NOT NULL, -- miktar * birim_fiyat
+                    birim_fiyat INTEGER NOT NULL DEFAULT 0, -- Ürünün sipariş anındaki fiyatı (kuruş)
+                    tutar INTEGER NOT NULL DEFAULT 0, -- miktar * birim_fiyat, kuruşa yuvarlanmış
                     kategori_id INTEGER, -- Ürün kategori ID'si (raporlama kolaylığı için saklanıyor) (ON DELETE SET NULL)
                     ekleme_zamani TEXT NOT NULL, -- Ürünün adisyona eklenme zamanı (YYYY-MM-DD HH:MM:SS)
                     FOREIGN KEY (siparis_id) REFERENCES siparis_gecmisi(siparis_id) ON DELETE CASCADE, -- Sipariş silinirse detayları da sil
@@ -118,7 +373,7 @@ class DatabaseManager:
                     musteri_id INTEGER PRIMARY KEY AUTOINCREMENT,
                     ad_soyad TEXT NOT NULL,
                     telefon TEXT UNIQUE,
-                    bakiye REAL DEFAULT 0.0
+                    bakiye INTEGER DEFAULT 0 -- Kuruş
                 );
             """)
 
@@ -151,10 +406,45 @@ class DatabaseManager:
             print("Veritabanı tabloları kontrol edildi/oluşturuldu.")
         except sqlite3.Error as e:
             print(f"Veritabanı tablo oluşturma hatası: {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Veritabanı tabloları oluşturulurken hata oluştu: {e}")
+            self._show_error("Veritabanı Hatası", f"Veritabanı tabloları oluşturulurken hata oluştu: {e}")
             if self.conn:
                 self.conn.rollback()
 
+    def get_schema_version(self):
+        """Veritabanına uygulanmış son şema sürümünü döndürür (hiç uygulanmadıysa 0)."""
+        try:
+            return int(self.get_setting('schema_version', 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def _apply_migrations(self):
+        """SCHEMA_MIGRATIONS listesindeki henüz uygulanmamış sürümleri sırayla uygular."""
+        current_version = self.get_schema_version()
+
+        for version, description, statements in SCHEMA_MIGRATIONS:
+            if version <= current_version:
+                continue
+            try:
+                # DDL komutları sqlite3 modülünde otomatik transaction başlatmaz,
+                # sürümün yarım kalmaması için transaction açıkça başlatılıyor.
+                self.cursor.execute("BEGIN")
+                for statement in statements:
+                    if callable(statement):
+                        statement(self.cursor)
+                    else:
+                        self.cursor.execute(statement)
+                self.cursor.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('schema_version', ?)", (str(version),))
+                self.conn.commit()
+                current_version = version
+                print(f"Şema sürümü {version} uygulandı: {description}")
+            except sqlite3.Error as e:
+                print(f"Şema sürümü {version} uygulanırken hata: {e}")
+                self._show_error("Veritabanı Hatası", f"Veritabanı şeması güncellenirken hata oluştu (Sürüm {version}): {e}")
+                self.conn.rollback()
+                break # Sonraki sürümler bu sürüme bağlı olabilir, devam etme
+
+        return current_version
+
 
     def _add_default_data(self):
         """Veritabanı boşsa varsayılan masa ve ürünleri ekler."""
@@ -188,7 +478,7 @@ class DatabaseManager:
                 for urun_info in constants.DEFAULT_PRODUCTS:
                     adi, fiyat, kategori_adi, aktif_durumu, hizli_satis_sirasi = urun_info
                     kategori_id = kategori_map.get(kategori_adi) # Kategori adına göre ID'yi bul
-                    urunler_to_insert.append((adi, fiyat, kategori_id, aktif_durumu, hizli_satis_sirasi))
+                    urunler_to_insert.append((adi, Money.from_tl(fiyat), kategori_id, aktif_durumu, hizli_satis_sirasi))
 
                 self.cursor.executemany("INSERT INTO urunler (adi, fiyat, kategori_id, aktif_durumu, hizli_satis_sirasi) VALUES (?, ?, ?, ?, ?)", urunler_to_insert)
                 self.conn.commit()
@@ -196,7 +486,7 @@ class DatabaseManager:
 
         except sqlite3.Error as e:
             print(f"Veritabanı varsayılan veri ekleme hatası: {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Varsayılan veriler eklenirken hata oluştu: {e}")
+            self._show_error("Veritabanı Hatası", f"Varsayılan veriler eklenirken hata oluştu: {e}")
             if self.conn:
                 self.conn.rollback()
 
@@ -226,137 +516,231 @@ class DatabaseManager:
 
 
     # --- Arşivleme ve Temizleme Metotları ---
-    def archive_and_delete_old_orders(self, year_to_process):
-        """Belirtilen yıldan önceki tamamlanmış siparişleri arşivler ve ana DB'den siler."""
+    # Arşive taşınan sütunlar (arşiv tabloları ana tablolarla aynı sütun sırasına sahiptir)
+    _ARCHIVE_ORDER_COLUMNS = ("siparis_id, masa_no, acilis_zamani, kapanis_zamani, durum, toplam_tutar, iskonto, "
+                              "odenen_tutar, odeme_yontemi, son_islem_zamani, musteri_id, kapanis_epoch")
+    _ARCHIVE_DETAIL_COLUMNS = "detay_id, siparis_id, urun_id, urun_adi, miktar, birim_fiyat, tutar, kategori_id, ekleme_zamani"
+    _ARCHIVE_MONEY_COLUMNS = ('toplam_tutar', 'iskonto', 'odenen_tutar', 'birim_fiyat', 'tutar')
+
+    @classmethod
+    def _archive_select_columns(cls, columns, money_in_kurus):
+        """Arşive kopyalanacak sütunların SELECT listesi; eski (REAL, TL) arşiv dosyasına tutarlar TL olarak yazılır."""
+        if money_in_kurus:
+            return columns
+        return ", ".join(f"{column} / 100.0" if column in cls._ARCHIVE_MONEY_COLUMNS else column
+                         for column in columns.split(", "))
+
+    def _create_archive_tables(self, cursor, schema='arsiv'):
+        """Bağlı (ATTACH) arşiv veritabanında arşiv tablolarını oluşturur (ana DB'deki yapıyla aynı sütunlar)."""
+        cursor.execute(f"""
+             CREATE TABLE IF NOT EXISTS {schema}.siparis_gecmisi (
+                 siparis_id INTEGER PRIMARY KEY, -- ID'yi koru
+                 masa_no INTEGER,
+                 acilis_zamani TEXT,
+                 kapanis_zamani TEXT,
+                 durum TEXT,
+                 toplam_tutar INTEGER, -- Kuruş (şema sürümü 5 öncesi arşivlerde REAL, TL)
+                 iskonto INTEGER,
+                 odenen_tutar INTEGER,
+                 odeme_yontemi TEXT,
+                 son_islem_zamani TEXT,
+                 musteri_id INTEGER, -- Müşteri ID'sini koru
+                 kapanis_epoch INTEGER
+             );
+         """)
+        cursor.execute(f"""
+             CREATE TABLE IF NOT EXISTS {schema}.siparis_detaylari (
+                 detay_id INTEGER PRIMARY KEY, -- ID'yi koru
+                 siparis_id INTEGER NOT NULL,
+                 urun_id INTEGER,
+                 urun_adi TEXT NOT NULL,
+                 miktar REAL NOT NULL,
+                 birim_fiyat INTEGER NOT NULL,
+                 tutar INTEGER NOT NULL,
+                 kategori_id INTEGER,
+                 ekleme_zamani TEXT NOT NULL -- Ekleme zamanı sütununu ekle
+             );
+         """)
+        # Arşivler raporlarda ana DB ile birlikte sorgulanır; ana DB'deki rapor indekslerinin aynısı
+        cursor.execute(f"""CREATE INDEX IF NOT EXISTS {schema}.idx_siparis_gecmisi_durum_kapanis_epoch
+                               ON siparis_gecmisi (durum, kapanis_epoch, toplam_tutar, iskonto, odenen_tutar)""")
+        cursor.execute(f"""CREATE INDEX IF NOT EXISTS {schema}.idx_siparis_detaylari_siparis
+                               ON siparis_detaylari (siparis_id, kategori_id, urun_adi, miktar, tutar)""")
+
+    def archive_and_delete_old_orders(self, year_to_process, archive_db_name=None, chunk_size=constants.ARCHIVE_CHUNK_SIZE,
+                                      progress_callback=None, cancel_event=None):
+        """Belirtilen yıl ve öncesindeki tamamlanmış siparişleri arşivler ve ana DB'den siler.
+
+        Arşiv dosyası ATTACH ile bağlanır ve veri Python'a okunmadan INSERT ... SELECT / DELETE ile, siparis_id sırasına
+        göre chunk_size siparişlik parçalar halinde taşınır. Her parça önce arşive kopyalanıp commit edilir, sonra ana
+        DB'den silinir ve ilerleme noktası (settings: archive_checkpoint_<yıl>) aynı commit ile kaydedilir. WAL modunda
+        iki dosyaya birden yapılan commit atomik olmadığı için bu sıra bilinçlidir: yarıda kalan bir parça tekrar
+        çalıştırıldığında arşive kopyalama INSERT OR IGNORE ile atlanır, veri kaybolmaz. İşlem kesilirse aynı çağrı
+        kaldığı yerden devam eder.
+
+        progress_callback(taşınan, toplam, mesaj) her parçadan sonra çağrılır. cancel_event (threading.Event) set edilirse
+        işlem parça sınırında durur; ilerleme noktası korunduğu için sonraki çağrı kaldığı yerden devam eder.
+        Bu metot diyalog açmaz, sonucu (başarılı mı, mesaj) olarak döndürür (arka plan işinden çağrılabilir).
+        """
         print(f"Arşivleme ve silme işlemi başlatılıyor: {year_to_process} yılı ve öncesi...")
 
-        try:
-            # Arşivlenecek yılın son gününü belirle
-            end_of_year = datetime(year_to_process, 12, 31, 23, 59, 59).strftime("%Y-%m-%d %H:%M:%S")
-
-            # Arşivlenecek siparişleri ve detaylarını çek
-            self.cursor.execute("""
-                SELECT sg.siparis_id, sg.masa_no, sg.acilis_zamani, sg.kapanis_zamani,
-                       sg.durum, sg.toplam_tutar, sg.iskonto, sg.odenen_tutar,
-                       sg.odeme_yontemi, sg.son_islem_zamani, sg.musteri_id
-                FROM siparis_gecmisi sg
-                WHERE sg.durum = 'Kapandı' -- Sadece kapanmış adisyonlar
-                  AND sg.kapanis_zamani <= ? -- Belirtilen yılın sonuna kadar olanlar
-            """, (end_of_year,))
-            orders_to_archive = self.cursor.fetchall()
-
-            if not orders_to_archive:
-                 print(f"{year_to_process} yılı ve öncesine ait arşivlenecek tamamlanmış sipariş bulunamadı.")
-                 return True, f"{year_to_process} yılı ve öncesine ait arşivlenecek veri yok."
-
-            print(f"Arşivlenecek toplam {len(orders_to_archive)} sipariş bulundu.")
-
-            # Arşiv veritabanı dosya adını belirle
-            archive_db_name = f'cafe_adisyon_archive_{year_to_process}.db'
-            # Arşiv veritabanı bağlantısını kur
-            archive_conn = None
-            archive_cursor = None
-            try:
-                archive_conn = sqlite3.connect(archive_db_name)
-                archive_cursor = archive_conn.cursor()
-                archive_conn.row_factory = sqlite3.Row # Arşiv DB için de row_factory ayarla
-
-                # Arşiv DB'de gerekli tabloları oluştur (ana DB'deki yapıyla aynı olmalı)
-                archive_cursor.execute("""
-                     CREATE TABLE IF NOT EXISTS siparis_gecmisi (
-                         siparis_id INTEGER PRIMARY KEY, -- ID'yi koru
-                         masa_no INTEGER,
-                         acilis_zamani TEXT,
-                         kapanis_zamani TEXT,
-                         durum TEXT,
-                         toplam_tutar REAL,
-                         iskonto REAL,
-                         odenen_tutar REAL,
-                         odeme_yontemi TEXT,
-                         son_islem_zamani TEXT,
-                         musteri_id INTEGER -- Müşteri ID'sini koru
-                     );
-                 """)
-                archive_cursor.execute("""
-                     CREATE TABLE IF NOT EXISTS siparis_detaylari (
-                         detay_id INTEGER PRIMARY KEY, -- ID'yi koru
-                         siparis_id INTEGER NOT NULL,
-                         urun_id INTEGER,
-                         urun_adi TEXT NOT NULL,
-                         miktar REAL NOT NULL,
-                         birim_fiyat REAL NOT NULL,
-                         tutar REAL NOT NULL,
-                         kategori_id INTEGER,
-                         ekleme_zamani TEXT NOT NULL -- Ekleme zamanı sütununu ekle
-                     );
-                 """)
-                archive_conn.commit()
-
-                # Sipariş detaylarını da çek ve arşiv DB'ye kopyala
-                deleted_order_ids = [order['siparis_id'] for order in orders_to_archive]
-                if deleted_order_ids:
-                     # Sipariş detaylarını çek
-                     placeholders = ','.join('?' for _ in deleted_order_ids)
-                     self.cursor.execute(f"""
-                         SELECT detay_id, siparis_id, urun_id, urun_adi, miktar, birim_fiyat, tutar, kategori_id, ekleme_zamani
-                         FROM siparis_detaylari
-                         WHERE siparis_id IN ({placeholders})
-                     """, deleted_order_ids)
-                     details_to_archive = self.cursor.fetchall()
-
-                     # Detayları arşiv DB'ye kopyala
-                     archive_cursor.executemany("""
-                         INSERT OR IGNORE INTO siparis_detaylari (detay_id, siparis_id, urun_id, urun_adi, miktar, birim_fiyat, tutar, kategori_id, ekleme_zamani)
-                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                     """, [(d['detay_id'], d['siparis_id'], d['urun_id'], d['urun_adi'], d['miktar'], d['birim_fiyat'], d['tutar'], d['kategori_id'], d['ekleme_zamani']) for d in details_to_archive])
-                     archive_conn.commit()
-                     print(f"Arşiv DB'ye {len(details_to_archive)} sipariş detayı kopyalandı.")
-
-
-                # Siparişleri arşiv DB'ye kopyala
-                archive_cursor.executemany("""
-                    INSERT OR IGNORE INTO siparis_gecmisi (siparis_id, masa_no, acilis_zamani, kapanis_zamani, durum, toplam_tutar, iskonto, odenen_tutar, odeme_yontemi, son_islem_zamani, musteri_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, [(o['siparis_id'], o['masa_no'], o['acilis_zamani'], o['kapanis_zamani'], o['durum'], o['toplam_tutar'], o['iskonto'], o['odenen_tutar'], o['odeme_yöntemi'], o['son_islem_zamani'], o['musteri_id']) for o in orders_to_archive])
-                archive_conn.commit()
-                print(f"Arşiv DB'ye {len(orders_to_archive)} sipariş kopyalandı.")
-
-
-                print("Arşivleme başarılı.")
-
-                # Ana DB'den silme işlemine geç
-                # sipariş_detaylari'dan silme (FOREIGN KEY ON DELETE CASCADE olduğu için siparişler silinince detayları da silinecek)
-                # Sadece siparis_gecmisi'nden silmek yeterli olabilir.
-                self.cursor.execute(f"""
-                    DELETE FROM siparis_gecmisi
-                    WHERE siparis_id IN ({placeholders})
-                """, deleted_order_ids)
-                self.conn.commit()
-                print(f"Ana DB'den {len(deleted_order_ids)} sipariş silindi.")
-
-                # Ayarlar tablosunu güncelle (son arşivlenen yılı kaydet)
-                self.set_setting("last_archived_year", year_to_process)
-
-                return True, f"{year_to_process} yılı ve öncesine ait tamamlanmış siparişler başarıyla arşivlendi ve ana veritabanından silindi."
-
-            except sqlite3.Error as e:
-                print(f"Arşivleme veya silme hatası: {e}")
-                messagebox.showerror("Veritabanı Hatası", f"Arşivleme veya silme işlemi sırasında hata oluştu: {e}")
-                if archive_conn:
-                     archive_conn.rollback()
-                if self.conn:
-                     self.conn.rollback()
-                return False, f"Arşivleme veya silme işlemi sırasında hata oluştu: {e}"
+        # Arşivlenecek yılın bitişi (sonraki yılın başı, yarı açık aralık)
+        end_of_year_epoch = to_epoch(datetime(year_to_process + 1, 1, 1))
+        # Arşiv veritabanı dosya adı
+        archive_db_name = archive_db_name or archive_db_path(self.db_name, year_to_process)
+        checkpoint_key = f"archive_checkpoint_{year_to_process}"
 
-            finally:
-                # Arşiv DB bağlantısını kapat
-                if archive_conn:
-                    archive_conn.close()
+        try:
+            last_siparis_id = int(self.get_setting(checkpoint_key, 0))
+        except ValueError:
+            last_siparis_id = 0
+        if last_siparis_id:
+            print(f"Önceki arşivleme {last_siparis_id} numaralı siparişte kesilmiş, kaldığı yerden devam ediliyor.")
+
+        archived_orders = 0
+        archived_lines = 0
+        attached = False
+        try:
+            if not last_siparis_id:
+                # Arşivlenecek veri yoksa arşiv dosyası hiç oluşturulmaz
+                self.cursor.execute("""
+                    SELECT 1 FROM siparis_gecmisi WHERE durum = 'Kapandı' AND kapanis_epoch < ? LIMIT 1
+                """, (end_of_year_epoch,))
+                if self.cursor.fetchone() is None:
+                    print(f"{year_to_process} yılı ve öncesine ait arşivlenecek tamamlanmış sipariş bulunamadı.")
+                    return True, f"{year_to_process} yılı ve öncesine ait arşivlenecek veri yok."
+
+            self.cursor.execute("ATTACH DATABASE ? AS arsiv", (archive_db_name,))
+            attached = True
+            with self.transaction() as cursor:
+                self._create_archive_tables(cursor)
+                # Aynı yılın şema sürümü 5 öncesi oluşturulmuş arşivine eklenirken dosyadaki birim (TL) korunur
+                archive_in_kurus = money_columns_in_kurus(self.conn, 'arsiv')
+                order_select = self._archive_select_columns(self._ARCHIVE_ORDER_COLUMNS, archive_in_kurus)
+                detail_select = self._archive_select_columns(self._ARCHIVE_DETAIL_COLUMNS, archive_in_kurus)
+                # Parçadaki sipariş ID'leri; IN (?,?,...) listesi yerine bu tablo kullanılır (parametre sınırı yok)
+                cursor.execute("CREATE TEMP TABLE IF NOT EXISTS arsiv_parca (siparis_id INTEGER PRIMARY KEY)")
+                total_orders = None
+                if progress_callback:
+                    # İlerleme göstergesi için toplam (durum/kapanış indeksinden sayılır)
+                    cursor.execute("""
+                        SELECT COUNT(*) FROM main.siparis_gecmisi
+                        WHERE durum = 'Kapandı' AND kapanis_epoch < ? AND siparis_id > ?
+                    """, (end_of_year_epoch, last_siparis_id))
+                    total_orders = cursor.fetchone()[0]
+
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    print(f"Arşivleme iptal edildi ({archived_orders} sipariş taşındı, son sipariş ID: {last_siparis_id}).")
+                    return False, (f"Arşivleme iptal edildi. {archived_orders} sipariş taşındı; "
+                                   f"işlem tekrar başlatıldığında kaldığı yerden devam edecektir.")
+
+                # 1) Parçayı seç ve arşive kopyala
+                with self.transaction() as cursor:
+                    cursor.execute("DELETE FROM temp.arsiv_parca")
+                    # NOT INDEXED: durum/kapanış indeksi yerine siparis_id (rowid) sırasıyla taranır, her parça
+                    # bir önceki parçanın bittiği yerden başlar
+                    cursor.execute("""
+                        INSERT INTO temp.arsiv_parca (siparis_id)
+                        SELECT siparis_id FROM main.siparis_gecmisi NOT INDEXED
+                        WHERE siparis_id > ?
+                          AND durum = 'Kapandı' -- Sadece kapanmış adisyonlar
+                          AND kapanis_epoch < ? -- Belirtilen yılın sonuna kadar olanlar
+                        ORDER BY siparis_id
+                        LIMIT ?
+                    """, (last_siparis_id, end_of_year_epoch, chunk_size))
+                    if cursor.rowcount <= 0:
+                        break
+
+                    cursor.execute(f"""
+                        INSERT OR IGNORE INTO arsiv.siparis_gecmisi ({self._ARCHIVE_ORDER_COLUMNS})
+                        SELECT {order_select} FROM main.siparis_gecmisi
+                        WHERE siparis_id IN (SELECT siparis_id FROM temp.arsiv_parca)
+                    """)
+                    cursor.execute(f"""
+                        INSERT OR IGNORE INTO arsiv.siparis_detaylari ({self._ARCHIVE_DETAIL_COLUMNS})
+                        SELECT {detail_select} FROM main.siparis_detaylari
+                        WHERE siparis_id IN (SELECT siparis_id FROM temp.arsiv_parca)
+                    """)
+
+                # 2) Ana DB'den sil ve ilerleme noktasını kaydet
+                with self.transaction() as cursor:
+                    cursor.execute("""
+                        DELETE FROM main.siparis_detaylari
+                        WHERE siparis_id IN (SELECT siparis_id FROM temp.arsiv_parca)
+                    """)
+                    archived_lines += cursor.rowcount
+                    cursor.execute("""
+                        DELETE FROM main.siparis_gecmisi
+                        WHERE siparis_id IN (SELECT siparis_id FROM temp.arsiv_parca)
+                    """)
+                    archived_orders += cursor.rowcount
+                    cursor.execute("SELECT MAX(siparis_id) FROM temp.arsiv_parca")
+                    last_siparis_id = cursor.fetchone()[0]
+                    cursor.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                                   (checkpoint_key, str(last_siparis_id)))
+
+                print(f"Arşivlenen: {archived_orders} sipariş, {archived_lines} detay (son sipariş ID: {last_siparis_id})")
+                if progress_callback:
+                    progress_callback(archived_orders, total_orders, f"{archived_orders} sipariş, {archived_lines} detay arşivlendi")
+
+            with self.transaction() as cursor:
+                cursor.execute("DROP TABLE IF EXISTS temp.arsiv_parca")
+                # Ayarlar tablosunu güncelle (son arşivlenen yılı kaydet), ilerleme noktasını temizle
+                cursor.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                               ("last_archived_year", str(year_to_process)))
+                cursor.execute("DELETE FROM settings WHERE key = ?", (checkpoint_key,))
+
+            print(f"Arşivleme başarılı: {archived_orders} sipariş, {archived_lines} detay '{archive_db_name}' dosyasına taşındı.")
+            return True, (f"{year_to_process} yılı ve öncesine ait tamamlanmış siparişler başarıyla arşivlendi ve ana "
+                          f"veritabanından silindi. ({archived_orders} sipariş, {archived_lines} detay)")
 
-        except Exception as e:
-            print(f"Genel arşivleme/silme hatası: {e}")
-            messagebox.showerror("Hata", f"Arşivleme/silme işlemi sırasında beklenmedik bir hata oluştu: {e}")
-            return False, f"Arşivleme/silme işlemi sırasında beklenmedik bir hata oluştu: {e}"
+        except sqlite3.Error as e:
+            print(f"Arşivleme veya silme hatası: {e}")
+            return False, (f"Arşivleme veya silme işlemi sırasında hata oluştu: {e}\n"
+                           f"İşlem tekrar başlatıldığında kaldığı yerden devam edecektir.")
+
+        finally:
+            if attached:
+                try:
+                    self.cursor.execute("DETACH DATABASE arsiv")
+                except sqlite3.Error as e:
+                    print(f"Arşiv veritabanı ayırma hatası: {e}")
+
+
+    # --- Bakım Metotları ---
+    def vacuum_database(self, progress_callback=None, cancel_event=None, pages_per_step=constants.VACUUM_PAGES_PER_STEP):
+        """Silinen kayıtlardan kalan boş sayfaları dosyadan geri verir (arşivleme sonrası).
+
+        İlk çalıştırmada veritabanı artımlı (INCREMENTAL) auto_vacuum moduna bir kez tam VACUUM ile geçirilir. Sonraki
+        çalıştırmalar incremental_vacuum ile pages_per_step sayfalık kısa adımlarla ilerler; her adım yazma kilidini kısa
+        süre tuttuğu için diğer bağlantılar (kasa) beklemez. progress_callback / cancel_event arşivlemedeki gibidir.
+        """
+        try:
+            self.conn.commit() # VACUUM / incremental_vacuum açık transaction içinde çalışamaz
+            if self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2: # 2 = INCREMENTAL
+                print("Veritabanı artımlı boş alan temizleme moduna geçiriliyor (tam VACUUM)...")
+                self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                self.conn.execute("VACUUM")
+                return True, "Veritabanı sıkıştırıldı (artımlı boş alan temizleme moduna geçildi)."
+
+            total_pages = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+            while True:
+                free_pages = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if free_pages == 0:
+                    break
+                if cancel_event is not None and cancel_event.is_set():
+                    return False, f"Sıkıştırma iptal edildi ({total_pages - free_pages}/{total_pages} sayfa geri verildi)."
+                self.conn.execute(f"PRAGMA incremental_vacuum({int(pages_per_step)})").fetchall()
+                if progress_callback:
+                    done = total_pages - self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+                    progress_callback(done, total_pages, f"{done}/{total_pages} boş sayfa geri verildi")
+
+            self.conn.execute("PRAGMA optimize")
+            return True, f"Veritabanı sıkıştırıldı ({total_pages} boş sayfa geri verildi)."
+        except sqlite3.Error as e:
+            print(f"Veritabanı sıkıştırma hatası: {e}")
+            return False, f"Veritabanı sıkıştırılırken hata oluştu: {e}"
 
 
     # --- Masa Metotları ---
@@ -375,7 +759,7 @@ class DatabaseManager:
             return self.cursor.fetchall()
         except sqlite3.Error as e:
             print(f"Masaları çekme hatası: {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Masalar yüklenirken hata oluştu: {e}")
+            self._show_error("Veritabanı Hatası", f"Masalar yüklenirken hata oluştu: {e}")
             return []
 
     def get_masa_info(self, masa_no):
@@ -399,7 +783,7 @@ class DatabaseManager:
             return False
 
     def update_masa_totals(self, masa_no, brut_total, discount_amount, odenen_tutar):
-        """Belirli bir masanın toplam ve iskonto bilgilerini günceller."""
+        """Belirli bir masanın toplam ve iskonto bilgilerini günceller (tutarlar Money)."""
         try:
             net_total = brut_total - discount_amount
             # Masalar tablosunda guncel_toplam (net tutarı tutacak), iskonto güncelleniyor.
@@ -424,7 +808,7 @@ class DatabaseManager:
             return next_masa_no
         except sqlite3.Error as e:
             print(f"Yeni masa ekleme hatası: {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Yeni masa eklenirken hata oluştu: {e}")
+            self._show_error("Veritabanı Hatası", f"Yeni masa eklenirken hata oluştu: {e}")
             self.conn.rollback()
             return None
 
@@ -440,28 +824,40 @@ class DatabaseManager:
             self.cursor.execute("DELETE FROM masalar WHERE masa_no = ?", (masa_no,))
             self.conn.commit()
             return True, f"Masa {masa_no} başarıyla silindi."
+        except sqlite3.IntegrityError:
+            # foreign_keys açıkken geçmiş adisyonlarda kullanılan masa silinemez (siparis_gecmisi.masa_no NOT NULL)
+            self.conn.rollback()
+            return False, f"Masa {masa_no} geçmiş adisyonlarda kullanıldığı için silinemez."
         except sqlite3.Error as e:
             print(f"Masa silme hatası (Masa {masa_no}): {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Masa {masa_no} silinirken hata oluştu: {e}")
+            self._show_error("Veritabanı Hatası", f"Masa {masa_no} silinirken hata oluştu: {e}")
             self.conn.rollback()
             return False, f"Masa {masa_no} silinirken hata oluştu: {e}"
 
-    # --- Kategori Metotları ---
-    def get_all_categories(self):
-        """Tüm kategorileri veritabanından çeker."""
+    # --- Katalog Önbelleği ---
+    def get_catalogue(self):
+        """Ürün/kategori kataloğunun güncel görüntüsünü (CatalogueSnapshot) döndürür.
+
+        Katalog sadece değiştiğinde (catalogue.version arttığında) veritabanından yeniden yüklenir.
+        """
         try:
-            self.cursor.execute("SELECT kategori_id, adi FROM kategoriler ORDER BY adi")
-            return self.cursor.fetchall()
+            return self.catalogue.snapshot()
         except sqlite3.Error as e:
-            print(f"Kategori çekme hatası: {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Kategori listesi alınırken hata oluştu: {e}")
-            return []
+            print(f"Ürün kataloğu yükleme hatası: {e}")
+            self._show_error("Veritabanı Hatası", f"Ürün kataloğu yüklenirken hata oluştu: {e}")
+            return CatalogueSnapshot(self.catalogue.version, [], [])
+
+    # --- Kategori Metotları ---
+    def get_all_categories(self):
+        """Tüm kategorileri ada göre sıralı döndürür (katalog önbelleğinden)."""
+        return list(self.get_catalogue().categories)
 
     def add_category(self, category_name):
         """Yeni bir kategori ekler."""
         try:
             self.cursor.execute("INSERT INTO kategoriler (adi) VALUES (?)", (category_name,))
             self.conn.commit()
+            self.catalogue.invalidate()
             return True, "Kategori başarıyla eklendi."
         except sqlite3.IntegrityError:
             self.conn.rollback()
@@ -471,6 +867,17 @@ class DatabaseManager:
             self.conn.rollback()
             return False, f"Kategori eklenirken hata oluştu: {e}"
 
+    def upsert_categories(self, category_names):
+        """Olmayan kategorileri ekler ve {kategori adı: kategori_id} eşlemesini döndürür (toplu içe aktarma için).
+
+        Commit yapmaz, çağıran transaction() içinde çağırır; katalog önbelleği çağıran tarafından geçersiz kılınır.
+        """
+        names = list(dict.fromkeys(category_names))
+        self.cursor.executemany("INSERT INTO kategoriler (adi) VALUES (?) ON CONFLICT (adi) DO NOTHING",
+                                [(name,) for name in names])
+        self.cursor.execute("SELECT kategori_id, adi FROM kategoriler")
+        return {row['adi']: row['kategori_id'] for row in self.cursor.fetchall()}
+
     def delete_category(self, category_name):
         """Belirli bir kategoriyi siler."""
         try:
@@ -492,60 +899,34 @@ class DatabaseManager:
 
             self.cursor.execute("DELETE FROM kategoriler WHERE kategori_id = ?", (kategori_id,))
             self.conn.commit()
+            self.catalogue.invalidate()
             return True, f"'{category_name}' kategorisi başarıyla silindi."
         except sqlite3.Error as e:
             print(f"Kategori silme hatası ('{category_name}'): {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Kategori silinirken hata oluştu: {e}")
+            self._show_error("Veritabanı Hatası", f"Kategori silinirken hata oluştu: {e}")
             self.conn.rollback()
             return False, f"Kategori silinirken hata oluştu: {e}"
 
 
     # --- Ürün Metotları ---
     def get_all_products(self, include_inactive=False):
-        """Tüm ürünleri (veya sadece aktif olanları) çeker."""
-        try:
-            query = """
-                SELECT
-                    u.urun_id, u.adi, u.fiyat, k.adi AS kategori_adi, u.aktif_durumu, u.hizli_satis_sirasi, u.kategori_id
-                FROM urunler u
-                LEFT JOIN kategoriler k ON u.kategori_id = k.kategori_id
-            """
-            if not include_inactive:
-                query += " WHERE u.aktif_durumu = 1"
-
-            query += " ORDER BY u.hizli_satis_sirasi, u.adi" # Önce hızlı satış sırası, sonra alfabetik
-
-            self.cursor.execute(query)
-            return self.cursor.fetchall()
-        except sqlite3.Error as e:
-            print(f"Ürünleri çekme hatası: {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Ürünler yüklenirken hata oluştu: {e}")
-            return []
+        """Tüm ürünleri (veya sadece aktif olanları) hızlı satış sırasıyla döndürür (katalog önbelleğinden)."""
+        return list(self.get_catalogue().get_products(include_inactive))
 
     def get_product_by_id(self, urun_id):
-         """Belirli bir ürünü ID'sine göre çeker."""
-         try:
-             self.cursor.execute("""
-                 SELECT
-                     u.urun_id, u.adi, u.fiyat, k.adi AS kategori_adi, u.aktif_durumu, u.hizli_satis_sirasi, u.kategori_id
-                 FROM urunler u
-                 LEFT JOIN kategoriler k ON u.kategori_id = k.kategori_id
-                 WHERE u.urun_id = ?
-             """, (urun_id,))
-             return self.cursor.fetchone()
-         except sqlite3.Error as e:
-             print(f"Ürün çekme hatası (ID {urun_id}): {e}")
-             return None
-
+         """Belirli bir ürünü ID'sine göre döndürür (katalog önbelleğinden, yoksa None)."""
+         return self.get_catalogue().get_product(urun_id)
 
     def add_product(self, adi, fiyat, kategori_id, aktif_durumu, hizli_satis_sirasi):
-        """Yeni bir ürün ekler."""
+        """Yeni bir ürün ekler (fiyat: Money veya TL sayı)."""
         try:
+            fiyat = Money.from_tl(fiyat)
             self.cursor.execute("""
                 INSERT INTO urunler (adi, fiyat, kategori_id, aktif_durumu, hizli_satis_sirasi)
                 VALUES (?, ?, ?, ?, ?)
             """, (adi, fiyat, kategori_id, aktif_durumu, hizli_satis_sirasi))
             self.conn.commit()
+            self.catalogue.invalidate()
             return True, f"'{adi}' ürünü başarıyla eklendi."
         except sqlite3.IntegrityError:
             self.conn.rollback()
@@ -555,15 +936,38 @@ class DatabaseManager:
             self.conn.rollback()
             return False, f"Ürün eklenirken hata oluştu: {e}"
 
+    def bulk_upsert_products(self, rows):
+        """(adi, fiyat Money, kategori_id, aktif_durumu, hizli_satis_sirasi) satırlarını tek executemany ile ekler/günceller.
+
+        Aynı adlı ürün varsa fiyat güncellenir; kategori_id, aktif_durumu ve hizli_satis_sirasi None ise mevcut değer
+        korunur (ör. sadece adi,fiyat sütunlu fiyat listesi). Yeni üründe aktif_durumu None ise 1, sıra None ise 0 olur.
+        Commit yapmaz (çağıran transaction() içinde çağırır). Dönüş: yeni eklenen ürün sayısı.
+        """
+        self.cursor.execute("SELECT COUNT(*) FROM urunler")
+        count_before = self.cursor.fetchone()[0]
+        self.cursor.executemany("""
+            INSERT INTO urunler (adi, fiyat, kategori_id, aktif_durumu, hizli_satis_sirasi)
+            VALUES (?1, ?2, ?3, IFNULL(?4, 1), IFNULL(?5, 0))
+            ON CONFLICT (adi) DO UPDATE SET
+                fiyat = excluded.fiyat,
+                kategori_id = CASE WHEN ?3 IS NULL THEN kategori_id ELSE excluded.kategori_id END,
+                aktif_durumu = CASE WHEN ?4 IS NULL THEN aktif_durumu ELSE excluded.aktif_durumu END,
+                hizli_satis_sirasi = CASE WHEN ?5 IS NULL THEN hizli_satis_sirasi ELSE excluded.hizli_satis_sirasi END
+        """, rows)
+        self.cursor.execute("SELECT COUNT(*) FROM urunler")
+        return self.cursor.fetchone()[0] - count_before
+
     def update_product(self, urun_id, adi, fiyat, kategori_id, aktif_durumu, hizli_satis_sirasi):
-        """Mevcut bir ürünü günceller."""
+        """Mevcut bir ürünü günceller (fiyat: Money veya TL sayı)."""
         try:
+            fiyat = Money.from_tl(fiyat)
             self.cursor.execute("""
                 UPDATE urunler
                 SET adi = ?, fiyat = ?, kategori_id = ?, aktif_durumu = ?, hizli_satis_sirasi = ?
                 WHERE urun_id = ?
             """, (adi, fiyat, kategori_id, aktif_durumu, hizli_satis_sirasi, urun_id))
             self.conn.commit()
+            self.catalogue.invalidate()
             return True, f"'{adi}' ürünü başarıyla güncellendi."
         except sqlite3.IntegrityError:
             self.conn.rollback()
@@ -578,6 +982,7 @@ class DatabaseManager:
         try:
             self.cursor.execute("UPDATE urunler SET aktif_durumu = 0 WHERE urun_id = ?", (urun_id,))
             self.conn.commit()
+            self.catalogue.invalidate()
             return True, "Ürün başarıyla pasif hale getirildi."
         except sqlite3.Error as e:
             print(f"Ürün pasifleştirme hatası (ID {urun_id}): {e}")
@@ -589,6 +994,7 @@ class DatabaseManager:
          try:
              self.cursor.execute("UPDATE urunler SET aktif_durumu = 1 WHERE urun_id = ?", (urun_id,))
              self.conn.commit()
+             self.catalogue.invalidate()
              return True, "Ürün başarıyla aktif hale getirildi."
          except sqlite3.Error as e:
              print(f"Ürün aktif hale getirme hatası (ID {urun_id}): {e}")
@@ -609,7 +1015,7 @@ class DatabaseManager:
             return self.cursor.fetchall()
         except sqlite3.Error as e:
             print(f"Sipariş detayları çekme hatası (Sipariş ID {siparis_id}): {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Sipariş detayları yüklenirken hata oluştu: {e}")
+            self._show_error("Veritabanı Hatası", f"Sipariş detayları yüklenirken hata oluştu: {e}")
             return []
 
     def get_order_info(self, siparis_id):
@@ -631,110 +1037,188 @@ class DatabaseManager:
         """Yeni bir sipariş (adisyon) oluşturur."""
         try:
             now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.cursor.execute("""
-                INSERT INTO siparis_gecmisi (masa_no, acilis_zamani, durum, son_islem_zamani, toplam_tutar, iskonto, odenen_tutar)
-                VALUES (?, ?, ?, ?, 0.0, 0.0, 0.0)
-            """, (masa_no, now, 'Açık', now))
-            siparis_id = self.cursor.lastrowid
-            # Masa durumunu ve aktif sipariş ID'sini güncelle
-            self.cursor.execute("UPDATE masalar SET aktif_siparis_id = ?, durum = 'Dolu', guncel_toplam = 0.0, iskonto = 0.0 WHERE masa_no = ?",
-                                (siparis_id, masa_no))
-            self.conn.commit()
+            with self.transaction() as cursor: # Toplu dokunuş yazmasında (apply_cart_taps) dıştaki transaction'a katılır
+                cursor.execute("""
+                    INSERT INTO siparis_gecmisi (masa_no, acilis_zamani, durum, son_islem_zamani, toplam_tutar, iskonto, odenen_tutar)
+                    VALUES (?, ?, ?, ?, 0, 0, 0)
+                """, (masa_no, now, 'Açık', now))
+                siparis_id = cursor.lastrowid
+                # Masa durumunu ve aktif sipariş ID'sini güncelle
+                cursor.execute("UPDATE masalar SET aktif_siparis_id = ?, durum = 'Dolu', guncel_toplam = 0, iskonto = 0 WHERE masa_no = ?",
+                               (siparis_id, masa_no))
             print(f"Yeni sipariş oluşturuldu. ID: {siparis_id} (Masa {masa_no})")
             return siparis_id
         except sqlite3.Error as e:
             print(f"Yeni sipariş oluşturma hatası (Masa {masa_no}): {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Yeni sipariş oluşturulurken hata oluştu: {e}")
-            self.conn.rollback()
+            self._show_error("Veritabanı Hatası", f"Yeni sipariş oluşturulurken hata oluştu: {e}")
             return None
 
-    # add_order_item metodu, ürün ekleme ve miktarı güncelleme için kullanılacak.
+    @staticmethod
+    def _order_totals(order_row):
+        """siparis_gecmisi satırındaki toplamlardan UI'ın ihtiyaç duyduğu toplamlar sözlüğünü (Money değerleri) oluşturur."""
+        brut_toplam = Money.of(order_row['toplam_tutar'])
+        iskonto = Money.of(order_row['iskonto'])
+        odenen_tutar = Money.of(order_row['odenen_tutar'])
+        net_toplam = brut_toplam - iskonto
+        return {
+            'toplam_tutar': brut_toplam,
+            'iskonto': iskonto,
+            'odenen_tutar': odenen_tutar,
+            'net_toplam': net_toplam,
+            'kalan_tutar': net_toplam - odenen_tutar,
+        }
+
+    def _apply_order_total_delta(self, cursor, siparis_id, delta_sql, delta_params, now):
+        """Siparişin brüt toplamını fark kadar günceller, masa toplamını eşitler ve yeni toplamları döndürür.
+
+        Toplam her seferinde SUM ile yeniden hesaplanmaz; delta_sql satır değişikliğinin tutar farkını verir.
+        """
+        cursor.execute(f"""
+            UPDATE siparis_gecmisi
+            SET toplam_tutar = COALESCE(toplam_tutar, 0) + ({delta_sql}), -- Tamsayı kuruş, yuvarlama gerekmez
+                son_islem_zamani = ?
+            WHERE siparis_id = ?
+            RETURNING toplam_tutar, iskonto, odenen_tutar
+        """, (*delta_params, now, siparis_id))
+        order_row = cursor.fetchone()
+        if order_row is None:
+            return None
+        totals = self._order_totals(order_row)
+
+        # Masa durumunu ve net toplamını aynı transaction içinde güncelle (ayrıca update_masa_totals gerekmez)
+        cursor.execute("""
+            UPDATE masalar
+            SET durum = 'Dolu', guncel_toplam = ?, iskonto = ?
+            WHERE aktif_siparis_id = ?
+        """, (totals['net_toplam'], totals['iskonto'], siparis_id))
+        return totals
+
+    # apply_order_item metodu, ürün ekleme ve miktarı güncelleme için kullanılacak.
     # Eğer detay_id None ise yeni kayıt ekler ve ekleme_zamani'nı kaydeder.
     # Varsa mevcut kaydı günceller (ekleme_zamani değişmez).
-    def add_order_item(self, siparis_id, urun_id, urun_adi, miktar, birim_fiyat, kategori_id, detay_id=None):
-        """Bir siparişe ürün ekler veya mevcut ürünün miktarını günceller."""
-        try:
-            tutar = miktar * birim_fiyat
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            if detay_id is None:
-                # Yeni ürün ekle
-                self.cursor.execute("""
-                    INSERT INTO siparis_detaylari (siparis_id, urun_id, urun_adi, miktar, birim_fiyat, tutar, kategori_id, ekleme_zamani)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (siparis_id, urun_id, urun_adi, miktar, birim_fiyat, tutar, kategori_id, now))
-                new_detay_id = self.cursor.lastrowid
-                # print(f"Yeni sipariş detayı eklendi. Detay ID: {new_detay_id}, Ürün: {urun_adi} x {miktar}") # Debug
-            else:
-                # Mevcut ürünün miktarını güncelle (ekleme_zamani değişmez)
-                self.cursor.execute("""
-                    UPDATE siparis_detaylari
-                    SET miktar = ?, tutar = ?
-                    WHERE detay_id = ? AND siparis_id = ?
-                """, (miktar, tutar, detay_id, siparis_id))
-                new_detay_id = detay_id # Güncelleme işleminde ID değişmez
-                # print(f"Sipariş detayı güncellendi. Detay ID: {detay_id}, Ürün: {urun_adi} x {miktar}") # Debug
+    def apply_order_item(self, siparis_id, urun_id, urun_adi, miktar, birim_fiyat, kategori_id, detay_id=None):
+        """Sepet satırını ekler/günceller, sipariş ve masa toplamlarını tek transaction'da fark kadar günceller.
 
+        birim_fiyat Money'dir (TL sayı da kabul edilir); satır tutarı kuruşa yuvarlanır.
+        Dönüş: (başarı, detay_id, toplamlar). toplamlar sözlüğü toplam_tutar, iskonto, odenen_tutar,
+        net_toplam ve kalan_tutar içerir; UI'ın toplamlar için tekrar sorgu yapmasına gerek kalmaz.
+        """
+        try:
+            birim_fiyat = Money.from_tl(birim_fiyat)
+            tutar = birim_fiyat * miktar
+            now = datetime.now().strftime(TIMESTAMP_FORMAT)
+
+            with self.transaction() as cursor:
+                if detay_id is None:
+                    # Yeni ürün ekle
+                    cursor.execute("""
+                        INSERT INTO siparis_detaylari (siparis_id, urun_id, urun_adi, miktar, birim_fiyat, tutar, kategori_id, ekleme_zamani)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (siparis_id, urun_id, urun_adi, miktar, birim_fiyat, tutar, kategori_id, now))
+                    new_detay_id = cursor.lastrowid
+                    totals = self._apply_order_total_delta(cursor, siparis_id, "?", (tutar,), now)
+                else:
+                    # Önce eski tutara göre toplam farkını uygula, sonra satırı güncelle (ekleme_zamani değişmez)
+                    totals = self._apply_order_total_delta(
+                        cursor, siparis_id,
+                        "? - COALESCE((SELECT tutar FROM siparis_detaylari WHERE detay_id = ? AND siparis_id = ?), ?)",
+                        (tutar, detay_id, siparis_id, tutar), now)
+                    cursor.execute("""
+                        UPDATE siparis_detaylari
+                        SET miktar = ?, tutar = ?
+                        WHERE detay_id = ? AND siparis_id = ?
+                    """, (miktar, tutar, detay_id, siparis_id))
+                    new_detay_id = detay_id # Güncelleme işleminde ID değişmez
+
+            return True, new_detay_id, totals # Başarı, işlem yapılan detay_id ve güncel toplamlar
+        except sqlite3.Error as e:
+            print(f"Sipariş detay ekleme/güncelleme hatası (Sipariş ID {siparis_id}, Ürün '{urun_adi}'): {e}")
+            self._show_error("Veritabanı Hatası", f"Ürün sepete eklenirken/güncellenirken hata oluştu: {e}")
+            return False, None, None
 
-            # Siparişin brüt toplamını ve son işlem zamanını güncelle
+    def add_order_item(self, siparis_id, urun_id, urun_adi, miktar, birim_fiyat, kategori_id, detay_id=None):
+        """Bir siparişe ürün ekler veya mevcut ürünün miktarını günceller (toplamlar gerekmiyorsa apply_order_item kısayolu)."""
+        success, new_detay_id, _ = self.apply_order_item(siparis_id, urun_id, urun_adi, miktar, birim_fiyat, kategori_id, detay_id=detay_id)
+        return success, new_detay_id # Başarı ve işlem yapılan detay_id'yi döndür
+
+    def add_product_to_table(self, masa_no, urun_id, urun_adi, birim_fiyat, kategori_id, miktar=1.0, taps=1):
+        """Hızlı satış dokunuşu: ürünü masanın açık siparişine ekler, ürün siparişte zaten varsa miktarını 1 artırır.
+
+        Masanın açık siparişi yoksa yeni sipariş açılır. Sipariş ve satır veritabanından bulunduğu için yazıcı iş
+        parçacığına (db_executor) art arda gönderilen dokunuşlar, arayüz önceki sonucu almadan da aynı siparişe/satıra
+        eklenir. miktar sadece yeni satır için kullanılır; mevcut satır kendi birim fiyatıyla güncellenir.
+        taps > 1: aynı ürüne art arda dokunuşlar tek satır yazmasıyla uygulanır (ilki miktar, sonrakiler +1).
+        Dönüş: (başarı, siparis_id, detay_id, satırın yeni miktarı, toplamlar).
+        """
+        try:
+            self.cursor.execute("SELECT aktif_siparis_id FROM masalar WHERE masa_no = ?", (masa_no,))
+            row = self.cursor.fetchone()
+            siparis_id = row['aktif_siparis_id'] if row else None
+            if siparis_id is None:
+                siparis_id = self.create_new_order(masa_no)
+                if siparis_id is None:
+                    return False, None, None, None, None
+
+            # Sepet görünümündeki gibi ürünün ilk satırı (eklenme sırası = detay_id sırası)
             self.cursor.execute("""
-                UPDATE siparis_gecmisi
-                SET toplam_tutar = (SELECT COALESCE(SUM(tutar), 0.0) FROM siparis_detaylari WHERE siparis_id = ?),
-                    son_islem_zamani = ?
-                WHERE siparis_id = ?
-            """, (siparis_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), siparis_id))
+                SELECT detay_id, miktar, birim_fiyat FROM siparis_detaylari WHERE siparis_id = ? AND urun_id = ?
+                ORDER BY detay_id LIMIT 1
+            """, (siparis_id, urun_id))
+            existing = self.cursor.fetchone()
+            if existing is not None:
+                miktar = existing['miktar'] + float(taps)
+                birim_fiyat = Money.of(existing['birim_fiyat'])
+            else:
+                miktar = miktar + float(taps - 1)
+            success, detay_id, totals = self.apply_order_item(siparis_id, urun_id, urun_adi, miktar, birim_fiyat, kategori_id,
+                                                              detay_id=existing['detay_id'] if existing is not None else None)
+            return success, siparis_id, detay_id, miktar, totals
+        except sqlite3.Error as e:
+            print(f"Masaya ürün ekleme hatası (Masa {masa_no}, Ürün '{urun_adi}'): {e}")
+            self._show_error("Veritabanı Hatası", f"Ürün sepete eklenirken hata oluştu: {e}")
+            if self._transaction_depth == 0:
+                self.conn.rollback()
+            return False, None, None, None, None
 
-            # Masa durumunu ve son işlem zamanını güncelle
-            self.cursor.execute("""
-                UPDATE masalar
-                SET durum = 'Dolu' -- Ürün eklendiğinde/güncellendiğinde masa dolu olur
-                WHERE aktif_siparis_id = ?
-            """, (siparis_id,))
+    def apply_cart_taps(self, taps):
+        """Grup commit: bir zaman penceresinde biriken hızlı satış dokunuşlarını tek transaction'da (tek commit) uygular.
 
-            self.conn.commit()
-            return True, new_detay_id # Başarı ve işlem yapılan detay_id'yi döndür
+        taps: (masa_no, urun_id, urun_adi, birim_fiyat, kategori_id, miktar, dokunuş sayısı) listesi; aynı satırın
+        dokunuşları önceden birleştirilmiştir (cart_tap_batcher). Biri başarısız olursa hiçbiri kaydedilmez.
+        Dönüş: (başarı, [(masa_no, urun_id, siparis_id, detay_id, satırın yeni miktarı, toplamlar), ...]).
+        """
+        results = []
+        try:
+            with self.transaction():
+                for masa_no, urun_id, urun_adi, birim_fiyat, kategori_id, miktar, count in taps:
+                    success, siparis_id, detay_id, line_miktar, totals = self.add_product_to_table(
+                        masa_no, urun_id, urun_adi, birim_fiyat, kategori_id, miktar, taps=count)
+                    if not success:
+                        raise sqlite3.Error(f"Masa {masa_no}, ürün '{urun_adi}' eklenemedi")
+                    results.append((masa_no, urun_id, siparis_id, detay_id, line_miktar, totals))
+            return True, results
         except sqlite3.Error as e:
-            print(f"Sipariş detay ekleme/güncelleme hatası (Sipariş ID {siparis_id}, Ürün '{urun_adi}'): {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Ürün sepete eklenirken/güncellenirken hata oluştu: {e}")
-            self.conn.rollback()
-            return False, None
+            print(f"Toplu sepet yazması hatası ({len(taps)} satır): {e}")
+            self._show_error("Veritabanı Hatası", f"Ürünler sepete eklenirken hata oluştu: {e}")
+            return False, []
 
 
     def remove_order_item(self, detay_id, siparis_id):
-        """Bir siparişten belirli bir detay öğesini siler."""
+        """Bir siparişten belirli bir detay öğesini siler. Dönüş: (başarı, güncel toplamlar)."""
         try:
-            # Silinecek detayın ait olduğu siparişin ID'sinin doğruluğunu kontrol etmek iyi olabilir.
-            # self.cursor.execute("SELECT siparis_id FROM siparis_detaylari WHERE detay_id = ?", (detay_id,))
-            # result = self.cursor.fetchone()
-            # if not result or result['siparis_id'] != siparis_id:
-            #      return False, "Silinecek ürün detayı bulunamadı veya yanlış siparişe ait."
-
-
-            self.cursor.execute("DELETE FROM siparis_detaylari WHERE detay_id = ?", (detay_id,))
-
-            # Siparişin brüt toplamını ve son işlem zamanını güncelle
-            self.cursor.execute("""
-                UPDATE siparis_gecmisi
-                SET toplam_tutar = (SELECT COALESCE(SUM(tutar), 0.0) FROM siparis_detaylari WHERE siparis_id = ?),
-                    son_islem_zamani = ?
-                WHERE siparis_id = ?
-            """, (siparis_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), siparis_id))
-
-            # Masa durumunu ve son işlem zamanını güncelle (eğer tüm ürünler silindiyse durum 'Boş' olabilir, AdisyonTab bunu yönetecek)
-            # Masa tablosindeki guncel_toplam ve iskonto AdisyonTab'da load_cart çağrılınca güncelleniyor.
-            self.cursor.execute("""
-                 UPDATE masalar
-                 SET aktif_siparis_id = ? -- Tekrar atama veya emin olma
-                 WHERE aktif_siparis_id = ?
-            """, (siparis_id, siparis_id))
-
-
-            self.conn.commit()
-            return True, None
+            now = datetime.now().strftime(TIMESTAMP_FORMAT)
+            with self.transaction() as cursor:
+                # Silinen satırın tutarı kadar toplamı düşür, sonra satırı sil
+                totals = self._apply_order_total_delta(
+                    cursor, siparis_id,
+                    "-COALESCE((SELECT tutar FROM siparis_detaylari WHERE detay_id = ? AND siparis_id = ?), 0)",
+                    (detay_id, siparis_id), now)
+                cursor.execute("DELETE FROM siparis_detaylari WHERE detay_id = ? AND siparis_id = ?", (detay_id, siparis_id))
+
+            return True, totals
         except sqlite3.Error as e:
             print(f"Sipariş detay silme hatası (Detay ID {detay_id}, Sipariş ID {siparis_id}): {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Ürün sepetten silinirken hata oluştu: {e}")
-            self.conn.rollback()
+            self._show_error("Veritabanı Hatası", f"Ürün sepetten silinirken hata oluştu: {e}")
             return False, None
 
     def clear_order_details(self, siparis_id):
@@ -744,18 +1228,19 @@ class DatabaseManager:
             self.cursor.execute("DELETE FROM siparis_detaylari WHERE siparis_id = ?", (siparis_id,))
 
             # Siparişi 'İptal Edildi' olarak işaretle ve toplamları sıfırla
+            now = datetime.now()
             self.cursor.execute("""
                 UPDATE siparis_gecmisi
-                SET toplam_tutar = 0.0, iskonto = 0.0, odenen_tutar = 0.0,
-                    durum = 'İptal Edildi', kapanis_zamani = ?, son_islem_zamani = NULL,
+                SET toplam_tutar = 0, iskonto = 0, odenen_tutar = 0,
+                    durum = 'İptal Edildi', kapanis_zamani = ?, kapanis_epoch = ?, son_islem_zamani = NULL,
                     musteri_id = NULL -- Müşteri ilişkisini de kopar
                 WHERE siparis_id = ?
-            """, (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), siparis_id))
+            """, (now.strftime(TIMESTAMP_FORMAT), to_epoch(now), siparis_id))
 
             # Masanın durumunu ve ilişkili sipariş bilgisini sıfırla
             self.cursor.execute("""
                 UPDATE masalar
-                SET aktif_siparis_id = NULL, durum = 'Boş', guncel_toplam = 0.0, iskonto = 0.0
+                SET aktif_siparis_id = NULL, durum = 'Boş', guncel_toplam = 0, iskonto = 0
                 WHERE aktif_siparis_id = ?
             """, (siparis_id,))
 
@@ -763,13 +1248,14 @@ class DatabaseManager:
             return True
         except sqlite3.Error as e:
             print(f"Sipariş detayları temizleme hatası (Sipariş ID {siparis_id}): {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Sepet temizlenirken hata oluştu: {e}")
+            self._show_error("Veritabanı Hatası", f"Sepet temizlenirken hata oluştu: {e}")
             self.conn.rollback()
             return False
 
     def update_order_discount(self, siparis_id, discount_amount):
-        """Belirli bir siparişe iskonto uygular ve sipariş/masa toplamlarını günceller."""
+        """Belirli bir siparişe iskonto uygular ve sipariş/masa toplamlarını günceller (discount_amount: Money)."""
         try:
+            discount_amount = Money.from_tl(discount_amount)
             self.cursor.execute("""
                 UPDATE siparis_gecmisi
                 SET iskonto = ?, son_islem_zamani = ?
@@ -791,8 +1277,9 @@ class DatabaseManager:
             return False
 
     def record_partial_payment(self, siparis_id, amount, payment_method="Ara Ödeme"):
-         """Sipariş için parçalı ödeme kaydeder."""
+         """Sipariş için parçalı ödeme kaydeder (amount: Money)."""
          try:
+             amount = Money.from_tl(amount)
              # siparis_gecmisi tablosundaki odenen_tutar alanını güncelle
              self.cursor.execute("""
                  UPDATE siparis_gecmisi
@@ -818,49 +1305,60 @@ class DatabaseManager:
 
 
     def process_full_payment(self, siparis_id, payment_method):
-        """Siparişin kalan tutarını kapatır ve adisyonu sonlandırır."""
+        """Siparişin kalan tutarını kapatır ve adisyonu sonlandırır. Dönüş: (başarı, net toplam Money).
+
+        Açık bir transaction() içinde çağrılırsa commit yapmaz (ör. müşteri bakiyesinden ödemede bakiye düşme ile birlikte).
+        """
         try:
             # Güncel sipariş bilgisini al
             order_info = self.get_order_info(siparis_id)
             if not order_info:
                  return False, "Sipariş bulunamadı."
 
-            brut_toplam = order_info['toplam_tutar'] or 0.0
-            iskonto = order_info['iskonto'] or 0.0
-            odenen_tutar_current = order_info['odenen_tutar'] or 0.0
+            # Tamsayı kuruş: kalan tutar tam sıfır olur (float toplamlardaki 0.0000001 TL kalıntısı oluşmaz)
+            brut_toplam = Money.of(order_info['toplam_tutar'])
+            iskonto = Money.of(order_info['iskonto'])
+            odenen_tutar_current = Money.of(order_info['odenen_tutar'])
             net_toplam = brut_toplam - iskonto
             kalan_tutar = net_toplam - odenen_tutar_current
 
             # Kalan tutar negatifse veya 0'dan küçükse (fazla ödeme veya hata)
             # Normal ödeme akışında kalan tutarı 0'a tamamlarız.
-            if kalan_tutar > 0:
+            if kalan_tutar > ZERO:
                  odenen_tutar_current += kalan_tutar # Kalanı ödenen tutara ekle
             # else: kalan tutar <= 0 ise zaten ya tam ödenmiştir ya da fazla ödenmiştir,
             # odenen_tutar_current olduğu gibi kalır.
 
-            # Siparişi 'Kapandı' olarak işaretle, kapanış zamanı, nihai toplamlar ve ödeme yöntemini kaydet
-            self.cursor.execute("""
-                UPDATE siparis_gecmisi
-                SET kapanis_zamani = ?, durum = 'Kapandı',
-                    toplam_tutar = ?, iskonto = ?, odenen_tutar = ?, -- Kapanış anındaki nihai değerler
-                    odeme_yontemi = ?, son_islem_zamani = NULL -- Kapalı siparişlerde son işlem zamanı olmaz
-                WHERE siparis_id = ?
-            """, (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), brut_toplam, iskonto, odenen_tutar_current, payment_method, siparis_id))
-
-            # Masanın durumunu ve ilişkili sipariş bilgisini sıfırla
-            self.cursor.execute("""
-                UPDATE masalar
-                SET aktif_siparis_id = NULL, durum = 'Boş', guncel_toplam = 0.0, iskonto = 0.0
-                WHERE aktif_siparis_id = ?
-            """, (siparis_id,))
+            with self.transaction() as cursor:
+                # Daha önce kapatılmış bir sipariş tekrar kapatılıyorsa eski katkısı günlük özetlerden çıkarılır
+                if order_info['durum'] == 'Kapandı':
+                    self._apply_order_to_sales_rollups(siparis_id, sign=-1)
+
+                # Siparişi 'Kapandı' olarak işaretle, kapanış zamanı, nihai toplamlar ve ödeme yöntemini kaydet
+                now = datetime.now()
+                cursor.execute("""
+                    UPDATE siparis_gecmisi
+                    SET kapanis_zamani = ?, kapanis_epoch = ?, durum = 'Kapandı',
+                        toplam_tutar = ?, iskonto = ?, odenen_tutar = ?, -- Kapanış anındaki nihai değerler
+                        odeme_yontemi = ?, son_islem_zamani = NULL -- Kapalı siparişlerde son işlem zamanı olmaz
+                    WHERE siparis_id = ?
+                """, (now.strftime(TIMESTAMP_FORMAT), to_epoch(now), brut_toplam, iskonto, odenen_tutar_current, payment_method, siparis_id))
+
+                # Günlük satış özetleri aynı transaction içinde güncellenir (commit/rollback siparişle birlikte)
+                self._apply_order_to_sales_rollups(siparis_id)
+
+                # Masanın durumunu ve ilişkili sipariş bilgisini sıfırla
+                cursor.execute("""
+                    UPDATE masalar
+                    SET aktif_siparis_id = NULL, durum = 'Boş', guncel_toplam = 0, iskonto = 0
+                    WHERE aktif_siparis_id = ?
+                """, (siparis_id,))
 
-            self.conn.commit()
             return True, net_toplam # Net toplamı döndür (raporlama için kullanılabilir)
         except sqlite3.Error as e:
             print(f"Tam ödeme işleme hatası (Sipariş ID {siparis_id}, Yöntem {payment_method}): {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Ödeme işlemi sırasında hata oluştu: {e}")
-            self.conn.rollback()
-            return False, 0.0
+            self._show_error("Veritabanı Hatası", f"Ödeme işlemi sırasında hata oluştu: {e}")
+            return False, ZERO
 
     def link_customer_to_order(self, siparis_id, musteri_id):
          """Bel belirli bir siparişi belirli bir müşteri ile ilişkilendirir."""
@@ -895,6 +1393,54 @@ class DatabaseManager:
             print(f"Geçikmiş masa bilgi çekme hatası: {e}")
             return []
 
+    # Son işlem zamanının epoch karşılığı (to_epoch ile aynı: yerel saat UTC gibi yorumlanır)
+    _SON_ISLEM_EPOCH_SQL = "CAST(strftime('%s', sg.son_islem_zamani) AS INTEGER)"
+
+    def get_late_table_deadlines(self, threshold_minutes, masa_no=None):
+        """Dolu masaların geçikme zamanlarını (son_islem_zamani + eşik, epoch saniye) döndürür.
+
+        Dönüş satırları: masa_no, durum, aktif_siparis_id, deadline_epoch. masa_no verilirse sadece o masa.
+        """
+        try:
+            query = f"""
+                SELECT m.masa_no, m.durum, m.aktif_siparis_id, {self._SON_ISLEM_EPOCH_SQL} + ? AS deadline_epoch
+                FROM masalar m
+                JOIN siparis_gecmisi sg ON m.aktif_siparis_id = sg.siparis_id
+                WHERE m.durum IN ('Dolu', 'Geçikmiş')
+                  AND sg.durum = 'Açık'
+                  AND sg.son_islem_zamani IS NOT NULL
+            """
+            params = [threshold_minutes * 60]
+            if masa_no is not None:
+                query += " AND m.masa_no = ?"
+                params.append(masa_no)
+            self.cursor.execute(query, params)
+            return self.cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Geçikme zamanı çekme hatası: {e}")
+            return []
+
+    def mark_late_tables(self, threshold_minutes, now_epoch):
+        """Son işlemi eşikten eski olan tüm dolu masaları tek UPDATE ile 'Geçikmiş' yapar. İşaretlenen masa numaralarını döndürür."""
+        try:
+            with self.transaction() as cursor:
+                cursor.execute(f"""
+                    UPDATE masalar
+                    SET durum = 'Geçikmiş'
+                    WHERE durum = 'Dolu'
+                      AND aktif_siparis_id IN (
+                          SELECT sg.siparis_id FROM siparis_gecmisi sg
+                          WHERE sg.durum = 'Açık'
+                            AND sg.son_islem_zamani IS NOT NULL
+                            AND {self._SON_ISLEM_EPOCH_SQL} + ? <= ?
+                      )
+                    RETURNING masa_no
+                """, (threshold_minutes * 60, now_epoch))
+                return [row['masa_no'] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Geçikmiş masa işaretleme hatası: {e}")
+            return []
+
 
     # --- Müşteri Metotları ---
     # get_all_customers artık müşteri ID'sini de döndürüyor
@@ -905,7 +1451,55 @@ class DatabaseManager:
             return self.cursor.fetchall()
         except sqlite3.Error as e:
             print(f"Müşterileri çekme hatası: {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Müşteri listesi yüklenirken hata oluştu: {e}")
+            self._show_error("Veritabanı Hatası", f"Müşteri listesi yüklenirken hata oluştu: {e}")
+            return []
+
+    def _has_customer_search_index(self):
+        if self._customer_search_fts is None:
+            self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'musteri_arama'")
+            self._customer_search_fts = self.cursor.fetchone() is not None
+        return self._customer_search_fts
+
+    def search_customers(self, text, limit=constants.CUSTOMER_SEARCH_LIMIT):
+        """Ad veya telefona göre en fazla limit müşteri döndürür (musteri_id, ad_soyad, telefon).
+
+        Arama Türkçe harf ve büyük/küçük harf duyarsızdır; boşlukla ayrılan her kelime ad veya telefonda geçmelidir.
+        Boş metin: alfabetik ilk kayıtlar. 1-2 harflik tek kelime: adı bununla başlayanlar (ifade indeksi).
+        Diğerleri: FTS5 trigram indeksi, adı ilk kelimeyle başlayanlar önce. Tuş başına çağrıldığı için hata diyaloğu açmaz.
+        """
+        name_key = sql_fold('m.ad_soyad') # idx_musteriler_ad_arama ifadesiyle aynı olmalı (indeks kullanımı için)
+        # Harf içermeyen kelimeler telefon parçasıdır: ayraçlar silinir ("0532-123" -> "0532123")
+        words = [phone_digits(word) or word if not any(ch.isalpha() for ch in word) else word
+                 for word in strip_like_wildcards(fold_text(text)).split()]
+        columns = "m.musteri_id, m.ad_soyad, m.telefon"
+        try:
+            if not words:
+                self.cursor.execute(f"SELECT {columns} FROM musteriler m ORDER BY {name_key} LIMIT ?", (limit,))
+            elif len(words) == 1 and len(words[0]) < 3 and not words[0].isdigit():
+                prefix = words[0]
+                upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+                self.cursor.execute(f"""
+                    SELECT {columns} FROM musteriler m
+                    WHERE {name_key} >= ? AND {name_key} < ?
+                    ORDER BY {name_key} LIMIT ?
+                """, (prefix, upper, limit))
+            else:
+                if self._has_customer_search_index():
+                    source = "musteri_arama a JOIN musteriler m ON m.musteri_id = a.rowid"
+                    search_text = "a.arama_metni"
+                else:
+                    source = "musteriler m" # FTS5 yok: tüm tablo taranır
+                    search_text = f"({_customer_search_text_sql('m.')})"
+                conditions = " AND ".join(f"{search_text} LIKE ?" for _ in words)
+                self.cursor.execute(f"""
+                    SELECT {columns} FROM {source}
+                    WHERE {conditions}
+                    ORDER BY {search_text} LIKE ? DESC, {search_text}
+                    LIMIT ?
+                """, [f"%{word}%" for word in words] + [f"{words[0]}%", limit])
+            return self.cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Müşteri arama hatası ('{text}'): {e}")
             return []
 
     def get_customer_by_id(self, musteri_id):
@@ -941,6 +1535,44 @@ class DatabaseManager:
             self.conn.rollback()
             return False, f"Müşteri eklenirken hata oluştu: {e}"
 
+    def bulk_upsert_customers(self, rows):
+        """(ad_soyad, telefon, bakiye Money veya None) satırlarını ekler/günceller.
+
+        Telefonlu satırlar tek executemany ile telefona göre eşleşir: müşterinin adı güncellenir, bakiye sadece verilmişse
+        (None değilse) değiştirilir. Telefonsuz satırlar aynı adlı telefonsuz müşteriyle eşleşir (aynı dosya tekrar içe
+        aktarıldığında çift kayıt oluşmaz); aynı adlı birden fazla telefonsuz müşteri varsa satır yazılmaz.
+        Commit yapmaz (çağıran transaction() içinde çağırır).
+        Dönüş: (yeni eklenen müşteri sayısı, adla eşleşen satır sayısı, yazılmayan satırların rows içindeki indeksleri).
+        """
+        self.cursor.execute("SELECT COUNT(*) FROM musteriler")
+        count_before = self.cursor.fetchone()[0]
+        self.cursor.executemany("""
+            INSERT INTO musteriler (ad_soyad, telefon, bakiye) VALUES (?, ?, IFNULL(?, 0))
+            ON CONFLICT (telefon) DO UPDATE SET
+                ad_soyad = excluded.ad_soyad,
+                bakiye = CASE WHEN ?3 IS NULL THEN bakiye ELSE excluded.bakiye END
+        """, [row for row in rows if row[1] is not None])
+
+        name_matched = 0
+        skipped = []
+        for index, (ad_soyad, telefon, bakiye) in enumerate(rows):
+            if telefon is not None:
+                continue
+            # idx_musteriler_ad_telefon indeksinden okunur
+            self.cursor.execute("SELECT musteri_id FROM musteriler WHERE telefon IS NULL AND ad_soyad = ? LIMIT 2", (ad_soyad,))
+            matches = self.cursor.fetchall()
+            if len(matches) > 1:
+                skipped.append(index) # Hangi müşteri olduğu belirsiz
+            elif matches:
+                name_matched += 1
+                if bakiye is not None:
+                    self.cursor.execute("UPDATE musteriler SET bakiye = ? WHERE musteri_id = ?", (bakiye, matches[0]['musteri_id']))
+            else:
+                self.cursor.execute("INSERT INTO musteriler (ad_soyad, telefon, bakiye) VALUES (?, NULL, IFNULL(?, 0))",
+                                    (ad_soyad, bakiye))
+        self.cursor.execute("SELECT COUNT(*) FROM musteriler")
+        return self.cursor.fetchone()[0] - count_before, name_matched, skipped
+
     def update_customer(self, musteri_id, ad_soyad, telefon):
         """Mevcut bir müşteriyi günceller."""
         try:
@@ -978,59 +1610,445 @@ class DatabaseManager:
             return False, f"Müşteri silinirken hata oluştu: {e}"
 
     def update_customer_balance(self, musteri_id, amount):
-         """Müşterinin bakiyesini günceller (pozitif miktar yükleme, negatif miktar tahsilat)."""
+         """Müşterinin bakiyesini günceller (amount: Money; pozitif miktar yükleme, negatif miktar tahsilat).
+
+         Açık bir transaction() içinde çağrılırsa commit yapmaz, dış blokla birlikte kaydedilir.
+         """
          try:
-             self.cursor.execute("UPDATE musteriler SET bakiye = bakiye + ? WHERE musteri_id = ?", (amount, musteri_id))
-             self.conn.commit()
+             amount = Money.from_tl(amount)
+             with self.transaction() as cursor:
+                 cursor.execute("UPDATE musteriler SET bakiye = bakiye + ? WHERE musteri_id = ?", (amount, musteri_id))
              return True
          except sqlite3.Error as e:
              print(f"Müşteri bakiye güncelleme hatası (ID {musteri_id}, Miktar {amount}): {e}")
-             self.conn.rollback()
              return False
 
-    # --- Raporlama Metotları ---
-    def get_sales_summary(self, start_date, end_date):
-        """Bel belirli bir tarih aralığındaki satış özetini çeker."""
+    # --- Günlük Satış Özetleri (Rollup) ---
+    # satis_ozeti_gunluk (gün × ödeme yöntemi) ve urun_satis_gunluk (gün × ürün × kategori) tabloları kapanmış
+    # siparişlerin günlük toplamlarını tutar. process_full_payment her kapanışta bunları aynı transaction içinde artırır,
+    # raporlar ham satırlar yerine gün başına birkaç satır okur. Özetler arşivlenen yılları da kapsar (arşivleme özetlere
+    # dokunmaz). Ham tablolara uygulama dışından yazıldığında rebuild_sales_rollups ile baştan oluşturulmalıdır.
+    _ALL_EPOCHS = (-(1 << 62), 1 << 62) # Tarih sınırı olmayan işlemler için epoch aralığı
+
+    def _apply_order_to_sales_rollups(self, siparis_id, sign=1):
+        """Kapanmış siparişin katkısını günlük özetlere ekler (sign=-1: çıkarır). Commit yapmaz."""
+        self.cursor.execute(f"""
+            INSERT INTO satis_ozeti_gunluk (gun_epoch, odeme_yontemi, adisyon_sayisi, brut_satis, toplam_iskonto, net_satis)
+            SELECT kapanis_epoch - kapanis_epoch % {SECONDS_PER_DAY}, IFNULL(odeme_yontemi, ''), ?,
+                   ? * IFNULL(toplam_tutar, 0), ? * IFNULL(iskonto, 0), ? * IFNULL(odenen_tutar, 0)
+            FROM siparis_gecmisi
+            WHERE siparis_id = ? AND durum = 'Kapandı' AND kapanis_epoch IS NOT NULL
+            ON CONFLICT (gun_epoch, odeme_yontemi) DO UPDATE SET
+                adisyon_sayisi = adisyon_sayisi + excluded.adisyon_sayisi,
+                brut_satis = brut_satis + excluded.brut_satis,
+                toplam_iskonto = toplam_iskonto + excluded.toplam_iskonto,
+                net_satis = net_satis + excluded.net_satis
+        """, (sign, sign, sign, sign, siparis_id))
+        self.cursor.execute(f"""
+            INSERT INTO urun_satis_gunluk (gun_epoch, urun_adi, kategori_id, toplam_miktar, toplam_tutar)
+            SELECT sg.kapanis_epoch - sg.kapanis_epoch % {SECONDS_PER_DAY}, sd.urun_adi, IFNULL(sd.kategori_id, 0),
+                   ? * SUM(sd.miktar), ? * SUM(sd.tutar)
+            FROM siparis_detaylari sd
+            JOIN siparis_gecmisi sg ON sg.siparis_id = sd.siparis_id
+            WHERE sd.siparis_id = ? AND sg.durum = 'Kapandı' AND sg.kapanis_epoch IS NOT NULL
+            GROUP BY sd.urun_adi, IFNULL(sd.kategori_id, 0)
+            ON CONFLICT (gun_epoch, urun_adi, kategori_id) DO UPDATE SET
+                toplam_miktar = toplam_miktar + excluded.toplam_miktar,
+                toplam_tutar = toplam_tutar + excluded.toplam_tutar
+        """, (sign, sign, siparis_id))
+
+    @staticmethod
+    def _raw_rollup_sql(sources):
+        """Verilen kaynaklardan (şema, kapanis_epoch var mı, tutarlar kuruş mu) günlük özet satırlarını hesaplayan iki SELECT.
+
+        Dönüş: (gün × ödeme yöntemi sorgusu, gün × ürün × kategori sorgusu); her biri kaynak başına (başlangıç, bitiş) epoch
+        parametresi bekler.
+        """
+        order_branches, product_branches = [], []
+        for schema, has_epoch, in_kurus in sources:
+            epoch = epoch_sql('sg', has_epoch)
+            day = f"({epoch}) - ({epoch}) % {SECONDS_PER_DAY}"
+            where = f"sg.durum = 'Kapandı' AND {epoch} >= ? AND {epoch} < ?"
+            order_branches.append(f"""
+                SELECT {day} AS gun_epoch, IFNULL(sg.odeme_yontemi, '') AS odeme_yontemi,
+                       {kurus_sql('sg.toplam_tutar', in_kurus)} AS toplam_tutar, {kurus_sql('sg.iskonto', in_kurus)} AS iskonto,
+                       {kurus_sql('sg.odenen_tutar', in_kurus)} AS odenen_tutar
+                FROM {schema}.siparis_gecmisi sg WHERE {where}""")
+            product_branches.append(f"""
+                SELECT {day} AS gun_epoch, sd.urun_adi, IFNULL(sd.kategori_id, 0) AS kategori_id, sd.miktar,
+                       {kurus_sql('sd.tutar', in_kurus)} AS tutar
+                FROM {schema}.siparis_detaylari sd
+                JOIN {schema}.siparis_gecmisi sg ON sd.siparis_id = sg.siparis_id
+                WHERE {where}""")
+        orders_sql = f"""
+            SELECT gun_epoch, odeme_yontemi, COUNT(*) AS adisyon_sayisi, IFNULL(SUM(toplam_tutar), 0) AS brut_satis,
+                   IFNULL(SUM(iskonto), 0) AS toplam_iskonto, IFNULL(SUM(odenen_tutar), 0) AS net_satis
+            FROM ({" UNION ALL ".join(order_branches)})
+            GROUP BY gun_epoch, odeme_yontemi"""
+        products_sql = f"""
+            SELECT gun_epoch, urun_adi, kategori_id, SUM(miktar) AS toplam_miktar, SUM(tutar) AS toplam_tutar
+            FROM ({" UNION ALL ".join(product_branches)})
+            GROUP BY gun_epoch, urun_adi, kategori_id"""
+        return orders_sql, products_sql
+
+    def rebuild_sales_rollups(self):
+        """Günlük satış özetlerini ana veritabanı ve tüm arşiv dosyalarındaki kapanmış siparişlerden baştan oluşturur.
+
+        Arşivler önce geçici tablolara özetlenir (ATTACH transaction içinde yapılamaz); ardından eski özetlerin silinmesi ve
+        ana veritabanının özetlenmesi tek transaction'da yapılır, bu sırada kapanan siparişler çift sayılmaz.
+        Yarıda kalırsa 'sales_rollups_stale' ayarı açık kalır: raporlar ham tablolara döner ve açılışta tekrar denenir.
+        """
         try:
-            # Tarih formatı:YYYY-MM-DD
-            # siparis_gecmisi'ndeki kapanis_zamani kullanılır.
-            self.cursor.execute("""
-                SELECT
-                    COUNT(siparis_id) as toplam_adisyon,
-                    SUM(toplam_tutar) as brut_satis,
-                    SUM(iskonto) as toplam_iskonto,
-                    SUM(odenen_tutar) as net_satis -- Kapanış anındaki toplam odenen tutar net satışı verir
-                FROM siparis_gecmisi
-                WHERE durum = 'Kapandı'
-                  AND date(kapanis_zamani) BETWEEN date(?) AND date(?)
-            """, (start_date, end_date))
-            return self.cursor.fetchone()
+            self.conn.commit()
+            self.cursor.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('sales_rollups_stale', '1')")
+            self.conn.commit()
+            self.cursor.execute("DROP TABLE IF EXISTS temp.satis_ozeti_parca")
+            self.cursor.execute("DROP TABLE IF EXISTS temp.urun_satis_parca")
+            self.cursor.execute("CREATE TEMP TABLE satis_ozeti_parca AS SELECT * FROM main.satis_ozeti_gunluk WHERE 0")
+            self.cursor.execute("CREATE TEMP TABLE urun_satis_parca AS SELECT * FROM main.urun_satis_gunluk WHERE 0")
+
+            archive_count = 0
+            for sources in self._iter_report_sources(*self._ALL_EPOCHS):
+                archive_sources = [source for source in sources if source[0] != 'main']
+                if not archive_sources:
+                    continue
+                orders_sql, products_sql = self._raw_rollup_sql(archive_sources)
+                params = self._ALL_EPOCHS * len(archive_sources)
+                self.cursor.execute(f"INSERT INTO temp.satis_ozeti_parca {orders_sql}", params)
+                self.cursor.execute(f"INSERT INTO temp.urun_satis_parca {products_sql}", params)
+                self.conn.commit() # Grup ayrılmadan (DETACH) önce
+                archive_count += len(archive_sources)
+
+            orders_sql, products_sql = self._raw_rollup_sql([self._MAIN_REPORT_SOURCE])
+            with self.transaction() as cursor:
+                cursor.execute("DELETE FROM main.satis_ozeti_gunluk")
+                cursor.execute("DELETE FROM main.urun_satis_gunluk")
+                cursor.execute(f"""
+                    INSERT INTO main.satis_ozeti_gunluk
+                    SELECT gun_epoch, odeme_yontemi, SUM(adisyon_sayisi), SUM(brut_satis), SUM(toplam_iskonto), SUM(net_satis)
+                    FROM (SELECT * FROM temp.satis_ozeti_parca UNION ALL {orders_sql})
+                    GROUP BY gun_epoch, odeme_yontemi
+                """, self._ALL_EPOCHS)
+                cursor.execute(f"""
+                    INSERT INTO main.urun_satis_gunluk
+                    SELECT gun_epoch, urun_adi, kategori_id, SUM(toplam_miktar), SUM(toplam_tutar)
+                    FROM (SELECT * FROM temp.urun_satis_parca UNION ALL {products_sql})
+                    GROUP BY gun_epoch, urun_adi, kategori_id
+                """, self._ALL_EPOCHS)
+                cursor.execute("SELECT COUNT(*) FROM main.satis_ozeti_gunluk")
+                day_rows = cursor.fetchone()[0]
+                cursor.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('sales_rollups_stale', '0')")
+            self.cursor.execute("DROP TABLE temp.satis_ozeti_parca")
+            self.cursor.execute("DROP TABLE temp.urun_satis_parca")
+            print(f"Günlük satış özetleri yeniden oluşturuldu ({archive_count} arşiv dosyası, {day_rows} gün/ödeme satırı).")
+            return True, f"Günlük satış özetleri yeniden oluşturuldu ({day_rows} gün/ödeme yöntemi satırı)."
         except sqlite3.Error as e:
+            print(f"Satış özeti yeniden oluşturma hatası: {e}")
+            self.conn.rollback()
+            return False, f"Günlük satış özetleri oluşturulurken hata oluştu: {e}"
+
+    def check_sales_rollups(self, start_date=None, end_date=None, tolerance=0.005):
+        """Günlük özetleri ham tablolarla (ana DB + arşivler) karşılaştırır.
+
+        Tutarlar tamsayı kuruş olduğundan birebir karşılaştırılır; tolerance sadece (REAL) miktar toplamları içindir.
+
+        Tarih verilmezse tüm geçmiş kontrol edilir. Dönüş: (tutarlı mı, farklar listesi); her fark okunabilir bir metindir.
+        """
+        try:
+            if start_date and end_date:
+                start_epoch, end_epoch = date_range_to_epochs(start_date, end_date)
+            else:
+                start_epoch, end_epoch = self._ALL_EPOCHS
+
+            raw_orders, raw_products = {}, {}
+            for sources in self._iter_report_sources(start_epoch, end_epoch):
+                orders_sql, products_sql = self._raw_rollup_sql(sources)
+                params = (start_epoch, end_epoch) * len(sources)
+                for row in self.cursor.execute(orders_sql, params).fetchall():
+                    totals = raw_orders.setdefault((row['gun_epoch'], row['odeme_yontemi']), [0, 0, 0, 0])
+                    for index, key in enumerate(('adisyon_sayisi', 'brut_satis', 'toplam_iskonto', 'net_satis')):
+                        totals[index] += row[key]
+                for row in self.cursor.execute(products_sql, params).fetchall():
+                    totals = raw_products.setdefault((row['gun_epoch'], row['urun_adi'], row['kategori_id']), [0.0, 0])
+                    totals[0] += row['toplam_miktar']
+                    totals[1] += row['toplam_tutar']
+
+            self.cursor.execute("""
+                SELECT gun_epoch, odeme_yontemi, adisyon_sayisi, brut_satis, toplam_iskonto, net_satis
+                FROM satis_ozeti_gunluk WHERE gun_epoch >= ? AND gun_epoch < ?
+            """, (start_epoch, end_epoch))
+            rollup_orders = {(row[0], row[1]): list(row[2:]) for row in self.cursor.fetchall()}
+            self.cursor.execute("""
+                SELECT gun_epoch, urun_adi, kategori_id, toplam_miktar, toplam_tutar
+                FROM urun_satis_gunluk WHERE gun_epoch >= ? AND gun_epoch < ?
+            """, (start_epoch, end_epoch))
+            rollup_products = {(row[0], row[1], row[2]): list(row[3:]) for row in self.cursor.fetchall()}
+
+            mismatches = []
+            for table, raw, rollup in (("satis_ozeti_gunluk", raw_orders, rollup_orders),
+                                       ("urun_satis_gunluk", raw_products, rollup_products)):
+                for key in sorted(set(raw) | set(rollup), key=repr):
+                    expected = raw.get(key)
+                    actual = rollup.get(key)
+                    if expected is None and actual is not None and all(abs(value) <= tolerance for value in actual):
+                        continue # Tekrar kapatma sonrası sıfırlanmış satır
+                    if (expected is None or actual is None
+                            or any(abs(e - a) > tolerance for e, a in zip(expected, actual))):
+                        day = (datetime(1970, 1, 1) + timedelta(seconds=key[0])).strftime("%Y-%m-%d")
+                        mismatches.append(f"{table} {day} {key[1:]}: ham={expected} özet={actual}")
+            if mismatches:
+                print(f"Satış özeti tutarsızlığı: {len(mismatches)} fark (ilk: {mismatches[0]})")
+            return not mismatches, mismatches
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Satış özeti kontrol hatası: {e}")
+            return False, [f"Kontrol sırasında hata oluştu: {e}"]
+
+    def _use_sales_rollups(self, include_archives, use_rollups):
+        """Rapor günlük özetlerden okunabilir mi? Özetler tüm geçmişi (arşivler dahil) kapsar, geçersizse ham tablolar okunur."""
+        return use_rollups and include_archives and self.get_setting('sales_rollups_stale', '0') != '1'
+
+    # --- Raporlama Metotları ---
+    # Raporlar ana veritabanı ile tarih aralığıyla kesişen arşiv dosyalarını (report_federation.ArchiveCatalog) birlikte
+    # sorgular. Her kaynak için ayrı bir UNION ALL kolu kurulur, böylece her kol kendi dosyasındaki indeksi kullanır.
+    _MAIN_REPORT_SOURCE = ('main', True, True)
+
+    def _iter_report_sources(self, start_epoch, end_epoch, include_archives=True):
+        """Rapor kaynak gruplarını üretir: her grup [(şema, kapanis_epoch sütunu var mı, tutarlar kuruş mu), ...] listesidir.
+
+        Sadece [start_epoch, end_epoch) ile kesişen arşivler ATTACH edilir; grup işlendikten sonra ayrılır (DETACH).
+        Arşiv sayısı REPORT_MAX_ATTACHED_ARCHIVES'ı aşarsa birden fazla grup üretilir (ana DB sadece ilk grupta).
+        """
+        archives = self.archives.overlapping(start_epoch, end_epoch) if include_archives else []
+        main_source = self._MAIN_REPORT_SOURCE
+        if not archives:
+            yield [main_source]
+            return
+
+        step = constants.REPORT_MAX_ATTACHED_ARCHIVES
+        for offset in range(0, len(archives), step):
+            aliases = []
+            try:
+                group = archives[offset:offset + step]
+                for index, info in enumerate(group):
+                    alias = f"rapor_arsiv_{index}"
+                    self.cursor.execute(f"ATTACH DATABASE ? AS {alias}", (info.path,))
+                    aliases.append(alias)
+                sources = [(alias, info.has_epoch_column, info.money_in_kurus) for alias, info in zip(aliases, group)]
+                yield ([main_source] if offset == 0 else []) + sources
+            finally:
+                for alias in aliases:
+                    self.cursor.execute(f"DETACH DATABASE {alias}")
+
+    def get_sales_summary(self, start_date, end_date, include_archives=True, use_rollups=True):
+        """Bel belirli bir tarih aralığındaki satış özetini çeker (aralıkla kesişen arşiv dosyaları dahil).
+
+        Tutarlar (brut_satis, toplam_iskonto, net_satis) tamsayı kuruştur; ekranda Money.of ile gösterilir.
+
+        use_rollups: günlük özet tablosundan okur (gün × ödeme yöntemi satırları); False ise ham siparişler taranır.
+        """
+        try:
+            # Tarih formatı:YYYY-MM-DD, bitiş günü dahil.
+            # siparis_gecmisi'ndeki kapanis_epoch üzerinde yarı açık aralık kullanılır (indeks ile aranabilir).
+            start_epoch, end_epoch = date_range_to_epochs(start_date, end_date)
+            if self._use_sales_rollups(include_archives, use_rollups):
+                self.cursor.execute("""
+                    SELECT
+                        IFNULL(SUM(adisyon_sayisi), 0) as toplam_adisyon,
+                        SUM(brut_satis) as brut_satis,
+                        SUM(toplam_iskonto) as toplam_iskonto,
+                        SUM(net_satis) as net_satis
+                    FROM satis_ozeti_gunluk
+                    WHERE gun_epoch >= ? AND gun_epoch < ?
+                """, (start_epoch, end_epoch))
+                return self.cursor.fetchone()
+
+            partials = []
+            for sources in self._iter_report_sources(start_epoch, end_epoch, include_archives):
+                branches = " UNION ALL ".join(f"""
+                    SELECT sg.siparis_id, {kurus_sql('sg.toplam_tutar', in_kurus)} AS toplam_tutar,
+                           {kurus_sql('sg.iskonto', in_kurus)} AS iskonto, {kurus_sql('sg.odenen_tutar', in_kurus)} AS odenen_tutar
+                    FROM {schema}.siparis_gecmisi sg
+                    WHERE sg.durum = 'Kapandı'
+                      AND {epoch_sql('sg', has_epoch)} >= ? AND {epoch_sql('sg', has_epoch)} < ?"""
+                    for schema, has_epoch, in_kurus in sources)
+                self.cursor.execute(f"""
+                    SELECT
+                        COUNT(siparis_id) as toplam_adisyon,
+                        SUM(toplam_tutar) as brut_satis,
+                        SUM(iskonto) as toplam_iskonto,
+                        SUM(odenen_tutar) as net_satis -- Kapanış anındaki toplam odenen tutar net satışı verir
+                    FROM ({branches})
+                """, (start_epoch, end_epoch) * len(sources))
+                partials.append(self.cursor.fetchone())
+
+            if len(partials) == 1:
+                return partials[0]
+            # Birden fazla arşiv grubu: kısmi toplamlar birleştirilir
+            merged = {'toplam_adisyon': sum(row['toplam_adisyon'] for row in partials)}
+            for key in ('brut_satis', 'toplam_iskonto', 'net_satis'):
+                values = [row[key] for row in partials if row[key] is not None]
+                merged[key] = sum(values) if values else None
+            return merged
+        except (sqlite3.Error, ValueError) as e:
             print(f"Satış özeti çekme hatası ({start_date} - {end_date}): {e}")
-            messagebox.showerror("Veritabanı Hatası", f"Satış özeti alınırken hata oluştu: {e}")
+            self._show_error("Veritabanı Hatası", f"Satış özeti alınırken hata oluştu: {e}")
             return None
 
-    def get_product_sales_report(self, start_date, end_date):
-         """Belirli bir tarih aralığındaki ürün satış detaylarını çeker."""
+    def get_sales_summaries(self, periods, include_archives=True, use_rollups=True):
+        """Birden fazla dönemin satış özetini döndürür (örn. bu Mart ile önceki üç Mart).
+
+        periods: [(başlangıç, bitiş), ...] 'YYYY-MM-DD'. Dönüş: [(başlangıç, bitiş, özet), ...]; her dönem sadece
+        kendi tarihleriyle kesişen arşivlere dokunur.
+        """
+        return [(start_date, end_date, self.get_sales_summary(start_date, end_date, include_archives, use_rollups))
+                for start_date, end_date in periods]
+
+    def get_product_sales_report(self, start_date, end_date, include_archives=True, use_rollups=True):
+         """Belirli bir tarih aralığındaki ürün satış detaylarını çeker (aralıkla kesişen arşiv dosyaları dahil).
+
+         toplam_tutar_urun tamsayı kuruştur.
+
+         use_rollups: günlük ürün özet tablosundan okur; False ise ham sipariş detayları taranır.
+         """
          try:
-             self.cursor.execute("""
-                 SELECT
-                     sd.urun_adi,
-                     SUM(sd.miktar) as toplam_miktar,
-                     SUM(sd.tutar) as toplam_tutar_urun,
-                     k.adi AS kategori_adi
-                 FROM siparis_detaylari sd
-                 JOIN siparis_gecmisi sg ON sd.siparis_id = sg.siparis_id
-                 LEFT JOIN kategoriler k ON sd.kategori_id = k.kategori_id
-                 WHERE sg.durum = 'Kapandı'
-                   AND date(sg.kapanis_zamani) BETWEEN date(?) AND date(?)
-                 GROUP BY sd.urun_adi, k.adi
-                 ORDER BY toplam_tutar_urun DESC
-             """, (start_date, end_date))
-             return self.cursor.fetchall()
-         except sqlite3.Error as e:
+             start_epoch, end_epoch = date_range_to_epochs(start_date, end_date)
+             if self._use_sales_rollups(include_archives, use_rollups):
+                 self.cursor.execute("""
+                     SELECT
+                         r.urun_adi,
+                         SUM(r.toplam_miktar) as toplam_miktar,
+                         SUM(r.toplam_tutar) as toplam_tutar_urun,
+                         k.adi AS kategori_adi
+                     FROM urun_satis_gunluk r
+                     LEFT JOIN kategoriler k ON r.kategori_id = k.kategori_id -- kategorisiz satırlar: kategori_id = 0
+                     WHERE r.gun_epoch >= ? AND r.gun_epoch < ?
+                     GROUP BY r.urun_adi, k.adi
+                     ORDER BY toplam_tutar_urun DESC
+                 """, (start_epoch, end_epoch))
+                 return self.cursor.fetchall()
+
+             partials = []
+             for sources in self._iter_report_sources(start_epoch, end_epoch, include_archives):
+                 branches = " UNION ALL ".join(f"""
+                     SELECT sd.urun_adi, sd.miktar, {kurus_sql('sd.tutar', in_kurus)} AS tutar, sd.kategori_id
+                     FROM {schema}.siparis_detaylari sd
+                     JOIN {schema}.siparis_gecmisi sg ON sd.siparis_id = sg.siparis_id
+                     WHERE sg.durum = 'Kapandı'
+                       AND {epoch_sql('sg', has_epoch)} >= ? AND {epoch_sql('sg', has_epoch)} < ?"""
+                     for schema, has_epoch, in_kurus in sources)
+                 self.cursor.execute(f"""
+                     SELECT
+                         sd.urun_adi,
+                         SUM(sd.miktar) as toplam_miktar,
+                         SUM(sd.tutar) as toplam_tutar_urun,
+                         k.adi AS kategori_adi
+                     FROM ({branches}) sd
+                     LEFT JOIN main.kategoriler k ON sd.kategori_id = k.kategori_id
+                     GROUP BY sd.urun_adi, k.adi
+                     ORDER BY toplam_tutar_urun DESC
+                 """, (start_epoch, end_epoch) * len(sources))
+                 partials.append(self.cursor.fetchall())
+
+             if len(partials) == 1:
+                 return partials[0]
+             # Birden fazla arşiv grubu: ürün/kategori bazında birleştirilir
+             merged = {}
+             for rows in partials:
+                 for row in rows:
+                     key = (row['urun_adi'], row['kategori_adi'])
+                     if key in merged:
+                         merged[key]['toplam_miktar'] += row['toplam_miktar']
+                         merged[key]['toplam_tutar_urun'] += row['toplam_tutar_urun']
+                     else:
+                         merged[key] = dict(row)
+             return sorted(merged.values(), key=lambda row: row['toplam_tutar_urun'], reverse=True)
+         except (sqlite3.Error, ValueError) as e:
              print(f"Ürün satış raporu çekme hatası ({start_date} - {end_date}): {e}")
-             messagebox.showerror("Veritabanı Hatası", f"Ürün satış raporu alınırken hata oluştu: {e}")
+             self._show_error("Veritabanı Hatası", f"Ürün satış raporu alınırken hata oluştu: {e}")
              return []
 
+    # iter_closed_order_lines'ın ürettiği tuple'ların sütunları (tutar kuruş, miktar binde bir olarak tamsayı; NULL id'ler -1)
+    ORDER_LINE_COLUMNS = ('kapanis_epoch', 'siparis_id', 'urun_id', 'urun_adi', 'kategori_id', 'miktar_milli',
+                          'tutar_kurus', 'odeme_yontemi')
+
+    def iter_closed_order_lines(self, start_date, end_date, chunk_size=constants.ANALYTICS_FETCH_CHUNK, include_archives=True):
+        """Tarih aralığında kapanmış siparişlerin detay satırlarını en fazla chunk_size satırlık tuple listeleri halinde üretir.
+
+        Satırlar sqlite3.Row yerine düz tuple'dır (ORDER_LINE_COLUMNS sırasıyla), miktar SQLite içinde sabit noktalı
+        tamsayıya çevrilir (tutarlar zaten kuruş). Aralıkla kesişen arşiv dosyaları dahildir. Veritabanı hataları çağırana iletilir.
+        """
+        start_epoch, end_epoch = date_range_to_epochs(start_date, end_date)
+        cursor = self.conn.cursor()
+        cursor.row_factory = None # Tuple: satır başına Row nesnesi oluşturulmaz
+        try:
+            for sources in self._iter_report_sources(start_epoch, end_epoch, include_archives):
+                branches = " UNION ALL ".join(f"""
+                    SELECT {epoch_sql('sg', has_epoch)}, sg.siparis_id, IFNULL(sd.urun_id, -1), sd.urun_adi,
+                           IFNULL(sd.kategori_id, -1), CAST(ROUND(sd.miktar * 1000) AS INTEGER),
+                           {kurus_sql('sd.tutar', in_kurus)}, IFNULL(sg.odeme_yontemi, '')
+                    FROM {schema}.siparis_gecmisi sg
+                    JOIN {schema}.siparis_detaylari sd ON sd.siparis_id = sg.siparis_id
+                    WHERE sg.durum = 'Kapandı'
+                      AND {epoch_sql('sg', has_epoch)} >= ? AND {epoch_sql('sg', has_epoch)} < ?"""
+                    for schema, has_epoch, in_kurus in sources)
+                cursor.execute(branches, (start_epoch, end_epoch) * len(sources))
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+        finally:
+            cursor.close()
+
+    # iter_order_export_rows'un ürettiği tuple'ların sütunları: sipariş sütunları + detay sütunları (detaysız siparişte NULL)
+    ORDER_EXPORT_ORDER_COLUMNS = ('siparis_id', 'masa_no', 'acilis_zamani', 'kapanis_zamani', 'kapanis_epoch', 'toplam_tutar',
+                                  'iskonto', 'odenen_tutar', 'odeme_yontemi', 'musteri_id')
+    ORDER_EXPORT_LINE_COLUMNS = ('detay_id', 'urun_id', 'urun_adi', 'kategori_id', 'miktar', 'birim_fiyat', 'tutar', 'ekleme_zamani')
+    ORDER_EXPORT_MONEY_COLUMNS = ('toplam_tutar', 'iskonto', 'odenen_tutar', 'birim_fiyat', 'tutar') # Tamsayı kuruş
+
+    def iter_order_export_rows(self, start_epoch, end_epoch, after=None, include_archives=False,
+                               chunk_size=constants.ORDER_EXPORT_FETCH_CHUNK):
+        """Kapanmış siparişleri detay satırlarıyla birlikte en fazla chunk_size satırlık tuple listeleri halinde üretir.
+
+        Satırlar (kapanis_epoch, siparis_id, detay_id) sırasındadır, aynı siparişin satırları ardışık gelir. Sıralama
+        kapanis_epoch indeksinden gelir (SQLite sadece aynı saniyede kapanan siparişleri sıralar), sonuç belleğe alınmaz.
+        after=(kapanis_epoch, siparis_id) verilirse sadece bu noktadan sonra kapanan siparişler döner (artımlı dışa aktarma).
+        Arşiv grupları ayrı sorgularla okunur; sıralama her grup içinde geçerlidir. Veritabanı hataları çağırana iletilir.
+        Tutar sütunları (ORDER_EXPORT_MONEY_COLUMNS) tamsayı kuruştur.
+        """
+        after_epoch, after_id = after if after else (start_epoch - 1, 0)
+        cursor = self.conn.cursor()
+        cursor.row_factory = None # Tuple: satır başına Row nesnesi oluşturulmaz
+        try:
+            for sources in self._iter_report_sources(start_epoch, end_epoch, include_archives):
+                branches = []
+                for schema, has_epoch, in_kurus in sources:
+                    epoch = epoch_sql('sg', has_epoch) # Eski arşivlerde kapanis_epoch sütunu yoktur
+
+                    def select_column(alias, column):
+                        if column == 'kapanis_epoch':
+                            return f"{epoch} AS kapanis_epoch"
+                        if column in self.ORDER_EXPORT_MONEY_COLUMNS:
+                            return f"{kurus_sql(f'{alias}.{column}', in_kurus)} AS {column}"
+                        return f"{alias}.{column}"
+
+                    columns = ", ".join([select_column('sg', column) for column in self.ORDER_EXPORT_ORDER_COLUMNS]
+                                        + [select_column('sd', column) for column in self.ORDER_EXPORT_LINE_COLUMNS])
+                    branches.append(f"""
+                        SELECT {columns}
+                        FROM {schema}.siparis_gecmisi sg
+                        LEFT JOIN {schema}.siparis_detaylari sd ON sd.siparis_id = sg.siparis_id
+                        WHERE sg.durum = 'Kapandı' AND {epoch} >= ? AND {epoch} < ?
+                          AND ({epoch} > ? OR ({epoch} = ? AND sg.siparis_id > ?))""")
+                params = (start_epoch, end_epoch, after_epoch, after_epoch, after_id) * len(sources)
+                cursor.execute(f"SELECT * FROM ({' UNION ALL '.join(branches)}) ORDER BY kapanis_epoch, siparis_id, detay_id",
+                               params)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+        finally:
+            cursor.close()
+
     # Diğer raporlama metotları buraya eklenebilir (kategori bazlı, müşteri bazlı vb.)
\ No newline at end of file
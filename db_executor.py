@@ -0,0 +1,145 @@
+# db_executor.py
+
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Signal
+
+import constants
+from database import DatabaseManager
+
+# --- Veritabanı Yazıcı İş Parçacığı ---
+# Kasa ekranının veritabanı işleri (sepete ekleme, ödeme, masa listesi...) arayüz iş parçacığında çalışmaz; yavaş disk
+# veya başka bir bağlantının tuttuğu kilit (busy_timeout beklemesi) arayüzü dondurmaz.
+#   - Yazmalar tek bir yazıcı iş parçacığında, gönderildiği sırayla ve onun bağlantısıyla (DatabaseManager(interactive=False))
+#     çalışır. Komut kuyruğu ThreadPoolExecutor'ın iş kuyruğudur.
+#   - Okumalar salt okunur bağlantılı okuyucu iş parçacıklarına sırayla dağıtılır. Bekleyen yazma varsa okuma yazıcı
+#     kuyruğunun sonuna eklenir, böylece arayüz kendi gönderdiği yazmaların sonucunu görür.
+# Sonuç, işçi iş parçacığından request_finished sinyaliyle arayüz iş parçacığına kuyruklanır ve gönderilirken verilen
+# on_result(sonuç) / on_error(hata) fonksiyonu orada çağrılır.
+#
+# İş fonksiyonu imzası: func(db_manager, *args) -> sonuç. DatabaseManager metotları doğrudan verilebilir
+# (ör. submit_read(DatabaseManager.get_order_info, siparis_id, on_result=...)).
+
+
+class DatabaseExecutor(QObject):
+    """Veritabanı komut kuyruğu. Sonuç fonksiyonları arayüz iş parçacığında çağrılır."""
+
+    request_finished = Signal(int, bool, object) # request_id, başarılı mı, sonuç (hata durumunda istisna)
+
+    def __init__(self, db_name, reader_threads=constants.DB_READER_THREADS, parent=None):
+        super().__init__(parent)
+        self.db_name = db_name
+        # Tek yazıcı: yazmalar sırayla çalışır, SQLite yazma kilidi için bağlantılar arasında yarışma olmaz
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db_yazici")
+        self._readers = [ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"db_okuyucu{i + 1}")
+                         for i in range(max(1, reader_threads))]
+        self._next_reader = itertools.cycle(self._readers)
+        self._request_ids = itertools.count(1)
+        self._handlers = {} # request_id -> (on_result, on_error); sadece arayüz iş parçacığında kullanılır
+        self._lock = threading.Lock()
+        self._pending_writes = 0
+        self._local = threading.local() # İşçi iş parçacığı başına bağlantı (SQLite bağlantıları paylaşılmaz)
+        self.stats = {'writes': 0, 'reads': 0, 'reads_after_writes': 0, 'failed': 0, 'max_pending_writes': 0}
+        # İşçi iş parçacığından yayınlanan sinyal, bu nesnenin iş parçacığında (arayüz) kuyruklanarak işlenir
+        self.request_finished.connect(self._on_request_finished)
+
+    @property
+    def pending_writes(self):
+        """Kuyrukta veya çalışmakta olan yazma sayısı."""
+        with self._lock:
+            return self._pending_writes
+
+    def submit_write(self, func, *args, on_result=None, on_error=None):
+        """Yazma işini yazıcı kuyruğuna ekler ve istek numarasını döndürür."""
+        request_id = self._register(on_result, on_error)
+        with self._lock:
+            self._pending_writes += 1
+            self.stats['max_pending_writes'] = max(self.stats['max_pending_writes'], self._pending_writes)
+        self.stats['writes'] += 1
+        self._writer.submit(self._run_write, request_id, func, args)
+        return request_id
+
+    def submit_read(self, func, *args, on_result=None, on_error=None):
+        """Okuma işini gönderir ve istek numarasını döndürür (bekleyen yazma varsa onlardan sonra çalışır)."""
+        request_id = self._register(on_result, on_error)
+        self.stats['reads'] += 1
+        with self._lock:
+            after_writes = self._pending_writes > 0
+        if after_writes:
+            self.stats['reads_after_writes'] += 1
+            self._writer.submit(self._run, request_id, func, args, False)
+        else:
+            next(self._next_reader).submit(self._run, request_id, func, args, True)
+        return request_id
+
+    def wait_for_writes(self, timeout=None):
+        """Şimdiye kadar gönderilen yazmalar bitene kadar bekler (arayüzü bloklar; kapanışta kullanılır).
+
+        Sonuç fonksiyonları bir sonraki olay döngüsü turunda çağrılır. Zaman aşımında False döner.
+        """
+        try:
+            self._writer.submit(lambda: None).result(timeout)
+            return True
+        except TimeoutError:
+            return False
+
+    def shutdown(self, wait=True):
+        """Kuyruktaki işler bittikten sonra işçi bağlantılarını kapatır."""
+        for executor in [self._writer] + self._readers:
+            executor.submit(self._close_worker_db)
+            executor.shutdown(wait=wait)
+        print(f"Veritabanı kuyruğu kapatıldı: {self.stats_text()}")
+
+    def stats_text(self):
+        return (f"{self.stats['writes']} yazma, {self.stats['reads']} okuma "
+                f"({self.stats['reads_after_writes']} yazmalardan sonra), {self.stats['failed']} hata, "
+                f"en fazla {self.stats['max_pending_writes']} bekleyen yazma")
+
+    def _register(self, on_result, on_error):
+        request_id = next(self._request_ids)
+        if on_result is not None or on_error is not None:
+            self._handlers[request_id] = (on_result, on_error)
+        return request_id
+
+    def _db(self, read_only):
+        db_manager = getattr(self._local, 'db', None)
+        if db_manager is None:
+            db_manager = DatabaseManager(self.db_name, interactive=False, read_only=read_only)
+            self._local.db = db_manager
+        return db_manager
+
+    def _close_worker_db(self):
+        db_manager = getattr(self._local, 'db', None)
+        if db_manager is not None:
+            db_manager.close()
+            self._local.db = None
+
+    def _run_write(self, request_id, func, args):
+        """Yazıcı iş parçacığında çalışır."""
+        try:
+            self._run(request_id, func, args, False)
+        finally:
+            with self._lock:
+                self._pending_writes -= 1
+
+    def _run(self, request_id, func, args, read_only):
+        """İşçi iş parçacığında çalışır."""
+        try:
+            result = func(self._db(read_only), *args)
+        except Exception as e:
+            print(f"Veritabanı işi hatası (#{request_id} {getattr(func, '__name__', func)}): {e}")
+            self.stats['failed'] += 1
+            self.request_finished.emit(request_id, False, e)
+            return
+        self.request_finished.emit(request_id, True, result)
+
+    def _on_request_finished(self, request_id, success, result):
+        """Arayüz iş parçacığında çalışır."""
+        on_result, on_error = self._handlers.pop(request_id, (None, None))
+        if success:
+            if on_result is not None:
+                on_result(result)
+        elif on_error is not None:
+            on_error(result)
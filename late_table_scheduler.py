@@ -0,0 +1,173 @@
+# late_table_scheduler.py
+
+import heapq
+import calendar
+from datetime import datetime
+
+from PySide6.QtCore import QObject, QTimer
+
+import constants
+import refresh_bus
+from database import DatabaseManager
+
+
+def _now_epoch():
+    """Şu anki yerel saatin epoch karşılığı (database.to_epoch ile aynı yorum, saniye kesirli)."""
+    now = datetime.now()
+    return calendar.timegm(now.timetuple()) + now.microsecond / 1_000_000
+
+
+def _read_deadlines(db_manager, threshold_minutes, masa_nos):
+    """Okuyucu iş parçacığında çalışır: masa_nos None ise tüm masaların, aksi halde verilen masaların son tarihleri."""
+    if masa_nos is None:
+        return db_manager.get_late_table_deadlines(threshold_minutes)
+    rows = []
+    for masa_no in masa_nos:
+        rows.extend(db_manager.get_late_table_deadlines(threshold_minutes, masa_no))
+    return rows
+
+
+class LateTableScheduler(QObject):
+    """Geçikmiş masa tespiti için son tarih (deadline) zamanlayıcısı.
+
+    Her açık adisyonun son_islem_zamani + LATE_TABLE_THRESHOLD_MINUTES değeri bir min-heap'te tutulur. Tek atımlık
+    timer en yakın son tarihe kurulur; zamanı gelen tüm masalar tek UPDATE ile işaretlenir ve yenileme veriyoluna
+    bildirilir (Masalar görünümü bir kez yenilenir). Hangi sekme açık olursa olsun çalışır.
+
+    Masa değişiklikleri (ürün ekleme, ödeme vb.) yenileme veriyolundaki MASA_CHANGED olaylarıyla izlenir; değişen
+    masanın son tarihi veritabanından yeniden okunur.
+
+    Veritabanı işleri arayüz iş parçacığında çalışmaz: son tarihler db_executor okuyucularıyla okunur, işaretleme
+    yazıcı kuyruğuna gönderilir. Heap ve veriyolu bildirimleri sonuç fonksiyonlarında (arayüz iş parçacığında) güncellenir.
+    Aynı anda en fazla bir okuma yapılır; bu sırada değişen masalar biriktirilip okuma bitince tek okumayla istenir.
+    """
+
+    def __init__(self, db_executor, bus, threshold_minutes=constants.LATE_TABLE_THRESHOLD_MINUTES, parent=None):
+        super().__init__(parent)
+        self.db_executor = db_executor
+        self.bus = bus
+        self.threshold_minutes = threshold_minutes
+
+        self._heap = [] # (deadline_epoch, masa_no) - eski kayıtlar _deadlines ile karşılaştırılarak atlanır
+        self._deadlines = {} # masa_no -> geçerli deadline_epoch (sadece 'Dolu' masalar)
+        self._active = False
+        self._loading = False # Son tarih okuması sürüyor
+        self._reload_all = False # Okuma bitince tüm masalar yeniden okunacak
+        self._dirty = set() # Okuma bitince yeniden okunacak masalar
+        self._marking = False # İşaretleme yazması yazıcı kuyruğunda
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+        self.stats = {'wakeups': 0, 'batches': 0, 'marked': 0}
+
+        bus.subscribe(refresh_bus.MASA_CHANGED, self._on_masa_changed)
+
+    def start(self):
+        """Tüm açık masaların son tarihlerini (arka planda) yükler; zamanlayıcı okuma bitince kurulur."""
+        self._active = True
+        self._reload()
+        print("Geçikmiş masa zamanlayıcısı başlatıldı.")
+
+    def stop(self):
+        self._active = False
+        self._timer.stop()
+        print("Geçikmiş masa zamanlayıcısı durduruldu.")
+
+    def next_deadline(self):
+        """En yakın geçerli son tarih (epoch) veya None."""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def _reload(self, masa_nos=None):
+        """Son tarihlerin okunmasını ister. masa_nos None ise tüm masalar, aksi halde sadece verilen masalar."""
+        if masa_nos is None:
+            self._reload_all = True
+            self._dirty.clear()
+        elif not self._reload_all:
+            self._dirty.update(masa_nos)
+        if not self._loading:
+            self._load_next()
+
+    def _load_next(self):
+        """Biriken okuma isteğini okuyucu kuyruğuna gönderir (bekleyen yazma varsa onlardan sonra çalışır)."""
+        if not self._reload_all and not self._dirty:
+            return
+        masa_nos = None if self._reload_all else sorted(self._dirty)
+        self._reload_all = False
+        self._dirty = set()
+        self._loading = True
+        self.db_executor.submit_read(_read_deadlines, self.threshold_minutes, masa_nos,
+                                     on_result=lambda rows: self._on_deadlines_loaded(masa_nos, rows),
+                                     on_error=lambda error: self._on_deadlines_loaded(masa_nos, []))
+
+    def _on_deadlines_loaded(self, masa_nos, rows):
+        """Okuma sonucu (arayüz iş parçacığında): heap güncellenir, zamanlayıcı yeniden kurulur."""
+        self._loading = False
+        if masa_nos is None:
+            self._heap = []
+            self._deadlines = {}
+        else:
+            for masa_no in masa_nos:
+                self._deadlines.pop(masa_no, None) # Masa kapandıysa/boşaldıysa izlemeden çıkar
+
+        for row in rows:
+            if row['durum'] != 'Dolu' or row['deadline_epoch'] is None:
+                continue # Zaten geçikmiş veya son işlem zamanı okunamadı
+            self._deadlines[row['masa_no']] = row['deadline_epoch']
+            heapq.heappush(self._heap, (row['deadline_epoch'], row['masa_no']))
+
+        self._load_next()
+        self._arm()
+
+    def _discard_stale(self):
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def _arm(self):
+        """Timer'ı en yakın son tarihe kurar (saat değişikliklerine karşı en fazla LATE_TABLE_CHECK_INTERVAL_MS bekler)."""
+        deadline = self.next_deadline()
+        if deadline is None or not self._active or self._marking:
+            self._timer.stop() # İşaretleme sürüyorsa timer sonucu gelince kurulur
+            return
+        delay_ms = max(0, int((deadline - _now_epoch()) * 1000) + 1)
+        self._timer.start(min(delay_ms, constants.LATE_TABLE_CHECK_INTERVAL_MS))
+
+    def _on_timeout(self):
+        self.stats['wakeups'] += 1
+        now = _now_epoch()
+        deadline = self.next_deadline()
+        if deadline is not None and deadline <= now:
+            # Zamanı gelen tüm masalar yazıcı kuyruğunda tek UPDATE ile (tek commit) işaretlenir
+            self._marking = True
+            self.db_executor.submit_write(DatabaseManager.mark_late_tables, self.threshold_minutes, int(now),
+                                          on_result=self._on_tables_marked,
+                                          on_error=lambda error: self._on_tables_marked([]))
+            while self._heap and self._heap[0][0] <= now:
+                _, masa_no = heapq.heappop(self._heap)
+                self._deadlines.pop(masa_no, None)
+        self._arm()
+
+    def _on_tables_marked(self, marked):
+        """İşaretleme sonucu (arayüz iş parçacığında): işaretlenen masalar veriyoluna bildirilir."""
+        self._marking = False
+        for masa_no in marked:
+            self._deadlines.pop(masa_no, None)
+            self.bus.publish(refresh_bus.MASA_CHANGED, masa_no)
+        if marked:
+            self.stats['batches'] += 1
+            self.stats['marked'] += len(marked)
+            print(f"Geçikmiş olarak işaretlenen masalar: {', '.join(str(m) for m in marked)}")
+        self._arm()
+
+    def _on_masa_changed(self, changes):
+        """Yenileme veriyolu aboneliği: değişen masaların son tarihlerini yeniden okur."""
+        if not self._active:
+            return
+        masa_nos = changes[refresh_bus.MASA_CHANGED]
+        if None in masa_nos:
+            self._reload()
+        else:
+            self._reload(masa_nos)
@@ -8,7 +8,13 @@ from datetime import datetime, date, timedelta
 
 # Veritabanı yöneticisi ve sabitler
 from database import DatabaseManager
+from db_executor import DatabaseExecutor
 import constants
+import refresh_bus
+from refresh_bus import RefreshBus
+from late_table_scheduler import LateTableScheduler
+from maintenance_jobs import (MaintenanceJobRunner, archive_job, vacuum_job, rebuild_sales_rollups_job, csv_import_job,
+                              order_export_job)
 
 # PySide6 tab sınıflarını import et
 from masa_tab_pyside import MasaTabPyside
@@ -16,7 +22,7 @@ from adisyon_tab_pyside import AdisyonTabPyside # <<< Adisyon sekmesi import edi
 # Diğer sekmeler tamamlandığında importları buraya eklenecek
 from urun_tab_pyside import UrunTabPyside
 # from musteriler_tab_pyside import MusterilerTabPyside
-# from raporlar_tab_pyside import RaporlarTabPyside
+from raporlar_tab_pyside import RaporlarTabPyside
 
 # Geçici olarak boş QWidget sınıfları tanımlayalım (henüz tamamlanmayan sekmeler için)
 
@@ -26,12 +32,6 @@ class MusterilerTabPyside(QWidget):
         layout = QVBoxLayout(self)
         layout.addWidget(QLabel("Müşteriler Sekmesi (PySide6) - Yapım Aşamasında"))
 
-class RaporlarTabPyside(QWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent) # <<< Düzeltme: self yerine parent geçirildi
-        layout = QVBoxLayout(self)
-        layout.addWidget(QLabel("Raporlar Sekmesi (PySide6) - Yapım Aşamasında"))
-
 class CafeAdisyonAppPyside(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -40,10 +40,23 @@ class CafeAdisyonAppPyside(QMainWindow):
         self.setGeometry(100, 100, 1200, 800)
 
         self.db_manager = DatabaseManager(constants.DB_NAME)
+        # Kasa ekranının okuma/yazmaları arka plan iş parçacıklarında çalışır (yazıcı + salt okunur okuyucular)
+        self.db_executor = DatabaseExecutor(self.db_manager.db_name, parent=self)
 
         self.aktif_masa = None
         self.aktif_siparis_id = None
 
+        # Sekmeler arası yenileme veriyolu: sekmeler birbirini doğrudan yenilemek yerine olay yayınlar
+        self.refresh_bus = RefreshBus(self)
+
+        # Arşivleme, sıkıştırma gibi uzun bakım işleri kendi bağlantısıyla arka plan iş parçacığında çalışır
+        self.maintenance_jobs = MaintenanceJobRunner(self.db_manager.db_name, self)
+        self._maintenance_job_handlers = {} # job_id -> iş bitince çağrılacak fonksiyon(success, message, result)
+        # Sinyaller bu pencerenin metotlarına bağlıdır, böylece işçi iş parçacığından kuyruklanıp arayüz iş parçacığında çalışırlar
+        self.maintenance_jobs.job_started.connect(self._on_maintenance_job_started)
+        self.maintenance_jobs.job_progress.connect(self._on_maintenance_job_progress)
+        self.maintenance_jobs.job_finished.connect(self._on_maintenance_job_finished)
+
         self.closeEvent = self._on_closing
 
         central_widget = QWidget()
@@ -65,66 +78,157 @@ class CafeAdisyonAppPyside(QMainWindow):
         self.tab_widget.addTab(self.musteriler_tab, "Müşteriler")
         self.tab_widget.addTab(self.raporlar_tab, "Raporlar")
 
+        self._subscribe_refresh_handlers()
+
+        # Geçikmiş masa tespiti: sekmeden bağımsız, bir sonraki masanın geçikeceği ana kurulan zamanlayıcı
+        self.late_table_scheduler = LateTableScheduler(self.db_executor, self.refresh_bus, parent=self)
+        self.late_table_scheduler.start()
+
         self.tab_widget.currentChanged.connect(self._on_tab_change)
 
         self.tab_widget.setCurrentIndex(0)
+        # Başlangıçta Masalar sekmesi zaten seçili olduğundan currentChanged tetiklenmez; ilk yüklemeyi veriyolu yapar
+        self.refresh_bus.publish(refresh_bus.MASA_CHANGED)
 
         # Otomatik arşivleme kontrolü şimdilik yorum satırı
         # self._check_and_perform_auto_archive()
 
 
-    # Otomatik arşivleme kontrolü (yorum satırı)
-    def _check_and_perform_auto_archive(self):
-        """Uygulama başlangıcında otomatik arşivleme yapılması gerekip gerekmediğini kontrol eder (PySide6 versiyonu)."""
-        # date modülünün import edildiğinden emin olun (from datetime import date)
+    def _subscribe_refresh_handlers(self):
+        """Yenileme olaylarını ilgili sekmelerin yükleme metotlarına bağlar. Her görünüm bir turda en fazla bir kez yenilenir."""
+        self.refresh_bus.subscribe((refresh_bus.MASA_CHANGED, refresh_bus.CUSTOMERS_CHANGED),
+                                   lambda changes: self.masa_tab.load_masa_buttons())
+        self.refresh_bus.subscribe((refresh_bus.PRODUCTS_CHANGED, refresh_bus.CATEGORIES_CHANGED),
+                                   lambda changes: self.adisyon_tab.filter_hizli_satis_buttons())
+        self.refresh_bus.subscribe((refresh_bus.PRODUCTS_CHANGED, refresh_bus.CATEGORIES_CHANGED),
+                                   lambda changes: self.urun_tab.load_data())
+
+
+    # --- Arka Plan Bakım İşleri ---
+    def submit_maintenance_job(self, name, func, *args, on_finished=None):
+        """Bakım işini arka plan kuyruğuna ekler. on_finished(success, message, result) iş bitince arayüz iş parçacığında çağrılır."""
+        job = self.maintenance_jobs.submit(name, func, *args)
+        if on_finished:
+            self._maintenance_job_handlers[job.job_id] = on_finished
+        return job
+
+    def _on_maintenance_job_started(self, job_id, name):
+        self.statusBar().showMessage(f"{name} başladı...")
+
+    def _on_maintenance_job_progress(self, job_id, done, total, message):
+        percent = f" (%{done * 100 // total})" if total else ""
+        self.statusBar().showMessage(f"{message}{percent}")
+
+    def _on_maintenance_job_finished(self, job_id, success, message, result):
+        self.statusBar().showMessage(message, 10000)
+        handler = self._maintenance_job_handlers.pop(job_id, None)
+        if handler:
+            handler(success, message, result)
+
+
+    def rebuild_sales_rollups(self):
+        """Günlük satış özetlerini arka planda baştan oluşturur ve ham tablolarla karşılaştırır."""
+        self.submit_maintenance_job("Satış özetlerini yeniden oluşturma", rebuild_sales_rollups_job,
+                                    on_finished=self._on_sales_rollups_rebuilt)
+
+    def _on_sales_rollups_rebuilt(self, success, message, result):
+        # Özetler yeniden yazıldı (kontrol fark bulsa bile); açık rapor yeni özetlerden tekrar sorgulanır
+        self.raporlar_tab.load_data()
+        if success:
+             QMessageBox.information(self, "Satış Özetleri", message)
+        elif result:
+             preview = result[:constants.SALES_ROLLUP_MISMATCH_PREVIEW]
+             lines = [message, ""] + preview
+             if len(result) > len(preview):
+                 lines.append(f"... ve {len(result) - len(preview)} fark daha.")
+             QMessageBox.warning(self, "Satış Özetleri Tutarsız", "\n".join(lines))
+        else:
+             QMessageBox.warning(self, "Satış Özetleri Hatası", message)
+
+
+    def import_csv(self, kind, path):
+        """CSV dosyasını (kategoriler/urunler/musteriler) arka planda tek transaction'da içe aktarır."""
+        self.submit_maintenance_job(f"CSV içe aktarma ({kind})", csv_import_job, kind, path,
+                                    on_finished=self._on_csv_imported)
+
+    def _on_csv_imported(self, success, message, result):
+        # İçe aktarma işçi bağlantısında yapıldı; bu bağlantının katalog önbelleği değişikliği kendisi göremez
+        if result is not None and result.kind in ('kategoriler', 'urunler'):
+            self.db_manager.catalogue.invalidate()
+        if success:
+            if result.kind == 'musteriler':
+                self.refresh_bus.publish(refresh_bus.CUSTOMERS_CHANGED, None)
+            else:
+                self.refresh_bus.publish(refresh_bus.CATEGORIES_CHANGED, None)
+                self.refresh_bus.publish(refresh_bus.PRODUCTS_CHANGED, None)
+            QMessageBox.information(self, "CSV İçe Aktarma", message)
+        else:
+            QMessageBox.warning(self, "CSV İçe Aktarma Hatası", message)
 
-        # today = date.today()
-        # current_year = today.year
-        # last_completed_year = current_year - 1 # Arşivlenecek yıl (geçen yıl)
 
-        # last_archived_year_str = self.db_manager.get_setting("last_archived_year")
+    def export_orders(self, path, start_date=None, end_date=None, since_last_export=False):
+        """Kapanmış siparişleri (arşivler dahil) arka planda dosyaya aktarır."""
+        self.submit_maintenance_job("Sipariş geçmişi dışa aktarma", order_export_job, path, start_date, end_date,
+                                    since_last_export, on_finished=self._on_orders_exported)
 
-        # try:
-        #     last_archived_year = int(last_archived_year_str) if last_archived_year_str else 0
-        # except ValueError:
-        #     last_archived_year = 0
+    def _on_orders_exported(self, success, message, result):
+        if success:
+             QMessageBox.information(self, "Dışa Aktarma", message)
+        else:
+             QMessageBox.warning(self, "Dışa Aktarma Hatası", message)
 
-        # if last_completed_year > last_archived_year:
 
-        #      reply = QMessageBox.question(self, "Otomatik Arşivleme",
-        #                                 f"'{last_completed_year}' yılına (dahil) ait tamamlanmış siparişler otomatik olarak arşivlensin ve ana veritabanından silinsin mi?\nBu işlem geri alınamaz!",
-        #                                 QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+    # Otomatik arşivleme kontrolü (başlangıçta çağrısı şimdilik yorum satırı)
+    def _check_and_perform_auto_archive(self):
+        """Uygulama başlangıcında otomatik arşivleme yapılması gerekip gerekmediğini kontrol eder (PySide6 versiyonu).
 
-        #      if reply == QMessageBox.Yes:
-        #          success, message = self.db_manager.archive_and_delete_old_orders(last_completed_year)
+        Arşivleme arka planda çalışır (kasa kullanılmaya devam edilebilir); bitince boşalan alan sıkıştırma işiyle geri verilir.
+        """
+        today = date.today()
+        current_year = today.year
+        last_completed_year = current_year - 1 # Arşivlenecek yıl (geçen yıl)
 
-        #          if success:
-        #               QMessageBox.information(self, "Arşivleme Başarılı", message)
-        #               if hasattr(self, 'masa_tab') and isinstance(self.masa_tab, MasaTabPyside):
-        #                   self.masa_tab.load_masa_buttons()
+        last_archived_year_str = self.db_manager.get_setting("last_archived_year")
 
-        #          else:
-        #               QMessageBox.warning(self, "Arşivleme Hatası", message)
-        #      else:
-        #           QMessageBox.information(self, "Arşivleme İptal", "Otomatik arşivleme işlemi kullanıcı tarafından iptal edildi.")
+        try:
+            last_archived_year = int(last_archived_year_str) if last_archived_year_str else 0
+        except ValueError:
+            last_archived_year = 0
+
+        if last_completed_year > last_archived_year:
+
+             reply = QMessageBox.question(self, "Otomatik Arşivleme",
+                                        f"'{last_completed_year}' yılına (dahil) ait tamamlanmış siparişler otomatik olarak arşivlensin ve ana veritabanından silinsin mi?\nBu işlem geri alınamaz!",
+                                        QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+
+             if reply == QMessageBox.Yes:
+                 self.submit_maintenance_job(f"{last_completed_year} arşivleme", archive_job, last_completed_year,
+                                             on_finished=self._on_auto_archive_finished)
+             else:
+                  QMessageBox.information(self, "Arşivleme İptal", "Otomatik arşivleme işlemi kullanıcı tarafından iptal edildi.")
+
+    def _on_auto_archive_finished(self, success, message, result):
+        if success:
+             QMessageBox.information(self, "Arşivleme Başarılı", message)
+             self.submit_maintenance_job("Veritabanı sıkıştırma", vacuum_job)
+        else:
+             QMessageBox.warning(self, "Arşivleme Hatası", message)
 
 
     def _on_tab_change(self, index):
         """Sekme değiştiğinde ilgili sekmenin içeriğini yükler/günceller."""
         print(f"_on_tab_change metodu çağrıldı. Sekme indeksi: {index}, Sekme Adı: {self.tab_widget.tabText(index)}")
-
-        # Sekme değiştiğinde geçikmiş masa kontrol timer'ını durdur (Masa sekmesi tamamlandıysa)
-        if hasattr(self, 'masa_tab') and isinstance(self.masa_tab, MasaTabPyside):
-             print("Masa tab timer durduruluyor.")
-             self.masa_tab.stop_late_table_check()
+        # Grup commit penceresinde bekleyen sepet dokunuşları sekme değişince hemen yazılır
+        self.adisyon_tab.flush_pending_taps()
 
         # İlgili sekmenin yükleme metotlarını çağır
         if index == 0: # Masalar sekmesi
              print("Masalar sekmesi seçildi.")
              if hasattr(self, 'masa_tab') and isinstance(self.masa_tab, MasaTabPyside):
-                 print("MasaTabPyside instance bulundu, load_masa_buttons çağrılıyor.")
-                 self.masa_tab.load_masa_buttons()
-                 self.masa_tab.start_late_table_check() # Masa sekmesine dönüldüğünde timer'ı başlat
+                 print("MasaTabPyside instance bulundu, masa butonları yenileniyor.")
+                 # Bekleyen olaylarla birlikte tek seferde uygulanır (diff tabanlı yükleme)
+                 self.refresh_bus.publish(refresh_bus.MASA_CHANGED)
+                 self.refresh_bus.flush()
              else:
                   print("Hata: MasaTabPyside instance bulunamadı veya doğru tipte değil.")
         elif index == 1: # Adisyon sekmesi
@@ -147,14 +251,16 @@ class CafeAdisyonAppPyside(QMainWindow):
             print("Ürünler sekmesi seçildi.")
             if hasattr(self, 'urun_tab') and isinstance(self.urun_tab, UrunTabPyside):
                 print("UrunTabPyside instance bulundu, load_data çağrılıyor.")
-                # self.urun_tab.load_data() # Bu sekme henüz tamamlanmadı
+                self.urun_tab.load_data()
             else:
                  print("Hata: UrunTabPyside instance bulunamadı veya doğru tipte değil.")
                  
         # elif index == 3: # Müşteriler sekmesi
         # ...
-        # elif index == 4: # Raporlar sekmesi
-        # ...
+        elif index == 4: # Raporlar sekmesi
+            print("Raporlar sekmesi seçildi.")
+            # Sorgu arka planda çalışır, sekme geçişi beklemez
+            self.raporlar_tab.load_data()
 
 
     def _on_closing(self, event):
@@ -163,10 +269,20 @@ class CafeAdisyonAppPyside(QMainWindow):
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            # Uygulama kapatılırken MasaTab'ın timer'ını durdurmak önemli (Masa sekmesi tamamlandıysa)
-            if hasattr(self, 'masa_tab') and isinstance(self.masa_tab, MasaTabPyside):
-                 self.masa_tab.stop_late_table_check()
-
+            # Uygulama kapatılırken geçikmiş masa zamanlayıcısını durdur
+            self.late_table_scheduler.stop()
+            # Bekleyen bakım işleri iptal edilir, çalışan iş parça sınırında durur (arşivleme sonraki açılışta devam eder)
+            self.maintenance_jobs.shutdown(wait=True)
+            # Çalışan rapor sorgusu kesilir ve rapor bağlantısı kapatılır
+            self.raporlar_tab.stop()
+            # Bekleyen sepet dokunuşları ve kuyruktaki sipariş/ödeme yazmaları tamamlanır, ardından işçi bağlantıları kapatılır
+            self.adisyon_tab.flush_pending_taps()
+            print(f"Grup commit: {self.adisyon_tab.tap_batcher.stats_text()}")
+            if not self.db_executor.wait_for_writes(constants.DB_SHUTDOWN_WAIT_S):
+                print(f"Uyarı: bekleyen veritabanı yazmaları {constants.DB_SHUTDOWN_WAIT_S} sn içinde bitmedi.")
+            self.db_executor.shutdown(wait=True)
+
+            print(f"Yenileme veriyolu: {self.refresh_bus.stats_text()}")
             if self.db_manager:
                 self.db_manager.close()
             event.accept()
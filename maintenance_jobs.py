@@ -0,0 +1,170 @@
+# maintenance_jobs.py
+
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from PySide6.QtCore import QObject, Signal
+
+from csv_import import import_csv
+from database import DatabaseManager
+from order_export import export_orders
+
+# --- Arka Plan Bakım İşleri ---
+# Uzun süren bakım işleri (arşivleme, sıkıştırma, satış özeti yeniden oluşturma, CSV içe/dışa aktarma) arayüz iş parçacığını dondurmadan tek bir
+# arka plan iş parçacığında sırayla çalışır. Bu iş parçacığı kendi veritabanı bağlantısını kullanır (SQLite
+# bağlantıları iş parçacıkları arasında paylaşılmaz); WAL modu sayesinde kasa tarafı okuma/yazmaya devam eder.
+#
+# İş fonksiyonu imzası: func(db_manager, job, *args) -> (başarılı mı, mesaj) veya (başarılı mı, mesaj, sonuç)
+# job.report_progress(...) ile ilerleme bildirir, job.cancel_event ile iptali parça sınırlarında kontrol eder.
+
+
+class MaintenanceJob:
+    """Kuyruktaki tek bir bakım işi."""
+
+    def __init__(self, job_id, name, func, args, runner):
+        self.job_id = job_id
+        self.name = name
+        self.func = func
+        self.args = args
+        self.cancel_event = threading.Event()
+        self.future = None
+        self._runner = runner
+
+    def report_progress(self, done, total, message=""):
+        """İlerleme bildirir (iş parçacığından çağrılır, sinyal arayüz iş parçacığına kuyruklanır)."""
+        self._runner.job_progress.emit(self.job_id, int(done or 0), int(total or 0), message)
+
+    def cancel(self):
+        """İşi iptal eder: henüz başlamadıysa kuyruktan çıkarılır, çalışıyorsa bir sonraki parça sınırında durur."""
+        self.cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self._runner.job_finished.emit(self.job_id, False, f"'{self.name}' işi başlamadan iptal edildi.", None)
+
+
+class MaintenanceJobRunner(QObject):
+    """Bakım işi kuyruğu. Sinyaller arayüz iş parçacığında (bağlı slotlarda) işlenir."""
+
+    job_started = Signal(int, str)                  # job_id, iş adı
+    job_progress = Signal(int, int, int, str)       # job_id, tamamlanan, toplam (0: bilinmiyor), mesaj
+    job_finished = Signal(int, bool, str, object)   # job_id, başarılı mı, mesaj, sonuç (yoksa None)
+
+    def __init__(self, db_name, parent=None):
+        super().__init__(parent)
+        self.db_name = db_name
+        # Tek işçi: işler gönderildiği sırayla çalışır ve aynı bağlantıyı kullanır
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bakim")
+        self._job_ids = itertools.count(1)
+        self._jobs = {} # job_id -> MaintenanceJob (bitmemiş işler)
+        self._lock = threading.Lock()
+        self._worker_db = None # Sadece işçi iş parçacığında oluşturulur ve kullanılır
+
+    def submit(self, name, func, *args):
+        """İşi kuyruğa ekler ve MaintenanceJob döndürür."""
+        job = MaintenanceJob(next(self._job_ids), name, func, args, self)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        job.future = self._executor.submit(self._run, job)
+        job.future.add_done_callback(lambda future, job_id=job.job_id: self._forget(job_id))
+        print(f"Bakım işi kuyruğa eklendi: #{job.job_id} {name}")
+        return job
+
+    def pending_jobs(self):
+        """Bitmemiş (kuyrukta veya çalışan) işler."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel_all(self):
+        for job in self.pending_jobs():
+            job.cancel()
+
+    def shutdown(self, wait=True):
+        """Bekleyen işleri iptal eder, çalışan işin parça sınırında durmasını bekler ve işçi bağlantısını kapatır."""
+        self.cancel_all()
+        self._executor.submit(self._close_worker_db)
+        self._executor.shutdown(wait=wait)
+
+    def _forget(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def _db(self):
+        if self._worker_db is None:
+            self._worker_db = DatabaseManager(self.db_name, interactive=False)
+        return self._worker_db
+
+    def _close_worker_db(self):
+        if self._worker_db is not None:
+            self._worker_db.close()
+            self._worker_db = None
+
+    def _run(self, job):
+        """İşçi iş parçacığında çalışır."""
+        if job.cancel_event.is_set():
+            self.job_finished.emit(job.job_id, False, f"'{job.name}' işi başlamadan iptal edildi.", None)
+            return
+        self.job_started.emit(job.job_id, job.name)
+        print(f"Bakım işi başladı: #{job.job_id} {job.name}")
+        try:
+            outcome = job.func(self._db(), job, *job.args)
+            success, message = outcome[0], outcome[1]
+            result = outcome[2] if len(outcome) > 2 else None
+        except Exception as e:
+            print(f"Bakım işi hatası (#{job.job_id} {job.name}): {e}")
+            success, message, result = False, f"'{job.name}' işi sırasında beklenmedik bir hata oluştu: {e}", None
+        print(f"Bakım işi bitti: #{job.job_id} {job.name} -> {message}")
+        self.job_finished.emit(job.job_id, success, message, result)
+
+
+# --- Hazır İşler ---
+def archive_job(db_manager, job, year_to_process, archive_db_name=None):
+    """Yıllık arşivleme (DatabaseManager.archive_and_delete_old_orders, parça parça, iptal edilebilir)."""
+    return db_manager.archive_and_delete_old_orders(year_to_process, archive_db_name, progress_callback=job.report_progress,
+                                                    cancel_event=job.cancel_event)
+
+
+def vacuum_job(db_manager, job):
+    """Boş sayfaları dosyadan geri verir (DatabaseManager.vacuum_database)."""
+    return db_manager.vacuum_database(progress_callback=job.report_progress, cancel_event=job.cancel_event)
+
+
+def rebuild_sales_rollups_job(db_manager, job):
+    """Günlük satış özetlerini ham tablolardan (ana DB + arşivler) baştan oluşturur ve tutarlılığını kontrol eder.
+
+    Tutarsızlıkta sonuç check_sales_rollups'ın fark listesidir.
+    """
+    job.report_progress(0, 2, "Günlük satış özetleri oluşturuluyor")
+    success, message = db_manager.rebuild_sales_rollups()
+    if not success:
+        return success, message
+    job.report_progress(1, 2, "Günlük satış özetleri kontrol ediliyor")
+    consistent, mismatches = db_manager.check_sales_rollups()
+    if not consistent:
+        return False, f"{message} Kontrolde {len(mismatches)} fark bulundu.", mismatches
+    return True, message
+
+
+def standard_report_periods(today=None):
+    """Raporlar sekmesinin hazır dönemleri: ad -> (başlangıç, bitiş) 'YYYY-MM-DD' (bitiş dahil)."""
+    today = today or date.today()
+    return {
+        "Bugün": (today.isoformat(), today.isoformat()),
+        "Bu Hafta": ((today - timedelta(days=today.weekday())).isoformat(), today.isoformat()),
+        "Bu Ay": (today.replace(day=1).isoformat(), today.isoformat()),
+        "Bu Yıl": (today.replace(month=1, day=1).isoformat(), today.isoformat()),
+    }
+
+
+def csv_import_job(db_manager, job, kind, path, create_missing_categories=True):
+    """CSV dosyasını tek transaction'da içe aktarır (csv_import.import_csv). Sonuç: ImportResult."""
+    result = import_csv(db_manager, kind, path, create_missing_categories=create_missing_categories,
+                        progress_callback=job.report_progress, cancel_event=job.cancel_event)
+    return result.success, result.summary_text(), result
+
+
+def order_export_job(db_manager, job, path, start_date=None, end_date=None, since_last_export=False, include_archives=True):
+    """Kapanmış siparişleri detaylarıyla dosyaya akış halinde yazar (order_export.export_orders)."""
+    return export_orders(db_manager, path, start_date=start_date, end_date=end_date, since_last_export=since_last_export,
+                         include_archives=include_archives, progress_callback=job.report_progress,
+                         cancel_event=job.cancel_event)
@@ -3,11 +3,12 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, # <<< BURASI: QHBoxLayout import edildi
                                  QGridLayout, QLabel, QMessageBox, QSizePolicy, QDialog,
                                  QInputDialog) # QInputDialog manuel yıl girişi için kullanılabilir
-from PySide6.QtCore import Qt, QTimer, QDateTime, QSize
+from PySide6.QtCore import Qt, QDateTime, QSize
 from PySide6.QtGui import QColor, QPalette
 
-import constants
-from datetime import datetime, timedelta
+import refresh_bus
+from database import DatabaseManager
+from money import Money, ZERO
 
 # Özel Masa Silme Onay Diyaloğu (İstenirse daha gelişmiş yapılabilir)
 class MasaDeleteConfirmDialog(QDialog):
@@ -37,15 +38,12 @@ class MasaTabPyside(QWidget):
         self.main_app = main_app # main_pyside.py'deki ana uygulama objesi
 
         self.masa_buttons = {} # Masa numaralarına karşılık gelen buton objeleri
+        self._masa_state = {} # Masa numarası -> butonda son gösterilen (metin, stil adı)
         self.delete_mode = False # Masa silme modu aktif mi?
 
         self._create_ui()
         self._configure_styles() # PySide6 stilleri
-
-        # Geçikmiş masa kontrolü için QTimer
-        self.late_table_timer = QTimer(self)
-        self.late_table_timer.timeout.connect(self.check_late_tables)
-        # Timer başlangıçta başlatılmayacak, sekme değiştiğinde başlatılacak.
+        # Geçikmiş masa tespiti ana penceredeki LateTableScheduler tarafından yapılır (late_table_scheduler.py)
 
 
     def _create_ui(self):
@@ -143,70 +141,62 @@ class MasaTabPyside(QWidget):
         """)
 
 
-    def load_masa_buttons(self):
-        """Veritabanından masa bilgilerini çeker ve butonları oluşturur/günceller."""
-        print("Masa butonları yükleniyor...") # Debug
-
-        # Mevcut butonları temizle
-        for i in reversed(range(self.masa_grid_layout.count())):
-            # layout'tan öğeyi al
-            item = self.masa_grid_layout.itemAt(i)
-            if item is not None:
-                widget = item.widget()
-                if widget is not None:
-                    # Widget'ı layout'tan kaldır
-                    self.masa_grid_layout.removeWidget(widget)
-                    # Widget'ı sil
-                    widget.deleteLater() # Widget'ı silmek için güvenli yol
-
-
-        self.masa_buttons = {} # Sözlüğü temizle
-
-        masalar = self.main_app.db_manager.get_all_masalar()
+    @staticmethod
+    def _masa_button_text(masa):
+        """Masa satırından buton metnini oluşturur."""
+        masa_no = masa['masa_no']
+        durum = masa['durum']
+        toplam = Money.of(masa['guncel_toplam']) if masa['guncel_toplam'] is not None else None
+        musteri_adi = masa['musteri_adi']
+
+        # Buton metni ve durumu belirle
+        button_text = f"Masa {masa_no}\nDurum: {durum}"
+        if musteri_adi:
+             button_text += f"\nMüşteri: {musteri_adi}"
+
+        # Toplam bilgisi dolu masalar için
+        if durum != 'Boş' and toplam is not None and toplam >= ZERO: # Toplam 0 veya negatifse de gösterilebilir
+            button_text += f"\nToplam: {toplam:.2f} TL"
+        return button_text
+
+    @staticmethod
+    def _masa_object_name(durum):
+        """Masa durumuna karşılık gelen stil (Object Name) adını döndürür."""
+        # Stili durumuna göre ayarla (Object Name kullanarak CSS stilinde belirttik)
+        if durum == 'Boş':
+            return "MasaBoş"
+        elif durum == 'Dolu':
+            return "MasaDolu"
+        elif durum == 'Ödeme Bekliyor':
+             return "MasaOdemeBekliyor"
+        elif durum == 'Geçikmiş': # Yeni Geçikmiş durumu
+             return "MasaGecikmiş"
+        return "MasaVarsayilan" # Tanımsız durumlar için
+
+    def _create_masa_button(self, masa_no):
+        """Yeni bir masa butonu oluşturur (metin ve stil load_masa_buttons içinde atanır)."""
+        btn = QPushButton()
+        btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding) # Otomatik boyutlandırma
+        btn.setMinimumSize(100, 80) # Minimum boyut ayarlayabilirsiniz
+
+        # Butona masa numarasını sakla (lambda ile bağlantı için)
+        btn.setProperty("masa_no", masa_no)
+
+        # Buton tıklama olayını bağla
+        btn.clicked.connect(lambda checked, mn=masa_no: self._on_masa_button_clicked(mn))
+        return btn
+
+    def _relayout_masa_buttons(self, masa_nos):
+        """Butonları silmeden ızgaradaki yerlerini masa numarası sırasına göre yeniden düzenler."""
+        # Mevcut yerleşimi temizle (widget'lar silinmez, sadece layout'tan çıkarılır)
+        while self.masa_grid_layout.count():
+            self.masa_grid_layout.takeAt(0)
 
         row, col = 0, 0
         max_cols = 5 # Izgaradaki maksimum sütun sayısı
 
-        for masa in masalar:
-            masa_no = masa['masa_no']
-            durum = masa['durum']
-            toplam = masa['guncel_toplam']
-            musteri_adi = masa['musteri_adi']
-
-            # Buton metni ve durumu belirle
-            button_text = f"Masa {masa_no}\nDurum: {durum}"
-            if musteri_adi:
-                 button_text += f"\nMüşteri: {musteri_adi}"
-
-            # Toplam bilgisi dolu masalar için
-            if durum != 'Boş' and toplam is not None and toplam >= 0: # Toplam 0 veya negatifse de gösterilebilir
-                button_text += f"\nToplam: {toplam:.2f} TL"
-
-
-            btn = QPushButton(button_text)
-            btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding) # Otomatik boyutlandırma
-            btn.setMinimumSize(100, 80) # Minimum boyut ayarlayabilirsiniz
-
-            # Stili durumuna göre ayarla (Object Name kullanarak CSS stilinde belirttik)
-            if durum == 'Boş':
-                btn.setObjectName("MasaBoş")
-            elif durum == 'Dolu':
-                btn.setObjectName("MasaDolu")
-            elif durum == 'Ödeme Bekliyor':
-                 btn.setObjectName("MasaOdemeBekliyor")
-            elif durum == 'Geçikmiş': # Yeni Geçikmiş durumu
-                 btn.setObjectName("MasaGecikmiş")
-            else:
-                 btn.setObjectName("MasaVarsayilan") # Tanımsız durumlar için
-
-            # Butona masa numarasını sakla (lambda ile bağlantı için)
-            btn.setProperty("masa_no", masa_no)
-
-            # Buton tıklama olayını bağla
-            btn.clicked.connect(lambda checked, mn=masa_no: self._on_masa_button_clicked(mn))
-
-            self.masa_grid_layout.addWidget(btn, row, col)
-            self.masa_buttons[masa_no] = btn # Buton referansını sakla
+        for masa_no in masa_nos:
+            self.masa_grid_layout.addWidget(self.masa_buttons[masa_no], row, col)
 
             col += 1
             if col >= max_cols:
@@ -217,13 +207,62 @@ class MasaTabPyside(QWidget):
         for i in range(max_cols):
             self.masa_grid_layout.setColumnStretch(i, 1)
 
-        # PySide6'da row stretch genellikle içeriğe göre otomatik ayarlanır,
-        # ancak isterseniz satırları da genişletmek için setRowStretch kullanabilirsiniz.
-        # for i in range(row + 1):
-        #     self.masa_grid_layout.setRowStretch(i, 1)
-
         self.updateGeometry() # Layout güncellendiğinde pencere boyutunu yeniden hesapla
 
+    def load_masa_buttons(self):
+        """Masa bilgilerini arka planda okur; sonuç gelince update_masa_buttons çağrılır."""
+        self.main_app.db_executor.submit_read(DatabaseManager.get_all_masalar, on_result=self.update_masa_buttons)
+
+    def update_masa_buttons(self, masalar):
+        """Okunan masa bilgilerine göre sadece değişen masa butonlarını günceller.
+
+        Butonlar her yenilemede yeniden oluşturulmaz; masa başına son gösterilen (metin, stil) bilgisi
+        self._masa_state içinde tutulur. Sadece metni/stili değişen butonlar güncellenir, masa eklenip
+        silindiğinde buton eklenir/kaldırılır ve ızgara yeniden düzenlenir. Güncellenen buton sayısını döndürür.
+        """
+        new_state = {}
+        for masa in masalar:
+            new_state[masa['masa_no']] = (self._masa_button_text(masa), self._masa_object_name(masa['durum']))
+
+        layout_changed = False
+
+        # Silinen masaların butonlarını kaldır
+        for masa_no in [mn for mn in self.masa_buttons if mn not in new_state]:
+            btn = self.masa_buttons.pop(masa_no)
+            self._masa_state.pop(masa_no, None)
+            self.masa_grid_layout.removeWidget(btn)
+            btn.deleteLater() # Widget'ı silmek için güvenli yol
+            layout_changed = True
+
+        updated_count = 0
+        for masa_no, (button_text, object_name) in new_state.items():
+            btn = self.masa_buttons.get(masa_no)
+            if btn is None:
+                btn = self._create_masa_button(masa_no)
+                self.masa_buttons[masa_no] = btn # Buton referansını sakla
+                layout_changed = True
+
+            old_state = self._masa_state.get(masa_no)
+            if old_state == (button_text, object_name):
+                continue # Değişiklik yok, butona dokunma
+
+            if old_state is None or old_state[0] != button_text:
+                btn.setText(button_text)
+            if old_state is None or old_state[1] != object_name:
+                btn.setObjectName(object_name)
+                # Object Name'e bağlı stilin yeniden uygulanması için
+                btn.style().unpolish(btn)
+                btn.style().polish(btn)
+
+            self._masa_state[masa_no] = (button_text, object_name)
+            updated_count += 1
+
+        if layout_changed:
+            self._relayout_masa_buttons(list(new_state.keys()))
+
+        print(f"Masa butonları güncellendi: {updated_count}/{len(new_state)} masa değişti.") # Debug
+        return updated_count
+
 
     def _on_masa_button_clicked(self, masa_no):
         """Masa butonuna tıklandığında çağrılır."""
@@ -243,8 +282,13 @@ class MasaTabPyside(QWidget):
         # Ana uygulamadaki aktif masa bilgisini güncelle
         self.main_app.aktif_masa = masa_no
 
-        # Seçilen masanın aktif siparişi var mı kontrol et
-        masa_info = self.main_app.db_manager.get_masa_info(self.main_app.aktif_masa)
+        # Seçilen masanın aktif siparişi var mı kontrol et (sonuç gelince Adisyon sekmesine geçilir)
+        self.main_app.db_executor.submit_read(DatabaseManager.get_masa_info, masa_no,
+                                              on_result=lambda masa_info: self._on_masa_info_loaded(masa_no, masa_info))
+
+    def _on_masa_info_loaded(self, masa_no, masa_info):
+        if self.main_app.aktif_masa != masa_no:
+            return # Bu arada başka masa seçildi
 
         if masa_info and masa_info['aktif_siparis_id']:
              self.main_app.aktif_siparis_id = masa_info['aktif_siparis_id']
@@ -277,11 +321,12 @@ class MasaTabPyside(QWidget):
             QMessageBox.warning(self, "Uyarı", "Masa silme modu aktif. Lütfen önce modu kapatın veya bir masa seçin.")
             return
 
-        next_masa_no = self.main_app.db_manager.add_masa()
+        self.main_app.db_executor.submit_write(DatabaseManager.add_masa, on_result=self._on_masa_added)
 
+    def _on_masa_added(self, next_masa_no):
         if next_masa_no:
             QMessageBox.information(self, "Başarılı", f"Masa {next_masa_no} başarıyla eklendi.")
-            self.load_masa_buttons() # Masa listesini ve butonları yeniden yükle
+            self.main_app.refresh_bus.publish(refresh_bus.MASA_CHANGED, next_masa_no) # Masa listesini ve butonları yeniden yükle
 
 
     def _toggle_delete_mode(self):
@@ -323,7 +368,10 @@ class MasaTabPyside(QWidget):
             return
 
         # Seçili masanın durumunu kontrol et (sadece boş masalar silinebilir)
-        masa_info = self.main_app.db_manager.get_masa_info(masa_no)
+        self.main_app.db_executor.submit_read(DatabaseManager.get_masa_info, masa_no,
+                                              on_result=lambda masa_info: self._confirm_delete_masa(masa_no, masa_info))
+
+    def _confirm_delete_masa(self, masa_no, masa_info):
         if masa_info and masa_info['durum'] != 'Boş':
             QMessageBox.warning(self, "Uyarı", f"Sadece boş masalar sililebilir. Masa {masa_no} durumu: {masa_info['durum']}")
             return
@@ -334,58 +382,22 @@ class MasaTabPyside(QWidget):
 
 
         if result == QDialog.Accepted: # Eğer kullanıcı 'Evet'e bastıysa
-            success, message = self.main_app.db_manager.delete_masa(masa_no)
-
-            if success:
-                QMessageBox.information(self, "Başarılı", message)
-                self.load_masa_buttons() # Masa listesini ve butonları yeniden yükle
-
-                # Eğer silinen masa aktif masa ise, aktif masa bilgisini sıfırla (Zaten _toggle_delete_mode içinde yapılıyor)
-                # if self.main_app.aktif_masa == masa_no:
-                #     self.main_app.aktif_masa = None
-                #     self.main_app.aktif_siparis_id = None
-                    # Adisyon sekmesi UI'ını güncellemek gerekebilir (main_pyside.py'deki _on_tab_change içinde halledilebilir veya doğrudan çağrılabilir)
-
-            else:
-                 QMessageBox.warning(self, "Uyarı", message) # delete_masa metotundan gelen uyarı mesajı
+            self.main_app.db_executor.submit_write(DatabaseManager.delete_masa, masa_no,
+                                                   on_result=lambda result: self._on_masa_deleted(masa_no, *result))
 
         else:
             QMessageBox.information(self, "Bilgi", "Silme işlemi iptal edildi.")
 
+    def _on_masa_deleted(self, masa_no, success, message):
+        if success:
+            QMessageBox.information(self, "Başarılı", message)
+            self.main_app.refresh_bus.publish(refresh_bus.MASA_CHANGED, masa_no) # Masa listesini ve butonları yeniden yükle
 
-    def check_late_tables(self):
-        """Geçikmiş masa kontrolünü yapar ve masa durumlarını günceller."""
-        # Bu fonksiyon artık MasaTab'a taşındı
-        late_tables_info = self.main_app.db_manager.get_late_table_info()
-        now = datetime.now()
-
-        for masa_info in late_tables_info:
-            masa_no = masa_info['masa_no']
-            son_islem_zamani_str = masa_info['son_islem_zamani']
-            current_durum = masa_info['durum'] # Mevcut durumu al
-
-            if son_islem_zamani_str:
-                 son_islem_zamani = datetime.strptime(son_islem_zamani_str, "%Y-%m-%d %H:%M:%S")
-                 # Eğer son işlem zamanı belirli bir eşikten eskiyse VE durumu zaten 'Geçikmiş' değilse
-                 if now - son_islem_zamani > timedelta(minutes=constants.LATE_TABLE_THRESHOLD_MINUTES) and current_durum != 'Geçikmiş':
-                     print(f"Masa {masa_no} geçikmiş olarak işaretleniyor.") # Debug
-                     self.main_app.db_manager.update_masa_status(masa_no, 'Geçikmiş')
-                     # Masa durumunu güncelledikten sonra butonları yeniden yükle
-                     self.load_masa_buttons()
-                 # Eğer masa daha önce geçikmiş olarak işaretlenmişse ve artık eşikten yeni durumdaysa
-                 # (Bu durumda normalde durumu 'Dolu'ya döner ama bu akış henüz net tanımlanmadı)
-                 # Şimdilik sadece geçikmiş işaretleme mantığı yeterli.
-
-
-    def start_late_table_check(self):
-        """Geçikmiş masa kontrol timer'ını başlatır."""
-        # Timer'ı başlatmadan önce aktif olup olmadığını kontrol et
-        if not self.late_table_timer.isActive():
-             print("Geçikmiş masa kontrolü başlatıldı.") # Debug
-             self.late_table_timer.start(constants.LATE_TABLE_CHECK_INTERVAL_MS)
-
-    def stop_late_table_check(self):
-        """Geçikmiş masa kontrol timer'ını durdurur."""
-        if self.late_table_timer.isActive():
-             print("Geçikmiş masa kontrolü durduruldu.") # Debug
-             self.late_table_timer.stop()
\ No newline at end of file
+            # Eğer silinen masa aktif masa ise, aktif masa bilgisini sıfırla (Zaten _toggle_delete_mode içinde yapılıyor)
+            # if self.main_app.aktif_masa == masa_no:
+            #     self.main_app.aktif_masa = None
+            #     self.main_app.aktif_siparis_id = None
+                # Adisyon sekmesi UI'ını güncellemek gerekebilir (main_pyside.py'deki _on_tab_change içinde halledilebilir veya doğrudan çağrılabilir)
+
+        else:
+             QMessageBox.warning(self, "Uyarı", message) # delete_masa metotundan gelen uyarı mesajı
\ No newline at end of file
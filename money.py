@@ -0,0 +1,149 @@
+# money.py
+
+import sqlite3
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import total_ordering
+
+# --- Para Tutarları ---
+# Tüm tutarlar (fiyat, tutar, iskonto, ödenen, bakiye) veritabanında tamsayı kuruş olarak saklanır ve uygulama içinde
+# değiştirilemez Money nesneleriyle taşınır. Toplama/çıkarma tamsayı olduğu için kuruş kayması olmaz; miktarla çarpım
+# (0.5 porsiyon gibi) kuruşa yarım yukarı yuvarlanır. Metne çevirme sadece ekranda yapılır: f"{tutar:.2f} TL".
+# Money sorgu parametresi olarak doğrudan geçilebilir (aşağıdaki sqlite3 adaptörü kuruş değerini yazar).
+
+_KURUS = Decimal(1)
+
+
+@total_ordering
+class Money:
+    """Kuruş cinsinden tamsayı tutar. Money(1250) == 12,50 TL."""
+    __slots__ = ('kurus',)
+
+    def __init__(self, kurus=0):
+        if isinstance(kurus, bool) or not isinstance(kurus, int):
+            raise TypeError(f"Money kuruş değeri tamsayı olmalı: {kurus!r}")
+        object.__setattr__(self, 'kurus', kurus)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Money değiştirilemez")
+
+    @classmethod
+    def _new(cls, kurus):
+        """Tip kontrolü yapmadan oluşturur; sadece sonucu zaten tamsayı olan aritmetik için (sepette her dokunuşta çağrılır)."""
+        money = object.__new__(cls)
+        _set_kurus(money, kurus)
+        return money
+
+    @classmethod
+    def from_tl(cls, value):
+        """TL cinsinden sayıdan (float, int, Decimal, '12.5') kuruşa yarım yukarı yuvarlayarak oluşturur."""
+        if isinstance(value, Money):
+            return value
+        try:
+            amount = Decimal(str(value))
+        except InvalidOperation:
+            raise ValueError(f"Geçersiz tutar: {value!r}")
+        if not amount.is_finite():
+            raise ValueError(f"Geçersiz tutar: {value!r}")
+        return cls(int((amount * 100).quantize(_KURUS, rounding=ROUND_HALF_UP)))
+
+    @classmethod
+    def parse(cls, text):
+        """Kullanıcı/CSV metninden tutar: '12,50', '12.50', '1.234,50', '12,50 TL'. Geçersizse ValueError."""
+        text = str(text).strip()
+        if text.upper().endswith("TL"):
+            text = text[:-2]
+        text = text.replace(" ", "")
+        if "," in text:
+            text = text.replace(".", "").replace(",", ".") # Türkçe biçim: binlik nokta, ondalık virgül
+        return cls.from_tl(text)
+
+    @classmethod
+    def of(cls, kurus):
+        """Veritabanı değeri (tamsayı kuruş veya NULL) -> Money; NULL sıfır kabul edilir."""
+        return ZERO if kurus is None else cls(int(kurus))
+
+    def to_decimal(self):
+        return Decimal(self.kurus).scaleb(-2)
+
+    def to_float(self):
+        """TL cinsinden float; sadece float bekleyen arayüz bileşenleri (QDoubleSpinBox) ve JSON için."""
+        return self.kurus / 100
+
+    # --- Aritmetik ---
+    def __add__(self, other):
+        if not isinstance(other, Money):
+            return NotImplemented
+        return Money._new(self.kurus + other.kurus)
+
+    def __radd__(self, other):
+        if other == 0: # sum() başlangıç değeri
+            return self
+        return NotImplemented
+
+    def __sub__(self, other):
+        if not isinstance(other, Money):
+            return NotImplemented
+        return Money._new(self.kurus - other.kurus)
+
+    def __neg__(self):
+        return Money._new(-self.kurus)
+
+    def __abs__(self):
+        return Money._new(abs(self.kurus))
+
+    def __mul__(self, quantity):
+        """Birim fiyat × miktar; sonuç kuruşa yarım yukarı yuvarlanır."""
+        if isinstance(quantity, bool) or isinstance(quantity, Money):
+            return NotImplemented
+        if isinstance(quantity, int):
+            return Money._new(self.kurus * quantity)
+        if isinstance(quantity, float):
+            if quantity.is_integer():
+                return Money._new(self.kurus * int(quantity))
+            if (quantity * 2).is_integer():
+                # Yarım porsiyon: kuruş * miktar tam olarak x.5 olabilir; yarım yukarı (sıfırdan uzağa) yuvarlanır
+                doubled = self.kurus * int(quantity * 2)
+                return Money._new((doubled + (1 if doubled >= 0 else -1)) // 2 if doubled % 2 else doubled // 2)
+        try:
+            product = Decimal(self.kurus) * Decimal(str(quantity))
+        except InvalidOperation:
+            return NotImplemented
+        return Money(int(product.quantize(_KURUS, rounding=ROUND_HALF_UP)))
+
+    __rmul__ = __mul__
+
+    # --- Karşılaştırma ---
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.kurus == other.kurus
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Money):
+            return self.kurus < other.kurus
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.kurus)
+
+    def __bool__(self):
+        return self.kurus != 0
+
+    # --- Gösterim ---
+    def __format__(self, spec):
+        """f"{tutar:.2f}" gibi sayı biçimleri TL değerine uygulanır (float'a çevrilmeden)."""
+        return format(self.to_decimal(), spec or ".2f")
+
+    def __str__(self):
+        return f"{self:.2f} TL"
+
+    def __repr__(self):
+        return f"Money({self.kurus})"
+
+
+_set_kurus = Money.kurus.__set__
+
+ZERO = Money(0)
+
+
+sqlite3.register_adapter(Money, lambda money: money.kurus)
@@ -0,0 +1,215 @@
+# order_export.py
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+import constants
+from database import DatabaseManager, date_range_to_epochs, TIMESTAMP_FORMAT
+from money import Money
+
+# --- Sipariş Geçmişi Dışa Aktarma (Muhasebe) ---
+# Kapanmış adisyonlar detay satırlarıyla birlikte CSV veya JSON Lines dosyasına yazılır. Satırlar veritabanından
+# ORDER_EXPORT_FETCH_CHUNK'lık parçalar halinde (fetchmany) okunup hemen dosyaya yazılır; bellek kullanımı
+# dışa aktarılan sipariş sayısından bağımsızdır.
+#
+#   csv:   her detay satırı bir CSV satırıdır (sipariş sütunları tekrarlanır; detaysız sipariş tek satır, detay sütunları boş)
+#   jsonl: her sipariş bir JSON satırıdır, detaylar 'satirlar' listesindedir
+#
+# Artımlı dışa aktarma: son dışa aktarılan siparişin (kapanis_epoch, siparis_id) değeri settings tablosunda
+# ORDER_EXPORT_WATERMARK_KEY anahtarıyla saklanır; since_last_export=True sadece bu noktadan sonra kapananları yazar.
+# Dosya önce '<dosya>.part' adıyla yazılır, başarıyla bitince yerine taşınır; hata veya iptalde son nokta değişmez.
+# Tutarlar veritabanından tamsayı kuruş olarak okunur, dosyaya TL olarak yazılır (CSV: "12.50", JSON: 12.5).
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+MONEY_COLUMNS = DatabaseManager.ORDER_EXPORT_MONEY_COLUMNS
+
+ORDER_COLUMNS = DatabaseManager.ORDER_EXPORT_ORDER_COLUMNS
+LINE_COLUMNS = DatabaseManager.ORDER_EXPORT_LINE_COLUMNS
+_ORDER_WIDTH = len(ORDER_COLUMNS)
+_SIPARIS_ID = ORDER_COLUMNS.index('siparis_id')
+_KAPANIS_EPOCH = ORDER_COLUMNS.index('kapanis_epoch')
+_DETAY_ID = _ORDER_WIDTH + LINE_COLUMNS.index('detay_id')
+
+
+def load_watermark(db_manager):
+    """Son artımlı dışa aktarmanın (kapanis_epoch, siparis_id) noktası; hiç yapılmadıysa None."""
+    value = db_manager.get_setting(constants.ORDER_EXPORT_WATERMARK_KEY)
+    if not value:
+        return None
+    try:
+        epoch, siparis_id = value.split(":")
+        return int(epoch), int(siparis_id)
+    except ValueError:
+        print(f"Geçersiz dışa aktarma son noktası ayarı: {value}")
+        return None
+
+
+def save_watermark(db_manager, watermark):
+    return db_manager.set_setting(constants.ORDER_EXPORT_WATERMARK_KEY, f"{watermark[0]}:{watermark[1]}")
+
+
+def detect_format(path, export_format=None):
+    """Biçim verilmemişse dosya uzantısından (.jsonl/.json -> jsonl, diğerleri csv) belirlenir."""
+    if export_format:
+        return export_format
+    return 'jsonl' if os.path.splitext(path)[1].lower() in ('.jsonl', '.json') else 'csv'
+
+
+def _export_epochs(start_date, end_date):
+    """Tarih verilmeyen uç açık kabul edilir."""
+    return date_range_to_epochs(start_date or "1970-01-01", end_date or "9999-12-30")
+
+
+def _money(value):
+    return None if value is None else Money(value).to_float()
+
+
+class _CsvWriter:
+    def __init__(self, file):
+        self._writer = csv.writer(file)
+        self._writer.writerow(ORDER_COLUMNS + LINE_COLUMNS)
+        self._money_indexes = [i for i, column in enumerate(ORDER_COLUMNS + LINE_COLUMNS) if column in MONEY_COLUMNS]
+
+    def write_rows(self, rows):
+        for row in rows:
+            row = list(row)
+            for i in self._money_indexes:
+                if row[i] is not None:
+                    row[i] = f"{Money(row[i]):.2f}"
+            self._writer.writerow(row)
+
+    def close(self):
+        pass
+
+
+class _JsonLinesWriter:
+    """Aynı siparişin satırlarını tek JSON nesnesinde toplar; sipariş parça sınırında bölünse de tek satır yazılır."""
+
+    def __init__(self, file):
+        self._file = file
+        self._order = None
+
+    def write_rows(self, rows):
+        for row in rows:
+            if self._order is None or self._order['siparis_id'] != row[_SIPARIS_ID]:
+                self._flush()
+                self._order = {column: (_money(value) if column in MONEY_COLUMNS else value)
+                               for column, value in zip(ORDER_COLUMNS, row)}
+                self._order['satirlar'] = []
+            if row[_DETAY_ID] is not None:
+                self._order['satirlar'].append({column: (_money(value) if column in MONEY_COLUMNS else value)
+                                                for column, value in zip(LINE_COLUMNS, row[_ORDER_WIDTH:])})
+
+    def _flush(self):
+        if self._order is not None:
+            self._file.write(json.dumps(self._order, ensure_ascii=False))
+            self._file.write("\n")
+            self._order = None
+
+    def close(self):
+        self._flush()
+
+
+def export_orders(db_manager, path, export_format=None, start_date=None, end_date=None, since_last_export=False,
+                  include_archives=False, chunk_size=constants.ORDER_EXPORT_FETCH_CHUNK, progress_callback=None,
+                  cancel_event=None):
+    """Kapanmış siparişleri detaylarıyla dosyaya akış halinde yazar.
+
+    start_date/end_date: 'YYYY-MM-DD' (bitiş dahil), verilmeyen uç açıktır. since_last_export=True ise sadece son artımlı
+    dışa aktarmadan sonra kapanan siparişler yazılır ve başarıyla bitince son nokta ilerletilir.
+    Dönüş: (başarılı mı, mesaj, {'orders', 'lines', 'path', 'watermark'}).
+    """
+    export_format = detect_format(path, export_format)
+    if export_format not in EXPORT_FORMATS:
+        return False, f"Bilinmeyen dışa aktarma biçimi: {export_format}", None
+    try:
+        start_epoch, end_epoch = _export_epochs(start_date, end_date)
+    except ValueError as e:
+        return False, f"Geçersiz tarih: {e}", None
+
+    watermark = load_watermark(db_manager) if since_last_export else None
+    last_exported = watermark
+    stats = {'orders': 0, 'lines': 0, 'path': path, 'watermark': watermark}
+    part_path = f"{path}.part"
+    last_siparis_id = None
+
+    try:
+        with open(part_path, "w", newline="", encoding="utf-8-sig" if export_format == 'csv' else "utf-8") as file:
+            writer = _CsvWriter(file) if export_format == 'csv' else _JsonLinesWriter(file)
+            for rows in db_manager.iter_order_export_rows(start_epoch, end_epoch, after=watermark,
+                                                          include_archives=include_archives, chunk_size=chunk_size):
+                writer.write_rows(rows)
+                for row in rows:
+                    if row[_SIPARIS_ID] != last_siparis_id:
+                        last_siparis_id = row[_SIPARIS_ID]
+                        stats['orders'] += 1
+                        point = (row[_KAPANIS_EPOCH], row[_SIPARIS_ID])
+                        if last_exported is None or point > last_exported:
+                            last_exported = point
+                    if row[_DETAY_ID] is not None:
+                        stats['lines'] += 1
+                if cancel_event is not None and cancel_event.is_set():
+                    raise _Cancelled()
+                if progress_callback:
+                    progress_callback(stats['orders'], 0, f"{stats['orders']} sipariş dışa aktarıldı")
+            writer.close()
+        os.replace(part_path, path)
+    except _Cancelled:
+        _remove_quietly(part_path)
+        return False, "Dışa aktarma iptal edildi, dosya yazılmadı.", stats
+    except (OSError, sqlite3.Error) as e:
+        print(f"Sipariş dışa aktarma hatası ({path}): {e}")
+        _remove_quietly(part_path)
+        return False, f"Dışa aktarma sırasında hata oluştu: {e}", stats
+
+    if since_last_export and last_exported is not None and last_exported != watermark:
+        save_watermark(db_manager, last_exported)
+        stats['watermark'] = last_exported
+    message = f"{stats['orders']} sipariş ({stats['lines']} satır) dışa aktarıldı: {path}"
+    if since_last_export:
+        since = (datetime(1970, 1, 1) + timedelta(seconds=watermark[0])).strftime(TIMESTAMP_FORMAT) if watermark else "ilk dışa aktarma"
+        message += f" (son dışa aktarmadan bu yana: {since})"
+    print(message)
+    return True, message, stats
+
+
+class _Cancelled(Exception):
+    pass
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kapanmış adisyonları detaylarıyla CSV veya JSON Lines dosyasına aktarır.")
+    parser.add_argument("path", help="Çıktı dosyası (.csv veya .jsonl)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, help="Verilmezse dosya uzantısından belirlenir")
+    parser.add_argument("--start", help="Başlangıç tarihi (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Bitiş tarihi (YYYY-MM-DD, dahil)")
+    parser.add_argument("--since-last", action="store_true", help="Sadece son artımlı dışa aktarmadan sonra kapananlar")
+    parser.add_argument("--archives", action="store_true", help="Yıllık arşiv dosyalarını da dahil et")
+    parser.add_argument("--db", default=constants.DB_NAME, help="Veritabanı dosyası")
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.db, interactive=False)
+    try:
+        success, message, _ = export_orders(db_manager, args.path, args.format, args.start, args.end,
+                                            since_last_export=args.since_last, include_archives=args.archives)
+        if not success:
+            print(message)
+        return 0 if success else 1
+    finally:
+        db_manager.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
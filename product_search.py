@@ -0,0 +1,69 @@
+# product_search.py
+
+from search_text import search_key
+
+# --- Ürün Arama İndeksi ---
+# Hızlı satış ızgarası ve Ürünler tablosu her tuş vuruşunda tüm ürün adlarını taramaz. Her katalog sürümü için ürün
+# adlarının arama anahtarları (search_key: Türkçe harf ve aksan duyarsız) bir kez hesaplanır ve anahtarlardaki her
+# 3 karakterlik parça (trigram) için ürün listesi (posting list) tutulur:
+#   - 3 karakter: doğrudan tek listeye bakılır (liste tam olarak metni içeren ürünlerdir)
+#   - daha uzun arama: metnin en seyrek 3'lüsünün listesi alınır ve sadece bu adaylarda alt dize kontrol edilir
+#   - 1-2 karakter: sonuçların çoğu zaten eşleştiğinden hazır anahtarlar taranır (1-2 karakterlik listeler indeksi
+#     oluşturma süresini ikiye katlıyordu)
+# Listeler popülerlik sırasıyla (son günlerde en çok satılan önce, eşitlikte hızlı satış sırası) oluşturulduğundan
+# sonuçlar ayrıca sıralanmaz.
+
+NGRAM_SIZE = 3
+
+
+class ProductSearchIndex:
+    """CatalogueSnapshot.products için n-gram arama indeksi.
+
+    Sonuçlar products tuple'ındaki konumlar (ProductTableModel satırları) veya ürün kayıtları olarak döner.
+    popularity: ürün adı -> satış miktarı (bulunmayan ürünler 0 kabul edilir).
+    """
+
+    def __init__(self, products, popularity=None):
+        popularity = popularity or {}
+        self.products = products
+        self.keys = [search_key(p.adi) for p in products]
+        # Konumlar popülerlik sırasıyla; sorted kararlı olduğundan eşitlikte katalog (hızlı satış) sırası korunur
+        self.ranked_positions = tuple(sorted(range(len(products)), key=lambda i: -popularity.get(products[i].adi, 0)))
+
+        postings = {}
+        for position in self.ranked_positions:
+            key = self.keys[position]
+            for gram in {key[i:i + NGRAM_SIZE] for i in range(len(key) - NGRAM_SIZE + 1)}:
+                postings.setdefault(gram, []).append(position)
+        self._postings = {gram: tuple(positions) for gram, positions in postings.items()}
+
+    def search_positions(self, text, kategori_id=None, include_inactive=True):
+        """Adında metin geçen ürünlerin konumlarını döndürür.
+
+        Boş metin: tüm ürünler katalog sırasıyla. Aksi halde popülerlik sırasıyla.
+        kategori_id None ise kategori filtresi uygulanmaz.
+        """
+        key = search_key(text)
+        keys = self.keys
+        if not key:
+            positions = range(len(self.products))
+        elif len(key) < NGRAM_SIZE:
+            positions = [position for position in self.ranked_positions if key in keys[position]]
+        elif len(key) == NGRAM_SIZE:
+            positions = self._postings.get(key, ())
+        else:
+            grams = [key[i:i + NGRAM_SIZE] for i in range(len(key) - NGRAM_SIZE + 1)]
+            rarest = min((self._postings.get(gram, ()) for gram in grams), key=len)
+            positions = [position for position in rarest if key in keys[position]]
+
+        if kategori_id is None and include_inactive:
+            return list(positions)
+        products = self.products
+        return [position for position in positions
+                if (kategori_id is None or products[position].kategori_id == kategori_id)
+                and (include_inactive or products[position].aktif_durumu == 1)]
+
+    def search(self, text, kategori_id=None, include_inactive=False):
+        """search_positions ile aynı filtre; ürün kayıtlarını döndürür (varsayılan: sadece aktif ürünler)."""
+        products = self.products
+        return [products[position] for position in self.search_positions(text, kategori_id, include_inactive)]
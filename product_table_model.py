@@ -0,0 +1,156 @@
+# product_table_model.py
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex
+from PySide6.QtGui import QColor, QFont
+
+from product_search import ProductSearchIndex
+
+# --- Ürün Tablosu Modeli ---
+# Ürünler sekmesi tablosu satır başına QTableWidgetItem oluşturmaz; QTableView bu modelden sadece ekranda görünen
+# hücreleri ister. Model doğrudan katalog önbelleğindeki (CatalogueSnapshot) değiştirilemez kayıt tuple'ını kullanır.
+
+PRODUCT_COLUMNS = ("Ürün Adı", "Fiyat", "Kategori")
+COLUMN_ADI, COLUMN_FIYAT, COLUMN_KATEGORI = range(len(PRODUCT_COLUMNS))
+
+
+class ProductTableModel(QAbstractTableModel):
+    """Katalog görüntüsündeki ürünleri (pasifler dahil) salt okunur tablo olarak sunar."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._products = () # CatalogueSnapshot.products (hızlı satış sırasıyla)
+        self._search_index = None # Filtre için ProductSearchIndex (konumlar = satır indeksleri), gerektiğinde oluşturulur
+        self._inactive_color = QColor(Qt.gray)
+        self._inactive_font = QFont()
+        self._inactive_font.setItalic(True)
+
+    def set_products(self, products, search_index=None):
+        """Modeli yeni ürün listesiyle değiştirir (tek reset, satır bazında sinyal yok).
+
+        search_index aynı products tuple'ı için oluşturulmuş olmalıdır (CatalogueSnapshot.search_index).
+        """
+        self.beginResetModel()
+        self._products = products
+        self._search_index = search_index
+        self.endResetModel()
+
+    def match_rows(self, search_term, category_id):
+        """Filtreye uyan satır indekslerini döndürür (arama varsa popülerlik sırasıyla)."""
+        if self._search_index is None:
+            self._search_index = ProductSearchIndex(self._products)
+        return self._search_index.search_positions(search_term, category_id)
+
+    def product_at(self, row):
+        """Kaynak modeldeki satırın ürün kaydını döndürür."""
+        return self._products[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._products)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(PRODUCT_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return PRODUCT_COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        product = self._products[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == COLUMN_ADI:
+                return product.adi
+            if column == COLUMN_FIYAT:
+                return f"{product.fiyat:.2f}" # Fiyat formatı
+            return product.kategori_adi or "Belirtilmemiş"
+        if role == Qt.TextAlignmentRole and column == COLUMN_FIYAT:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if not product.aktif_durumu:
+            # Pasif ürünler gri, adı italik gösterilir
+            if role == Qt.ForegroundRole:
+                return self._inactive_color
+            if role == Qt.FontRole and column == COLUMN_ADI:
+                return self._inactive_font
+        return None
+
+
+class ProductFilterProxyModel(QAbstractProxyModel):
+    """Ürün adı ve kategoriye göre filtre uygulayan proxy model.
+
+    Eşleşen kaynak satırlar filtre değiştiğinde ProductTableModel.match_rows ile ürün arama indeksinden alınır ve bir
+    indeks dizisinde tutulur (arama sonuçları popülerlik sırasıyla görünür). QSortFilterProxyModel her kaynak satır için Python'daki filterAcceptsRow'u çağırdığından
+    büyük katalogda her tuş vuruşu satır sayısıyla orantılı sürer; burada görünüm sadece ekrandaki satırları eşler.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._search_term = ""
+        self._category_id = None
+        self._rows = None # Görünen kaynak satır indeksleri (None: filtre yok, tüm satırlar)
+        self._proxy_rows = None # Kaynak satır -> proxy satır (mapFromSource için, gerektiğinde oluşturulur)
+
+    def set_filter(self, search_term, category_id):
+        """Arama metnini (Türkçe harf ve büyük/küçük harf duyarsız) ve kategori ID'sini (None: tümü) uygular."""
+        self._search_term = search_term
+        self._category_id = category_id
+        self.beginResetModel()
+        self._rebuild_rows()
+        self.endResetModel()
+
+    def setSourceModel(self, model):
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._on_source_reset)
+        self._rebuild_rows()
+        self.endResetModel()
+
+    def _on_source_reset(self):
+        # Yeni katalogda mevcut filtreyi yeniden uygula
+        self._rebuild_rows()
+        self.endResetModel()
+
+    def _rebuild_rows(self):
+        self._proxy_rows = None
+        if not self._search_term and self._category_id is None:
+            self._rows = None
+            return
+        self._rows = self.sourceModel().match_rows(self._search_term, self._category_id)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        return self.sourceModel().rowCount() if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        return self.sourceModel().columnCount()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < self.rowCount()) or not (0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex() # Düz tablo
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        row = proxy_index.row() if self._rows is None else self._rows[proxy_index.row()]
+        return self.sourceModel().index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        if self._rows is None:
+            return self.index(source_index.row(), source_index.column())
+        if self._proxy_rows is None:
+            self._proxy_rows = {source_row: proxy_row for proxy_row, source_row in enumerate(self._rows)}
+        proxy_row = self._proxy_rows.get(source_index.row())
+        return QModelIndex() if proxy_row is None else self.index(proxy_row, source_index.column())
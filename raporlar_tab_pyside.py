@@ -0,0 +1,223 @@
+# raporlar_tab_pyside.py
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QDateEdit, QGroupBox,
+                                 QFormLayout, QProgressBar, QTableView, QAbstractItemView, QHeaderView, QPushButton, QMenu,
+                                 QFileDialog)
+from PySide6.QtCore import QDate, QTimer
+
+import constants
+from maintenance_jobs import standard_report_periods
+from money import Money
+from report_query_executor import ReportQueryExecutor
+from report_table_model import ProductSalesReportModel, COLUMN_URUN
+
+# DatabaseManager main_app üzerinden erişilecek; rapor sorguları ReportQueryExecutor'ın salt okunur bağlantısında çalışır
+
+CUSTOM_PERIOD = "Özel Aralık"
+
+
+class RaporlarTabPyside(QWidget):
+    def __init__(self, main_app):
+        super().__init__()
+        self.main_app = main_app # Ana uygulama instance'ı
+        self.db_manager = main_app.db_manager # DatabaseManager instance'ı
+
+        # Sorgular arka plan iş parçacığında çalışır; tarih aralığı değişince eski sorgu iptal edilir
+        self.report_executor = ReportQueryExecutor(self.db_manager.db_name, parent=self)
+        self.report_executor.summary_ready.connect(self._on_summary_ready)
+        self.report_executor.rows_ready.connect(self._on_rows_ready)
+        self.report_executor.query_finished.connect(self._on_query_finished)
+        self._current_request_id = None # Sadece bu numaralı sorgunun sonuçları gösterilir
+
+        # Hızlı ardışık tarih değişikliklerinde sadece sonuncusu sorgulanır
+        self._requery_timer = QTimer(self)
+        self._requery_timer.setSingleShot(True)
+        self._requery_timer.setInterval(constants.REPORT_REQUERY_DELAY_MS)
+        self._requery_timer.timeout.connect(self.load_data)
+
+        # Kısa raporlarda ilerleme göstergesi yanıp sönmesin diye gecikmeli açılır
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(constants.REPORT_PROGRESS_DELAY_MS)
+        self._progress_timer.timeout.connect(self._show_progress)
+
+        self._create_ui()
+        # İlk sorgu sekme açıldığında (_on_tab_change -> load_data) yapılır
+        self._set_period_dates(self.cmb_period.currentText())
+
+        self.cmb_period.currentTextChanged.connect(self._apply_period)
+        self.date_start.dateChanged.connect(self._on_date_changed)
+        self.date_end.dateChanged.connect(self._on_date_changed)
+
+    def _create_ui(self):
+        """Raporlar sekmesi arayüzünü oluşturur."""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(10, 10, 10, 10)
+
+        # Dönem seçimi
+        controls_layout = QHBoxLayout()
+        self.cmb_period = QComboBox(self)
+        self.cmb_period.addItems(list(standard_report_periods()) + [CUSTOM_PERIOD])
+        self.date_start = QDateEdit(self)
+        self.date_end = QDateEdit(self)
+        for date_edit in (self.date_start, self.date_end):
+            date_edit.setCalendarPopup(True)
+            date_edit.setDisplayFormat("dd.MM.yyyy")
+
+        controls_layout.addWidget(QLabel("Dönem:", self))
+        controls_layout.addWidget(self.cmb_period)
+        controls_layout.addWidget(QLabel("Başlangıç:", self))
+        controls_layout.addWidget(self.date_start)
+        controls_layout.addWidget(QLabel("Bitiş:", self))
+        controls_layout.addWidget(self.date_end)
+        controls_layout.addStretch()
+
+        # Muhasebe için sipariş geçmişi dışa aktarma (arka planda, akış halinde)
+        self.btn_export = QPushButton("Dışa Aktar", self)
+        export_menu = QMenu(self.btn_export)
+        export_menu.addAction("Seçili Aralık...", lambda: self._export_orders(since_last_export=False))
+        export_menu.addAction("Son Dışa Aktarmadan Bu Yana...", lambda: self._export_orders(since_last_export=True))
+        self.btn_export.setMenu(export_menu)
+        controls_layout.addWidget(self.btn_export)
+
+        # Günlük satış özetlerinin bakımı (uygulama dışından ham tablolara yazıldıysa özetler yeniden oluşturulur)
+        self.btn_maintenance = QPushButton("Bakım", self)
+        maintenance_menu = QMenu(self.btn_maintenance)
+        maintenance_menu.addAction("Satış Özetlerini Yeniden Oluştur ve Kontrol Et", self.main_app.rebuild_sales_rollups)
+        self.btn_maintenance.setMenu(maintenance_menu)
+        controls_layout.addWidget(self.btn_maintenance)
+        main_layout.addLayout(controls_layout)
+
+        # Satış özeti
+        summary_box = QGroupBox("Satış Özeti", self)
+        summary_layout = QFormLayout(summary_box)
+        self.lbl_adisyon = QLabel("-", self)
+        self.lbl_brut = QLabel("-", self)
+        self.lbl_iskonto = QLabel("-", self)
+        self.lbl_net = QLabel("-", self)
+        summary_layout.addRow("Adisyon Sayısı:", self.lbl_adisyon)
+        summary_layout.addRow("Brüt Satış:", self.lbl_brut)
+        summary_layout.addRow("Toplam İskonto:", self.lbl_iskonto)
+        summary_layout.addRow("Net Satış:", self.lbl_net)
+        main_layout.addWidget(summary_box)
+
+        # İlerleme göstergesi (süresi bilinmediği için belirsiz mod) ve durum
+        status_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.hide()
+        self.lbl_status = QLabel("", self)
+        status_layout.addWidget(self.progress_bar)
+        status_layout.addWidget(self.lbl_status)
+        status_layout.addStretch()
+        main_layout.addLayout(status_layout)
+
+        # Ürün satışları (sayfa sayfa dolan model)
+        self.report_model = ProductSalesReportModel(self)
+        self.report_view = QTableView(self)
+        self.report_view.setModel(self.report_model)
+        self.report_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.report_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.report_view.verticalHeader().setVisible(False)
+        self.report_view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.report_view.horizontalHeader().setSectionResizeMode(COLUMN_URUN, QHeaderView.Stretch)
+        main_layout.addWidget(self.report_view)
+
+    def _set_period_dates(self, period_name):
+        """Hazır dönemin tarihlerini tarih alanlarına yazar. Özel Aralık'ta tarihler olduğu gibi kalır (False döner)."""
+        period = standard_report_periods().get(period_name)
+        if period is None:
+            return False
+        for date_edit, value in zip((self.date_start, self.date_end), period):
+            date_edit.blockSignals(True)
+            date_edit.setDate(QDate.fromString(value, "yyyy-MM-dd"))
+            date_edit.blockSignals(False)
+        return True
+
+    def _apply_period(self, period_name):
+        """Hazır dönem seçildiğinde tarihleri doldurur ve raporu kısa bir gecikmeyle yeniden sorgular."""
+        if self._set_period_dates(period_name):
+            self._requery_timer.start()
+
+    def _on_date_changed(self, _date):
+        """Tarih elle değiştirildiğinde dönem 'Özel Aralık' olur ve rapor kısa bir gecikmeyle yeniden sorgulanır."""
+        self.cmb_period.blockSignals(True)
+        self.cmb_period.setCurrentText(CUSTOM_PERIOD)
+        self.cmb_period.blockSignals(False)
+        self._requery_timer.start()
+
+    def load_data(self):
+        """Seçili tarih aralığı için raporu arka planda sorgular (çalışan eski sorgu iptal edilir)."""
+        self._requery_timer.stop()
+        start, end = self.date_start.date(), self.date_end.date()
+        if start > end:
+            self.report_executor.cancel_pending()
+            self._current_request_id = None
+            self._hide_progress()
+            self.lbl_status.setText("Başlangıç tarihi bitiş tarihinden sonra olamaz.")
+            return
+
+        self._current_request_id = self.report_executor.submit(start.toString("yyyy-MM-dd"), end.toString("yyyy-MM-dd"))
+        self.report_model.clear()
+        for label in (self.lbl_adisyon, self.lbl_brut, self.lbl_iskonto, self.lbl_net):
+            label.setText("...")
+        self.lbl_status.setText("Rapor hazırlanıyor...")
+        if start.daysTo(end) + 1 > constants.REPORT_LONG_RANGE_DAYS:
+            self._show_progress() # Uzun aralık: gösterge hemen açılır
+        else:
+            self._progress_timer.start()
+
+    def _export_orders(self, since_last_export):
+        """Kapanmış adisyonları detaylarıyla CSV/JSON Lines dosyasına aktarır.
+
+        Seçili aralıkta tarih alanları kullanılır; artımlı dışa aktarmada sadece son dışa aktarmadan sonra kapananlar yazılır.
+        """
+        path, _ = QFileDialog.getSaveFileName(self, "Sipariş Geçmişini Dışa Aktar", "siparis_gecmisi.csv",
+                                              "CSV Dosyası (*.csv);;JSON Lines (*.jsonl)")
+        if not path:
+            return
+        if since_last_export:
+            self.main_app.export_orders(path, since_last_export=True)
+        else:
+            start, end = self.date_start.date(), self.date_end.date()
+            self.main_app.export_orders(path, start.toString("yyyy-MM-dd"), end.toString("yyyy-MM-dd"))
+
+    def stop(self):
+        """Uygulama kapanırken bekleyen sorguları iptal eder ve rapor bağlantısını kapatır."""
+        self._requery_timer.stop()
+        self._progress_timer.stop()
+        self.report_executor.shutdown(wait=True)
+
+    def _show_progress(self):
+        if self._current_request_id is not None:
+            self.progress_bar.show()
+
+    def _hide_progress(self):
+        self._progress_timer.stop()
+        self.progress_bar.hide()
+
+    def _on_summary_ready(self, request_id, summary):
+        if request_id != self._current_request_id:
+            return # Eski sorgunun sonucu
+        self.lbl_adisyon.setText(str(summary['toplam_adisyon'] or 0))
+        self.lbl_brut.setText(f"{Money.of(summary['brut_satis']):.2f} TL") # Özet tutarları tamsayı kuruş
+        self.lbl_iskonto.setText(f"{Money.of(summary['toplam_iskonto']):.2f} TL")
+        self.lbl_net.setText(f"{Money.of(summary['net_satis']):.2f} TL")
+
+    def _on_rows_ready(self, request_id, rows, loaded_count):
+        if request_id != self._current_request_id:
+            return
+        self.report_model.append_rows(rows)
+        self.lbl_status.setText(f"Ürün satırları yükleniyor... ({loaded_count})")
+
+    def _on_query_finished(self, request_id, success, message):
+        if request_id != self._current_request_id:
+            return # İptal edilen eski sorgular yeni sorgunun göstergesini kapatmaz
+        self._current_request_id = None
+        self._hide_progress()
+        self.lbl_status.setText(message)
+        if not success:
+            for label in (self.lbl_adisyon, self.lbl_brut, self.lbl_iskonto, self.lbl_net):
+                if label.text() == "...":
+                    label.setText("-")
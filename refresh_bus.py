@@ -0,0 +1,76 @@
+# refresh_bus.py
+
+from PySide6.QtCore import QObject, QTimer
+
+# --- Olay Türleri ---
+# publish(olay, anahtar) çağrısındaki anahtar değişen kaydı belirtir (None: tümü).
+MASA_CHANGED = 'masa_changed'               # Anahtar: masa_no (durum, toplam, müşteri, masa ekleme/silme)
+PRODUCTS_CHANGED = 'products_changed'       # Anahtar: urun_id (ürün kataloğu)
+CATEGORIES_CHANGED = 'categories_changed'   # Anahtar: kategori_id
+CUSTOMERS_CHANGED = 'customers_changed'     # Anahtar: musteri_id
+
+
+class RefreshBus(QObject):
+    """Sekmeler arası yenileme (invalidation) olay veriyolu.
+
+    Veriyi değiştiren kod ilgili görünümleri doğrudan yenilemek yerine publish() ile olay yayınlar.
+    Aynı olay döngüsü turunda (tick) gelen olaylar birleştirilir ve her abone fonksiyon sadece bir kez,
+    o turda biriken tüm değişikliklerle çağrılır. Ana uygulama (CafeAdisyonAppPyside) tarafından sahiplenilir.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._subscribers = [] # (callback, olay kümesi) listesi, abone olunma sırasıyla çağrılır
+        self._pending = {} # olay -> değişen anahtarlar kümesi
+        self._pending_counts = {} # olay -> bu turda kaç kez yayınlandığı
+
+        # 0 ms tek seferlik timer: olay döngüsü bir sonraki turda flush() çalıştırır
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self.flush)
+
+        # Sayaçlar: published = yayınlanan olay, refreshes = gerçekten çalışan yenileme,
+        # avoided = her olay ayrı ayrı yenileseydi yapılacak ama birleştirme sayesinde yapılmayan yenileme
+        self.stats = {'published': 0, 'flushes': 0, 'refreshes': 0, 'avoided': 0}
+
+    def subscribe(self, events, callback):
+        """callback'i verilen olay(lar) için kaydeder. callback(changes) ile çağrılır; changes = {olay: anahtarlar kümesi}."""
+        if isinstance(events, str):
+            events = (events,)
+        self._subscribers.append((callback, frozenset(events)))
+
+    def publish(self, event, key=None):
+        """Bir değişiklik olayı yayınlar; aboneler bir sonraki olay döngüsü turunda toplu olarak çağrılır."""
+        self.stats['published'] += 1
+        self._pending.setdefault(event, set()).add(key)
+        self._pending_counts[event] = self._pending_counts.get(event, 0) + 1
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """Biriken olayları hemen uygular (örn. sekme değişmeden önce görünümün güncel olması gerekiyorsa)."""
+        self._flush_timer.stop()
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        pending_counts, self._pending_counts = self._pending_counts, {}
+        self.stats['flushes'] += 1
+
+        for callback, events in self._subscribers:
+            changes = {event: keys for event, keys in pending.items() if event in events}
+            if not changes:
+                continue
+            self.stats['refreshes'] += 1
+            self.stats['avoided'] += sum(pending_counts[event] for event in changes) - 1
+            try:
+                callback(changes)
+            except Exception as e:
+                # Bir görünümün hatası diğer görünümlerin yenilenmesini engellemesin
+                print(f"Yenileme hatası ({', '.join(changes)}): {e}")
+
+    def stats_text(self):
+        """Sayaçları okunabilir metin olarak döndürür."""
+        return (f"{self.stats['published']} olay, {self.stats['flushes']} toplu uygulama, "
+                f"{self.stats['refreshes']} yenileme, {self.stats['avoided']} gereksiz yenileme önlendi")
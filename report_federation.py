@@ -0,0 +1,119 @@
+# report_federation.py
+
+import glob
+import os
+import re
+import sqlite3
+from collections import namedtuple
+from urllib.request import pathname2url
+
+import constants
+
+# --- Arşiv Dosyaları Kataloğu ---
+# Arşivleme (DatabaseManager.archive_and_delete_old_orders) kapanmış siparişleri ana veritabanının yanındaki
+# cafe_adisyon_archive_<yıl>.db dosyalarına taşır. Raporlar bu dosyaları ana veritabanıyla birlikte sorgular;
+# katalog her dosyanın kapanış zamanı aralığını (epoch) bilir, böylece sadece istenen tarihlerle kesişen arşivler
+# bağlanır (ATTACH). Dosya adındaki yıl "bu yıl ve öncesi" anlamına geldiği için aralık dosyanın içinden okunur.
+# Şema sürümü 5'ten önce oluşturulan arşivlerde tutarlar REAL (TL) sütunlardadır; sorgular onları kuruşa çevirir.
+
+ArchiveInfo = namedtuple('ArchiveInfo', ['path', 'year', 'min_epoch', 'max_epoch', 'has_epoch_column', 'money_in_kurus'])
+
+_ARCHIVE_FILE_RE = re.compile(re.escape(constants.ARCHIVE_DB_PREFIX) + r"(\d{4})\.db$")
+
+
+def epoch_sql(table_alias, has_epoch_column=True):
+    """Kapanış zamanının epoch ifadesi. Eski arşiv dosyalarında kapanis_epoch sütunu yoktur, metinden hesaplanır."""
+    if has_epoch_column:
+        return f"{table_alias}.kapanis_epoch"
+    return f"CAST(strftime('%s', {table_alias}.kapanis_zamani) AS INTEGER)"
+
+
+def kurus_sql(column_expr, money_in_kurus=True):
+    """Tutar sütununun kuruş ifadesi. Eski arşiv dosyalarında tutarlar REAL (TL) olarak saklanır."""
+    if money_in_kurus:
+        return column_expr
+    return f"CAST(ROUND({column_expr} * 100) AS INTEGER)"
+
+
+def money_columns_in_kurus(conn, schema='main'):
+    """siparis_gecmisi tutarları tamsayı kuruş mu (sütun tipi INTEGER), yoksa eski REAL (TL) mi?"""
+    for row in conn.execute(f"PRAGMA {schema}.table_info(siparis_gecmisi)").fetchall():
+        if row[1] == 'toplam_tutar':
+            return (row[2] or '').upper() == 'INTEGER'
+    return True
+
+
+def archive_db_path(db_name, year):
+    """Ana veritabanının yanında, verilen yılın arşiv dosyasının yolu."""
+    directory = os.path.dirname(os.path.abspath(db_name))
+    return os.path.join(directory, f"{constants.ARCHIVE_DB_PREFIX}{year}.db")
+
+
+class ArchiveCatalog:
+    """Ana veritabanının dizinindeki arşiv dosyalarını ve kapanış zamanı aralıklarını listeler.
+
+    Aralıklar dosya başına bir kez okunur ve dosya değişmedikçe (boyut/değişiklik zamanı) önbellekten verilir.
+    """
+
+    def __init__(self, db_name):
+        self.directory = os.path.dirname(os.path.abspath(db_name))
+        self._cache = {} # yol -> ((mtime_ns, boyut), ArchiveInfo veya None)
+        self.stats = {'scans': 0, 'range_reads': 0}
+
+    def archives(self):
+        """Okunabilen tüm arşiv dosyaları (yıla göre sıralı). Boş veya okunamayan dosyalar atlanır."""
+        self.stats['scans'] += 1
+        result = []
+        seen = set()
+        for path in glob.glob(os.path.join(self.directory, f"{constants.ARCHIVE_DB_PREFIX}*.db")):
+            match = _ARCHIVE_FILE_RE.search(os.path.basename(path))
+            if not match:
+                continue
+            seen.add(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            cached = self._cache.get(path)
+            if cached is None or cached[0] != signature:
+                cached = (signature, self._read_range(path, int(match.group(1))))
+                self._cache[path] = cached
+            if cached[1] is not None:
+                result.append(cached[1])
+        for path in list(self._cache):
+            if path not in seen:
+                del self._cache[path]
+        return sorted(result, key=lambda info: info.year)
+
+    def overlapping(self, start_epoch, end_epoch):
+        """[start_epoch, end_epoch) aralığıyla kesişen arşivler."""
+        return [info for info in self.archives() if info.min_epoch < end_epoch and info.max_epoch >= start_epoch]
+
+    def _read_range(self, path, year):
+        """Arşivdeki kapanmış siparişlerin en küçük/en büyük kapanış epoch'u (salt okunur bağlantıyla)."""
+        self.stats['range_reads'] += 1
+        try:
+            conn = sqlite3.connect(f"file:{pathname2url(path)}?mode=ro", uri=True)
+        except sqlite3.Error as e:
+            print(f"Arşiv dosyası açılamadı ({path}): {e}")
+            return None
+        try:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(siparis_gecmisi)").fetchall()]
+            if not columns:
+                return None
+            has_epoch_column = 'kapanis_epoch' in columns
+            epoch_expr = epoch_sql("sg", has_epoch_column)
+            # Ayrı alt sorgular: tek MIN veya MAX (durum, kapanis_epoch) indeksinin ucundan okunur
+            min_epoch, max_epoch = conn.execute(f"""
+                SELECT (SELECT MIN({epoch_expr}) FROM siparis_gecmisi sg WHERE sg.durum = 'Kapandı'),
+                       (SELECT MAX({epoch_expr}) FROM siparis_gecmisi sg WHERE sg.durum = 'Kapandı')
+            """).fetchone()
+            if min_epoch is None:
+                return None
+            return ArchiveInfo(path, year, min_epoch, max_epoch, has_epoch_column, money_columns_in_kurus(conn))
+        except sqlite3.Error as e:
+            print(f"Arşiv dosyası okunamadı ({path}): {e}")
+            return None
+        finally:
+            conn.close()
@@ -0,0 +1,139 @@
+# report_query_executor.py
+
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Signal
+
+import constants
+from database import DatabaseManager
+
+# --- Asenkron Rapor Sorguları ---
+# Raporlar sekmesinin sorguları arayüz iş parçacığında çalışmaz: tek bir arka plan iş parçacığı kendi salt okunur
+# bağlantısıyla (DatabaseManager(read_only=True)) sorguyu çalıştırır, sonuçları sinyallerle sayfa sayfa geri gönderir.
+# Yeni bir sorgu gönderildiğinde önceki (artık geçersiz) sorgu iptal edilir: kuyruktaysa hiç çalışmaz, çalışıyorsa
+# SQLite progress handler'ı bir sonraki kontrol noktasında sorguyu keser. Sinyaller sorgu numarası taşır; arayüz sadece
+# son gönderdiği numaranın sonuçlarını kullanır.
+
+
+class ReportQuery:
+    """Kuyruktaki tek bir rapor sorgusu."""
+
+    def __init__(self, request_id, start_date, end_date, use_rollups):
+        self.request_id = request_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.use_rollups = use_rollups
+        self.cancel_event = threading.Event()
+
+
+class ReportQueryExecutor(QObject):
+    """Rapor sorgu kuyruğu. Sinyaller arayüz iş parçacığında (bağlı slotlarda) işlenir."""
+
+    query_started = Signal(int)                 # request_id
+    summary_ready = Signal(int, object)         # request_id, satış özeti (dict veya None)
+    rows_ready = Signal(int, list, int)         # request_id, ürün satırları sayfası (dict listesi), şimdiye kadar gönderilen satır
+    query_finished = Signal(int, bool, str)     # request_id, başarılı mı, mesaj (iptal edilen sorgular için de gönderilir)
+
+    def __init__(self, db_name, page_size=constants.REPORT_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.db_name = db_name
+        self.page_size = page_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rapor")
+        self._request_ids = itertools.count(1)
+        self._latest = None # Son gönderilen sorgu (öncekiler iptal edilir)
+        self._lock = threading.Lock()
+        self._running = None # İşçi iş parçacığında çalışan sorgu (progress handler okur)
+        self._worker_db = None # Sadece işçi iş parçacığında oluşturulur ve kullanılır
+        self.stats = {'submitted': 0, 'completed': 0, 'cancelled': 0}
+
+    def submit(self, start_date, end_date, use_rollups=True):
+        """Yeni rapor sorgusu gönderir, önceki sorguyu iptal eder ve sorgu numarasını döndürür."""
+        query = ReportQuery(next(self._request_ids), start_date, end_date, use_rollups)
+        with self._lock:
+            if self._latest is not None:
+                self._latest.cancel_event.set()
+            self._latest = query
+        self.stats['submitted'] += 1
+        self._executor.submit(self._run, query)
+        return query.request_id
+
+    def cancel_pending(self):
+        """Kuyruktaki ve çalışan sorguyu iptal eder."""
+        with self._lock:
+            if self._latest is not None:
+                self._latest.cancel_event.set()
+
+    def shutdown(self, wait=True):
+        """Sorguları iptal eder ve işçi bağlantısını kapatır."""
+        self.cancel_pending()
+        self._executor.submit(self._close_worker_db)
+        self._executor.shutdown(wait=wait)
+
+    def _db(self):
+        if self._worker_db is None:
+            self._worker_db = DatabaseManager(self.db_name, interactive=False, read_only=True)
+            # Uzun süren sorgu, yerine yeni bir sorgu gönderildiğinde bir sonraki kontrol noktasında kesilir
+            self._worker_db.conn.set_progress_handler(self._should_interrupt, constants.REPORT_CANCEL_CHECK_OPS)
+        return self._worker_db
+
+    def _close_worker_db(self):
+        if self._worker_db is not None:
+            self._worker_db.close()
+            self._worker_db = None
+
+    def _should_interrupt(self):
+        """SQLite progress handler'ı (işçi iş parçacığında): sıfırdan farklı dönüş çalışan sorguyu keser."""
+        query = self._running
+        return 1 if query is not None and query.cancel_event.is_set() else 0
+
+    def _detach_leftovers(self, db_manager):
+        """Kesilen sorgudan bağlı kalmış arşiv dosyası varsa ayırır."""
+        for row in db_manager.conn.execute("PRAGMA database_list").fetchall():
+            if row[1] not in ('main', 'temp'):
+                db_manager.conn.execute(f"DETACH DATABASE {row[1]}")
+
+    def _cancelled(self, query):
+        self.stats['cancelled'] += 1
+        self.query_finished.emit(query.request_id, False, "Rapor sorgusu iptal edildi.")
+
+    def _run(self, query):
+        """İşçi iş parçacığında çalışır."""
+        if query.cancel_event.is_set():
+            self._cancelled(query)
+            return
+        self.query_started.emit(query.request_id)
+        try:
+            db_manager = self._db()
+            self._running = query
+            try:
+                summary = db_manager.get_sales_summary(query.start_date, query.end_date, use_rollups=query.use_rollups)
+                if query.cancel_event.is_set():
+                    self._cancelled(query)
+                    return
+                if summary is None:
+                    self.query_finished.emit(query.request_id, False, "Satış özeti alınırken hata oluştu.")
+                    return
+                self.summary_ready.emit(query.request_id, dict(summary))
+
+                rows = db_manager.get_product_sales_report(query.start_date, query.end_date, use_rollups=query.use_rollups)
+            finally:
+                self._running = None
+                self._detach_leftovers(db_manager)
+
+            # Ürün satırları sayfalar halinde gönderilir; arayüz her sayfayı tek ekleme ile modele işler
+            for offset in range(0, len(rows), self.page_size):
+                if query.cancel_event.is_set():
+                    self._cancelled(query)
+                    return
+                page = [dict(row) for row in rows[offset:offset + self.page_size]]
+                self.rows_ready.emit(query.request_id, page, offset + len(page))
+            if query.cancel_event.is_set():
+                self._cancelled(query)
+                return
+            self.stats['completed'] += 1
+            self.query_finished.emit(query.request_id, True, f"{len(rows)} ürün satırı.")
+        except Exception as e:
+            print(f"Rapor sorgusu hatası (#{query.request_id} {query.start_date} - {query.end_date}): {e}")
+            self.query_finished.emit(query.request_id, False, f"Rapor alınırken hata oluştu: {e}")
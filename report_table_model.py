@@ -0,0 +1,63 @@
+# report_table_model.py
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from money import Money
+
+# --- Ürün Satış Raporu Modeli ---
+# Rapor satırları arka plan sorgusundan (report_query_executor) sayfalar halinde gelir; her sayfa tek
+# beginInsertRows/endInsertRows ile sona eklenir, böylece uzun raporlarda görünüm satır satır güncellenmez.
+
+REPORT_COLUMNS = ("Ürün Adı", "Kategori", "Miktar", "Tutar")
+COLUMN_URUN, COLUMN_KATEGORI, COLUMN_MIKTAR, COLUMN_TUTAR = range(len(REPORT_COLUMNS))
+
+
+class ProductSalesReportModel(QAbstractTableModel):
+    """get_product_sales_report satırlarını (dict) salt okunur tablo olarak sunar."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def clear(self):
+        self.beginResetModel()
+        self._rows = []
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        """Bir sayfa satırı modelin sonuna ekler."""
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(REPORT_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return REPORT_COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == COLUMN_URUN:
+                return row['urun_adi']
+            if column == COLUMN_KATEGORI:
+                return row['kategori_adi'] or "Belirtilmemiş"
+            if column == COLUMN_MIKTAR:
+                return f"{row['toplam_miktar']:g}"
+            return f"{Money.of(row['toplam_tutar_urun']):.2f}" # Kuruş -> TL sadece gösterimde
+        if role == Qt.TextAlignmentRole and column in (COLUMN_MIKTAR, COLUMN_TUTAR):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
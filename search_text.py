@@ -0,0 +1,70 @@
+# search_text.py
+
+# --- Arama Anahtarları ---
+# Arama metinleri Türkçe harfler ASCII karşılığına indirgenip küçük harfe çevrilerek karşılaştırılır:
+# "İlker Işık", "ilker isik" ve "ILKER ISIK" aynı anahtarı (ilker isik) üretir. Python'un str.lower()'ı 'İ'yi
+# 'i̇' (iki karakter), SQLite'ın lower()/LIKE'ı ise sadece ASCII harfleri dönüştürdüğü için aynı dönüşüm hem Python'da
+# (fold_text) hem SQL'de (sql_fold, iç içe replace + lower) tanımlıdır; SQL ifadesi tetikleyicilerde ve ifade
+# indekslerinde kullanılabilir (sadece yerleşik, deterministik fonksiyonlar).
+
+import re
+import unicodedata
+
+TURKISH_FOLD_MAP = {
+    'İ': 'i', 'I': 'i', 'ı': 'i',
+    'Ş': 's', 'ş': 's',
+    'Ğ': 'g', 'ğ': 'g',
+    'Ü': 'u', 'ü': 'u',
+    'Ö': 'o', 'ö': 'o',
+    'Ç': 'c', 'ç': 'c',
+}
+_FOLD_TABLE = str.maketrans(TURKISH_FOLD_MAP)
+
+# Telefon numarasındaki ayraçlar; arama anahtarında telefon sadece rakamlardan oluşur
+PHONE_SEPARATORS = (' ', '-', '(', ')', '+', '.', '/')
+_NON_DIGIT_RE = re.compile(r"\D")
+
+
+def fold_text(text):
+    """Türkçe harfleri indirger ve küçük harfe çevirir; sql_fold ile aynı sonucu verir."""
+    return (text or "").translate(_FOLD_TABLE).lower()
+
+
+def search_key(text):
+    """Uygulama içi (Python) aramalar için anahtar: fold_text + aksan silme ("Crème Brûlée" -> "creme brulee").
+
+    Boşluklar tek boşluğa indirilir. SQL karşılığı yoktur; veritabanında saklanan anahtarlar için fold_text kullanılır.
+    """
+    key = fold_text(text)
+    if not key.isascii():
+        decomposed = unicodedata.normalize("NFKD", key)
+        key = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(key.split())
+
+
+def phone_digits(text):
+    return _NON_DIGIT_RE.sub("", text or "")
+
+
+def sql_fold(expression):
+    """fold_text'in SQL karşılığı: verilen SQL ifadesini saran iç içe replace(...) + lower(...) ifadesi."""
+    for source, target in TURKISH_FOLD_MAP.items():
+        expression = f"replace({expression}, '{source}', '{target}')"
+    return f"lower({expression})"
+
+
+def sql_phone_digits(expression):
+    """Telefon ayraçlarını silen SQL ifadesi (NULL telefon boş metin olur)."""
+    expression = f"IFNULL({expression}, '')"
+    for separator in PHONE_SEPARATORS:
+        expression = f"replace({expression}, '{separator}', '')"
+    return expression
+
+
+def strip_like_wildcards(text):
+    """LIKE desenine gömülecek kullanıcı metninden % ve _ karakterlerini siler.
+
+    ESCAPE yan tümcesi FTS5 trigram indeksinin LIKE'ı kullanmasını engellediği için kaçırma yerine silinir
+    (ad ve telefonlarda bu karakterler aranmaz).
+    """
+    return text.replace("%", "").replace("_", "")
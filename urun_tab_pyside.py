@@ -1,19 +1,22 @@
 # urun_tab_pyside.py
 
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QLineEdit,
-                                 QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView,
-                                 QMessageBox, QDialog, QFormLayout, QDoubleSpinBox, QComboBox, QCheckBox) # QCheckBox eklendi
-from PySide6.QtCore import Qt, QModelIndex
-from PySide6.QtGui import QDoubleValidator, QColor # QColor buraya eklendi
+                                 QTableView, QAbstractItemView, QHeaderView,
+                                 QMessageBox, QDialog, QFormLayout, QDoubleSpinBox, QComboBox, QCheckBox, # QCheckBox eklendi
+                                 QInputDialog, QFileDialog)
+from PySide6.QtCore import QModelIndex
+from PySide6.QtGui import QDoubleValidator
 
 import os # Dosya yolu kontrolü için eklendi
 
+import refresh_bus
+from money import Money
+from product_table_model import ProductTableModel, ProductFilterProxyModel, COLUMN_ADI
+
 # DatabaseManager main_app üzerinden erişilecek
 
-# Adisyon sekmesindeki hızlı satış butonlarını güncellemek için AdisyonTabPyside import edilmeli
-# Bu import burada gerekli çünkü _add_product ve _edit_product metotları AdisyonTabPyside referansını kullanıyor.
-# Ancak dairesel import sorunu yaşamamak için bu import'u metot içinde yapabiliriz.
-# from adisyon_tab_pyside import AdisyonTabPyside # Dairesel import'u önlemek için commentlendi
+# Ürün değişikliklerinden sonra Adisyon sekmesindeki hızlı satış butonları ve bu sekmenin tablosu
+# doğrudan yenilenmez; main_app.refresh_bus üzerinden PRODUCTS_CHANGED olayı yayınlanır.
 
 
 # --- PySide6 Özel Diyalog Sınıfları ---
@@ -77,8 +80,8 @@ class ProductDialogPyside(QDialog):
          # Verileri yükle (Eğer düzenleme modu ise)
          if self.product_data:
              self.entry_name.setText(self.product_data['adi'])
-             self.spinbox_price.setValue(self.product_data['fiyat'])
-             self.check_active.setChecked(bool(self.product_data['aktif'])) # 0 veya 1'i bool'a çevir
+             self.spinbox_price.setValue(self.product_data['fiyat'].to_float()) # Money -> spinbox TL
+             self.check_active.setChecked(bool(self.product_data['aktif_durumu'])) # 0 veya 1'i bool'a çevir
 
          # Kategori ComboBox'ını doldur (database manager üzerinden)
          self._load_categories()
@@ -121,7 +124,7 @@ class ProductDialogPyside(QDialog):
          return {
              'urun_id': self.product_id,
              'adi': self.entry_name.text().strip(),
-             'fiyat': self.spinbox_price.value(),
+             'fiyat': Money.from_tl(self.spinbox_price.value()),
              'kategori_id': kategori_id, # None veya kategori_id
              'aktif': int(self.check_active.isChecked()) # True/False'u 1/0'a çevir
          }
@@ -150,6 +153,7 @@ class UrunTabPyside(QWidget):
         self.btn_add_product.clicked.connect(self._add_product)
         self.btn_edit_product.clicked.connect(self._edit_product)
         self.btn_delete_product.clicked.connect(self._delete_product)
+        self.btn_import_csv.clicked.connect(self._import_csv)
         self.entry_search.textChanged.connect(self.filter_products) # Filtreleme metodu bağlantısı
         self.cmb_kategori_filter.currentIndexChanged.connect(self.filter_products) # Filtreleme metodu bağlantısı
 
@@ -182,95 +186,60 @@ class UrunTabPyside(QWidget):
         self.btn_add_product = QPushButton("Yeni Ürün", self)
         self.btn_edit_product = QPushButton("Düzenle", self)
         self.btn_delete_product = QPushButton("Sil", self)
+        self.btn_import_csv = QPushButton("CSV İçe Aktar", self)
 
         controls_layout.addWidget(self.btn_add_product)
         controls_layout.addWidget(self.btn_edit_product)
         controls_layout.addWidget(self.btn_delete_product)
+        controls_layout.addWidget(self.btn_import_csv)
 
         main_layout.addLayout(controls_layout) # Kontrol layout'unu ana layout'a ekle
 
-        # Ürün listesi için TableWidget
-        self.table_products = QTableWidget(self)
-        self.table_products.setColumnCount(6) # urun_id, adi, fiyat, kategori_id, aktif, kategori_adi
-        self.table_products.setHorizontalHeaderLabels(["ID", "Ürün Adı", "Fiyat", "Kategori ID", "Aktif", "Kategori"])
-        self.table_products.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch) # Ürün Adı sütununu genişlet
+        # Ürün listesi için TableView (model/view: satır başına widget öğesi oluşturulmaz)
+        self.product_model = ProductTableModel(self)
+        self.product_proxy = ProductFilterProxyModel(self)
+        self.product_proxy.setSourceModel(self.product_model)
+
+        self.table_products = QTableView(self)
+        self.table_products.setModel(self.product_proxy)
+        self.table_products.horizontalHeader().setSectionResizeMode(COLUMN_ADI, QHeaderView.Stretch) # Ürün Adı sütununu genişlet
+        self.table_products.verticalHeader().setVisible(False)
+        # Sabit satır yüksekliği: görünüm satır yüksekliklerini tek tek hesaplamaz
+        self.table_products.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.table_products.setEditTriggers(QAbstractItemView.NoEditTriggers) # Tabloyu düzenlenemez yap
         self.table_products.setSelectionBehavior(QAbstractItemView.SelectRows) # Satır seçimi yap
         self.table_products.setSelectionMode(QAbstractItemView.SingleSelection) # Tekli seçim yap
 
-        # ID, Kategori ID ve Aktif sütunlarını gizle (isteğe bağlı ama genellikle daha temiz durur)
-        self.table_products.setColumnHidden(0, True) # ID sütunu
-        self.table_products.setColumnHidden(3, True) # Kategori ID sütunu
-        self.table_products.setColumnHidden(4, True) # Aktif sütunu
-
         main_layout.addWidget(self.table_products) # Tabloyu ana layout'a ekle
 
-        # Placeholder etiketi kaldırıldı
-
     def _configure_styles(self):
         """Ürünler sekmesi için özel stilleri yapılandırır."""
         # Buraya daha sonra ürün sekmesine özel stiller eklenecek
         pass
 
     def load_data(self):
-        """Ürünler sekmesi aktif olduğunda verileri yükler ve tabloyu doldurur."""
-        print("Ürünler sekmesi verileri yükleniyor...") # <<< Bu print çalışmalı
-        self.table_products.setRowCount(0) # Tabloyu temizle
+        """Ürünler sekmesi aktif olduğunda verileri yükler.
 
-        products = self.db_manager.get_all_products(include_inactive=True) # Pasif ürünleri de alalım
+        Model katalog önbelleğindeki kayıtları doğrudan kullanır; tablo sadece görünen hücreleri çizer.
+        """
+        print("Ürünler sekmesi verileri yükleniyor...") # <<< Bu print çalışmalı
+        catalogue = self.db_manager.get_catalogue()
+        self.load_categories_combobox(catalogue.categories)
+        products = catalogue.get_products(include_inactive=True) # Pasif ürünleri de alalım
+        self.product_model.set_products(products, catalogue.search_index) # Mevcut filtre proxy tarafından yeniden uygulanır
 
         if not products:
             print("Veritabanında ürün bulunamadı.")
-            # Tablo zaten boş, placeholder gösterilebilir veya bilgilendirme eklenebilir
-            # self.placeholder_label.setVisible(True) # Placeholder geri gösterilebilir
             return
-
-        # self.placeholder_label.setVisible(False) # Placeholder gizlenir
-
-        self.table_products.setRowCount(len(products)) # Tabloya ürün sayısı kadar satır ekle
-
-        for row_index, product in enumerate(products):
-            # Sütunlar: ID (Gizli), Ürün Adı, Fiyat, Kategori ID (Gizli), Aktif (Gizli), Kategori
-            item_id = QTableWidgetItem(str(product['urun_id']))
-            item_name = QTableWidgetItem(product['adi'])
-            item_price = QTableWidgetItem(f"{product['fiyat']:.2f}") # Fiyat formatı
-            item_category_id = QTableWidgetItem(str(product['kategori_id']))
-            item_active = QTableWidgetItem(str(product['aktif']))
-
-            # Kategori adını alalım (eğer kategori_id varsa)
-            category_name = "Belirtilmemiş"
-            if product['kategori_id'] is not None:
-                 category = self.db_manager.get_category_by_id(product['kategori_id'])
-                 if category:
-                      category_name = category['adi']
-
-            item_category_name = QTableWidgetItem(category_name)
-
-            # Ürün pasif ise satırı gri yap
-            if not product['aktif']:
-                font = item_name.font()
-                font.setItalic(True) # Pasif ürün adını italik yap
-                item_name.setFont(font)
-                color = QColor(Qt.gray)
-                item_id.setForeground(color)
-                item_name.setForeground(color)
-                item_price.setForeground(color)
-                item_category_id.setForeground(color)
-                item_active.setForeground(color)
-                item_category_name.setForeground(color)
-
-
-            self.table_products.setItem(row_index, 0, item_id)
-            self.table_products.setItem(row_index, 1, item_name)
-            self.table_products.setItem(row_index, 2, item_price)
-            self.table_products.setItem(row_index, 3, item_category_id)
-            self.table_products.setItem(row_index, 4, item_active)
-            self.table_products.setItem(row_index, 5, item_category_name)
-
         print(f"Ürünler tablosuna {len(products)} adet ürün yüklendi.") # <<< Bu print çalışmalı
 
-        # Filtrelemeyi yükledikten sonra uygula (varsayılan tüm ürünler)
-        # self.filter_products() # filter_products çağrısı load_data içinde olmamalı, sonsuz döngüye neden olabilir.
+    def _selected_product(self):
+        """Tabloda seçili ürün kaydını döndürür (seçim yoksa None)."""
+        selected_rows = self.table_products.selectionModel().selectedRows()
+        if not selected_rows:
+            return None
+        source_index = self.product_proxy.mapToSource(selected_rows[0])
+        return self.product_model.product_at(source_index.row())
 
     def _add_product(self):
          """Yeni ürün ekleme diyaloğunu açar."""
@@ -279,135 +248,107 @@ class UrunTabPyside(QWidget):
          if dialog.exec() == QDialog.Accepted:
              product_data = dialog.get_product_data()
              if product_data:
-                 success = self.db_manager.add_product(product_data)
+                 # Yeni ürün hızlı satış sırasının sonuna eklenir
+                 products = self.db_manager.get_catalogue().products
+                 hizli_satis_sirasi = max((p.hizli_satis_sirasi or 0 for p in products), default=0) + 1
+                 success, message = self.db_manager.add_product(product_data['adi'], product_data['fiyat'], product_data['kategori_id'],
+                                                                product_data['aktif'], hizli_satis_sirasi)
                  if success:
-                     QMessageBox.information(self, "Başarılı", "Ürün başarıyla eklendi.")
-                     self.load_data() # Tabloyu yeniden yükle
-                     # Adisyon sekmesindeki hızlı satış butonlarını da güncelle
-                     # Dairesel import'u önlemek için burada import yapalım
-                     try:
-                         from adisyon_tab_pyside import AdisyonTabPyside
-                         if hasattr(self.main_app, 'adisyon_tab') and isinstance(self.main_app.adisyon_tab, AdisyonTabPyside):
-                             self.main_app.adisyon_tab.filter_hizli_satis_buttons()
-                     except ImportError:
-                         print("AdisyonTabPyside import edilemedi. Hızlı satış butonları güncellenemedi.")
+                     QMessageBox.information(self, "Başarılı", message)
+                     # Ürün tablosu ve Adisyon sekmesindeki hızlı satış butonları bir sonraki turda bir kez yenilenir
+                     self.main_app.refresh_bus.publish(refresh_bus.PRODUCTS_CHANGED, None)
+                 else:
+                     QMessageBox.warning(self, "Uyarı", message)
 
 
     def _edit_product(self):
          """Seçili ürünü düzenleme diyaloğunu açar."""
-         selected_items = self.table_products.selectedItems()
-         if not selected_items:
+         product_data = self._selected_product()
+         if not product_data:
              QMessageBox.warning(self, "Uyarı", "Lütfen düzenlemek için bir ürün seçin.")
              return
 
-         # Seçili satırın ID'sini al
-         selected_row = selected_items[0].row()
-         product_id = int(self.table_products.item(selected_row, 0).text())
-
-         # Ürün verilerini veritabanından çek
-         product_data = self.db_manager.get_product_by_id(product_id)
-
-         if product_data:
-              print(f"Ürün düzenle: ID {product_id}")
-              dialog = ProductDialogPyside(self, product_data=product_data, db_manager=self.db_manager)
-              if dialog.exec() == QDialog.Accepted:
-                  updated_product_data = dialog.get_product_data()
-                  if updated_product_data:
-                      success = self.db_manager.update_product(updated_product_data)
-                      if success:
-                          QMessageBox.information(self, "Başarılı", "Ürün başarıyla güncellendi.")
-                          self.load_data() # Tabloyu yeniden yükle
-                          # Adisyon sekmesindeki hızlı satış butonlarını da güncelle
-                          # Dairesel import'u önlemek için burada import yapalım
-                          try:
-                              from adisyon_tab_pyside import AdisyonTabPyside
-                              if hasattr(self.main_app, 'adisyon_tab') and isinstance(self.main_app.adisyon_tab, AdisyonTabPyside):
-                                  self.main_app.adisyon_tab.filter_hizli_satis_buttons()
-                          except ImportError:
-                              print("AdisyonTabPyside import edilemedi. Hızlı satış butonları güncellenemedi.")
-         else:
-             QMessageBox.critical(self, "Hata", "Seçili ürün bilgisi veritabanında bulunamadı.")
+         product_id = product_data['urun_id']
+         print(f"Ürün düzenle: ID {product_id}")
+         dialog = ProductDialogPyside(self, product_data=product_data, db_manager=self.db_manager)
+         if dialog.exec() == QDialog.Accepted:
+             updated_product_data = dialog.get_product_data()
+             if updated_product_data:
+                 success, message = self.db_manager.update_product(product_id, updated_product_data['adi'], updated_product_data['fiyat'],
+                                                                   updated_product_data['kategori_id'], updated_product_data['aktif'],
+                                                                   product_data['hizli_satis_sirasi'])
+                 if success:
+                     QMessageBox.information(self, "Başarılı", message)
+                     # Ürün tablosu ve Adisyon sekmesindeki hızlı satış butonları bir sonraki turda bir kez yenilenir
+                     self.main_app.refresh_bus.publish(refresh_bus.PRODUCTS_CHANGED, product_id)
+                 else:
+                     QMessageBox.warning(self, "Uyarı", message)
 
 
     def _delete_product(self):
-         """Seçili ürünü siler."""
-         selected_items = self.table_products.selectedItems()
-         if not selected_items:
+         """Seçili ürünü pasif hale getirir.
+
+         Ürünler adisyon geçmişinde kullanıldığı için veritabanından silinmez (mark_product_inactive).
+         """
+         product_data = self._selected_product()
+         if not product_data:
              QMessageBox.warning(self, "Uyarı", "Lütfen silmek için bir ürün seçin.")
              return
 
-         # Seçili satırın ID'sini ve adını al
-         selected_row = selected_items[0].row()
-         product_id = int(self.table_products.item(selected_row, 0).text())
-         product_name = self.table_products.item(selected_row, 1).text()
-
+         product_id = product_data['urun_id']
+         product_name = product_data['adi']
 
-         reply = QMessageBox.question(self, "Silme Onayı", f"'{product_name}' ürününü silmek istediğinizden emin misiniz?\nBu işlem geri alınamaz!",
+         reply = QMessageBox.question(self, "Silme Onayı", f"'{product_name}' ürünü pasif hale getirilecek ve hızlı satış ekranından kaldırılacak. Emin misiniz?",
                                       QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
          if reply == QMessageBox.Yes:
-             # Ürünün herhangi bir açık veya tamamlanmış adisyonda olup olmadığını kontrol et (İsteğe bağlı ama iyi bir kontrol)
-             # Simplistik yaklaşım: Direkt silmeye çalış, FK hatası olursa kullanıcıyı bilgilendir
-             try:
-                 success = self.db_manager.delete_product(product_id)
-                 if success:
-                     QMessageBox.information(self, "Başarılı", "Ürün başarıyla silindi.")
-                     self.load_data() # Tabloyu yeniden yükle
-                     # Adisyon sekmesindeki hızlı satış butonlarını da güncelle
-                     # Dairesel import'u önlemek için burada import yapalım
-                     try:
-                         from adisyon_tab_pyside import AdisyonTabPyside
-                         if hasattr(self.main_app, 'adisyon_tab') and isinstance(self.main_app.adisyon_tab, AdisyonTabPyside):
-                             self.main_app.adisyon_tab.filter_hizli_satis_buttons()
-                     except ImportError:
-                         print("AdisyonTabPyside import edilemedi. Hızlı satış butonları güncellenemedi.")
+             success, message = self.db_manager.mark_product_inactive(product_id)
+             if success:
+                 QMessageBox.information(self, "Başarılı", message)
+                 # Ürün tablosu ve Adisyon sekmesindeki hızlı satış butonları bir sonraki turda bir kez yenilenir
+                 self.main_app.refresh_bus.publish(refresh_bus.PRODUCTS_CHANGED, product_id)
+             else:
+                 QMessageBox.critical(self, "Hata", message)
+
 
+    def _import_csv(self):
+         """Seçilen CSV dosyasını (ürün, kategori veya müşteri listesi) arka planda toplu içe aktarır.
 
-             except Exception as e:
-                 # FK hatası veya başka bir veritabanı hatası olabilir
-                 QMessageBox.critical(self, "Hata", f"Ürün silinirken bir hata oluştu. Ürün adisyonlarda kullanılıyor olabilir.\nHata: {e}")
+         Hatalı satırlar atlanır ve sonuç mesajında satır numarasıyla listelenir; tablolar iş bitince yenilenir.
+         """
+         kinds = {"Ürünler": "urunler", "Kategoriler": "kategoriler", "Müşteriler": "musteriler"}
+         kind_label, ok = QInputDialog.getItem(self, "CSV İçe Aktar", "İçe aktarılacak liste:", list(kinds), 0, False)
+         if not ok:
+             return
+         path, _ = QFileDialog.getOpenFileName(self, "CSV Dosyası Seç", "", "CSV Dosyaları (*.csv *.txt);;Tüm Dosyalar (*)")
+         if not path:
+             return
+         print(f"CSV içe aktarma: {kind_label} <- {path}")
+         self.main_app.import_csv(kinds[kind_label], path)
 
 
     def filter_products(self):
-         """Arama kutusu ve kategori seçimine göre ürün tablosunu filtreler."""
-         search_term = self.entry_search.text().strip().lower()
+         """Arama kutusu ve kategori seçimine göre ürün tablosunu filtreler (proxy model, satır gizleme yok)."""
+         search_term = self.entry_search.text().strip() # Arama indeksi Türkçe harf duyarsız anahtar kullanır
          selected_category_id = self.cmb_kategori_filter.currentData() # None veya kategori_id
+         self.product_proxy.set_filter(search_term, selected_category_id)
 
-         for row in range(self.table_products.rowCount()):
-             # Ürün Adı sütunu (Index 1)
-             item_name = self.table_products.item(row, 1)
-             # Kategori ID sütunu (Index 3)
-             item_category_id = self.table_products.item(row, 3)
-
-             name_match = (search_term in item_name.text().lower())
-
-             # item_category_id'nin None olup olmadığını kontrol et
-             category_id = int(item_category_id.text()) if item_category_id and item_category_id.text() else None
-             # Eğer kategori ID -1 (Kategori Seçin) ise None olarak kabul et
-             if category_id == -1:
-                  category_id = None
-
-             category_match = (selected_category_id is None or selected_category_id == category_id)
-
-             # Hem isim hem de kategori filtresine uyuyorsa satırı göster, yoksa gizle
-             if name_match and category_match:
-                 self.table_products.setRowHidden(row, False)
-             else:
-                 self.table_products.setRowHidden(row, True)
-
-    def load_categories_combobox(self):
-        """Kategori filtre Combobox'ını günceller (Adisyon sekmesindeki metodun benzeri)."""
+    def load_categories_combobox(self, categories=None):
+        """Kategori filtre Combobox'ını günceller (Adisyon sekmesindeki metodun benzeri). Mevcut seçim korunur."""
         print("Ürünler sekmesi kategori combobox yükleniyor...")
-        categories = self.db_manager.get_all_categories()
+        if categories is None:
+            categories = self.db_manager.get_all_categories()
+        selected_category_id = self.cmb_kategori_filter.currentData()
 
+        self.cmb_kategori_filter.blockSignals(True) # Doldururken filtre tekrar tekrar uygulanmasın
         self.cmb_kategori_filter.clear()
         self.cmb_kategori_filter.addItem("Tümü", None) # Varsayılan olarak Tümü, data None
 
         for cat in categories:
              self.cmb_kategori_filter.addItem(cat['adi'], cat['kategori_id'])
 
-        self.cmb_kategori_filter.setCurrentIndex(0) # Varsayılan olarak Tümü seçili
-
-
-# Adisyon sekmesindeki hızlı satış butonlarını güncellemek için AdisyonTabPyside import edilmeli
-# from adisyon_tab_pyside import AdisyonTabPyside # Dairesel import'u önlemek için metod içinde yapılıyor
\ No newline at end of file
+        index = self.cmb_kategori_filter.findData(selected_category_id) if selected_category_id is not None else 0
+        self.cmb_kategori_filter.setCurrentIndex(max(index, 0)) # Seçili kategori silinmişse Tümü
+        self.cmb_kategori_filter.blockSignals(False)
+        if self.cmb_kategori_filter.currentData() != selected_category_id:
+             self.filter_products()
\ No newline at end of file